@@ -24,8 +24,16 @@ def _get_metadata():
     from app.modules.pets.infra.models import PetModel, PetWeightEntryModel  # noqa: F401
     from app.modules.booking.infra.models import HoldModel, AvailabilitySlotModel  # noqa: F401
     from app.modules.orders.infra.models import OrderModel, OrderAssignmentModel  # noqa: F401
-    from app.modules.notifications.infra.models import NotificationModel  # noqa: F401
-    from app.modules.push.infra.models import DeviceTokenModel  # noqa: F401
+    from app.modules.notifications.infra.models import NotificationModel, NotificationUnreadCounterModel  # noqa: F401
+    from app.modules.chat.infra.models import ChatMessageModel, ChatUnreadCounterModel  # noqa: F401
+    from app.modules.push.infra.models import (  # noqa: F401
+        DeviceTokenModel,
+        PushBroadcastChunkModel,
+        PushBroadcastModel,
+        PushDeliveryStatsModel,
+        PushOutboxModel,
+        PushTicketModel,
+    )
     from app.modules.cart.infra.models import CartSessionModel, CartItemModel  # noqa: F401
     from app.modules.catalog.infra.models import BreedModel  # noqa: F401
     from app.modules.store.infra.db_models import (
@@ -0,0 +1,83 @@
+"""push: background broadcast jobs with per-chunk results
+
+Revision ID: a7b8c9d0e1f2
+Revises: f6a7b8c9d0e1
+Create Date: 2026-10-17
+
+POST /push/broadcast deja de enviar dentro del request: crea un job que un
+runner en segundo plano procesa página por página.
+
+Tablas:
+  - push_broadcasts: job + progreso (total_tokens, sent, failed, chunks_done),
+    cursor keyset last_token_id para reanudar y heartbeat_at para detectar
+    jobs huérfanos (instancia caída).
+  - push_broadcast_chunks: resultado de cada chunk de hasta 100 tokens.
+
+Índices:
+  - ix_device_tokens_active_id (id) WHERE is_active
+      → paginación keyset de tokens activos sin ordenar la tabla completa.
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+revision: str = "a7b8c9d0e1f2"
+down_revision: Union[str, None] = "f6a7b8c9d0e1"
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    op.create_table(
+        "push_broadcasts",
+        sa.Column("id", sa.Uuid(as_uuid=True), primary_key=True),
+        sa.Column("created_by", sa.Uuid(as_uuid=True), nullable=False),
+        sa.Column("title", sa.String(200), nullable=False),
+        sa.Column("body", sa.Text(), nullable=False),
+        sa.Column("data", sa.JSON(), nullable=True),
+        sa.Column("status", sa.String(20), nullable=False, server_default="queued"),
+        sa.Column("total_tokens", sa.Integer(), nullable=False, server_default="0"),
+        sa.Column("sent", sa.Integer(), nullable=False, server_default="0"),
+        sa.Column("failed", sa.Integer(), nullable=False, server_default="0"),
+        sa.Column("chunks_done", sa.Integer(), nullable=False, server_default="0"),
+        sa.Column("last_token_id", sa.Uuid(as_uuid=True), nullable=True),
+        sa.Column("last_error", sa.Text(), nullable=True),
+        sa.Column(
+            "created_at",
+            sa.DateTime(timezone=True),
+            nullable=False,
+            server_default=sa.text("now()"),
+        ),
+        sa.Column("started_at", sa.DateTime(timezone=True), nullable=True),
+        sa.Column("finished_at", sa.DateTime(timezone=True), nullable=True),
+        sa.Column("heartbeat_at", sa.DateTime(timezone=True), nullable=True),
+    )
+    op.create_table(
+        "push_broadcast_chunks",
+        sa.Column("broadcast_id", sa.Uuid(as_uuid=True), primary_key=True),
+        sa.Column("chunk_index", sa.Integer(), primary_key=True),
+        sa.Column("token_count", sa.Integer(), nullable=False),
+        sa.Column("ok_count", sa.Integer(), nullable=False, server_default="0"),
+        sa.Column("error_count", sa.Integer(), nullable=False, server_default="0"),
+        sa.Column("error", sa.Text(), nullable=True),
+        sa.Column(
+            "created_at",
+            sa.DateTime(timezone=True),
+            nullable=False,
+            server_default=sa.text("now()"),
+        ),
+    )
+    op.create_index(
+        "ix_device_tokens_active_id",
+        "device_tokens",
+        ["id"],
+        postgresql_where=sa.text("is_active"),
+    )
+
+
+def downgrade() -> None:
+    op.drop_index("ix_device_tokens_active_id", table_name="device_tokens")
+    op.drop_table("push_broadcast_chunks")
+    op.drop_table("push_broadcasts")
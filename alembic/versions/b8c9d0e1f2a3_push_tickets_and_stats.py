@@ -0,0 +1,77 @@
+"""push: Expo tickets, receipts and delivery stats
+
+Revision ID: b8c9d0e1f2a3
+Revises: a7b8c9d0e1f2
+Create Date: 2026-10-17
+
+Expo responde cada envío con un ticket; el resultado real (entregado, token
+muerto) llega después como receipt. Un job del scheduler consulta los
+receipts en lotes de 1000, desactiva en bloque los tokens
+DeviceNotRegistered y acumula estadísticas de entrega.
+
+Tablas:
+  - push_tickets: ticket_id (PK, id de Expo), token, origen
+    (source_type + source_id), status pending | ok | error | expired.
+  - push_delivery_stats: (source_type, source_id) PK con accepted,
+    delivered, failed y pruned_tokens.
+
+Índices:
+  - ix_push_tickets_pending (created_at) WHERE status = 'pending'
+  - ix_device_tokens_token ya existe (desactivación por token).
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+revision: str = "b8c9d0e1f2a3"
+down_revision: Union[str, None] = "a7b8c9d0e1f2"
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    op.create_table(
+        "push_tickets",
+        sa.Column("ticket_id", sa.String(100), primary_key=True),
+        sa.Column("token", sa.String(500), nullable=False),
+        sa.Column("source_type", sa.String(20), nullable=False),
+        sa.Column("source_id", sa.Uuid(as_uuid=True), nullable=True),
+        sa.Column("status", sa.String(20), nullable=False, server_default="pending"),
+        sa.Column("error", sa.String(100), nullable=True),
+        sa.Column(
+            "created_at",
+            sa.DateTime(timezone=True),
+            nullable=False,
+            server_default=sa.text("now()"),
+        ),
+        sa.Column("checked_at", sa.DateTime(timezone=True), nullable=True),
+    )
+    op.create_index(
+        "ix_push_tickets_pending",
+        "push_tickets",
+        ["created_at"],
+        postgresql_where=sa.text("status = 'pending'"),
+    )
+    op.create_table(
+        "push_delivery_stats",
+        sa.Column("source_type", sa.String(20), primary_key=True),
+        sa.Column("source_id", sa.Uuid(as_uuid=True), primary_key=True),
+        sa.Column("accepted", sa.Integer(), nullable=False, server_default="0"),
+        sa.Column("delivered", sa.Integer(), nullable=False, server_default="0"),
+        sa.Column("failed", sa.Integer(), nullable=False, server_default="0"),
+        sa.Column("pruned_tokens", sa.Integer(), nullable=False, server_default="0"),
+        sa.Column(
+            "updated_at",
+            sa.DateTime(timezone=True),
+            nullable=False,
+            server_default=sa.text("now()"),
+        ),
+    )
+
+
+def downgrade() -> None:
+    op.drop_table("push_delivery_stats")
+    op.drop_index("ix_push_tickets_pending", table_name="push_tickets")
+    op.drop_table("push_tickets")
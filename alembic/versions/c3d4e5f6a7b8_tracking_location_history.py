@@ -0,0 +1,63 @@
+"""tracking: partitioned ally location history
+
+Revision ID: c3d4e5f6a7b8
+Revises: b2c3d4e5f6a7
+Create Date: 2026-10-17
+
+Crea ally_location_history: historial append-only de posiciones del ally,
+usado por GET /tracking/orders/{id}/trail (mapa del cliente y disputas).
+
+Diseño:
+  - Particionada por RANGE(recorded_at), una partición por día UTC
+    (ally_location_history_pYYYYMMDD).
+  - La retención se aplica con DROP de particiones completas (job de
+    mantenimiento en app/core/scheduler.py), sin DELETE masivo.
+  - El job crea por adelantado las particiones de los próximos días; esta
+    migración crea las de hoy y los dos días siguientes.
+  - Sin PK ni FK: es un log de solo inserción; la integridad se garantiza
+    en la capa de aplicación (igual que ally_locations).
+  - Índice (order_id, recorded_at) en la tabla padre → se propaga a cada partición.
+"""
+from datetime import datetime, timedelta, timezone
+from typing import Sequence, Union
+
+from alembic import op
+
+
+revision: str = "c3d4e5f6a7b8"
+down_revision: Union[str, None] = "b2c3d4e5f6a7"
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    op.execute(
+        """
+        CREATE TABLE ally_location_history (
+            order_id    UUID             NOT NULL,
+            ally_id     UUID             NOT NULL,
+            lat         DOUBLE PRECISION NOT NULL,
+            lng         DOUBLE PRECISION NOT NULL,
+            accuracy_m  DOUBLE PRECISION,
+            recorded_at TIMESTAMPTZ      NOT NULL
+        ) PARTITION BY RANGE (recorded_at)
+        """
+    )
+    op.execute(
+        "CREATE INDEX ix_ally_location_history_order_recorded "
+        "ON ally_location_history (order_id, recorded_at)"
+    )
+
+    today = datetime.now(timezone.utc).date()
+    for offset in range(3):
+        day = today + timedelta(days=offset)
+        op.execute(
+            f"CREATE TABLE ally_location_history_p{day:%Y%m%d} PARTITION OF ally_location_history "
+            f"FOR VALUES FROM ('{day.isoformat()} 00:00:00+00') "
+            f"TO ('{(day + timedelta(days=1)).isoformat()} 00:00:00+00')"
+        )
+
+
+def downgrade() -> None:
+    # DROP de la tabla padre elimina todas sus particiones.
+    op.execute("DROP TABLE IF EXISTS ally_location_history")
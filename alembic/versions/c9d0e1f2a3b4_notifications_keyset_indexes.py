@@ -0,0 +1,60 @@
+"""notifications: keyset indexes for the inbox
+
+Revision ID: c9d0e1f2a3b4
+Revises: b8c9d0e1f2a3
+Create Date: 2026-10-17
+
+GET /notifications pagina con cursor keyset sobre (created_at, id), más
+recientes primero, y POST /notifications/mark-read marca en una sola
+sentencia por lista de ids o "todo hasta el cursor X".
+
+Índices:
+  - ix_notifications_user_read_created (user_id, is_read, created_at, id)
+      → bandeja `unread_only` y mark-read hasta cursor:
+        `WHERE user_id = :u AND is_read = false AND (created_at, id) < (:ts, :id)`
+        con un solo index scan (backward para el orden desc).
+  - ix_notifications_user_created_id (user_id, created_at, id)
+      → bandeja completa paginada.
+  - Se eliminan ix_notifications_user_created (user_id, created_at) y
+    ix_notifications_user_unread (user_id, is_read): son prefijos de los
+    nuevos índices y quedan redundantes.
+"""
+from typing import Sequence, Union
+
+from alembic import op
+
+
+revision: str = "c9d0e1f2a3b4"
+down_revision: Union[str, None] = "b8c9d0e1f2a3"
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    op.create_index(
+        "ix_notifications_user_read_created",
+        "notifications",
+        ["user_id", "is_read", "created_at", "id"],
+    )
+    op.create_index(
+        "ix_notifications_user_created_id",
+        "notifications",
+        ["user_id", "created_at", "id"],
+    )
+    op.drop_index("ix_notifications_user_unread", table_name="notifications")
+    op.drop_index("ix_notifications_user_created", table_name="notifications")
+
+
+def downgrade() -> None:
+    op.create_index(
+        "ix_notifications_user_created",
+        "notifications",
+        ["user_id", "created_at"],
+    )
+    op.create_index(
+        "ix_notifications_user_unread",
+        "notifications",
+        ["user_id", "is_read"],
+    )
+    op.drop_index("ix_notifications_user_created_id", table_name="notifications")
+    op.drop_index("ix_notifications_user_read_created", table_name="notifications")
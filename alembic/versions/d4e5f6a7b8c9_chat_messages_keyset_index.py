@@ -0,0 +1,43 @@
+"""chat: composite keyset index on chat_messages
+
+Revision ID: d4e5f6a7b8c9
+Revises: c3d4e5f6a7b8
+Create Date: 2026-10-17
+
+GET /chat/orders/{id}/messages pagina con cursores keyset sobre
+(created_at, id) en ambas direcciones (after / before).
+
+Índices:
+  - ix_chat_messages_order_created_id (order_id, created_at, id)
+      → resuelve `WHERE order_id = :o AND (created_at, id) > (:ts, :id)`
+        y su inversa con un solo index scan (asc o backward).
+  - Se elimina ix_chat_messages_order_created (order_id, created_at):
+    es prefijo del nuevo índice y queda redundante.
+"""
+from typing import Sequence, Union
+
+from alembic import op
+
+
+revision: str = "d4e5f6a7b8c9"
+down_revision: Union[str, None] = "c3d4e5f6a7b8"
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    op.create_index(
+        "ix_chat_messages_order_created_id",
+        "chat_messages",
+        ["order_id", "created_at", "id"],
+    )
+    op.drop_index("ix_chat_messages_order_created", table_name="chat_messages")
+
+
+def downgrade() -> None:
+    op.create_index(
+        "ix_chat_messages_order_created",
+        "chat_messages",
+        ["order_id", "created_at"],
+    )
+    op.drop_index("ix_chat_messages_order_created_id", table_name="chat_messages")
@@ -0,0 +1,77 @@
+"""notifications/chat: incremental unread counters
+
+Revision ID: e5f6a7b8c9d0
+Revises: d4e5f6a7b8c9
+Create Date: 2026-10-17
+
+Los badges (GET /notifications/unread-count y
+GET /chat/orders/{id}/unread-count) se consultan en cada foreground de la
+app. En lugar de contar filas en cada request, se mantienen contadores
+actualizados en la misma transacción que los writes.
+
+Tablas:
+  - notification_unread_counters (user_id PK, unread)
+  - chat_unread_counters ((order_id, sender_id) PK, unread)
+      → no leídos de un receptor = suma de los demás remitentes de la orden.
+
+La migración inicializa los contadores con los conteos actuales. Un job del
+scheduler (app/core/scheduler.py) repara cualquier desvío.
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+revision: str = "e5f6a7b8c9d0"
+down_revision: Union[str, None] = "d4e5f6a7b8c9"
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    op.create_table(
+        "notification_unread_counters",
+        sa.Column("user_id", sa.Uuid(as_uuid=True), primary_key=True),
+        sa.Column("unread", sa.Integer(), nullable=False, server_default="0"),
+        sa.Column(
+            "updated_at",
+            sa.DateTime(timezone=True),
+            nullable=False,
+            server_default=sa.text("now()"),
+        ),
+    )
+    op.create_table(
+        "chat_unread_counters",
+        sa.Column("order_id", sa.Uuid(as_uuid=True), primary_key=True),
+        sa.Column("sender_id", sa.Uuid(as_uuid=True), primary_key=True),
+        sa.Column("unread", sa.Integer(), nullable=False, server_default="0"),
+        sa.Column(
+            "updated_at",
+            sa.DateTime(timezone=True),
+            nullable=False,
+            server_default=sa.text("now()"),
+        ),
+    )
+
+    op.execute(
+        """
+        INSERT INTO notification_unread_counters (user_id, unread)
+        SELECT user_id, count(*) FROM notifications
+        WHERE is_read = false
+        GROUP BY user_id
+        """
+    )
+    op.execute(
+        """
+        INSERT INTO chat_unread_counters (order_id, sender_id, unread)
+        SELECT order_id, sender_id, count(*) FROM chat_messages
+        WHERE is_read = false
+        GROUP BY order_id, sender_id
+        """
+    )
+
+
+def downgrade() -> None:
+    op.drop_table("chat_unread_counters")
+    op.drop_table("notification_unread_counters")
@@ -0,0 +1,73 @@
+"""push: transactional outbox for push delivery
+
+Revision ID: f6a7b8c9d0e1
+Revises: e5f6a7b8c9d0
+Create Date: 2026-10-17
+
+Crea push_outbox: las notificaciones encolan su push en la misma transacción
+y un worker asíncrono (app/modules/push/infra/outbox_worker.py) los envía a
+Expo en lotes de 100, con reintentos y backoff exponencial.
+
+Columnas:
+  - id:              BIGSERIAL, PK (orden de llegada)
+  - user_id:         destinatario; los tokens activos se resuelven al enviar
+  - notification_id: notificación de origen (nullable)
+  - title/body/data: contenido del push
+  - status:          pending | sent | failed
+  - attempts:        intentos realizados
+  - last_error:      último error de Expo / red
+  - next_attempt_at: no se reintenta antes de este momento (backoff)
+  - created_at/sent_at
+
+Índices:
+  - ix_push_outbox_pending (next_attempt_at, id) WHERE status = 'pending'
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+revision: str = "f6a7b8c9d0e1"
+down_revision: Union[str, None] = "e5f6a7b8c9d0"
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    op.create_table(
+        "push_outbox",
+        sa.Column("id", sa.BigInteger(), primary_key=True, autoincrement=True),
+        sa.Column("user_id", sa.Uuid(as_uuid=True), nullable=False),
+        sa.Column("notification_id", sa.Uuid(as_uuid=True), nullable=True),
+        sa.Column("title", sa.String(200), nullable=False),
+        sa.Column("body", sa.Text(), nullable=False),
+        sa.Column("data", sa.JSON(), nullable=True),
+        sa.Column("status", sa.String(20), nullable=False, server_default="pending"),
+        sa.Column("attempts", sa.Integer(), nullable=False, server_default="0"),
+        sa.Column("last_error", sa.Text(), nullable=True),
+        sa.Column(
+            "next_attempt_at",
+            sa.DateTime(timezone=True),
+            nullable=False,
+            server_default=sa.text("now()"),
+        ),
+        sa.Column(
+            "created_at",
+            sa.DateTime(timezone=True),
+            nullable=False,
+            server_default=sa.text("now()"),
+        ),
+        sa.Column("sent_at", sa.DateTime(timezone=True), nullable=True),
+    )
+    op.create_index(
+        "ix_push_outbox_pending",
+        "push_outbox",
+        ["next_attempt_at", "id"],
+        postgresql_where=sa.text("status = 'pending'"),
+    )
+
+
+def downgrade() -> None:
+    op.drop_index("ix_push_outbox_pending", table_name="push_outbox")
+    op.drop_table("push_outbox")
@@ -9,7 +9,7 @@ from typing import Any, Dict, Optional, Union
 from uuid import UUID
 
 import bcrypt
-from fastapi import Depends, HTTPException, status, Request
+from fastapi import Depends, HTTPException, status, WebSocket, WebSocketException
 from fastapi.security import HTTPAuthorizationCredentials, HTTPBearer
 from app.core.settings import settings
 
@@ -105,25 +105,17 @@ def decode_token(token: str) -> Dict[str, Any]:
 
 
 def _log_auth_failure(failure_reason: str, extra: dict):
-    import inspect
-    from fastapi import Request
-    import sys
-    # Try to get request context if available
-    request = None
-    for frame_info in inspect.stack():
-        frame = frame_info.frame
-        if "request" in frame.f_locals and isinstance(frame.f_locals["request"], Request):
-            request = frame.f_locals["request"]
-            break
-    request_path = request.url.path if request else None
-    http_method = request.method if request else None
-    client_ip = request.client.host if request and request.client else None
+    # Contexto del request desde el contextvar de RequestContextMiddleware (sin inspeccionar frames).
+    from app.core.request_context import get_request_context
+
+    ctx = get_request_context()
     user_id = extra.get("user_id") if extra else None
     log_data = {
         "failure_reason": failure_reason,
-        "request_path": request_path,
-        "http_method": http_method,
-        "client_ip": client_ip,
+        "request_id": ctx.request_id if ctx else None,
+        "request_path": ctx.path if ctx else None,
+        "http_method": ctx.method if ctx else None,
+        "client_ip": ctx.client_ip if ctx else None,
         "user_id": user_id,
         "timestamp": datetime.now(timezone.utc).isoformat(),
     }
@@ -173,7 +165,6 @@ def create_refresh_token(user: Any) -> str:
 
 async def get_current_user(
     credentials: HTTPAuthorizationCredentials = Depends(security),
-    request: Request = None,
 ) -> CurrentUser:
     token = credentials.credentials
     try:
@@ -184,12 +175,7 @@ async def get_current_user(
     if data.get("type") != "access":
         _log_auth_failure(
             failure_reason="invalid_token",
-            extra={
-                "request_path": request.url.path if request else None,
-                "http_method": request.method if request else None,
-                "client_ip": request.client.host if request and request.client else None,
-                "user_id": data.get("sub") if data else None,
-            },
+            extra={"user_id": data.get("sub") if data else None},
         )
         raise HTTPException(status_code=status.HTTP_401_UNAUTHORIZED, detail="Invalid token")
 
@@ -198,12 +184,7 @@ async def get_current_user(
     except Exception as exc:
         _log_auth_failure(
             failure_reason="malformed_token",
-            extra={
-                "request_path": request.url.path if request else None,
-                "http_method": request.method if request else None,
-                "client_ip": request.client.host if request and request.client else None,
-                "user_id": data.get("sub") if data else None,
-            },
+            extra={"user_id": data.get("sub") if data else None},
         )
         raise HTTPException(status_code=status.HTTP_401_UNAUTHORIZED, detail="Invalid token") from exc
 
@@ -216,6 +197,39 @@ async def get_current_user(
     )
 
 
+async def get_current_user_ws(websocket: WebSocket) -> CurrentUser:
+    """Auth para WebSocket: el navegador no permite headers custom en el handshake,
+    así que el access token puede venir en `?token=` o en `Authorization: Bearer`.
+    Si el token es inválido se cierra el handshake con 1008 (policy violation).
+    """
+    token = websocket.query_params.get("token")
+    if not token:
+        scheme, _, credentials = websocket.headers.get("authorization", "").partition(" ")
+        if scheme.lower() == "bearer":
+            token = credentials.strip()
+    if not token:
+        raise WebSocketException(code=status.WS_1008_POLICY_VIOLATION, reason="Missing token")
+
+    try:
+        data = decode_token(token)
+    except HTTPException as exc:
+        raise WebSocketException(code=status.WS_1008_POLICY_VIOLATION, reason=str(exc.detail)) from exc
+    if data.get("type") != "access":
+        raise WebSocketException(code=status.WS_1008_POLICY_VIOLATION, reason="Invalid token")
+    try:
+        user_id = UUID(str(data.get("sub")))
+    except Exception as exc:
+        raise WebSocketException(code=status.WS_1008_POLICY_VIOLATION, reason="Invalid token") from exc
+
+    return CurrentUser(
+        id=user_id,
+        email=str(data.get("email")),
+        role=str(data.get("role")),
+        is_active=bool(data.get("is_active", True)),
+        profile_completed=bool(data.get("profile_completed", True)),
+    )
+
+
 def require_roles(*roles: str):
     async def _check(current: CurrentUser = Depends(get_current_user)) -> CurrentUser:
         if current.role not in roles:
@@ -1,19 +1,103 @@
-from typing import AsyncGenerator
+from contextlib import asynccontextmanager
+from typing import Any, AsyncGenerator, AsyncIterator, Optional
 
+from sqlalchemy import text
 from sqlalchemy.ext.asyncio import AsyncEngine, AsyncSession, async_sessionmaker, create_async_engine
+from sqlalchemy.pool import Pool
 
+from app.core.db_pool import (
+    InstrumentedQueuePool,
+    InstrumentedReadQueuePool,
+    PoolStats,
+    pool_stats,
+    read_pool_stats,
+)
+from app.core.db_replica import REPLICA_LAG_SQL, ReplicaRouter
+from app.core.metrics import instrument_engine
 from app.core.settings import settings
 
 
 if not settings.DATABASE_URL:
     raise RuntimeError("DATABASE_URL is required. Refusing to fall back to sqlite.")
 
-engine: AsyncEngine = create_async_engine(
-    settings.DATABASE_URL,
-    echo=settings.DEBUG,
+
+def _connect_args() -> dict[str, Any]:
+    server_settings = {"application_name": settings.APP_NAME[:63]}
+    if settings.DB_STATEMENT_TIMEOUT_MS > 0:
+        server_settings["statement_timeout"] = str(settings.DB_STATEMENT_TIMEOUT_MS)
+    return {
+        "statement_cache_size": settings.DB_STATEMENT_CACHE_SIZE,
+        "server_settings": server_settings,
+    }
+
+
+def _create_engine(url: str, poolclass: type[Pool]) -> AsyncEngine:
+    return create_async_engine(
+        url,
+        echo=settings.DB_ECHO,
+        poolclass=poolclass,
+        pool_size=settings.DB_POOL_SIZE,
+        max_overflow=settings.DB_MAX_OVERFLOW,
+        pool_timeout=settings.DB_POOL_TIMEOUT_SECONDS,
+        pool_recycle=settings.DB_POOL_RECYCLE_SECONDS,
+        pool_pre_ping=settings.DB_POOL_PRE_PING,
+        connect_args=_connect_args(),
+    )
+
+
+engine: AsyncEngine = _create_engine(settings.DATABASE_URL, InstrumentedQueuePool)
+
+# Réplica de lectura: engine y pool propios. Sin DATABASE_READ_URL es el mismo engine.
+read_engine: AsyncEngine = (
+    _create_engine(settings.DATABASE_READ_URL, InstrumentedReadQueuePool)
+    if settings.DATABASE_READ_URL
+    else engine
 )
 
+instrument_engine(engine, name="primary")
+if read_engine is not engine:
+    instrument_engine(read_engine, name="replica")
+
 AsyncSessionLocal = async_sessionmaker(engine, expire_on_commit=False)
+AsyncReadSessionLocal = async_sessionmaker(read_engine, expire_on_commit=False)
+
+
+async def _replica_lag_seconds() -> Optional[float]:
+    async with read_engine.connect() as conn:
+        lag = (await conn.execute(text(REPLICA_LAG_SQL))).scalar_one()
+    return float(lag) if lag is not None else None
+
+
+replica_router = ReplicaRouter(
+    enabled=read_engine is not engine,
+    probe=_replica_lag_seconds,
+    max_lag_seconds=settings.DB_READ_MAX_LAG_SECONDS,
+    check_interval_seconds=settings.DB_READ_LAG_CHECK_SECONDS,
+)
+
+
+def _pool_snapshot(pool: Pool, stats: PoolStats) -> dict[str, Any]:
+    return {
+        "size": pool.size(),
+        "max_overflow": settings.DB_MAX_OVERFLOW,
+        "checked_out": pool.checkedout(),
+        "checked_in": pool.checkedin(),
+        # overflow() arranca en -pool_size: negativo = conexiones base aún no abiertas.
+        "overflow": max(pool.overflow(), 0),
+        "timeout_seconds": settings.DB_POOL_TIMEOUT_SECONDS,
+        **stats.snapshot(),
+    }
+
+
+def pool_status() -> dict[str, Any]:
+    """Estado actual del pool + estadísticas de espera (GET /admin/metrics/db-pool)."""
+    status = _pool_snapshot(engine.pool, pool_stats)
+    if read_engine is not engine:
+        status["read_replica"] = {
+            **replica_router.status(),
+            "pool": _pool_snapshot(read_engine.pool, read_pool_stats),
+        }
+    return status
 
 
 async def get_async_session() -> AsyncGenerator[AsyncSession, None]:
@@ -23,3 +107,37 @@ async def get_async_session() -> AsyncGenerator[AsyncSession, None]:
             yield session
         finally:
             await session.close()
+
+
+async def get_read_session() -> AsyncGenerator[AsyncSession, None]:
+    """
+    Sesión de solo lectura para endpoints que toleran staleness acotado.
+    Va a la réplica si está dentro de DB_READ_MAX_LAG_SECONDS; si no, al primario.
+    """
+    factory = AsyncReadSessionLocal if await replica_router.use_replica() else AsyncSessionLocal
+    async with factory() as session:
+        try:
+            yield session
+        finally:
+            await session.close()
+
+
+@asynccontextmanager
+async def session_scope() -> AsyncIterator[AsyncSession]:
+    """
+    Unit of work para trabajo fuera de un request (workers, jobs, fan-out).
+
+    Abre una sesión propia del pool, hace commit al salir sin error y rollback
+    si hay excepción. No usar get_async_session fuera de FastAPI: es un async
+    generator para Depends, no un context manager.
+
+        async with session_scope() as session:
+            await PostgresPushOutboxRepository(session=session).enqueue(...)
+    """
+    async with AsyncSessionLocal() as session:
+        try:
+            yield session
+            await session.commit()
+        except BaseException:
+            await session.rollback()
+            raise
@@ -0,0 +1,88 @@
+"""
+Instrumentación del pool de conexiones de SQLAlchemy.
+
+El engine (app/core/db.py) usa InstrumentedQueuePool: el mismo pool que
+SQLAlchemy usa por defecto con asyncpg, pero mide cuánto espera cada
+checkout. Sin esto no se distingue "la query es lenta" de "el request esperó
+una conexión libre" (pool agotado).
+"""
+
+from __future__ import annotations
+
+import threading
+import time
+from collections import deque
+from typing import Any
+
+from sqlalchemy import exc as sa_exc
+from sqlalchemy.pool import AsyncAdaptedQueuePool
+
+
+class PoolStats:
+    """
+    Espera por conexión del pool (checkout). Una espera alta o timeouts > 0
+    indican pool agotado: la latencia viene de esperar conexión, no de la query.
+    """
+
+    def __init__(self, *, window: int = 1024) -> None:
+        self._lock = threading.Lock()
+        self._recent: deque[float] = deque(maxlen=window)
+        self.checkouts = 0
+        self.timeouts = 0
+        self.wait_total_s = 0.0
+        self.wait_max_s = 0.0
+
+    def observe(self, wait_s: float, *, timed_out: bool = False) -> None:
+        with self._lock:
+            if timed_out:
+                self.timeouts += 1
+            else:
+                self.checkouts += 1
+            self.wait_total_s += wait_s
+            self.wait_max_s = max(self.wait_max_s, wait_s)
+            self._recent.append(wait_s)
+
+    def snapshot(self) -> dict[str, Any]:
+        with self._lock:
+            recent = sorted(self._recent)
+            checkouts, timeouts, total, peak = self.checkouts, self.timeouts, self.wait_total_s, self.wait_max_s
+
+        def pct(q: float) -> float:
+            return recent[min(len(recent) - 1, int(q * len(recent)))] if recent else 0.0
+
+        observed = checkouts + timeouts
+        return {
+            "checkouts": checkouts,
+            "timeouts": timeouts,
+            "wait_avg_ms": round(total / observed * 1000, 3) if observed else 0.0,
+            "wait_p50_ms": round(pct(0.50) * 1000, 3),
+            "wait_p95_ms": round(pct(0.95) * 1000, 3),
+            "wait_p99_ms": round(pct(0.99) * 1000, 3),
+            "wait_max_ms": round(peak * 1000, 3),
+        }
+
+
+pool_stats = PoolStats()
+read_pool_stats = PoolStats()
+
+
+class InstrumentedQueuePool(AsyncAdaptedQueuePool):
+    """Pool por defecto de asyncpg + medición del tiempo de espera por checkout."""
+
+    stats: PoolStats = pool_stats
+
+    def _do_get(self):
+        started = time.perf_counter()
+        try:
+            conn = super()._do_get()
+        except sa_exc.TimeoutError:
+            self.stats.observe(time.perf_counter() - started, timed_out=True)
+            raise
+        self.stats.observe(time.perf_counter() - started)
+        return conn
+
+
+class InstrumentedReadQueuePool(InstrumentedQueuePool):
+    """Mismo pool para el engine de la réplica, con sus propias estadísticas."""
+
+    stats: PoolStats = read_pool_stats
@@ -0,0 +1,107 @@
+"""
+Ruteo de lecturas a la réplica con staleness acotado.
+
+get_read_session (app/core/db.py) pregunta a ReplicaRouter si la réplica
+está dentro del lag permitido:
+  - El lag se mide como máximo cada DB_READ_LAG_CHECK_SECONDS (una sola
+    medición en curso; los demás requests usan el último valor).
+  - Lag > DB_READ_MAX_LAG_SECONDS, lag desconocido (réplica sin WAL
+    receiver en streaming), error o timeout de la medición → el request lee
+    del primario hasta la próxima medición.
+  - Sin DATABASE_READ_URL el router está deshabilitado y todo va al primario.
+
+Usar la réplica solo en lecturas que toleran unos segundos de atraso
+(catálogo, tienda, disponibilidad, listados admin). Flujos que leen lo que
+el mismo usuario acaba de escribir siguen en get_async_session.
+"""
+
+from __future__ import annotations
+
+import asyncio
+import logging
+import time
+from typing import Any, Awaitable, Callable, Optional
+
+logger = logging.getLogger(__name__)
+
+LagProbe = Callable[[], Awaitable[Optional[float]]]
+
+# Lag en segundos. Réplica al día (todo lo recibido ya aplicado) = 0 aunque el
+# primario esté ocioso y pg_last_xact_replay_timestamp() sea viejo.
+# Sin WAL receiver en streaming (caído, reconectando) "todo lo recibido" no
+# dice nada del primario → NULL (lag desconocido, no sana). El rol necesita
+# pg_read_all_stats para ver el status de pg_stat_wal_receiver.
+REPLICA_LAG_SQL = """
+SELECT CASE
+    WHEN NOT pg_is_in_recovery() THEN 0
+    WHEN NOT EXISTS (SELECT 1 FROM pg_stat_wal_receiver WHERE status = 'streaming') THEN NULL
+    WHEN pg_last_wal_receive_lsn() = pg_last_wal_replay_lsn() THEN 0
+    ELSE COALESCE(EXTRACT(EPOCH FROM now() - pg_last_xact_replay_timestamp()), 0)
+END
+"""
+
+
+class ReplicaRouter:
+    def __init__(
+        self,
+        *,
+        enabled: bool,
+        probe: LagProbe,
+        max_lag_seconds: float,
+        check_interval_seconds: float,
+        probe_timeout_seconds: float = 2.0,
+    ) -> None:
+        self._enabled = enabled
+        self._probe = probe
+        self._max_lag = max_lag_seconds
+        self._interval = max(check_interval_seconds, 0.0)
+        self._timeout = probe_timeout_seconds
+        self._lock = asyncio.Lock()
+        self._checked_at: float | None = None
+        self._lag: Optional[float] = None
+        self._healthy = False
+
+    @property
+    def enabled(self) -> bool:
+        return self._enabled
+
+    async def use_replica(self) -> bool:
+        if not self._enabled:
+            return False
+        if self._max_lag <= 0:
+            return True
+        if self._is_due() and not self._lock.locked():
+            async with self._lock:
+                if self._is_due():
+                    await self._check()
+        return self._healthy
+
+    def _is_due(self) -> bool:
+        return self._checked_at is None or time.monotonic() - self._checked_at >= self._interval
+
+    async def _check(self) -> None:
+        try:
+            lag = await asyncio.wait_for(self._probe(), timeout=self._timeout)
+        except Exception as exc:
+            if self._healthy or self._checked_at is None:
+                logger.warning("read replica unavailable, reading from primary: %s", exc)
+            self._lag, self._healthy = None, False
+        else:
+            if lag is None:
+                if self._healthy or self._checked_at is None:
+                    logger.warning("read replica WAL receiver not streaming, reading from primary")
+                self._lag, self._healthy = None, False
+            else:
+                healthy = lag <= self._max_lag
+                if healthy != self._healthy:
+                    logger.warning("read replica lag=%.1fs healthy=%s", lag, healthy)
+                self._lag, self._healthy = lag, healthy
+        self._checked_at = time.monotonic()
+
+    def status(self) -> dict[str, Any]:
+        return {
+            "enabled": self._enabled,
+            "healthy": self._healthy if self._enabled else False,
+            "lag_seconds": self._lag,
+            "max_lag_seconds": self._max_lag,
+        }
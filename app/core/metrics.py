@@ -0,0 +1,300 @@
+"""
+Métricas del proceso en formato de exposición de texto de Prometheus.
+
+Primitivas mínimas (Counter, Gauge, Histogram) con labels y un registro
+que se serializa en GET /metrics. Cada instancia de Cloud Run expone sus
+propios valores; la agregación entre instancias la hace el scraper.
+
+Qué se mide:
+  - HTTP (app/core/metrics_middleware.py): duración por método + plantilla de
+    ruta + status, requests en curso, y queries / tiempo de DB por request.
+  - DB (instrument_engine): total de queries y duración por query, vía
+    eventos del engine. El conteo por request usa un contextvar.
+  - Llamadas externas (track_external): Google Routes, Expo, firma GCS,
+    Firebase — cantidad por resultado y duración.
+  - Tracking: puntos del historial de posiciones descartados sin persistir.
+
+Labels con cardinalidad acotada: la ruta es la plantilla ("/orders/{id}"),
+nunca el path concreto.
+"""
+
+from __future__ import annotations
+
+import threading
+import time
+from contextvars import ContextVar
+from typing import Any, Iterable, Optional
+
+DEFAULT_BUCKETS = (0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0)
+COUNT_BUCKETS = (0, 1, 2, 5, 10, 20, 50, 100)
+
+
+def _escape(value: str) -> str:
+    return value.replace("\\", "\\\\").replace("\n", "\\n").replace('"', '\\"')
+
+
+def _format_labels(names: Iterable[str], values: Iterable[str], extra: str = "") -> str:
+    parts = [f'{n}="{_escape(v)}"' for n, v in zip(names, values)]
+    if extra:
+        parts.append(extra)
+    return "{" + ",".join(parts) + "}" if parts else ""
+
+
+def _format_value(value: float) -> str:
+    if value == float("inf"):
+        return "+Inf"
+    return repr(float(value)) if not float(value).is_integer() else str(int(value))
+
+
+class _Metric:
+    type = ""
+
+    def __init__(self, name: str, help: str, labelnames: tuple[str, ...] = ()) -> None:
+        self.name = name
+        self.help = help
+        self.labelnames = tuple(labelnames)
+        self._lock = threading.Lock()
+
+    def _key(self, labels: dict[str, Any]) -> tuple[str, ...]:
+        if set(labels) != set(self.labelnames):
+            raise ValueError(f"{self.name}: labels {sorted(labels)} != {sorted(self.labelnames)}")
+        return tuple(str(labels[n]) for n in self.labelnames)
+
+    def _samples(self) -> list[str]:
+        raise NotImplementedError
+
+    def render(self) -> str:
+        lines = [f"# HELP {self.name} {self.help}", f"# TYPE {self.name} {self.type}"]
+        lines.extend(self._samples())
+        return "\n".join(lines)
+
+
+class Counter(_Metric):
+    type = "counter"
+
+    def __init__(self, name: str, help: str, labelnames: tuple[str, ...] = ()) -> None:
+        super().__init__(name, help, labelnames)
+        self._values: dict[tuple[str, ...], float] = {}
+
+    def inc(self, amount: float = 1.0, **labels: Any) -> None:
+        key = self._key(labels)
+        with self._lock:
+            self._values[key] = self._values.get(key, 0.0) + amount
+
+    def value(self, **labels: Any) -> float:
+        return self._values.get(self._key(labels), 0.0)
+
+    def _samples(self) -> list[str]:
+        with self._lock:
+            items = list(self._values.items())
+        return [f"{self.name}{_format_labels(self.labelnames, k)} {_format_value(v)}" for k, v in items]
+
+
+class Gauge(Counter):
+    type = "gauge"
+
+    def dec(self, amount: float = 1.0, **labels: Any) -> None:
+        self.inc(-amount, **labels)
+
+    def set(self, value: float, **labels: Any) -> None:
+        key = self._key(labels)
+        with self._lock:
+            self._values[key] = value
+
+
+class Histogram(_Metric):
+    type = "histogram"
+
+    def __init__(
+        self,
+        name: str,
+        help: str,
+        labelnames: tuple[str, ...] = (),
+        buckets: tuple[float, ...] = DEFAULT_BUCKETS,
+    ) -> None:
+        super().__init__(name, help, labelnames)
+        self.buckets = tuple(sorted(buckets))
+        # key → ([conteo por bucket (no acumulado)..., +Inf], suma)
+        self._values: dict[tuple[str, ...], tuple[list[int], list[float]]] = {}
+
+    def observe(self, value: float, **labels: Any) -> None:
+        key = self._key(labels)
+        index = len(self.buckets)
+        for i, bound in enumerate(self.buckets):
+            if value <= bound:
+                index = i
+                break
+        with self._lock:
+            counts, total = self._values.setdefault(key, ([0] * (len(self.buckets) + 1), [0.0]))
+            counts[index] += 1
+            total[0] += value
+
+    def count(self, **labels: Any) -> int:
+        entry = self._values.get(self._key(labels))
+        return sum(entry[0]) if entry else 0
+
+    def _samples(self) -> list[str]:
+        with self._lock:
+            items = [(k, list(c), t[0]) for k, (c, t) in self._values.items()]
+        lines: list[str] = []
+        for key, counts, total in items:
+            cumulative = 0
+            for bound, n in zip(self.buckets + (float("inf"),), counts):
+                cumulative += n
+                le = f'le="{_format_value(bound)}"'
+                lines.append(f"{self.name}_bucket{_format_labels(self.labelnames, key, le)} {cumulative}")
+            lines.append(f"{self.name}_sum{_format_labels(self.labelnames, key)} {_format_value(total)}")
+            lines.append(f"{self.name}_count{_format_labels(self.labelnames, key)} {cumulative}")
+        return lines
+
+
+class Registry:
+    def __init__(self) -> None:
+        self._metrics: dict[str, _Metric] = {}
+
+    def register(self, metric: _Metric) -> Any:
+        if metric.name in self._metrics:
+            raise ValueError(f"metric already registered: {metric.name}")
+        self._metrics[metric.name] = metric
+        return metric
+
+    def render(self) -> str:
+        return "\n".join(m.render() for m in self._metrics.values()) + "\n"
+
+
+registry = Registry()
+
+# ---------------------------------------------------------------------------
+# HTTP
+# ---------------------------------------------------------------------------
+http_request_duration = registry.register(Histogram(
+    "http_request_duration_seconds", "Duración de requests HTTP.", ("method", "route", "status"),
+))
+http_requests_in_flight = registry.register(Gauge(
+    "http_requests_in_flight", "Requests HTTP en curso.", ("method",),
+))
+http_request_db_queries = registry.register(Histogram(
+    "http_request_db_queries", "Queries de DB por request.", ("route",), buckets=COUNT_BUCKETS,
+))
+http_request_db_seconds = registry.register(Histogram(
+    "http_request_db_seconds", "Tiempo total en DB por request.", ("route",),
+))
+
+# ---------------------------------------------------------------------------
+# DB
+# ---------------------------------------------------------------------------
+db_queries_total = registry.register(Counter(
+    "db_queries_total", "Queries ejecutadas.", ("engine",),
+))
+db_query_duration = registry.register(Histogram(
+    "db_query_duration_seconds", "Duración por query.", ("engine",),
+))
+
+# ---------------------------------------------------------------------------
+# Llamadas externas
+# ---------------------------------------------------------------------------
+external_calls_total = registry.register(Counter(
+    "external_calls_total", "Llamadas a servicios externos.", ("service", "operation", "outcome"),
+))
+external_call_duration = registry.register(Histogram(
+    "external_call_duration_seconds", "Duración de llamadas a servicios externos.", ("service", "operation"),
+))
+
+
+# ---------------------------------------------------------------------------
+# Tracking
+# ---------------------------------------------------------------------------
+tracking_history_points_dropped_total = registry.register(Counter(
+    "tracking_history_points_dropped_total",
+    "Puntos del historial de posiciones descartados sin persistir.",
+    ("reason",),
+))
+
+# ---------------------------------------------------------------------------
+# Uso de DB por request
+# ---------------------------------------------------------------------------
+
+class RequestDbUsage:
+    __slots__ = ("queries", "seconds")
+
+    def __init__(self) -> None:
+        self.queries = 0
+        self.seconds = 0.0
+
+
+# Objeto mutable: las sesiones async corren en greenlets que heredan el contexto
+# del request, así que todas suman sobre la misma instancia.
+request_db_usage: ContextVar[Optional[RequestDbUsage]] = ContextVar("request_db_usage", default=None)
+
+
+def instrument_engine(engine: Any, *, name: str = "primary") -> None:
+    """Cuenta queries y tiempo de DB vía eventos del engine (AsyncEngine o Engine)."""
+    from sqlalchemy import event
+
+    sync_engine = getattr(engine, "sync_engine", engine)
+
+    @event.listens_for(sync_engine, "before_cursor_execute")
+    def _before(conn, cursor, statement, parameters, context, executemany):  # noqa: ANN001
+        conn.info.setdefault("query_started", []).append(time.perf_counter())
+
+    @event.listens_for(sync_engine, "after_cursor_execute")
+    def _after(conn, cursor, statement, parameters, context, executemany):  # noqa: ANN001
+        stack = conn.info.get("query_started")
+        if not stack:
+            return
+        elapsed = time.perf_counter() - stack.pop()
+        db_queries_total.inc(engine=name)
+        db_query_duration.observe(elapsed, engine=name)
+        usage = request_db_usage.get()
+        if usage is not None:
+            usage.queries += 1
+            usage.seconds += elapsed
+
+    @event.listens_for(sync_engine, "handle_error")
+    def _error(context):  # noqa: ANN001
+        conn = context.connection
+        stack = conn.info.get("query_started") if conn is not None else None
+        if stack:
+            stack.pop()
+
+
+# ---------------------------------------------------------------------------
+# Llamadas externas
+# ---------------------------------------------------------------------------
+
+class track_external:
+    """
+    Mide una llamada externa (sync o async):
+
+        async with track_external("expo", "send"):
+            ...
+        with track_external("gcs", "sign_upload"):
+            ...
+
+    outcome = "error" si el bloque lanza una excepción, "ok" si no.
+    """
+
+    __slots__ = ("service", "operation", "_started")
+
+    def __init__(self, service: str, operation: str) -> None:
+        self.service = service
+        self.operation = operation
+        self._started = 0.0
+
+    def __enter__(self) -> "track_external":
+        self._started = time.perf_counter()
+        return self
+
+    def __exit__(self, exc_type, exc, tb) -> None:  # noqa: ANN001
+        external_call_duration.observe(
+            time.perf_counter() - self._started, service=self.service, operation=self.operation
+        )
+        external_calls_total.inc(
+            service=self.service, operation=self.operation, outcome="error" if exc_type else "ok"
+        )
+
+    async def __aenter__(self) -> "track_external":
+        return self.__enter__()
+
+    async def __aexit__(self, exc_type, exc, tb) -> None:  # noqa: ANN001
+        self.__exit__(exc_type, exc, tb)
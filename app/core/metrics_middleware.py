@@ -0,0 +1,66 @@
+"""
+Middleware ASGI de métricas HTTP (ver app/core/metrics.py).
+
+ASGI puro (sin BaseHTTPMiddleware): no crea tareas ni envuelve el body, así
+que no afecta respuestas en streaming. Solo mide requests HTTP; los
+WebSockets pasan directo.
+"""
+
+from __future__ import annotations
+
+import time
+
+from starlette.types import ASGIApp, Message, Receive, Scope, Send
+
+from app.core.metrics import (
+    RequestDbUsage,
+    http_request_db_queries,
+    http_request_db_seconds,
+    http_request_duration,
+    http_requests_in_flight,
+    request_db_usage,
+)
+
+UNMATCHED_ROUTE = "unmatched"
+
+
+def route_template(scope: Scope) -> str:
+    """Plantilla de la ruta resuelta por el router ("/orders/{id}"), no el path concreto."""
+    route = scope.get("route")
+    path = getattr(route, "path_format", None) or getattr(route, "path", None)
+    return path or UNMATCHED_ROUTE
+
+
+class MetricsMiddleware:
+    def __init__(self, app: ASGIApp, *, exclude_paths: tuple[str, ...] = ("/metrics",)) -> None:
+        self.app = app
+        self.exclude_paths = exclude_paths
+
+    async def __call__(self, scope: Scope, receive: Receive, send: Send) -> None:
+        if scope["type"] != "http" or scope.get("path") in self.exclude_paths:
+            await self.app(scope, receive, send)
+            return
+
+        method = scope.get("method", "GET")
+        status_code = 500
+        usage = RequestDbUsage()
+        token = request_db_usage.set(usage)
+        http_requests_in_flight.inc(method=method)
+        started = time.perf_counter()
+
+        async def send_wrapper(message: Message) -> None:
+            nonlocal status_code
+            if message["type"] == "http.response.start":
+                status_code = message["status"]
+            await send(message)
+
+        try:
+            await self.app(scope, receive, send_wrapper)
+        finally:
+            elapsed = time.perf_counter() - started
+            route = route_template(scope)
+            http_requests_in_flight.dec(method=method)
+            http_request_duration.observe(elapsed, method=method, route=route, status=str(status_code))
+            http_request_db_queries.observe(usage.queries, route=route)
+            http_request_db_seconds.observe(usage.seconds, route=route)
+            request_db_usage.reset(token)
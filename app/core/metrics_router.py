@@ -0,0 +1,48 @@
+"""
+Endpoints de observabilidad del proceso (por instancia de Cloud Run).
+
+  GET /metrics               → métricas en formato de texto Prometheus
+                               (protegido con METRICS_TOKEN si está configurado;
+                               en producción sin token responde 404).
+  GET /admin/metrics/db-pool → estado del pool de conexiones y tiempos de
+                               espera por checkout (solo admin).
+"""
+
+import secrets
+from typing import Any
+
+from fastapi import APIRouter, Depends, HTTPException, Request, status
+from fastapi.responses import PlainTextResponse
+
+from app.core.auth import CurrentUser, require_roles
+from app.core.db import pool_status
+from app.core.metrics import registry
+from app.core.settings import settings
+
+router = APIRouter(tags=["metrics"])
+admin_router = APIRouter(tags=["metrics"], prefix="/metrics")
+
+PROMETHEUS_CONTENT_TYPE = "text/plain; version=0.0.4; charset=utf-8"
+
+
+@router.get("/metrics", include_in_schema=False)
+async def metrics(request: Request) -> PlainTextResponse:
+    if not settings.METRICS_TOKEN and settings.ENV == "production":
+        # En producción no se exponen métricas sin token.
+        raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail="Not Found")
+    if settings.METRICS_TOKEN:
+        expected = f"Bearer {settings.METRICS_TOKEN}"
+        if not secrets.compare_digest(request.headers.get("authorization", ""), expected):
+            raise HTTPException(status_code=status.HTTP_401_UNAUTHORIZED, detail="Unauthorized")
+    return PlainTextResponse(registry.render(), media_type=PROMETHEUS_CONTENT_TYPE)
+
+
+@admin_router.get("/db-pool")
+async def db_pool_metrics(
+    _: CurrentUser = Depends(require_roles("admin")),
+) -> dict[str, Any]:
+    """
+    - `checked_out` cerca de `size + max_overflow` y `wait_p95_ms` alto → pool agotado.
+    - `timeouts` > 0 → requests que fallaron esperando conexión (DB_POOL_TIMEOUT_SECONDS).
+    """
+    return pool_status()
@@ -0,0 +1,43 @@
+"""
+Cursores opacos para paginación keyset.
+
+Un cursor codifica la clave de orden (created_at, id) del último elemento
+visto. El cliente lo trata como un string opaco y lo devuelve en `after` /
+`before`; el servidor lo traduce a una comparación de fila
+`(created_at, id) > (:ts, :id)` que se resuelve con un índice compuesto,
+sin OFFSET y sin saltos ni duplicados cuando varios elementos comparten el
+mismo timestamp.
+
+Formato (interno, puede cambiar): base64url("<created_at ISO-8601>|<uuid>")
+sin padding.
+"""
+
+from __future__ import annotations
+
+import base64
+import binascii
+from datetime import datetime
+from uuid import UUID
+
+KeysetKey = tuple[datetime, UUID]
+
+
+def encode_cursor(created_at: datetime, id: UUID) -> str:
+    raw = f"{created_at.isoformat()}|{id}".encode("utf-8")
+    return base64.urlsafe_b64encode(raw).decode("ascii").rstrip("=")
+
+
+def decode_cursor(cursor: str) -> KeysetKey:
+    """Devuelve (created_at, id). Lanza ValueError("invalid_cursor") si no es válido."""
+    try:
+        padded = cursor + "=" * (-len(cursor) % 4)
+        raw = base64.urlsafe_b64decode(padded.encode("ascii")).decode("utf-8")
+        ts, sep, id_ = raw.partition("|")
+        if not sep:
+            raise ValueError("missing separator")
+        created_at = datetime.fromisoformat(ts)
+        if created_at.tzinfo is None:
+            raise ValueError("naive timestamp")
+        return created_at, UUID(id_)
+    except (ValueError, UnicodeError, binascii.Error) as exc:
+        raise ValueError("invalid_cursor") from exc
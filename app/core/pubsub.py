@@ -0,0 +1,209 @@
+"""
+Pub/sub en proceso + puente LISTEN/NOTIFY de PostgreSQL.
+
+Piezas:
+  - Broadcaster: fan-out en memoria por clave (ej. order_id) hacia las colas
+    asyncio de los clientes conectados a ESTA instancia (WebSocket / SSE).
+  - PostgresListener: una conexión asyncpg dedicada por proceso que hace
+    LISTEN sobre los canales registrados y entrega cada payload a sus callbacks.
+  - notify(): emite un NOTIFY dentro de la transacción de la sesión recibida.
+    PostgreSQL solo entrega el NOTIFY cuando la transacción hace commit, así que
+    un evento nunca llega antes que el dato que lo originó.
+  - pg_listener.publish(): NOTIFY sin transacción para eventos efímeros
+    (ej. "escribiendo..." del chat), por la misma conexión del listener.
+
+Flujo entre instancias (Cloud Run):
+    write + NOTIFY (commit)  →  PostgreSQL  →  LISTEN en cada instancia
+                                              →  Broadcaster.publish(key, msg)
+                                              →  colas de los sockets locales
+
+Si el listener no está corriendo (sin asyncpg, tests, scripts), los módulos
+publican directamente en su Broadcaster local (ver `pg_listener.is_listening`).
+"""
+from __future__ import annotations
+
+import asyncio
+import logging
+from typing import Any, Callable, Hashable
+
+from sqlalchemy import text
+from sqlalchemy.engine import make_url
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from app.core.settings import settings
+
+logger = logging.getLogger(__name__)
+
+
+class Broadcaster:
+    """
+    Fan-out en memoria: clave -> conjunto de colas de suscriptores.
+
+    Las colas son acotadas. Si un cliente lento llena su cola se descarta el
+    mensaje más antiguo: para posiciones y eventos en vivo importa el último.
+    """
+
+    def __init__(self, *, queue_size: int = 16) -> None:
+        self._queue_size = queue_size
+        self._subs: dict[Hashable, set[asyncio.Queue]] = {}
+
+    def subscribe(self, key: Hashable) -> asyncio.Queue:
+        queue: asyncio.Queue = asyncio.Queue(maxsize=self._queue_size)
+        self._subs.setdefault(key, set()).add(queue)
+        return queue
+
+    def unsubscribe(self, key: Hashable, queue: asyncio.Queue) -> None:
+        subs = self._subs.get(key)
+        if not subs:
+            return
+        subs.discard(queue)
+        if not subs:
+            del self._subs[key]
+
+    def publish(self, key: Hashable, message: Any) -> int:
+        """Entrega el mensaje a todos los suscriptores de la clave. Devuelve cuántos lo recibieron."""
+        subs = self._subs.get(key)
+        if not subs:
+            return 0
+        for queue in subs:
+            if queue.full():
+                try:
+                    queue.get_nowait()
+                except asyncio.QueueEmpty:
+                    pass
+            queue.put_nowait(message)
+        return len(subs)
+
+    def subscriber_count(self, key: Hashable) -> int:
+        return len(self._subs.get(key, ()))
+
+
+class PostgresListener:
+    """
+    LISTEN sobre una conexión asyncpg dedicada (fuera del pool de SQLAlchemy).
+
+    - Los callbacks se registran con `on(channel, callback)` antes de `start()`.
+    - Si la conexión se cae, reconecta con backoff exponencial (máx. 30 s).
+    - Los callbacks son síncronos y se ejecutan en el event loop: deben ser
+      O(1) (decodificar payload + Broadcaster.publish).
+    """
+
+    def __init__(self) -> None:
+        self._callbacks: dict[str, list[Callable[[str], None]]] = {}
+        self._conn: Any = None
+        self._task: asyncio.Task | None = None
+        self._listening = False
+        # asyncpg no admite operaciones concurrentes sobre una misma conexión.
+        self._publish_lock = asyncio.Lock()
+
+    @property
+    def is_listening(self) -> bool:
+        return self._listening
+
+    def on(self, channel: str, callback: Callable[[str], None]) -> None:
+        callbacks = self._callbacks.setdefault(channel, [])
+        if callback not in callbacks:
+            callbacks.append(callback)
+
+    def _dispatch(self, _conn: Any, _pid: int, channel: str, payload: str) -> None:
+        for callback in self._callbacks.get(channel, ()):
+            try:
+                callback(payload)
+            except Exception:
+                logger.exception("pg_listener callback failed channel=%s", channel)
+
+    def deliver_locally(self, channel: str, payload: str) -> None:
+        """
+        Sin LISTEN activo, entrega el payload a los callbacks de esta instancia
+        (equivale al NOTIFY en un despliegue de una sola instancia). Con LISTEN
+        activo no hace nada: el evento llega por NOTIFY y se duplicaría.
+        """
+        if not self._listening:
+            self._dispatch(None, 0, channel, payload)
+
+    async def publish(self, channel: str, payload: str) -> None:
+        """NOTIFY inmediato (fuera de transacción) para eventos efímeros."""
+        conn = self._conn
+        if not self._listening or conn is None:
+            self.deliver_locally(channel, payload)
+            return
+        try:
+            async with self._publish_lock:
+                await conn.execute("SELECT pg_notify($1, $2)", channel, payload)
+        except Exception as exc:
+            logger.warning("pg_listener publish failed channel=%s: %s", channel, exc)
+
+    async def start(self) -> None:
+        if self._task is not None or not self._callbacks:
+            return
+        if not settings.DATABASE_URL or "asyncpg" not in settings.DATABASE_URL:
+            logger.info("pg_listener disabled: DATABASE_URL is not an asyncpg URL")
+            return
+        self._task = asyncio.create_task(self._run(), name="pg_listener")
+
+    async def stop(self) -> None:
+        task, self._task = self._task, None
+        if task is not None:
+            task.cancel()
+            try:
+                await task
+            except asyncio.CancelledError:
+                pass
+        await self._close()
+
+    async def _close(self) -> None:
+        self._listening = False
+        conn, self._conn = self._conn, None
+        if conn is not None and not conn.is_closed():
+            try:
+                await conn.close()
+            except Exception:
+                pass
+
+    async def _run(self) -> None:
+        import asyncpg
+
+        dsn = make_url(settings.DATABASE_URL).set(drivername="postgresql").render_as_string(hide_password=False)
+        backoff = 1.0
+        while True:
+            try:
+                self._conn = await asyncpg.connect(dsn)
+                for channel in self._callbacks:
+                    await self._conn.add_listener(channel, self._dispatch)
+                self._listening = True
+                backoff = 1.0
+                logger.info("pg_listener listening channels=%s", list(self._callbacks))
+                while not self._conn.is_closed():
+                    await asyncio.sleep(5)
+                logger.warning("pg_listener connection closed, reconnecting")
+            except asyncio.CancelledError:
+                raise
+            except Exception as exc:
+                logger.error("pg_listener error: %s", exc)
+            await self._close()
+            await asyncio.sleep(backoff)
+            backoff = min(backoff * 2, 30.0)
+
+
+async def notify(session: AsyncSession, channel: str, payload: str) -> None:
+    """NOTIFY transaccional: se entrega a los listeners cuando la sesión hace commit."""
+    await session.execute(
+        text("SELECT pg_notify(:channel, :payload)"),
+        {"channel": channel, "payload": payload},
+    )
+
+
+async def notify_many(session: AsyncSession, channel: str, payloads: list[str]) -> None:
+    """Varios NOTIFY en un solo round-trip (mismo comportamiento transaccional que notify)."""
+    if not payloads:
+        return
+    await session.execute(
+        text("SELECT pg_notify(:channel, p) FROM unnest(CAST(:payloads AS text[])) AS p"),
+        {"channel": channel, "payloads": payloads},
+    )
+
+
+# ---------------------------------------------------------------------------
+# Singleton de proceso — una sola conexión LISTEN por instancia.
+# ---------------------------------------------------------------------------
+pg_listener = PostgresListener()
@@ -0,0 +1,153 @@
+"""
+Contexto por request (request id, método, path, IP) en un contextvar.
+
+Reemplaza a RequestIDMiddleware (BaseHTTPMiddleware): ese middleware crea
+una tarea y envuelve el body por request y rompe respuestas en streaming.
+RequestContextMiddleware es ASGI puro:
+  - Toma X-Request-ID del cliente (si es válido) o genera uno, lo guarda en
+    el contextvar y en request.state.request_id (compatibilidad), y lo
+    devuelve en la respuesta.
+  - Agrega Server-Timing: `app` (tiempo hasta los headers), `db` (queries y
+    tiempo de DB del request, ver app/core/metrics.py) y los tramos que el
+    código registre con add_server_timing().
+  - En WebSockets solo fija el contexto (no hay headers de respuesta).
+
+Logs: configure_logging() agrega `request_id` a todos los LogRecord (record
+factory), así cualquier logger puede usar %(request_id)s sin recibir el
+Request ni inspeccionar frames.
+"""
+
+from __future__ import annotations
+
+import logging
+import re
+import time
+from contextvars import ContextVar
+from dataclasses import dataclass, field
+from typing import Optional
+from uuid import uuid4
+
+from starlette.datastructures import MutableHeaders
+from starlette.types import ASGIApp, Message, Receive, Scope, Send
+
+from app.core.metrics import request_db_usage
+
+_REQUEST_ID_RE = re.compile(r"^[A-Za-z0-9._:\-]{1,128}$")
+
+LOG_FORMAT = "%(asctime)s %(levelname)s [%(request_id)s] %(name)s: %(message)s"
+
+
+@dataclass
+class RequestContext:
+    request_id: str
+    method: Optional[str]
+    path: Optional[str]
+    client_ip: Optional[str]
+    started: float = field(default_factory=time.perf_counter)
+    # name → (duración ms, descripción)
+    timings: dict[str, tuple[float, Optional[str]]] = field(default_factory=dict)
+
+
+_current: ContextVar[Optional[RequestContext]] = ContextVar("request_context", default=None)
+
+
+def get_request_context() -> Optional[RequestContext]:
+    return _current.get()
+
+
+def get_request_id() -> Optional[str]:
+    ctx = _current.get()
+    return ctx.request_id if ctx is not None else None
+
+
+def add_server_timing(name: str, duration_ms: float, desc: Optional[str] = None) -> None:
+    """Suma un tramo al header Server-Timing del request en curso (no-op fuera de un request)."""
+    ctx = _current.get()
+    if ctx is None:
+        return
+    previous, _ = ctx.timings.get(name, (0.0, None))
+    ctx.timings[name] = (previous + duration_ms, desc)
+
+
+def _server_timing_header(ctx: RequestContext) -> str:
+    entries = [f"app;dur={(time.perf_counter() - ctx.started) * 1000:.1f}"]
+    usage = request_db_usage.get()
+    if usage is not None and usage.queries:
+        entries.append(f'db;dur={usage.seconds * 1000:.1f};desc="{usage.queries} queries"')
+    for name, (duration, desc) in ctx.timings.items():
+        entry = f"{name};dur={duration:.1f}"
+        if desc:
+            entry += f';desc="{desc}"'
+        entries.append(entry)
+    return ", ".join(entries)
+
+
+def _incoming_request_id(scope: Scope) -> Optional[str]:
+    for key, value in scope.get("headers") or ():
+        if key == b"x-request-id":
+            candidate = value.decode("latin-1")
+            return candidate if _REQUEST_ID_RE.match(candidate) else None
+    return None
+
+
+class RequestContextMiddleware:
+    def __init__(self, app: ASGIApp, *, server_timing: bool = True) -> None:
+        self.app = app
+        self.server_timing = server_timing
+
+    async def __call__(self, scope: Scope, receive: Receive, send: Send) -> None:
+        if scope["type"] not in ("http", "websocket"):
+            await self.app(scope, receive, send)
+            return
+
+        client = scope.get("client")
+        ctx = RequestContext(
+            request_id=_incoming_request_id(scope) or str(uuid4()),
+            method=scope.get("method"),
+            path=scope.get("path"),
+            client_ip=client[0] if client else None,
+        )
+        scope.setdefault("state", {})["request_id"] = ctx.request_id
+        token = _current.set(ctx)
+
+        async def send_wrapper(message: Message) -> None:
+            if message["type"] == "http.response.start":
+                headers = MutableHeaders(scope=message)
+                headers["X-Request-ID"] = ctx.request_id
+                if self.server_timing:
+                    headers.append("Server-Timing", _server_timing_header(ctx))
+            await send(message)
+
+        try:
+            await self.app(scope, receive, send_wrapper)
+        finally:
+            _current.reset(token)
+
+
+# ---------------------------------------------------------------------------
+# Logging
+# ---------------------------------------------------------------------------
+
+def configure_logging(level: str = "INFO") -> None:
+    """
+    Agrega `request_id` a todos los LogRecord ("-" fuera de un request) y, si
+    nadie configuró el root logger, instala un handler con LOG_FORMAT.
+    """
+    base_factory = logging.getLogRecordFactory()
+    if getattr(base_factory, "_adds_request_id", False):
+        return
+
+    def factory(*args, **kwargs) -> logging.LogRecord:
+        record = base_factory(*args, **kwargs)
+        record.request_id = get_request_id() or "-"
+        return record
+
+    factory._adds_request_id = True  # type: ignore[attr-defined]
+    logging.setLogRecordFactory(factory)
+
+    root = logging.getLogger()
+    if not root.handlers:
+        handler = logging.StreamHandler()
+        handler.setFormatter(logging.Formatter(LOG_FORMAT))
+        root.addHandler(handler)
+        root.setLevel(level.upper())
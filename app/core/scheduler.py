@@ -1,5 +1,5 @@
 import logging
-from datetime import datetime, timezone
+from datetime import datetime, timedelta, timezone
 
 from apscheduler.schedulers.asyncio import AsyncIOScheduler
 from apscheduler.triggers.interval import IntervalTrigger
@@ -37,6 +37,81 @@ async def _cleanup_job() -> None:
         logger.exception("cleanup_job failed")
 
 
+async def _tracking_history_job() -> None:
+    try:
+        async with AsyncSessionLocal() as session:
+            from app.modules.tracking.infra.location_history import run_history_maintenance
+
+            await run_history_maintenance(session)
+    except Exception:
+        logger.exception("tracking_history_job failed")
+
+
+async def _unread_counters_job() -> None:
+    try:
+        async with AsyncSessionLocal() as session:
+            from app.modules.chat.infra.postgres_chat_repository import PostgresChatRepository
+            from app.modules.notifications.infra.postgres_notification_repository import (
+                PostgresNotificationRepository,
+            )
+
+            fixed_notifications = await PostgresNotificationRepository(
+                session=session, engine=engine
+            ).reconcile_unread_counters()
+            fixed_chat = await PostgresChatRepository(session=session, engine=engine).reconcile_unread_counters()
+
+            if fixed_notifications or fixed_chat:
+                logger.warning(
+                    "unread_counters_job drift fixed notifications=%s chat=%s",
+                    fixed_notifications,
+                    fixed_chat,
+                )
+    except Exception:
+        logger.exception("unread_counters_job failed")
+
+
+async def _push_outbox_purge_job() -> None:
+    try:
+        async with AsyncSessionLocal() as session:
+            from app.modules.push.infra.postgres_push_outbox import PostgresPushOutboxRepository
+
+            older_than = datetime.now(timezone.utc) - timedelta(days=7)
+            purged = await PostgresPushOutboxRepository(session=session, engine=engine).purge_finished(
+                older_than=older_than
+            )
+            logger.info("push_outbox_purge_job purged=%s", purged)
+    except Exception:
+        logger.exception("push_outbox_purge_job failed")
+
+
+async def _push_broadcast_resume_job() -> None:
+    try:
+        async with AsyncSessionLocal() as session:
+            from app.modules.push.infra.broadcast_runner import BROADCAST_STALE_AFTER, broadcast_runner
+            from app.modules.push.infra.postgres_push_broadcast import PostgresPushBroadcastRepository
+
+            ids = await PostgresPushBroadcastRepository(session=session, engine=engine).list_resumable(
+                stale_after=BROADCAST_STALE_AFTER
+            )
+        for broadcast_id in ids:
+            broadcast_runner.launch(broadcast_id)
+        if ids:
+            logger.info("push_broadcast_resume_job launched=%s", len(ids))
+    except Exception:
+        logger.exception("push_broadcast_resume_job failed")
+
+
+async def _push_receipts_job() -> None:
+    try:
+        async with AsyncSessionLocal() as session:
+            from app.modules.push.infra.receipts import check_receipts
+
+            totals = await check_receipts(session)
+            logger.info("push_receipts_job %s", totals)
+    except Exception:
+        logger.exception("push_receipts_job failed")
+
+
 def start_scheduler() -> None:
     scheduler = get_scheduler()
     if scheduler.running:
@@ -50,6 +125,47 @@ def start_scheduler() -> None:
         max_instances=1,
         coalesce=True,
     )
+    scheduler.add_job(
+        _tracking_history_job,
+        trigger=IntervalTrigger(hours=1),
+        id="tracking_history_job",
+        replace_existing=True,
+        max_instances=1,
+        coalesce=True,
+        next_run_time=datetime.now(timezone.utc),
+    )
+    scheduler.add_job(
+        _unread_counters_job,
+        trigger=IntervalTrigger(minutes=30),
+        id="unread_counters_job",
+        replace_existing=True,
+        max_instances=1,
+        coalesce=True,
+    )
+    scheduler.add_job(
+        _push_outbox_purge_job,
+        trigger=IntervalTrigger(hours=1),
+        id="push_outbox_purge_job",
+        replace_existing=True,
+        max_instances=1,
+        coalesce=True,
+    )
+    scheduler.add_job(
+        _push_broadcast_resume_job,
+        trigger=IntervalTrigger(minutes=5),
+        id="push_broadcast_resume_job",
+        replace_existing=True,
+        max_instances=1,
+        coalesce=True,
+    )
+    scheduler.add_job(
+        _push_receipts_job,
+        trigger=IntervalTrigger(minutes=15),
+        id="push_receipts_job",
+        replace_existing=True,
+        max_instances=1,
+        coalesce=True,
+    )
     scheduler.start()
     logger.info("APScheduler started")
 
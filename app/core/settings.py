@@ -15,6 +15,39 @@ class Settings:
 
     # Database
     DATABASE_URL: Optional[str] = os.getenv("DATABASE_URL")
+    # Log de SQL (muy verboso): independiente de DEBUG para no activarlo en prod por accidente.
+    DB_ECHO: bool = os.getenv("DB_ECHO", "false").lower() == "true"
+    # Pool por proceso: hasta DB_POOL_SIZE + DB_MAX_OVERFLOW conexiones simultáneas.
+    # Dimensionar contra max_connections de Postgres × instancias de Cloud Run.
+    DB_POOL_SIZE: int = int(os.getenv("DB_POOL_SIZE", "10"))
+    DB_MAX_OVERFLOW: int = int(os.getenv("DB_MAX_OVERFLOW", "10"))
+    # Segundos esperando una conexión libre antes de fallar (pool agotado).
+    DB_POOL_TIMEOUT_SECONDS: float = float(os.getenv("DB_POOL_TIMEOUT_SECONDS", "10"))
+    # Reciclar conexiones más viejas que N segundos (proxies / LB que cortan conexiones ociosas).
+    DB_POOL_RECYCLE_SECONDS: int = int(os.getenv("DB_POOL_RECYCLE_SECONDS", "1800"))
+    DB_POOL_PRE_PING: bool = os.getenv("DB_POOL_PRE_PING", "true").lower() == "true"
+    # Cache de prepared statements de asyncpg por conexión (0 si hay PgBouncer en modo transaction).
+    DB_STATEMENT_CACHE_SIZE: int = int(os.getenv("DB_STATEMENT_CACHE_SIZE", "100"))
+    # statement_timeout del servidor por conexión (0 = sin límite).
+    DB_STATEMENT_TIMEOUT_MS: int = int(os.getenv("DB_STATEMENT_TIMEOUT_MS", "15000"))
+    # Réplica de lectura (opcional). Sin URL, get_read_session usa el primario.
+    DATABASE_READ_URL: Optional[str] = os.getenv("DATABASE_READ_URL")
+    # Staleness acotado: si la réplica va más de N segundos atrasada (o no responde),
+    # las lecturas vuelven al primario. 0 = no medir el lag.
+    DB_READ_MAX_LAG_SECONDS: float = float(os.getenv("DB_READ_MAX_LAG_SECONDS", "5"))
+    DB_READ_LAG_CHECK_SECONDS: float = float(os.getenv("DB_READ_LAG_CHECK_SECONDS", "5"))
+
+    # Métricas — GET /metrics (formato Prometheus). Con token, el scraper debe enviar
+    # "Authorization: Bearer <token>"; sin token el endpoint es público, salvo en
+    # producción (ENV=production), donde responde 404.
+    METRICS_TOKEN: Optional[str] = os.getenv("METRICS_TOKEN")
+
+    # Logs con request id (app/core/request_context.py) y header Server-Timing en las respuestas.
+    LOG_LEVEL: str = os.getenv("LOG_LEVEL", "INFO")
+    # Server-Timing expone tiempos internos: apagado por defecto en producción.
+    SERVER_TIMING_ENABLED: bool = os.getenv(
+        "SERVER_TIMING_ENABLED", "false" if ENV == "production" else "true"
+    ).lower() == "true"
     
     # Security
     SECRET_KEY: str = os.getenv("SECRET_KEY", "your-secret-key-change-in-production")
@@ -47,10 +80,76 @@ class Settings:
     STREAMING_TURN_USERNAME: str = os.getenv("STREAMING_TURN_USERNAME", "webrtc")
     STREAMING_TURN_CREDENTIAL: str = os.getenv("STREAMING_TURN_CREDENTIAL", "webrtc123")
 
+    # Orders — cache de participación (status/user_id/ally_id/destino) para autorizar
+    # tracking, chat y streaming sin leer la orden completa. 0 = deshabilitado.
+    ORDERS_PARTICIPATION_TTL_SECONDS: int = int(os.getenv("ORDERS_PARTICIPATION_TTL_SECONDS", "30"))
+
+    # Catálogo — índice raza → coat_type para pricing (app/modules/catalog/infra/breed_index.py)
+    # Recarga completa como red de seguridad además del NOTIFY. 0 = sin vencimiento.
+    CATALOG_BREED_INDEX_TTL_SECONDS: int = int(os.getenv("CATALOG_BREED_INDEX_TTL_SECONDS", "300"))
+    # Cache-Control max-age de GET /catalog/breeds (se revalida con ETag al vencer).
+    CATALOG_BREEDS_MAX_AGE_SECONDS: int = int(os.getenv("CATALOG_BREEDS_MAX_AGE_SECONDS", "300"))
+
+    # Store — índice compilado de reglas de precio (app/modules/store/infra/price_index.py)
+    # Deshabilitado → price_for_many resuelve con una query por lote.
+    STORE_PRICE_INDEX_ENABLED: bool = os.getenv("STORE_PRICE_INDEX_ENABLED", "true").lower() == "true"
+    # Recarga completa como red de seguridad además del NOTIFY. 0 = sin vencimiento.
+    STORE_PRICE_INDEX_TTL_SECONDS: int = int(os.getenv("STORE_PRICE_INDEX_TTL_SECONDS", "300"))
+    # Cache de cotizaciones por perfil de mascota + producto + addons (app/modules/store/infra/quote_cache.py).
+    # 0 = deshabilitado.
+    STORE_QUOTE_CACHE_TTL_SECONDS: int = int(os.getenv("STORE_QUOTE_CACHE_TTL_SECONDS", "300"))
+
+    # Pets — cache del perfil de precio (especie, raza, peso) usado por /store/quote. 0 = deshabilitado.
+    PETS_PROFILE_TTL_SECONDS: int = int(os.getenv("PETS_PROFILE_TTL_SECONDS", "300"))
+
     # Tracking — Google Routes API
-    # Dejar vacío para deshabilitar el endpoint GET /tracking/orders/{id}/route.
+    # Opcional: sin key, GET /tracking/orders/{id}/route responde solo con la estimación local.
     # Obtener en: https://console.cloud.google.com/apis/credentials
     GOOGLE_ROUTES_API_KEY: Optional[str] = os.getenv("GOOGLE_ROUTES_API_KEY")
+    # Cache de rutas: se recalcula tras N segundos o si el ally se movió más de N metros
+    # desde el origen cacheado. Entre recálculos el ETA se interpola localmente.
+    TRACKING_ROUTE_TTL_SECONDS: int = int(os.getenv("TRACKING_ROUTE_TTL_SECONDS", "120"))
+    TRACKING_ROUTE_RECOMPUTE_METERS: int = int(os.getenv("TRACKING_ROUTE_RECOMPUTE_METERS", "300"))
+
+    # Tracking — ETA local (sin red)
+    # Velocidad urbana media y overrides por distrito de destino: "150101:14,150122:22".
+    TRACKING_DEFAULT_SPEED_KMH: float = float(os.getenv("TRACKING_DEFAULT_SPEED_KMH", "20"))
+    TRACKING_DISTRICT_SPEEDS_KMH: str = os.getenv("TRACKING_DISTRICT_SPEEDS_KMH", "")
+    # Distancia por calles ≈ línea recta × factor.
+    TRACKING_DETOUR_FACTOR: float = float(os.getenv("TRACKING_DETOUR_FACTOR", "1.3"))
+
+    # Tracking — buffer de ingesta de posiciones
+    # Cada cuánto se persisten en lote las posiciones pendientes (0 = escribir directo).
+    TRACKING_FLUSH_INTERVAL_MS: int = int(os.getenv("TRACKING_FLUSH_INTERVAL_MS", "1000"))
+    # Flush anticipado al llegar a N órdenes pendientes.
+    TRACKING_FLUSH_MAX_BATCH: int = int(os.getenv("TRACKING_FLUSH_MAX_BATCH", "500"))
+
+    # Tracking — historial de posiciones (trail)
+    # Puntos recientes por orden en memoria (120 × 10 s ≈ 20 min).
+    TRACKING_HISTORY_RING_SIZE: int = int(os.getenv("TRACKING_HISTORY_RING_SIZE", "120"))
+    # Días de particiones diarias que se conservan en ally_location_history.
+    TRACKING_HISTORY_RETENTION_DAYS: int = int(os.getenv("TRACKING_HISTORY_RETENTION_DAYS", "30"))
+
+    # Push — outbox de envíos (app/modules/push/infra/outbox_worker.py)
+    # Expo acepta hasta 100 mensajes por request.
+    PUSH_OUTBOX_BATCH_SIZE: int = int(os.getenv("PUSH_OUTBOX_BATCH_SIZE", "100"))
+    # Cada cuánto el worker revisa el outbox si nadie lo despierta (0 = worker apagado).
+    PUSH_OUTBOX_POLL_SECONDS: float = float(os.getenv("PUSH_OUTBOX_POLL_SECONDS", "2"))
+    # Lease de las filas tomadas: otra instancia no las reenvía mientras este
+    # lote habla con Expo. Debe superar el envío de un lote completo.
+    PUSH_OUTBOX_LEASE_SECONDS: float = float(os.getenv("PUSH_OUTBOX_LEASE_SECONDS", "120"))
+    # Reintentos con backoff exponencial: base × 2^(intento-1), tope 10 min.
+    PUSH_MAX_ATTEMPTS: int = int(os.getenv("PUSH_MAX_ATTEMPTS", "5"))
+    PUSH_RETRY_BASE_SECONDS: float = float(os.getenv("PUSH_RETRY_BASE_SECONDS", "5"))
+
+    # Push — broadcast en segundo plano (app/modules/push/infra/broadcast_runner.py)
+    # Tokens leídos por página (keyset) y chunks de 100 enviados en paralelo por página.
+    PUSH_BROADCAST_PAGE_SIZE: int = int(os.getenv("PUSH_BROADCAST_PAGE_SIZE", "1000"))
+    PUSH_BROADCAST_CONCURRENCY: int = int(os.getenv("PUSH_BROADCAST_CONCURRENCY", "4"))
+
+    # Notificaciones — dispatcher con agrupación (app/modules/notifications/infra/dispatcher.py)
+    # Ventana en la que eventos del mismo usuario/orden se reducen al último (0 = escritura inmediata).
+    NOTIFICATIONS_COALESCE_MS: int = int(os.getenv("NOTIFICATIONS_COALESCE_MS", "3000"))
 
 
 settings = Settings()
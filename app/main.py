@@ -1,14 +1,19 @@
 import json
 import logging
 from contextlib import asynccontextmanager
-from uuid import uuid4
 
-from fastapi import FastAPI, Request
+from fastapi import FastAPI
 from fastapi.middleware.cors import CORSMiddleware
-from starlette.middleware.base import BaseHTTPMiddleware
 
 from app.core.settings import settings
+from app.core.request_context import RequestContextMiddleware, configure_logging
 from app.core.scheduler import start_scheduler, stop_scheduler
+from app.core.pubsub import pg_listener
+from app.core.metrics_middleware import MetricsMiddleware
+from app.core.metrics_router import (
+    router as metrics_router,
+    admin_router as metrics_admin_router,
+)
 
 from app.modules.booking.api.router import router as booking_router
 from app.modules.cart.api.router import router as cart_router
@@ -40,8 +45,23 @@ from app.modules.store.api.router import (
     admin_router as store_admin_router,
 )
 from app.modules.chat.api.router import router as chat_router
+from app.modules.chat.infra.live_room import register_chat_channel
 from app.modules.streaming.api.router import router as streaming_router
 from app.modules.tracking.api.router import router as tracking_router
+from app.modules.orders.infra.participation_cache import register_participation_channel
+from app.modules.store.infra.price_index import register_price_index_channel
+from app.modules.store.infra.quote_cache import register_quote_channel
+from app.modules.pets.infra.profile_cache import register_pet_profile_channel
+from app.modules.catalog.infra.breed_index import register_breed_index_channel
+from app.modules.catalog.infra.postgres_breed_repository import seed_breed_catalog
+from app.modules.tracking.infra.live_channel import register_live_channel
+from app.modules.notifications.infra.dispatcher import notification_dispatcher
+from app.modules.push.infra.broadcast_runner import broadcast_runner
+from app.modules.push.infra.outbox_worker import push_outbox_worker
+from app.modules.tracking.infra.location_buffer import location_buffer
+from app.modules.tracking.infra.route_cache import close_http_client, register_route_cache_channel
+
+configure_logging(settings.LOG_LEVEL)
 
 
 def _init_firebase() -> None:
@@ -73,10 +93,33 @@ def _init_firebase() -> None:
 @asynccontextmanager
 async def lifespan(app: FastAPI):
     _init_firebase()
+    try:
+        # Una vez por arranque: los repos ya no consultan la tabla antes de cada query.
+        await seed_breed_catalog()
+    except Exception as exc:
+        logging.error(f"Failed to seed breeds catalog: {exc}")
     start_scheduler()
+    register_live_channel()
+    register_participation_channel()
+    register_route_cache_channel()
+    register_price_index_channel()
+    register_quote_channel()
+    register_pet_profile_channel()
+    register_breed_index_channel()
+    register_chat_channel()
+    await pg_listener.start()
+    await location_buffer.start()
+    await push_outbox_worker.start()
+    await notification_dispatcher.start()
     try:
         yield
     finally:
+        await notification_dispatcher.stop()
+        await broadcast_runner.stop()
+        await push_outbox_worker.stop()
+        await location_buffer.stop()
+        await pg_listener.stop()
+        await close_http_client()
         stop_scheduler()
 
 
@@ -100,18 +143,10 @@ app.add_middleware(
 )
 
 
-class RequestIDMiddleware(BaseHTTPMiddleware):
-    async def dispatch(self, request: Request, call_next):
-        # Usar X-Request-ID si ya viene del cliente, sino generar uno
-        req_id = request.headers.get("X-Request-ID") or str(uuid4())
-        request.state.request_id = req_id
-        response = await call_next(request)
-        # Exponerlo en la respuesta para facilitar correlación en logs
-        response.headers["X-Request-ID"] = req_id
-        return response
-
-
-app.add_middleware(RequestIDMiddleware)
+# Request id en contextvar + X-Request-ID / Server-Timing (ASGI puro, ver app/core/request_context.py)
+app.add_middleware(RequestContextMiddleware, server_timing=settings.SERVER_TIMING_ENABLED)
+# Último en agregarse = más externo: mide también el tiempo de los demás middlewares.
+app.add_middleware(MetricsMiddleware)
 
 app.include_router(geo_router, prefix="/geo")
 app.include_router(catalog_router)
@@ -134,7 +169,9 @@ app.include_router(catalog_admin_router, prefix="/admin")
 app.include_router(iam_admin_router, prefix="/admin")
 app.include_router(pets_admin_router, prefix="/admin")
 app.include_router(store_admin_router, prefix="/admin")
+app.include_router(metrics_admin_router, prefix="/admin")
 app.include_router(media_router)
+app.include_router(metrics_router)
 
 
 @app.get("/health")
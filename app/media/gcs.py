@@ -8,6 +8,7 @@ import google.auth.iam
 import google.auth.transport.requests
 from google.cloud import storage
 
+from app.core.metrics import track_external
 from app.core.settings import settings
 from app.media.schemas import MediaEntityType
 
@@ -126,27 +127,29 @@ def _get_signing_credentials():
 
 
 def generate_signed_upload_url(object_name: str, content_type: str, expires_in: int) -> str:
-    signing_credentials = _get_signing_credentials()
-    client = storage.Client()
-    bucket = client.bucket(get_bucket_name())
-    blob = bucket.blob(object_name)
-    return blob.generate_signed_url(
-        version="v4",
-        expiration=timedelta(seconds=expires_in),
-        method="PUT",
-        content_type=content_type,
-        credentials=signing_credentials,
-    )
+    with track_external("gcs", "sign_upload"):
+        signing_credentials = _get_signing_credentials()
+        client = storage.Client()
+        bucket = client.bucket(get_bucket_name())
+        blob = bucket.blob(object_name)
+        return blob.generate_signed_url(
+            version="v4",
+            expiration=timedelta(seconds=expires_in),
+            method="PUT",
+            content_type=content_type,
+            credentials=signing_credentials,
+        )
 
 
 def generate_signed_read_url(object_name: str, expires_in: int) -> str:
-    signing_credentials = _get_signing_credentials()
-    client = storage.Client()
-    bucket = client.bucket(get_bucket_name())
-    blob = bucket.blob(object_name)
-    return blob.generate_signed_url(
-        version="v4",
-        expiration=timedelta(seconds=expires_in),
-        method="GET",
-        credentials=signing_credentials,
-    )
+    with track_external("gcs", "sign_read"):
+        signing_credentials = _get_signing_credentials()
+        client = storage.Client()
+        bucket = client.bucket(get_bucket_name())
+        blob = bucket.blob(object_name)
+        return blob.generate_signed_url(
+            version="v4",
+            expiration=timedelta(seconds=expires_in),
+            method="GET",
+            credentials=signing_credentials,
+        )
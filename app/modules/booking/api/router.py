@@ -6,7 +6,7 @@ from fastapi import APIRouter, Depends, Query, status
 from sqlalchemy.ext.asyncio import AsyncSession
 
 from app.core.auth import CurrentUser, get_current_user, require_profile_complete, require_roles
-from app.core.db import engine, get_async_session
+from app.core.db import engine, get_async_session, get_read_session
 from app.modules.booking.api.schemas import (
     AvailabilityOut,
     AvailabilitySlotCreateIn,
@@ -38,6 +38,11 @@ def get_availability_repo(session: AsyncSession = Depends(get_async_session)) ->
     return PostgresAvailabilityRepository(session=session, engine=engine)
 
 
+def get_availability_read_repo(session: AsyncSession = Depends(get_read_session)) -> PostgresAvailabilityRepository:
+    # Listados de cupos: réplica de lectura. Crear/confirmar holds revalida en el primario.
+    return PostgresAvailabilityRepository(session=session, engine=engine)
+
+
 # ------------------------------------------------------------------
 # Holds
 # ------------------------------------------------------------------
@@ -89,7 +94,7 @@ async def availability(
     date_from: Optional[date] = Query(None),
     days: int = Query(7, ge=1, le=30),
     _: CurrentUser = Depends(get_current_user),
-    repo: PostgresAvailabilityRepository = Depends(get_availability_repo),
+    repo: PostgresAvailabilityRepository = Depends(get_availability_read_repo),
 ) -> list[AvailabilityOut]:
     slots = await ListAvailability(repo=repo).execute(
         service_id=service_id,
@@ -121,7 +126,7 @@ async def admin_list_availability(
     date_from: Optional[date] = Query(None),
     days: int = Query(30, ge=1, le=90),
     _: CurrentUser = Depends(require_roles("admin")),
-    repo: PostgresAvailabilityRepository = Depends(get_availability_repo),
+    repo: PostgresAvailabilityRepository = Depends(get_availability_read_repo),
 ) -> list[AvailabilityOut]:
     slots = await ListAvailability(repo=repo).execute(
         service_id=service_id,
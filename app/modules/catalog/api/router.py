@@ -1,13 +1,13 @@
 from __future__ import annotations
 
-from collections import defaultdict
 from typing import List, Optional
 
-from fastapi import APIRouter, Depends, Query, status
+from fastapi import APIRouter, Depends, Query, Request, Response, status
 from sqlalchemy.ext.asyncio import AsyncSession
 
 from app.core.auth import CurrentUser, require_roles
 from app.core.db import engine, get_async_session
+from app.core.settings import settings
 from app.modules.catalog.api.schemas import (
     BreedCreateIn,
     BreedItemOut,
@@ -18,11 +18,12 @@ from app.modules.catalog.api.schemas import (
 )
 from app.modules.catalog.app.use_cases import (
     CreateBreed,
-    ListBreeds,
+    GetBreedCatalog,
     ListBreedsAdmin,
     ToggleBreed,
     UpdateBreed,
 )
+from app.modules.catalog.infra.breed_index import breed_index
 from app.modules.catalog.infra.postgres_breed_repository import PostgresBreedRepository
 
 router = APIRouter(prefix="/catalog", tags=["catalog"])
@@ -33,22 +34,17 @@ def _get_repo(session: AsyncSession = Depends(get_async_session)) -> PostgresBre
     return PostgresBreedRepository(session=session, engine=engine)
 
 
-def _group_by_species(breeds) -> list[dict]:
-    """Agrupa lista de Breed por species — mantiene el contrato de respuesta original."""
-    groups: dict[str, list] = defaultdict(list)
-    for b in breeds:
-        groups[b.species].append({"id": b.id, "name": b.name, "coat_group": b.coat_group, "coat_type": b.coat_type})
-    # orden estable: dog primero, cat segundo
-    order = ["dog", "cat"]
-    result = []
-    for sp in order:
-        if sp in groups:
-            result.append({"species": sp, "breeds": groups[sp]})
-    # cualquier otra especie que se añada en el futuro
-    for sp in groups:
-        if sp not in order:
-            result.append({"species": sp, "breeds": groups[sp]})
-    return result
+def _etag_matches(if_none_match: Optional[str], etag: str) -> bool:
+    if not if_none_match:
+        return False
+    candidates = {c.strip().removeprefix("W/") for c in if_none_match.split(",")}
+    return "*" in candidates or etag in candidates
+
+
+def _breed_out(b) -> BreedOut:
+    return BreedOut(
+        id=b.id, name=b.name, species=b.species, is_active=b.is_active, coat_group=b.coat_group, coat_type=b.coat_type
+    )
 
 
 # ------------------------------------------------------------------
@@ -57,12 +53,21 @@ def _group_by_species(breeds) -> list[dict]:
 
 @router.get("/breeds", response_model=List[BreedsBySpeciesOut])
 async def list_breeds(
+    request: Request,
     species: Optional[str] = Query(None, description="Filtrar por especie: dog|cat"),
-    repo: PostgresBreedRepository = Depends(_get_repo),
 ):
-    """Catálogo de razas activas, agrupado por especie."""
-    breeds = await ListBreeds(repo=repo).execute(species=species)
-    return _group_by_species(breeds)
+    """
+    Catálogo de razas activas, agrupado por especie. Se sirve desde memoria
+    con ETag + Cache-Control; If-None-Match vigente → 304 sin cuerpo.
+    """
+    catalog = await GetBreedCatalog(breeds=breed_index).execute(species=species)
+    headers = {
+        "ETag": catalog.etag,
+        "Cache-Control": f"public, max-age={settings.CATALOG_BREEDS_MAX_AGE_SECONDS}",
+    }
+    if _etag_matches(request.headers.get("if-none-match"), catalog.etag):
+        return Response(status_code=status.HTTP_304_NOT_MODIFIED, headers=headers)
+    return Response(content=catalog.body, media_type="application/json", headers=headers)
 
 
 # ------------------------------------------------------------------
@@ -77,7 +82,7 @@ async def admin_list_breeds(
 ):
     """Lista todas las razas (activas e inactivas)."""
     breeds = await ListBreedsAdmin(repo=repo).execute(species=species)
-    return [BreedOut(id=b.id, name=b.name, species=b.species, is_active=b.is_active, coat_group=b.coat_group, coat_type=b.coat_type) for b in breeds]
+    return [_breed_out(b) for b in breeds]
 
 
 @admin_router.post("/breeds", response_model=BreedOut, status_code=status.HTTP_201_CREATED)
@@ -92,7 +97,7 @@ async def admin_create_breed(
         name=payload.name,
         species=payload.species,
     )
-    return BreedOut(id=breed.id, name=breed.name, species=breed.species, is_active=breed.is_active)
+    return _breed_out(breed)
 
 
 @admin_router.patch("/breeds/{breed_id}", response_model=BreedOut)
@@ -102,9 +107,14 @@ async def admin_update_breed(
     _: CurrentUser = Depends(require_roles("admin")),
     repo: PostgresBreedRepository = Depends(_get_repo),
 ):
-    """Actualiza el nombre de una raza."""
-    breed = await UpdateBreed(repo=repo).execute(breed_id, name=payload.name)
-    return BreedOut(id=breed.id, name=breed.name, species=breed.species, is_active=breed.is_active)
+    """Actualiza nombre y/o manto (coat_group, coat_type) de una raza. El coat_type define su precio en la tienda."""
+    breed = await UpdateBreed(repo=repo).execute(
+        breed_id,
+        name=payload.name,
+        coat_group=payload.coat_group,
+        coat_type=payload.coat_type,
+    )
+    return _breed_out(breed)
 
 
 @admin_router.post("/breeds/{breed_id}/toggle", response_model=BreedOut)
@@ -116,4 +126,4 @@ async def admin_toggle_breed(
 ):
     """Activa o desactiva una raza del catálogo."""
     breed = await ToggleBreed(repo=repo).execute(breed_id, is_active=payload.is_active)
-    return BreedOut(id=breed.id, name=breed.name, species=breed.species, is_active=breed.is_active)
+    return _breed_out(breed)
@@ -41,7 +41,9 @@ class BreedCreateIn(BaseModel):
 
 
 class BreedUpdateIn(BaseModel):
-    name: str
+    name: Optional[str] = None
+    coat_group: Optional[str] = None   # "single" | "double"
+    coat_type: Optional[str] = None    # ver COAT_TYPES en domain/breed.py — define la categoría de precio
 
 
 class BreedToggleIn(BaseModel):
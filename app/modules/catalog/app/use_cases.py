@@ -1,21 +1,60 @@
 from __future__ import annotations
 
+import hashlib
+import json
+from collections import defaultdict
 from dataclasses import dataclass
-from typing import Optional
+from typing import Iterable, Optional
 
 from fastapi import HTTPException, status
 
-from app.modules.catalog.domain.breed import Breed
+from app.modules.catalog.domain.breed import COAT_GROUPS, COAT_TYPES, Breed
+from app.modules.catalog.infra.breed_index import BreedIndexCache
 from app.modules.catalog.infra.postgres_breed_repository import PostgresBreedRepository
 
 
+def group_by_species(breeds: Iterable[Breed]) -> list[dict]:
+    """Agrupa lista de Breed por species — mantiene el contrato de respuesta original."""
+    groups: dict[str, list] = defaultdict(list)
+    for b in breeds:
+        groups[b.species].append({"id": b.id, "name": b.name, "coat_group": b.coat_group, "coat_type": b.coat_type})
+    # orden estable: dog primero, cat segundo
+    order = ["dog", "cat"]
+    result = []
+    for sp in order:
+        if sp in groups:
+            result.append({"species": sp, "breeds": groups[sp]})
+    # cualquier otra especie que se añada en el futuro
+    for sp in groups:
+        if sp not in order:
+            result.append({"species": sp, "breeds": groups[sp]})
+    return result
+
+
+@dataclass(frozen=True)
+class BreedCatalog:
+    body: bytes   # JSON ya serializado de group_by_species
+    etag: str     # hash del contenido: igual en todas las instancias
+
+
+def _build_catalog(breeds: list[Breed]) -> BreedCatalog:
+    body = json.dumps(group_by_species(breeds), ensure_ascii=False, separators=(",", ":")).encode("utf-8")
+    return BreedCatalog(body=body, etag=f'"{hashlib.sha256(body).hexdigest()[:32]}"')
+
+
 @dataclass
-class ListBreeds:
-    repo: PostgresBreedRepository
+class GetBreedCatalog:
+    breeds: BreedIndexCache
 
-    async def execute(self, *, species: Optional[str] = None) -> list[Breed]:
-        """Público: solo razas activas."""
-        return await self.repo.list_active(species=species)
+    async def execute(self, *, species: Optional[str] = None) -> BreedCatalog:
+        """
+        Público: razas activas agrupadas por especie, desde memoria (índice
+        cargado del primario). La respuesta se serializa una vez por versión
+        del índice de razas.
+        """
+        species = species.strip().lower() if species else None
+        index = await self.breeds.get()
+        return index.derived(("public_catalog", species), lambda: _build_catalog(index.active(species)))
 
 
 @dataclass
@@ -52,10 +91,31 @@ class CreateBreed:
 class UpdateBreed:
     repo: PostgresBreedRepository
 
-    async def execute(self, breed_id: str, *, name: Optional[str] = None) -> Breed:
+    async def execute(
+        self,
+        breed_id: str,
+        *,
+        name: Optional[str] = None,
+        coat_group: Optional[str] = None,
+        coat_type: Optional[str] = None,
+    ) -> Breed:
         patch = {}
         if name is not None:
             patch["name"] = name
+        if coat_group is not None:
+            if coat_group not in COAT_GROUPS:
+                raise HTTPException(
+                    status_code=status.HTTP_422_UNPROCESSABLE_ENTITY,
+                    detail=f"coat_group_invalid: debe ser uno de {', '.join(COAT_GROUPS)}",
+                )
+            patch["coat_group"] = coat_group
+        if coat_type is not None:
+            if coat_type not in COAT_TYPES:
+                raise HTTPException(
+                    status_code=status.HTTP_422_UNPROCESSABLE_ENTITY,
+                    detail=f"coat_type_invalid: debe ser uno de {', '.join(COAT_TYPES)}",
+                )
+            patch["coat_type"] = coat_type
         try:
             return await self.repo.update(breed_id, patch)
         except ValueError as exc:
@@ -3,6 +3,16 @@ from __future__ import annotations
 from dataclasses import dataclass
 from typing import Optional
 
+COAT_GROUPS = ("single", "double")
+COAT_TYPES = (
+    "simple_short",
+    "simple_medium_long",
+    "curly_no_undercoat",
+    "double_short",
+    "double_long",
+    "mixed_curly_undercoat",
+)
+
 
 @dataclass(frozen=True)
 class Breed:
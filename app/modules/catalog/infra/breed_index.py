@@ -0,0 +1,236 @@
+"""
+Índice en memoria raza → coat_type, construido desde la tabla breeds.
+
+Problema:
+  El pricing de la tienda (store/app/use_cases_impl) resolvía la categoría
+  de raza recorriendo BREEDS_CATALOG completo en cada llamada, y además
+  ignoraba los cambios que el admin hace en la tabla breeds.
+
+Diseño:
+  - Se carga la tabla breeds una vez y se arma un dict por clave
+    normalizada (minúsculas, sin tildes, separadores → "_").
+  - Además del id, cada raza se registra bajo alias derivados del nombre:
+    "Dachshund (Salchicha)" → "dachshund_salchicha", "dachshund", "salchicha".
+    El id siempre gana sobre un alias de otra raza.
+  - create / update / toggle en PostgresBreedRepository parchean el índice
+    local y emiten NOTIFY 'catalog_breeds' en la misma transacción; las
+    demás instancias lo marcan como vencido y recargan en el próximo uso.
+    Una carga que se cruzó con apply/invalidate se descarta y se repite.
+  - La carga usa una sesión propia sobre el primario (AsyncSessionLocal),
+    nunca la sesión del request.
+  - TTL (CATALOG_BREED_INDEX_TTL_SECONDS) como red de seguridad.
+  - Tabla vacía (aún sin seed) → se usa BREEDS_CATALOG.
+  - También sirve el catálogo público (/catalog/breeds): la respuesta
+    agrupada se precalcula una vez por versión del índice (derived).
+"""
+
+from __future__ import annotations
+
+import asyncio
+import itertools
+import logging
+import re
+import time
+import unicodedata
+from typing import Any, Callable, Hashable, Iterable, Optional
+from uuid import uuid4
+
+from sqlalchemy import select
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from app.core.pubsub import notify, pg_listener
+from app.core.settings import settings
+from app.modules.catalog.domain.breed import Breed
+
+logger = logging.getLogger(__name__)
+
+BREEDS_CHANNEL = "catalog_breeds"
+
+# Identifica a esta instancia en el payload del NOTIFY: la instancia que
+# escribió ya parcheó su índice y no necesita recargarlo.
+_INSTANCE_ID = uuid4().hex
+
+# Cada índice construido o parcheado recibe una versión nueva.
+_versions = itertools.count(1)
+
+# Recargas máximas si apply/invalidate llegan mientras se carga el índice.
+_LOAD_ATTEMPTS = 3
+
+_SEPARATORS = re.compile(r"[^a-z0-9]+")
+_PARENTHESIZED = re.compile(r"\(([^)]*)\)")
+
+
+def normalize_breed_key(value: str) -> str:
+    """ "Pastor Alemán" / "pastor-aleman" / " PASTOR_ALEMAN " → "pastor_aleman"."""
+    decomposed = unicodedata.normalize("NFKD", value)
+    ascii_only = "".join(c for c in decomposed if not unicodedata.combining(c))
+    return _SEPARATORS.sub("_", ascii_only.lower()).strip("_")
+
+
+def breed_aliases(breed: Breed) -> list[str]:
+    """Alias normalizados del nombre: completo, sin paréntesis y el contenido del paréntesis."""
+    aliases = [breed.name, _PARENTHESIZED.sub(" ", breed.name)]
+    aliases.extend(_PARENTHESIZED.findall(breed.name))
+    keys = (normalize_breed_key(a) for a in aliases)
+    return [k for k in dict.fromkeys(keys) if k]
+
+
+class BreedIndex:
+    def __init__(self, breeds: Iterable[Breed] = ()) -> None:
+        self._by_id: dict[str, Breed] = {}
+        for breed in breeds:
+            self._by_id[normalize_breed_key(breed.id)] = breed
+        self._rebuild()
+
+    def _rebuild(self) -> None:
+        keys: dict[str, Breed] = {}
+        for breed in self._by_id.values():
+            for alias in breed_aliases(breed):
+                keys.setdefault(alias, breed)
+        keys.update(self._by_id)   # el id gana sobre alias
+        self._keys = keys
+        self._derived: dict[Hashable, Any] = {}
+        self.version = next(_versions)
+
+    def __len__(self) -> int:
+        return len(self._by_id)
+
+    def get(self, breed: Optional[str], *, species: Optional[str] = None) -> Optional[Breed]:
+        if not breed or not str(breed).strip():
+            return None
+        hit = self._keys.get(normalize_breed_key(str(breed)))
+        if hit is None or (species is not None and hit.species != species):
+            return None
+        return hit
+
+    def coat_type(self, breed: Optional[str], *, species: Optional[str] = None) -> Optional[str]:
+        """coat_type de la raza, o None si no existe o aún no tiene coat_type asignado."""
+        hit = self.get(breed, species=species)
+        return hit.coat_type if hit is not None else None
+
+    def active(self, species: Optional[str] = None) -> list[Breed]:
+        """Razas activas ordenadas por especie y nombre."""
+        breeds = [
+            b for b in self._by_id.values()
+            if b.is_active and (species is None or b.species == species)
+        ]
+        return sorted(breeds, key=lambda b: (b.species, normalize_breed_key(b.name), b.name))
+
+    def derived(self, key: Hashable, build: Callable[[], Any]) -> Any:
+        """
+        Memo de vistas derivadas (p. ej. la respuesta agrupada de /catalog/breeds).
+        Vive lo que vive esta versión del índice: cualquier cambio la descarta.
+        """
+        if key not in self._derived:
+            self._derived[key] = build()
+        return self._derived[key]
+
+    def apply(self, breed: Breed) -> None:
+        self._by_id[normalize_breed_key(breed.id)] = breed
+        self._rebuild()
+
+
+def _static_breeds() -> list[Breed]:
+    from app.modules.catalog.domain.breeds_data import BREEDS_CATALOG
+
+    return [
+        Breed(
+            id=b["id"],
+            name=b["name"],
+            species=group["species"],
+            is_active=True,
+            coat_group=b.get("coat_group"),
+            coat_type=b.get("coat_type"),
+        )
+        for group in BREEDS_CATALOG
+        for b in group["breeds"]
+    ]
+
+
+class BreedIndexCache:
+    """Índice por proceso con carga perezosa, single-flight y TTL."""
+
+    def __init__(self, *, ttl_seconds: int) -> None:
+        self._ttl = ttl_seconds
+        self._index: Optional[BreedIndex] = None
+        self._loaded_at = 0.0
+        self._lock = asyncio.Lock()
+        # Sube con cada apply/invalidate (ver PriceIndexCache._generation).
+        self._generation = 0
+
+    def _fresh(self) -> bool:
+        return self._index is not None and (self._ttl <= 0 or time.monotonic() - self._loaded_at < self._ttl)
+
+    async def get(self) -> BreedIndex:
+        if self._fresh():
+            return self._index
+        async with self._lock:
+            for _ in range(_LOAD_ATTEMPTS):
+                if self._fresh():
+                    return self._index
+                generation = self._generation
+                index = await self._load()
+                if generation == self._generation:
+                    self._index = index
+                    self._loaded_at = time.monotonic()
+                    return index
+                logger.info("breed index changed while loading, reloading")
+            # Cambios continuos: se usa la última carga sin cachearla.
+            return index
+
+    async def _load(self) -> BreedIndex:
+        # Siempre desde el primario y con sesión propia (ver price_index._load).
+        from app.core.db import AsyncSessionLocal
+        from app.modules.catalog.infra.models import BreedModel
+
+        async with AsyncSessionLocal() as session:
+            result = await session.execute(select(BreedModel))
+            models = result.scalars().all()
+        breeds = [
+            Breed(
+                id=m.id,
+                name=m.name,
+                species=m.species,
+                is_active=m.is_active,
+                coat_group=m.coat_group,
+                coat_type=m.coat_type,
+            )
+            for m in models
+        ]
+        if not breeds:
+            logger.warning("breeds table is empty, using BREEDS_CATALOG for the breed index")
+            breeds = _static_breeds()
+        index = BreedIndex(breeds)
+        logger.info("breed index loaded breeds=%s", len(index))
+        return index
+
+    def apply(self, breed: Breed) -> None:
+        self._generation += 1
+        if self._index is not None:
+            self._index.apply(breed)
+
+    def invalidate(self) -> None:
+        self._generation += 1
+        self._index = None
+
+
+async def notify_breed_changed(session: AsyncSession, breed_id: str) -> None:
+    """NOTIFY transaccional: llamar antes del commit que crea/actualiza la raza."""
+    await notify(session, BREEDS_CHANNEL, f"{_INSTANCE_ID}:{breed_id}")
+
+
+def _on_breeds_notify(payload: str) -> None:
+    origin, _, _ = payload.partition(":")
+    if origin != _INSTANCE_ID:
+        breed_index.invalidate()
+
+
+def register_breed_index_channel() -> None:
+    """Registra la invalidación entre instancias. Se llama en el lifespan antes de pg_listener.start()."""
+    pg_listener.on(BREEDS_CHANNEL, _on_breeds_notify)
+
+
+# ---------------------------------------------------------------------------
+# Singleton de proceso
+# ---------------------------------------------------------------------------
+breed_index = BreedIndexCache(ttl_seconds=settings.CATALOG_BREED_INDEX_TTL_SECONDS)
@@ -8,11 +8,9 @@ from sqlalchemy.exc import IntegrityError
 from sqlalchemy.ext.asyncio import AsyncEngine, AsyncSession
 
 from app.modules.catalog.domain.breed import Breed
+from app.modules.catalog.infra.breed_index import breed_index, notify_breed_changed
 from app.modules.catalog.infra.models import BreedModel
 
-_catalog_seeded = False
-
-
 def _utcnow() -> datetime:
     return datetime.now(timezone.utc)
 
@@ -23,18 +21,14 @@ class PostgresBreedRepository:
         self._engine = engine
 
     # ------------------------------------------------------------------
-    # Seed idempotente — igual patrón que commerce
+    # Seed idempotente — igual patrón que commerce. Corre una sola vez en el
+    # arranque (seed_breed_catalog), no en cada query.
     # ------------------------------------------------------------------
 
     async def seed_if_empty(self) -> None:
-        global _catalog_seeded
-        if _catalog_seeded:
-            return
-
         # Si ya hay razas en la tabla, no hacer nada (idempotente entre workers)
         res = await self._session.execute(select(BreedModel.id).limit(1))
         if res.first() is not None:
-            _catalog_seeded = True
             return
 
         from app.modules.catalog.domain.breeds_data import BREEDS_CATALOG
@@ -63,8 +57,10 @@ class PostgresBreedRepository:
         except IntegrityError:
             # Otro worker llegó primero — la data ya está, rollback y continuar
             await self._session.rollback()
+            return
 
-        _catalog_seeded = True
+        # Un índice cargado antes del seed usa BREEDS_CATALOG: recargar desde la tabla.
+        breed_index.invalidate()
 
     # ------------------------------------------------------------------
     # Queries
@@ -80,18 +76,8 @@ class PostgresBreedRepository:
             coat_type=m.coat_type,
         )
 
-    async def list_active(self, *, species: Optional[str] = None) -> list[Breed]:
-        await self.seed_if_empty()
-        stmt = select(BreedModel).where(BreedModel.is_active.is_(True))
-        if species:
-            stmt = stmt.where(BreedModel.species == species.strip().lower())
-        stmt = stmt.order_by(BreedModel.species, BreedModel.name)
-        res = await self._session.execute(stmt)
-        return [self._to_domain(r) for r in res.scalars().all()]
-
     async def list_all(self, *, species: Optional[str] = None) -> list[Breed]:
         """Admin: devuelve todas incluidas las inactivas."""
-        await self.seed_if_empty()
         stmt = select(BreedModel)
         if species:
             stmt = stmt.where(BreedModel.species == species.strip().lower())
@@ -100,35 +86,47 @@ class PostgresBreedRepository:
         return [self._to_domain(r) for r in res.scalars().all()]
 
     async def get(self, breed_id: str) -> Optional[Breed]:
-        await self.seed_if_empty()
         m = await self._session.get(BreedModel, breed_id)
         return self._to_domain(m) if m else None
 
     async def create(self, *, id: str, name: str, species: str) -> Breed:
-        await self.seed_if_empty()
         now = _utcnow()
         m = BreedModel(id=id, name=name, species=species, is_active=True,
                        created_at=now, updated_at=now)
         self._session.add(m)
         try:
+            await self._session.flush()
+            await notify_breed_changed(self._session, id)
             await self._session.commit()
         except IntegrityError:
             await self._session.rollback()
             raise ValueError("breed_already_exists")
         await self._session.refresh(m)
-        return self._to_domain(m)
+        breed = self._to_domain(m)
+        breed_index.apply(breed)
+        return breed
 
     async def update(self, breed_id: str, patch: dict) -> Breed:
-        await self.seed_if_empty()
         m = await self._session.get(BreedModel, breed_id)
         if m is None:
             raise ValueError("breed_not_found")
         for key, value in patch.items():
             setattr(m, key, value)
         m.updated_at = _utcnow()
+        await notify_breed_changed(self._session, breed_id)
         await self._session.commit()
         await self._session.refresh(m)
-        return self._to_domain(m)
+        breed = self._to_domain(m)
+        breed_index.apply(breed)
+        return breed
 
     async def set_active(self, breed_id: str, is_active: bool) -> Breed:
         return await self.update(breed_id, {"is_active": is_active})
+
+
+async def seed_breed_catalog() -> None:
+    """Seed de la tabla breeds en el arranque (lifespan). Idempotente entre instancias."""
+    from app.core.db import engine, session_scope
+
+    async with session_scope() as session:
+        await PostgresBreedRepository(session=session, engine=engine).seed_if_empty()
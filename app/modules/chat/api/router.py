@@ -1,17 +1,22 @@
 from __future__ import annotations
 
+import asyncio
 import logging
+import time
 from datetime import datetime
 from typing import Optional
 from uuid import UUID
 
-from fastapi import APIRouter, Depends, HTTPException, Query, Request, status
+from fastapi import APIRouter, Depends, HTTPException, Query, Request, WebSocket, WebSocketDisconnect, status
 from sqlalchemy.ext.asyncio import AsyncSession
 
-from app.core.auth import CurrentUser, get_current_user
-from app.core.db import engine, get_async_session
+from app.core.auth import CurrentUser, get_current_user, get_current_user_ws
+from app.core.db import AsyncSessionLocal, engine, get_async_session
+from app.core.pagination import encode_cursor
+from app.core.pubsub import pg_listener
 from app.modules.chat.api.schemas import MessageOut, SendMessageIn, UnreadCountOut
 from app.modules.chat.app.use_cases import ListMessages, MarkReadForReceiver, SendMessage, UnreadCount
+from app.modules.chat.infra.live_room import CHAT_CHANNEL, chat_broadcaster, message_to_dict, typing_event
 from app.modules.chat.infra.postgres_chat_repository import PostgresChatRepository
 from app.modules.orders.infra.postgres_order_repository import PostgresOrderRepository
 
@@ -43,7 +48,7 @@ async def _get_order_or_403(
     current: CurrentUser,
     orders_repo: PostgresOrderRepository,
 ):
-    order = await orders_repo.get_order_admin(id=order_id)
+    order = await orders_repo.get_participation(id=order_id)
     if order is None:
         raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail="order_not_found")
 
@@ -57,6 +62,15 @@ async def _get_order_or_403(
     return order
 
 
+def _resolve_sender(order, current: CurrentUser) -> tuple[str, Optional[UUID]]:
+    """Rol del sender y destinatario del push según quién escribe."""
+    if current.role == "admin":
+        return "admin", None
+    if order.user_id == current.id:
+        return "user", order.ally_id  # puede ser None si aún no hay ally asignado
+    return "ally", order.user_id
+
+
 # ------------------------------------------------------------------
 # POST /chat/orders/{order_id}/messages
 # Envía un mensaje en la conversación de una orden.
@@ -78,23 +92,15 @@ async def send_message(
     Envía un mensaje de texto en el chat de una orden.
 
     Acceso: usuario dueño de la orden, ally asignado o admin.
-    El mensaje queda persistido en PostgreSQL; el destinatario lo obtiene
-    en su próxima petición de polling a GET /messages.
+    El mensaje queda persistido en PostgreSQL y se entrega al instante a los
+    sockets conectados a `WS /chat/orders/{id}/ws` (o en el próximo polling).
     """
     request_id = getattr(request.state, "request_id", None)
 
     order = await _get_order_or_403(order_id, current, orders_repo)
 
     # Determinar rol del sender y el id del destinatario para el push
-    if current.role == "admin":
-        sender_role = "admin"
-        recipient_id = None
-    elif order.user_id == current.id:
-        sender_role = "user"
-        recipient_id = order.ally_id  # puede ser None si aún no hay ally asignado
-    else:
-        sender_role = "ally"
-        recipient_id = order.user_id
+    sender_role, recipient_id = _resolve_sender(order, current)
 
     logger.info(
         "chat.send_message order_id=%s sender_id=%s sender_role=%s request_id=%s",
@@ -117,6 +123,7 @@ async def send_message(
         body=message.body,
         is_read=message.is_read,
         created_at=message.created_at,
+        cursor=encode_cursor(message.created_at, message.id),
     )
 
 
@@ -126,7 +133,8 @@ async def send_message(
 #
 # Uso del cliente:
 #   Primera carga  → GET /chat/orders/{id}/messages
-#   Polling (cada 3s) → GET /chat/orders/{id}/messages?since=<created_at del último msg>
+#   Polling (fallback del WS) → GET /chat/orders/{id}/messages?after=<cursor del último msg>
+#   Historial hacia atrás     → GET /chat/orders/{id}/messages?before=<cursor del primer msg>
 #
 # Esto garantiza que el cliente nunca reciba el mismo mensaje dos veces y que
 # cada petición devuelva solo el diferencial (normalmente 0–2 mensajes).
@@ -139,7 +147,15 @@ async def list_messages(
     order_id: UUID,
     since: Optional[datetime] = Query(
         default=None,
-        description="Cursor ISO-8601. Devuelve solo mensajes posteriores a este timestamp.",
+        description="Cursor ISO-8601 (legacy). Devuelve solo mensajes posteriores a este timestamp.",
+    ),
+    after: Optional[str] = Query(
+        default=None,
+        description="Cursor opaco (`cursor` de un mensaje). Devuelve los mensajes siguientes.",
+    ),
+    before: Optional[str] = Query(
+        default=None,
+        description="Cursor opaco (`cursor` de un mensaje). Devuelve los mensajes anteriores (historial).",
     ),
     limit: int = Query(default=50, ge=1, le=100),
     current: CurrentUser = Depends(get_current_user),
@@ -149,8 +165,10 @@ async def list_messages(
     """
     Devuelve los mensajes de chat de una orden.
 
-    Para polling continuo, enviar `since` con el `created_at` del último
-    mensaje recibido. La respuesta estará vacía cuando no haya mensajes nuevos.
+    Paginación keyset por (created_at, id), siempre en orden ascendente:
+      - `after=<cursor del último mensaje>` → mensajes nuevos (polling).
+      - `before=<cursor del primer mensaje>` → página anterior del historial.
+    `since` (timestamp) se mantiene por compatibilidad.
 
     También marca como leídos los mensajes del otro participante.
     """
@@ -159,6 +177,8 @@ async def list_messages(
     messages = await ListMessages(repo=chat_repo).execute(
         order_id=order_id,
         since=since,
+        after=after,
+        before=before,
         limit=limit,
     )
 
@@ -181,6 +201,7 @@ async def list_messages(
             body=m.body,
             is_read=m.is_read,
             created_at=m.created_at,
+            cursor=encode_cursor(m.created_at, m.id),
         )
         for m in messages
     ]
@@ -211,3 +232,118 @@ async def unread_count(
         receiver_id=current.id,
     )
     return UnreadCountOut(unread_count=count)
+
+
+# ------------------------------------------------------------------
+# WS /chat/orders/{order_id}/ws?token=<access_token>
+# Sala en vivo de la orden: mensajes, "escribiendo..." y confirmaciones de lectura.
+#
+# Cliente → servidor:
+#   {"type": "message", "body": "..."}   envía un mensaje (igual que POST /messages)
+#   {"type": "typing"}                   "escribiendo..." (máx. 1 cada 2 s)
+#   {"type": "read"}                     marca leídos los mensajes del otro participante
+#
+# Servidor → cliente:
+#   {"type": "message", "message": {...}}  |  {"type": "typing", "user_id", "sender_role"}
+#   {"type": "read", "reader_id"}          |  {"type": "resync"}  |  {"type": "ping"}
+#   {"type": "error", "detail": "..."}
+# ------------------------------------------------------------------
+
+_WS_KEEPALIVE_SECONDS = 25
+_TYPING_MIN_INTERVAL = 2.0
+
+
+async def _ws_handle_client_event(websocket: WebSocket, order, order_id: UUID, current: CurrentUser, data: dict) -> None:
+    event_type = data.get("type") if isinstance(data, dict) else None
+    try:
+        if event_type == "message":
+            sender_role, recipient_id = _resolve_sender(order, current)
+            async with AsyncSessionLocal() as session:
+                await SendMessage(repo=PostgresChatRepository(session=session, engine=engine)).execute(
+                    order_id=order_id,
+                    sender_id=current.id,
+                    sender_role=sender_role,
+                    body=str(data.get("body") or ""),
+                    recipient_id=recipient_id,
+                )
+        elif event_type == "read":
+            async with AsyncSessionLocal() as session:
+                await MarkReadForReceiver(repo=PostgresChatRepository(session=session, engine=engine)).execute(
+                    order_id=order_id,
+                    receiver_id=current.id,
+                )
+        elif event_type == "typing":
+            sender_role, _ = _resolve_sender(order, current)
+            await pg_listener.publish(CHAT_CHANNEL, typing_event(order_id, current.id, sender_role))
+    except HTTPException as exc:
+        await websocket.send_json({"type": "error", "detail": exc.detail})
+    except WebSocketDisconnect:
+        raise
+    except Exception:
+        # Un fallo de DB en un evento no debe tumbar el socket: se informa y se sigue leyendo.
+        logger.exception("chat.ws event failed order_id=%s user_id=%s type=%s", order_id, current.id, event_type)
+        await websocket.send_json({"type": "error", "detail": f"{event_type}_failed"})
+
+
+@router.websocket("/orders/{order_id}/ws")
+async def chat_socket(
+    websocket: WebSocket,
+    order_id: UUID,
+    current: CurrentUser = Depends(get_current_user_ws),
+) -> None:
+    """
+    Sala de chat en vivo de una orden. Acceso validado una sola vez al conectar
+    (dueño, ally asignado o admin); si falla se acepta y se cierra con 4403 / 4404.
+    Los mensajes enviados por POST /messages también llegan por este socket.
+    """
+    queue = chat_broadcaster.subscribe(order_id)
+    try:
+        try:
+            async with AsyncSessionLocal() as session:
+                order = await _get_order_or_403(
+                    order_id, current, PostgresOrderRepository(session=session, engine=engine)
+                )
+        except HTTPException as exc:
+            # Cerrar antes de accept() se traduce en un 403 del handshake: aceptar y luego cerrar.
+            await websocket.accept()
+            await websocket.close(code=4000 + exc.status_code, reason=str(exc.detail)[:120])
+            return
+
+        await websocket.accept()
+        own_id = str(current.id)
+
+        async def _reader() -> None:
+            last_typing = 0.0
+            while True:
+                data = await websocket.receive_json()
+                if isinstance(data, dict) and data.get("type") == "typing":
+                    now = time.monotonic()
+                    if now - last_typing < _TYPING_MIN_INTERVAL:
+                        continue
+                    last_typing = now
+                await _ws_handle_client_event(websocket, order, order_id, current, data)
+
+        async def _writer() -> None:
+            while True:
+                try:
+                    event = await asyncio.wait_for(queue.get(), timeout=_WS_KEEPALIVE_SECONDS)
+                except asyncio.TimeoutError:
+                    await websocket.send_json({"type": "ping"})
+                    continue
+                # El propio "escribiendo..." no se devuelve al emisor.
+                if event.get("type") == "typing" and event.get("user_id") == own_id:
+                    continue
+                await websocket.send_json(event)
+
+        tasks = [asyncio.create_task(_reader()), asyncio.create_task(_writer())]
+        try:
+            done, pending = await asyncio.wait(tasks, return_when=asyncio.FIRST_COMPLETED)
+            for task in done:
+                exc = task.exception()
+                if exc is not None and not isinstance(exc, (WebSocketDisconnect, RuntimeError, ValueError)):
+                    logger.warning("chat.ws error order_id=%s user_id=%s: %s", order_id, current.id, exc)
+        finally:
+            for task in tasks:
+                task.cancel()
+    finally:
+        chat_broadcaster.unsubscribe(order_id, queue)
@@ -26,6 +26,8 @@ class MessageOut(BaseModel):
     body: str
     is_read: bool
     created_at: datetime
+    # Cursor opaco (keyset) de este mensaje, para `after` / `before`.
+    cursor: str
 
     model_config = {"from_attributes": True}
 
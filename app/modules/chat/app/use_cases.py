@@ -1,5 +1,6 @@
 from __future__ import annotations
 
+import logging
 from dataclasses import dataclass
 from datetime import datetime, timezone
 from typing import Optional
@@ -7,8 +8,11 @@ from uuid import UUID
 
 from fastapi import HTTPException, status
 
+from app.core.pagination import decode_cursor
 from app.modules.chat.domain.message import Message, MessageRepository
 
+logger = logging.getLogger(__name__)
+
 
 def _utcnow() -> datetime:
     return datetime.now(timezone.utc)
@@ -54,31 +58,24 @@ class SendMessage:
         )
         saved = await self.repo.save(message)
 
-        # Notificar al destinatario vía push (best-effort, no bloquea la respuesta)
+        # Notificar al destinatario vía push (best-effort, no bloquea la respuesta):
+        # se encola en push_outbox en una sesión propia y lo envía el worker.
         if recipient_id is not None:
             try:
-                from app.core.db import engine, get_async_session
-                from app.core.settings import settings
                 from app.modules.push.domain.push import PushMessage
-                from app.modules.push.infra.postgres_device_repository import PostgresDeviceTokenRepository
-                from app.modules.push.infra.provider import ExpoPushProvider, MockPushProvider
+                from app.modules.push.infra.outbox_worker import enqueue_push
 
                 sender_label = "Tu groomer" if sender_role == "ally" else "Tu cliente"
-                async with get_async_session() as session:
-                    devices_repo = PostgresDeviceTokenRepository(session=session, engine=engine)
-                    tokens = await devices_repo.get_active_tokens(recipient_id)
-                    if tokens:
-                        provider = ExpoPushProvider() if settings.ENV == "production" else MockPushProvider()
-                        provider.send(
-                            tokens=tokens,
-                            message=PushMessage(
-                                title=f"Mensaje de {sender_label}",
-                                body=body[:100],
-                                data={"order_id": str(order_id), "type": "chat_message"},
-                            ),
-                        )
+                await enqueue_push(
+                    user_id=recipient_id,
+                    message=PushMessage(
+                        title=f"Mensaje de {sender_label}",
+                        body=body[:100],
+                        data={"order_id": str(order_id), "type": "chat_message"},
+                    ),
+                )
             except Exception:
-                pass  # El push es best-effort; nunca falla el endpoint
+                logger.exception("chat push enqueue failed order_id=%s", order_id)
 
         return saved
 
@@ -96,9 +93,35 @@ class ListMessages:
         *,
         order_id: UUID,
         since: Optional[datetime] = None,
+        after: Optional[str] = None,
+        before: Optional[str] = None,
         limit: int = 50,
     ) -> list[Message]:
-        return await self.repo.list_since(order_id=order_id, since=since, limit=limit)
+        if after is not None and before is not None:
+            raise HTTPException(
+                status_code=status.HTTP_422_UNPROCESSABLE_ENTITY,
+                detail="Usa solo uno de 'after' o 'before'.",
+            )
+        if since is not None and (after is not None or before is not None):
+            raise HTTPException(
+                status_code=status.HTTP_422_UNPROCESSABLE_ENTITY,
+                detail="'since' no se puede combinar con 'after' ni 'before'.",
+            )
+        try:
+            after_key = decode_cursor(after) if after is not None else None
+            before_key = decode_cursor(before) if before is not None else None
+        except ValueError as exc:
+            raise HTTPException(
+                status_code=status.HTTP_422_UNPROCESSABLE_ENTITY,
+                detail=str(exc),
+            ) from exc
+        return await self.repo.list_since(
+            order_id=order_id,
+            since=since,
+            after=after_key,
+            before=before_key,
+            limit=limit,
+        )
 
 
 # ------------------------------------------------------------------
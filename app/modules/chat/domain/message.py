@@ -62,6 +62,8 @@ class MessageRepository(Protocol):
         order_id: UUID,
         *,
         since: Optional[datetime] = None,
+        after: Optional[tuple[datetime, UUID]] = None,
+        before: Optional[tuple[datetime, UUID]] = None,
         limit: int = 50,
     ) -> list[Message]:
         ...
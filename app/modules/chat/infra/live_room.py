@@ -0,0 +1,88 @@
+"""
+Salas de chat en vivo por orden (WebSocket) — reemplaza el polling cada 3 s.
+
+Flujo:
+  1. PostgresChatRepository.save / mark_read_for_receiver emiten NOTIFY
+     'chat_events' en la misma transacción del write.
+  2. "Escribiendo..." es efímero: se publica sin transacción (pg_listener.publish).
+  3. Cada instancia escucha el canal y reenvía el evento al Broadcaster local
+     indexado por order_id → sockets de /chat/orders/{id}/ws en esa instancia.
+
+Eventos (JSON):
+  {"type": "message", "order_id", "message": {...MessageOut}}
+  {"type": "read",    "order_id", "reader_id"}
+  {"type": "typing",  "order_id", "user_id", "sender_role"}
+  {"type": "resync",  "order_id"}   → el cliente debe pedir GET /messages
+
+NOTIFY admite hasta 8000 bytes de payload: un mensaje muy largo (2000
+caracteres multibyte) viaja como "resync" en lugar de con el cuerpo.
+"""
+
+from __future__ import annotations
+
+import json
+import logging
+from typing import Any
+from uuid import UUID
+
+from app.core.pagination import encode_cursor
+from app.core.pubsub import Broadcaster, pg_listener
+from app.modules.chat.domain.message import Message
+
+logger = logging.getLogger(__name__)
+
+CHAT_CHANNEL = "chat_events"
+_MAX_NOTIFY_BYTES = 7900
+
+# Cola por socket; un cliente muy lento pierde los eventos más viejos y se
+# resincroniza con GET /messages al reconectar.
+chat_broadcaster = Broadcaster(queue_size=64)
+
+
+def message_to_dict(message: Message) -> dict[str, Any]:
+    return {
+        "id": str(message.id),
+        "order_id": str(message.order_id),
+        "sender_id": str(message.sender_id),
+        "sender_role": message.sender_role,
+        "body": message.body,
+        "is_read": message.is_read,
+        "created_at": message.created_at.isoformat(),
+        "cursor": encode_cursor(message.created_at, message.id),
+    }
+
+
+def _encode(event: dict[str, Any]) -> str:
+    payload = json.dumps(event, separators=(",", ":"), ensure_ascii=False)
+    if len(payload.encode("utf-8")) > _MAX_NOTIFY_BYTES:
+        payload = json.dumps({"type": "resync", "order_id": event["order_id"]})
+    return payload
+
+
+def message_event(message: Message) -> str:
+    return _encode({"type": "message", "order_id": str(message.order_id), "message": message_to_dict(message)})
+
+
+def read_event(order_id: UUID, reader_id: UUID) -> str:
+    return _encode({"type": "read", "order_id": str(order_id), "reader_id": str(reader_id)})
+
+
+def typing_event(order_id: UUID, user_id: UUID, sender_role: str) -> str:
+    return _encode(
+        {"type": "typing", "order_id": str(order_id), "user_id": str(user_id), "sender_role": sender_role}
+    )
+
+
+def _on_chat_notify(payload: str) -> None:
+    try:
+        event = json.loads(payload)
+        order_id = UUID(event["order_id"])
+    except (ValueError, KeyError, TypeError) as exc:
+        logger.warning("chat live: invalid payload: %s", exc)
+        return
+    chat_broadcaster.publish(order_id, event)
+
+
+def register_chat_channel() -> None:
+    """Registra el callback del canal. Se llama en el lifespan antes de pg_listener.start()."""
+    pg_listener.on(CHAT_CHANNEL, _on_chat_notify)
@@ -3,7 +3,7 @@ from __future__ import annotations
 from datetime import datetime, timezone
 from uuid import UUID, uuid4
 
-from sqlalchemy import Boolean, DateTime, Index, String, Text
+from sqlalchemy import Boolean, DateTime, Index, Integer, String, Text, func
 from sqlalchemy.ext.asyncio import AsyncEngine
 from sqlalchemy.orm import Mapped, mapped_column
 from sqlalchemy.types import Uuid
@@ -36,13 +36,32 @@ class ChatMessageModel(Base):
     )
 
     __table_args__ = (
-        # Query principal: mensajes de una orden ordenados por tiempo
-        Index("ix_chat_messages_order_created", "order_id", "created_at"),
+        # Query principal: paginación keyset (created_at, id) dentro de una orden
+        Index("ix_chat_messages_order_created_id", "order_id", "created_at", "id"),
         # Para marcar leídos: mensajes no leídos recibidos por alguien
         Index("ix_chat_messages_order_unread", "order_id", "is_read"),
     )
 
 
+# [TECH]
+# Denormalized unread counter per (order_id, sender_id). The unread count of a
+# receiver is the sum over the other senders of the order (2-3 rows), which
+# mirrors exactly the `sender_id != receiver_id AND NOT is_read` semantics.
+# Updated in the same transaction as chat_messages writes.
+#
+# [NATURAL/BUSINESS]
+# Mensajes sin leer de cada remitente dentro de una orden (badge del chat).
+class ChatUnreadCounterModel(Base):
+    __tablename__ = "chat_unread_counters"
+
+    order_id: Mapped[UUID] = mapped_column(Uuid(as_uuid=True), primary_key=True)
+    sender_id: Mapped[UUID] = mapped_column(Uuid(as_uuid=True), primary_key=True)
+    unread: Mapped[int] = mapped_column(Integer, nullable=False, default=0, server_default="0")
+    updated_at: Mapped[datetime] = mapped_column(
+        DateTime(timezone=True), nullable=False, server_default=func.now(), onupdate=func.now()
+    )
+
+
 async def ensure_chat_schema(engine: AsyncEngine) -> None:
     # DDL gestionado por Alembic. No crear tablas aquí.
     pass
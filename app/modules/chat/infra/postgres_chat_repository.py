@@ -4,10 +4,13 @@ from datetime import datetime
 from typing import Optional
 from uuid import UUID
 
-from sqlalchemy import func, select, update
+from sqlalchemy import func, select, text, tuple_, update
+from sqlalchemy.dialects.postgresql import insert
 from sqlalchemy.ext.asyncio import AsyncEngine, AsyncSession
 
+from app.core.pubsub import notify, pg_listener
 from app.modules.chat.domain.message import Message, MessageRepository
+from app.modules.chat.infra.live_room import CHAT_CHANNEL, message_event, read_event
 
 
 class PostgresChatRepository(MessageRepository):
@@ -31,6 +34,16 @@ class PostgresChatRepository(MessageRepository):
             created_at=row.created_at,
         )
 
+    async def _bump_unread(self, order_id: UUID, sender_id: UUID) -> None:
+        from app.modules.chat.infra.models import ChatUnreadCounterModel as Counter
+
+        stmt = insert(Counter).values(order_id=order_id, sender_id=sender_id, unread=1)
+        stmt = stmt.on_conflict_do_update(
+            index_elements=[Counter.order_id, Counter.sender_id],
+            set_={"unread": Counter.unread + 1, "updated_at": func.now()},
+        )
+        await self._session.execute(stmt)
+
     # ------------------------------------------------------------------
     # Write
     # ------------------------------------------------------------------
@@ -49,7 +62,13 @@ class PostgresChatRepository(MessageRepository):
         )
         self._session.add(model)
         await self._session.flush()
+        if not message.is_read:
+            await self._bump_unread(message.order_id, message.sender_id)
+        # Evento para las salas en vivo: se entrega recién al hacer commit.
+        payload = message_event(message)
+        await notify(self._session, CHAT_CHANNEL, payload)
         await self._session.commit()
+        pg_listener.deliver_locally(CHAT_CHANNEL, payload)
         return message
 
     async def mark_read_for_receiver(
@@ -59,7 +78,7 @@ class PostgresChatRepository(MessageRepository):
     ) -> None:
         """Marca como leídos todos los mensajes de la orden que NO fueron enviados
         por receiver_id (es decir, los mensajes dirigidos a él)."""
-        from app.modules.chat.infra.models import ChatMessageModel
+        from app.modules.chat.infra.models import ChatMessageModel, ChatUnreadCounterModel as Counter
 
         stmt = (
             update(ChatMessageModel)
@@ -70,8 +89,19 @@ class PostgresChatRepository(MessageRepository):
             )
             .values(is_read=True)
         )
-        await self._session.execute(stmt)
+        result = await self._session.execute(stmt)
+        if result.rowcount:
+            await self._session.execute(
+                update(Counter)
+                .where(Counter.order_id == order_id, Counter.sender_id != receiver_id, Counter.unread != 0)
+                .values(unread=0, updated_at=func.now())
+            )
+        payload = read_event(order_id, receiver_id) if result.rowcount else None
+        if payload is not None:
+            await notify(self._session, CHAT_CHANNEL, payload)
         await self._session.commit()
+        if payload is not None:
+            pg_listener.deliver_locally(CHAT_CHANNEL, payload)
 
     # ------------------------------------------------------------------
     # Read
@@ -82,32 +112,119 @@ class PostgresChatRepository(MessageRepository):
         order_id: UUID,
         *,
         since: Optional[datetime] = None,
+        after: Optional[tuple[datetime, UUID]] = None,
+        before: Optional[tuple[datetime, UUID]] = None,
         limit: int = 50,
     ) -> list[Message]:
-        """Devuelve mensajes de una orden, opcionalmente filtrados a partir de
-        un timestamp (cursor-based polling: el cliente envía el created_at del
-        último mensaje que ya tiene)."""
+        """Devuelve mensajes de una orden en orden (created_at, id) ascendente.
+
+        - after:  página siguiente a la clave (created_at, id) dada.
+        - before: página anterior (historial hacia atrás); se lee en orden
+          descendente por el mismo índice y se invierte.
+        - since:  compatibilidad con el polling por timestamp.
+        - sin cursor: los primeros `limit` mensajes de la orden (comportamiento
+          histórico del endpoint; los clientes siguen con `after`)."""
         from app.modules.chat.infra.models import ChatMessageModel
 
+        key = tuple_(ChatMessageModel.created_at, ChatMessageModel.id)
         stmt = select(ChatMessageModel).where(ChatMessageModel.order_id == order_id)
 
         if since is not None:
             stmt = stmt.where(ChatMessageModel.created_at > since)
+        if after is not None:
+            stmt = stmt.where(key > tuple_(*after))
 
-        stmt = stmt.order_by(ChatMessageModel.created_at.asc()).limit(limit)
+        if before is not None:
+            stmt = stmt.where(key < tuple_(*before))
 
-        result = await self._session.execute(stmt)
+        # Solo la página anterior se lee desde el final.
+        from_end = before is not None
+        if from_end:
+            stmt = stmt.order_by(ChatMessageModel.created_at.desc(), ChatMessageModel.id.desc())
+        else:
+            stmt = stmt.order_by(ChatMessageModel.created_at.asc(), ChatMessageModel.id.asc())
+
+        result = await self._session.execute(stmt.limit(limit))
         rows = result.scalars().all()
+        if from_end:
+            rows = list(reversed(rows))
         return [self._row_to_message(r) for r in rows]
 
     async def unread_count(self, order_id: UUID, receiver_id: UUID) -> int:
-        """Cuenta mensajes no leídos dirigidos a receiver_id en la orden."""
-        from app.modules.chat.infra.models import ChatMessageModel
+        """Mensajes no leídos dirigidos a receiver_id en la orden: suma de los
+        contadores de los demás remitentes (lectura por PK, 2-3 filas)."""
+        from app.modules.chat.infra.models import ChatUnreadCounterModel as Counter
 
-        stmt = select(func.count()).where(
-            ChatMessageModel.order_id == order_id,
-            ChatMessageModel.sender_id != receiver_id,
-            ChatMessageModel.is_read.is_(False),
+        stmt = select(func.coalesce(func.sum(Counter.unread), 0)).where(
+            Counter.order_id == order_id,
+            Counter.sender_id != receiver_id,
         )
         result = await self._session.execute(stmt)
-        return result.scalar_one()
+        return int(result.scalar_one())
+
+    async def reconcile_unread_counters(self) -> int:
+        """Recalcula los contadores desde chat_messages y corrige los que
+        divergen. Devuelve cuántos se corrigieron.
+
+        Misma estrategia que notifications: bloquear los contadores candidatos
+        y recontar en una sentencia posterior, para no pisar incrementos o
+        puestas a cero que se confirmaron durante el conteo."""
+        rows = (await self._session.execute(text(_DRIFTED_SQL))).all()
+        if not rows:
+            await self._session.commit()
+            return 0
+        params = {"order_ids": [r.order_id for r in rows], "sender_ids": [r.sender_id for r in rows]}
+        await self._session.execute(text(_LOCK_SQL), params)
+        result = await self._session.execute(text(_RECOUNT_SQL), params)
+        fixed = len(result.all())
+        await self._session.commit()
+        return fixed
+
+
+_DRIFTED_SQL = """
+WITH actual AS (
+    SELECT order_id, sender_id, count(*)::int AS unread
+    FROM chat_messages
+    WHERE is_read = false
+    GROUP BY order_id, sender_id
+)
+SELECT coalesce(a.order_id, c.order_id) AS order_id,
+       coalesce(a.sender_id, c.sender_id) AS sender_id
+FROM actual a
+FULL JOIN chat_unread_counters c ON c.order_id = a.order_id AND c.sender_id = a.sender_id
+WHERE coalesce(a.unread, 0) <> coalesce(c.unread, 0)
+"""
+
+_LOCK_SQL = """
+SELECT c.order_id
+FROM chat_unread_counters c
+JOIN unnest(CAST(:order_ids AS uuid[]), CAST(:sender_ids AS uuid[])) AS k(order_id, sender_id)
+  ON c.order_id = k.order_id AND c.sender_id = k.sender_id
+ORDER BY c.order_id, c.sender_id
+FOR UPDATE OF c
+"""
+
+_RECOUNT_SQL = """
+WITH actual AS (
+    SELECT k.order_id, k.sender_id,
+           (SELECT count(*)::int FROM chat_messages m
+            WHERE m.order_id = k.order_id AND m.sender_id = k.sender_id AND m.is_read = false) AS unread
+    FROM unnest(CAST(:order_ids AS uuid[]), CAST(:sender_ids AS uuid[])) AS k(order_id, sender_id)
+),
+updated AS (
+    UPDATE chat_unread_counters c
+    SET unread = a.unread, updated_at = now()
+    FROM actual a
+    WHERE c.order_id = a.order_id AND c.sender_id = a.sender_id AND c.unread <> a.unread
+    RETURNING c.order_id
+),
+inserted AS (
+    INSERT INTO chat_unread_counters (order_id, sender_id, unread, updated_at)
+    SELECT order_id, sender_id, unread, now() FROM actual WHERE unread > 0
+    ON CONFLICT (order_id, sender_id) DO NOTHING
+    RETURNING order_id
+)
+SELECT order_id FROM updated
+UNION ALL
+SELECT order_id FROM inserted
+"""
@@ -3,6 +3,7 @@ from __future__ import annotations
 import firebase_admin
 from firebase_admin import auth as firebase_auth
 
+from app.core.metrics import track_external
 from app.modules.iam.domain.oauth_provider import OAuthProfile
 
 
@@ -18,7 +19,8 @@ class FirebaseOAuthProvider:
 
     async def exchange_token(self, provider: str, token: str) -> OAuthProfile:
         try:
-            decoded = firebase_auth.verify_id_token(token)
+            with track_external("firebase", "verify_id_token"):
+                decoded = firebase_auth.verify_id_token(token)
         except firebase_admin.exceptions.FirebaseError as exc:
             from fastapi import HTTPException, status
             raise HTTPException(
@@ -5,8 +5,9 @@ from sqlalchemy.ext.asyncio import AsyncSession
 
 from app.core.auth import CurrentUser, get_current_user
 from app.core.db import engine, get_async_session
-from app.modules.notifications.api.schemas import NotificationOut, UnreadCountOut
-from app.modules.notifications.app.use_cases import ListNotifications, MarkRead, UnreadCount
+from app.core.pagination import encode_cursor
+from app.modules.notifications.api.schemas import MarkReadManyIn, MarkReadManyOut, NotificationOut, UnreadCountOut
+from app.modules.notifications.app.use_cases import ListNotifications, MarkRead, MarkReadMany, UnreadCount
 from app.modules.notifications.infra.postgres_notification_repository import PostgresNotificationRepository
 
 
@@ -17,15 +18,24 @@ def get_notifications_repo(session: AsyncSession = Depends(get_async_session)) -
     return PostgresNotificationRepository(session=session, engine=engine)
 
 
+# Paginación keyset, más recientes primero:
+#   Primera página  → GET /notifications
+#   Siguiente       → GET /notifications?before=<cursor de la última notificación>
 @router.get("", response_model=list[NotificationOut])
 async def list_notifications(
     unread_only: bool = Query(False),
     limit: int = Query(20, ge=1, le=100),
+    before: str | None = Query(
+        None,
+        description="Cursor opaco (`cursor` de una notificación). Devuelve las anteriores a ella.",
+    ),
     current: CurrentUser = Depends(get_current_user),
     repo: PostgresNotificationRepository = Depends(get_notifications_repo),
 ) -> list[NotificationOut]:
-    items = await ListNotifications(repo=repo).execute(user_id=current.id, unread_only=unread_only, limit=limit)
-    return [NotificationOut(**n.__dict__) for n in items]
+    items = await ListNotifications(repo=repo).execute(
+        user_id=current.id, unread_only=unread_only, limit=limit, before=before
+    )
+    return [NotificationOut(**n.__dict__, cursor=encode_cursor(n.created_at, n.id)) for n in items]
 
 
 @router.get("/unread-count", response_model=UnreadCountOut)
@@ -37,6 +47,22 @@ async def unread_count(
     return UnreadCountOut(unread_count=count)
 
 
+@router.post("/mark-read", response_model=MarkReadManyOut)
+async def mark_read_many(
+    payload: MarkReadManyIn,
+    current: CurrentUser = Depends(get_current_user),
+    repo: PostgresNotificationRepository = Depends(get_notifications_repo),
+) -> MarkReadManyOut:
+    """
+    Marca en lote con una sola sentencia. Enviar exactamente uno de:
+      - `ids`: notificaciones puntuales (máx. 500).
+      - `up_to`: cursor de una notificación → marca esa y todas las anteriores
+        ("marcar todo como leído" usando el cursor de la primera de la bandeja).
+    """
+    marked, unread = await MarkReadMany(repo=repo).execute(user_id=current.id, ids=payload.ids, up_to=payload.up_to)
+    return MarkReadManyOut(marked=marked, unread_count=unread)
+
+
 @router.post("/{id}/read", status_code=status.HTTP_204_NO_CONTENT)
 async def mark_read(
     id: UUID,
@@ -2,7 +2,7 @@ from datetime import datetime
 from typing import Any, Optional
 from uuid import UUID
 
-from pydantic import BaseModel
+from pydantic import BaseModel, Field
 
 
 # [TECH]
@@ -19,6 +19,8 @@ class NotificationOut(BaseModel):
     data: Optional[dict[str, Any]] = None
     is_read: bool
     created_at: datetime
+    # Cursor opaco (keyset) de esta notificación, para `before` / `up_to`.
+    cursor: str
 
 
 # [TECH]
@@ -28,3 +30,23 @@ class NotificationOut(BaseModel):
 # Cantidad de notificaciones no leídas del usuario.
 class UnreadCountOut(BaseModel):
     unread_count: int
+
+
+# [TECH]
+# Bulk mark-read input: explicit ids or everything up to a keyset cursor.
+#
+# [NATURAL/BUSINESS]
+# Marcar varias notificaciones como leídas (seleccionadas o "todas").
+class MarkReadManyIn(BaseModel):
+    ids: Optional[list[UUID]] = Field(default=None, max_length=500)
+    up_to: Optional[str] = None
+
+
+# [TECH]
+# Bulk mark-read result with the remaining unread count.
+#
+# [NATURAL/BUSINESS]
+# Cuántas se marcaron y cuántas quedan sin leer.
+class MarkReadManyOut(BaseModel):
+    marked: int
+    unread_count: int
@@ -1,52 +1,36 @@
 from dataclasses import dataclass
-from typing import Any, Optional
+from typing import Optional
 from uuid import UUID
 
 from fastapi import HTTPException, status
 
+from app.core.pagination import KeysetKey, decode_cursor
 from app.modules.notifications.domain.notification import Notification, NotificationRepository
 
 
+def _decode_or_422(cursor: str) -> KeysetKey:
+    try:
+        return decode_cursor(cursor)
+    except ValueError as exc:
+        raise HTTPException(status_code=status.HTTP_422_UNPROCESSABLE_ENTITY, detail=str(exc)) from exc
+
+
 @dataclass
-class CreateNotification:
+class ListNotifications:
     repo: NotificationRepository
 
     async def execute(
         self,
         *,
         user_id: UUID,
-        type: str,
-        title: str,
-        body: str,
-        data: Optional[dict[str, Any]] = None,
-    ) -> Notification:
-        n = await self.repo.create_notification(user_id=user_id, type=type, title=title, body=body, data=data)
-
-        try:
-            from app.core.db import engine, get_async_session
-            from app.core.settings import settings
-            from app.modules.push.domain.push import PushMessage
-            from app.modules.push.infra.postgres_device_repository import PostgresDeviceTokenRepository
-            from app.modules.push.infra.provider import ExpoPushProvider, MockPushProvider
-
-            async with get_async_session() as session:
-                devices_repo = PostgresDeviceTokenRepository(session=session, engine=engine)
-                tokens = await devices_repo.get_active_tokens(user_id)
-                if tokens:
-                    provider = ExpoPushProvider() if settings.ENV == "production" else MockPushProvider()
-                    provider.send(tokens=tokens, message=PushMessage(title=title, body=body, data=data))
-        except Exception:
-            pass
-
-        return n
-
-
-@dataclass
-class ListNotifications:
-    repo: NotificationRepository
-
-    async def execute(self, *, user_id: UUID, unread_only: bool = False, limit: int = 20) -> list[Notification]:
-        return await self.repo.list_notifications(user_id=user_id, unread_only=unread_only, limit=limit)
+        unread_only: bool = False,
+        limit: int = 20,
+        before: Optional[str] = None,
+    ) -> list[Notification]:
+        before_key = _decode_or_422(before) if before is not None else None
+        return await self.repo.list_notifications(
+            user_id=user_id, unread_only=unread_only, limit=limit, before=before_key
+        )
 
 
 @dataclass
@@ -62,6 +46,29 @@ class MarkRead:
             raise
 
 
+@dataclass
+class MarkReadMany:
+    """Marca en lote: lista de ids o todo hasta un cursor (inclusive). Devuelve (marcadas, no leídas)."""
+    repo: NotificationRepository
+
+    async def execute(
+        self,
+        *,
+        user_id: UUID,
+        ids: Optional[list[UUID]] = None,
+        up_to: Optional[str] = None,
+    ) -> tuple[int, int]:
+        if (ids is None) == (up_to is None):
+            raise HTTPException(
+                status_code=status.HTTP_422_UNPROCESSABLE_ENTITY,
+                detail="Envía solo uno de 'ids' o 'up_to'.",
+            )
+        if ids is not None and not ids:
+            return 0, await self.repo.unread_count(user_id=user_id)
+        up_to_key = _decode_or_422(up_to) if up_to is not None else None
+        return await self.repo.mark_read_many(user_id=user_id, ids=ids, up_to=up_to_key)
+
+
 @dataclass
 class UnreadCount:
     repo: NotificationRepository
@@ -0,0 +1,225 @@
+"""
+Eventos tipados de notificación + plantillas precompiladas.
+
+Los módulos emisores (orders, ...) ya no arman título/cuerpo a mano: publican
+un evento y el dispatcher (infra/dispatcher.py) lo renderiza con la plantilla
+de su tipo, lo agrupa con otros del mismo usuario y lo persiste en lote.
+
+Coalescing: eventos con la misma `coalesce_key` dentro de la ventana del
+dispatcher se reducen al último (p. ej. accepted → on_the_way en pocos
+segundos = una sola notificación "Groomer en camino").
+"""
+
+from __future__ import annotations
+
+import string
+from dataclasses import dataclass
+from datetime import datetime
+from typing import Any, Mapping, Optional
+from uuid import UUID
+
+
+# ---------------------------------------------------------------------------
+# Plantillas
+# ---------------------------------------------------------------------------
+
+class CompiledTemplate:
+    """Plantilla `str.format` parseada una sola vez (al importar el módulo)."""
+
+    __slots__ = ("source", "_parts")
+
+    def __init__(self, source: str) -> None:
+        self.source = source
+        self._parts: tuple[tuple[str, Optional[str]], ...] = tuple(
+            (literal, field) for literal, field, _, _ in string.Formatter().parse(source)
+        )
+
+    def render(self, context: Mapping[str, Any]) -> str:
+        out: list[str] = []
+        for literal, field in self._parts:
+            out.append(literal)
+            if field is not None:
+                out.append(str(context[field]))
+        return "".join(out)
+
+
+@dataclass(frozen=True)
+class NotificationTemplate:
+    title: CompiledTemplate
+    body: CompiledTemplate
+
+    @classmethod
+    def compile(cls, title: str, body: str) -> "NotificationTemplate":
+        return cls(title=CompiledTemplate(title), body=CompiledTemplate(body))
+
+
+_T = NotificationTemplate.compile
+
+TEMPLATES: dict[str, NotificationTemplate] = {
+    "order_created":          _T("Pedido creado", "Tu pedido fue creado y está en preparación."),
+    "order_status.accepted":   _T("Servicio aceptado", "Tu groomer aceptó el servicio."),
+    "order_status.on_the_way": _T("Groomer en camino", "Tu groomer está en camino a tu domicilio."),
+    "order_status.in_service": _T("¡El grooming comenzó!", "Tu mascota está siendo atendida por nuestro groomer."),
+    "order_status.done":       _T("Servicio finalizado", "¡El servicio ha concluido! Esperamos que tu mascota esté feliz."),
+    "order_status.cancelled":  _T("Servicio cancelado", "Tu servicio ha sido cancelado."),
+    "order_status":            _T("Estado actualizado", "Se actualizó el estado de tu pedido."),
+    "order_payment_confirmed": _T(
+        "Pago confirmado",
+        "Tu pago fue procesado correctamente. Pronto asignaremos un groomer.",
+    ),
+    "order_assigned": _T(
+        "Servicio asignado",
+        "Tu servicio fue programado. Tu groomer estará contigo el {scheduled_date} a las {scheduled_time}.",
+    ),
+}
+
+
+# ---------------------------------------------------------------------------
+# Eventos
+# ---------------------------------------------------------------------------
+
+# [TECH]
+# Rendered notification ready for a batched insert.
+#
+# [NATURAL/BUSINESS]
+# Notificación lista para guardar y enviar por push.
+@dataclass(frozen=True)
+class NotificationDraft:
+    user_id: UUID
+    type: str
+    title: str
+    body: str
+    data: Optional[dict[str, Any]]
+
+
+@dataclass(frozen=True)
+class NotificationEvent:
+    """Base: cada evento define tipo, plantilla, contexto, data y clave de agrupación."""
+
+    user_id: UUID
+
+    type = "generic"
+
+    @property
+    def template_key(self) -> str:
+        return self.type
+
+    @property
+    def coalesce_key(self) -> tuple[Any, ...]:
+        return (self.user_id, self.type)
+
+    def context(self) -> dict[str, Any]:
+        return {}
+
+    def data(self) -> Optional[dict[str, Any]]:
+        return None
+
+    def render(self) -> NotificationDraft:
+        template = TEMPLATES.get(self.template_key) or TEMPLATES[self.type]
+        ctx = self.context()
+        return NotificationDraft(
+            user_id=self.user_id,
+            type=self.type,
+            title=template.title.render(ctx),
+            body=template.body.render(ctx),
+            data=self.data(),
+        )
+
+
+# [TECH]
+# Order created from a checked-out cart.
+#
+# [NATURAL/BUSINESS]
+# El cliente creó un pedido.
+@dataclass(frozen=True)
+class OrderCreated(NotificationEvent):
+    order_id: UUID
+    status: str
+
+    type = "order_status"
+
+    @property
+    def template_key(self) -> str:
+        return "order_created"
+
+    @property
+    def coalesce_key(self) -> tuple[Any, ...]:
+        # Mismo grupo que los cambios de estado: creado → aceptado en ráfaga = solo el último.
+        return (self.user_id, self.order_id, "order_status")
+
+    def data(self) -> dict[str, Any]:
+        return {"order_id": str(self.order_id), "status": self.status}
+
+
+# [TECH]
+# Order status transition (ally flow, admin or user patch).
+#
+# [NATURAL/BUSINESS]
+# Cambió el estado del servicio (aceptado, en camino, en servicio, etc.).
+@dataclass(frozen=True)
+class OrderStatusChanged(NotificationEvent):
+    order_id: UUID
+    status: str
+
+    type = "order_status"
+
+    @property
+    def template_key(self) -> str:
+        return f"order_status.{self.status}"
+
+    @property
+    def coalesce_key(self) -> tuple[Any, ...]:
+        return (self.user_id, self.order_id, "order_status")
+
+    def data(self) -> dict[str, Any]:
+        return {"order_id": str(self.order_id), "status": self.status}
+
+
+# [TECH]
+# Successful Culqi charge registered on the order.
+#
+# [NATURAL/BUSINESS]
+# El pago del pedido fue confirmado.
+@dataclass(frozen=True)
+class OrderPaymentConfirmed(NotificationEvent):
+    order_id: UUID
+    payment_status: str
+
+    type = "order_status"
+
+    @property
+    def template_key(self) -> str:
+        return "order_payment_confirmed"
+
+    @property
+    def coalesce_key(self) -> tuple[Any, ...]:
+        return (self.user_id, self.order_id, "order_payment")
+
+    def data(self) -> dict[str, Any]:
+        return {"order_id": str(self.order_id), "payment_status": self.payment_status}
+
+
+# [TECH]
+# Ally assigned / visit scheduled by an admin.
+#
+# [NATURAL/BUSINESS]
+# Se programó el servicio con un groomer.
+@dataclass(frozen=True)
+class OrderAssigned(NotificationEvent):
+    order_id: UUID
+    scheduled_at: datetime
+
+    type = "order_assigned"
+
+    @property
+    def coalesce_key(self) -> tuple[Any, ...]:
+        return (self.user_id, self.order_id, "order_assigned")
+
+    def context(self) -> dict[str, Any]:
+        return {
+            "scheduled_date": self.scheduled_at.strftime("%d/%m/%Y"),
+            "scheduled_time": self.scheduled_at.strftime("%H:%M"),
+        }
+
+    def data(self) -> dict[str, Any]:
+        return {"order_id": str(self.order_id), "scheduled_at": self.scheduled_at.isoformat()}
@@ -2,9 +2,12 @@ from __future__ import annotations
 
 from dataclasses import dataclass
 from datetime import datetime
-from typing import Any, Optional, Protocol
+from typing import TYPE_CHECKING, Any, Optional, Protocol, Sequence
 from uuid import UUID, uuid4
 
+if TYPE_CHECKING:
+    from app.modules.notifications.domain.events import NotificationDraft
+
 
 # [TECH]
 # Immutable entity for user notifications with read status.
@@ -55,20 +58,29 @@ class Notification:
 # [NATURAL/BUSINESS]
 # Guarda y gestiona notificaciones de usuarios.
 class NotificationRepository(Protocol):
-    async def create_notification(
+    async def create_many(self, drafts: Sequence["NotificationDraft"], *, push: bool = False) -> list[Notification]:
+        ...
+
+    async def list_notifications(
         self,
         user_id: UUID,
-        type: str,
-        title: str,
-        body: str,
-        data: Optional[dict[str, Any]] = None,
-    ) -> Notification:
+        *,
+        unread_only: bool = False,
+        limit: int = 20,
+        before: Optional[tuple[datetime, UUID]] = None,
+    ) -> list[Notification]:
         ...
 
-    async def list_notifications(self, user_id: UUID, *, unread_only: bool = False, limit: int = 20) -> list[Notification]:
+    async def mark_read(self, user_id: UUID, notification_id: UUID) -> Notification:
         ...
 
-    async def mark_read(self, user_id: UUID, notification_id: UUID) -> Notification:
+    async def mark_read_many(
+        self,
+        user_id: UUID,
+        *,
+        ids: Optional[Sequence[UUID]] = None,
+        up_to: Optional[tuple[datetime, UUID]] = None,
+    ) -> tuple[int, int]:
         ...
 
     async def unread_count(self, user_id: UUID) -> int:
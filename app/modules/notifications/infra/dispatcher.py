@@ -0,0 +1,130 @@
+"""
+Dispatcher de notificaciones con agrupación (coalescing) y escritura en lote.
+
+Problema:
+  Cada transición de una orden llamaba a CreateNotification dentro del
+  request: un INSERT + upsert de contador + INSERT en push_outbox + commit por
+  notificación. Un ally que marca accepted → on_the_way en pocos segundos
+  generaba dos pushes casi simultáneos al cliente.
+
+Diseño:
+  - Los módulos emisores publican eventos tipados (domain/events.py) con
+    `notification_dispatcher.dispatch(...)`; el request no espera la escritura.
+  - Eventos con la misma `coalesce_key` (usuario + orden + grupo) dentro de
+    NOTIFICATIONS_COALESCE_MS se reducen al último.
+  - Al cerrar la ventana, todo lo pendiente se renderiza y se escribe en una
+    sola transacción (session_scope): INSERT multi-fila en notifications,
+    upsert multi-fila de contadores y INSERT multi-fila en push_outbox.
+    Después se despierta al worker de push.
+  - Best effort: un error de escritura se loguea y no llega al request.
+  - Fuera del lifespan (scripts, tests) o con ventana 0 se escribe al instante.
+
+Estado por instancia: lo pendiente vive en memoria; stop() lo escribe antes
+de apagar. Un corte abrupto puede perder como máximo una ventana de eventos.
+"""
+
+from __future__ import annotations
+
+import asyncio
+import logging
+from typing import Any, Awaitable, Callable, Sequence
+
+from app.core.settings import settings
+from app.modules.notifications.domain.events import NotificationDraft, NotificationEvent
+
+logger = logging.getLogger(__name__)
+
+DraftWriter = Callable[[Sequence[NotificationDraft]], Awaitable[None]]
+
+
+async def write_drafts(drafts: Sequence[NotificationDraft]) -> None:
+    """Escritura por defecto: una transacción para todo el lote + wake del worker de push."""
+    from app.core.db import engine, session_scope
+    from app.modules.notifications.infra.postgres_notification_repository import PostgresNotificationRepository
+    from app.modules.push.infra.outbox_worker import push_outbox_worker
+
+    async with session_scope() as session:
+        await PostgresNotificationRepository(session=session, engine=engine).create_many(drafts, push=True)
+    push_outbox_worker.wake()
+
+
+class NotificationDispatcher:
+    def __init__(
+        self,
+        *,
+        coalesce_ms: int,
+        writer: DraftWriter | None = None,
+        max_pending: int = 1000,
+    ) -> None:
+        self._window = max(coalesce_ms, 0) / 1000
+        self._writer = writer or write_drafts
+        self._max_pending = max(1, max_pending)
+        self._pending: dict[tuple[Any, ...], NotificationEvent] = {}
+        self._running = False
+        self._flush_now = asyncio.Event()
+        self._task: asyncio.Task | None = None
+
+    @property
+    def pending(self) -> int:
+        return len(self._pending)
+
+    async def start(self) -> None:
+        self._running = True
+
+    async def stop(self) -> None:
+        """Cierra la ventana en curso y escribe lo pendiente."""
+        self._running = False
+        task = self._task
+        if task is not None:
+            self._flush_now.set()
+            await task
+        await self.flush()
+
+    async def dispatch(self, *events: NotificationEvent) -> None:
+        if not events:
+            return
+        if not self._running or self._window <= 0:
+            await self._write(list(events))
+            return
+
+        for event in events:
+            # Reinsertar mantiene el orden de llegada del último evento del grupo.
+            self._pending.pop(event.coalesce_key, None)
+            self._pending[event.coalesce_key] = event
+
+        if len(self._pending) >= self._max_pending:
+            await self.flush()
+        elif self._task is None:
+            self._flush_now.clear()
+            self._task = asyncio.create_task(self._flush_after_window(), name="notification_dispatcher")
+
+    async def flush(self) -> int:
+        """Escribe lo pendiente en un solo lote. Devuelve cuántas notificaciones se escribieron."""
+        pending, self._pending = self._pending, {}
+        if not pending:
+            return 0
+        return await self._write(list(pending.values()))
+
+    async def _flush_after_window(self) -> None:
+        try:
+            await asyncio.wait_for(self._flush_now.wait(), timeout=self._window)
+        except asyncio.TimeoutError:
+            pass
+        finally:
+            self._task = None
+        await self.flush()
+
+    async def _write(self, events: list[NotificationEvent]) -> int:
+        try:
+            drafts = [event.render() for event in events]
+            await self._writer(drafts)
+        except Exception:
+            logger.exception("notification dispatch failed size=%s", len(events))
+            return 0
+        return len(drafts)
+
+
+# ---------------------------------------------------------------------------
+# Singleton de proceso — arrancado/detenido en el lifespan de app.main.
+# ---------------------------------------------------------------------------
+notification_dispatcher = NotificationDispatcher(coalesce_ms=settings.NOTIFICATIONS_COALESCE_MS)
@@ -4,7 +4,7 @@ from datetime import datetime
 from typing import Any, Optional
 from uuid import UUID
 
-from sqlalchemy import JSON, Boolean, DateTime, Index, String, Text, Uuid
+from sqlalchemy import JSON, Boolean, DateTime, Index, Integer, String, Text, Uuid, func
 from sqlalchemy.ext.asyncio import AsyncEngine
 from sqlalchemy.orm import Mapped, mapped_column
 
@@ -23,9 +23,26 @@ class NotificationModel(Base):
     is_read: Mapped[bool] = mapped_column(Boolean, nullable=False, default=False, index=True)
     created_at: Mapped[datetime] = mapped_column(DateTime(timezone=True), nullable=False, default=datetime.utcnow, index=True)
 
+    # Keyset (created_at, id) por usuario: bandeja completa y solo no leídas.
     __table_args__ = (
-        Index("ix_notifications_user_created", "user_id", "created_at"),
-        Index("ix_notifications_user_unread", "user_id", "is_read"),
+        Index("ix_notifications_user_created_id", "user_id", "created_at", "id"),
+        Index("ix_notifications_user_read_created", "user_id", "is_read", "created_at", "id"),
+    )
+
+
+# [TECH]
+# Denormalized unread counter per user, updated in the same transaction as
+# notifications inserts / mark-read. Reconciled periodically by the scheduler.
+#
+# [NATURAL/BUSINESS]
+# Cantidad de notificaciones sin leer de cada usuario (badge de la app).
+class NotificationUnreadCounterModel(Base):
+    __tablename__ = "notification_unread_counters"
+
+    user_id: Mapped[UUID] = mapped_column(Uuid, primary_key=True)
+    unread: Mapped[int] = mapped_column(Integer, nullable=False, default=0, server_default="0")
+    updated_at: Mapped[datetime] = mapped_column(
+        DateTime(timezone=True), nullable=False, server_default=func.now(), onupdate=func.now()
     )
 
 
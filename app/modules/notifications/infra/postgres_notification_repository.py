@@ -1,12 +1,16 @@
 from __future__ import annotations
 
+from collections import Counter as Tally
 from datetime import datetime, timezone
-from typing import Any, Optional
+from typing import Optional, Sequence
 from uuid import UUID
 
-from sqlalchemy import select, update
+from sqlalchemy import func, select, text, tuple_, update
+from sqlalchemy.dialects.postgresql import insert
 from sqlalchemy.ext.asyncio import AsyncEngine, AsyncSession
 
+from app.core.pagination import KeysetKey
+from app.modules.notifications.domain.events import NotificationDraft
 from app.modules.notifications.domain.notification import Notification, NotificationRepository
 
 
@@ -15,48 +19,91 @@ class PostgresNotificationRepository(NotificationRepository):
         self._session = session
         self._engine = engine
 
-    async def create_notification(
-        self,
-        user_id: UUID,
-        type: str,
-        title: str,
-        body: str,
-        data: Optional[dict[str, Any]] = None,
-    ) -> Notification:
-        now = datetime.now(timezone.utc)
-        notification = Notification.new(
-            user_id=user_id,
-            type=type,
-            title=title,
-            body=body,
-            data=data,
-            created_at=now,
+    # ------------------------------------------------------------------
+    # Contador de no leídas (misma transacción que el write)
+    # ------------------------------------------------------------------
+
+    async def _bump_unread(self, user_id: UUID, delta: int) -> None:
+        from app.modules.notifications.infra.models import NotificationUnreadCounterModel as Counter
+
+        stmt = insert(Counter).values(user_id=user_id, unread=max(delta, 0))
+        stmt = stmt.on_conflict_do_update(
+            index_elements=[Counter.user_id],
+            set_={"unread": func.greatest(Counter.unread + delta, 0), "updated_at": func.now()},
         )
+        await self._session.execute(stmt)
 
+    async def create_many(self, drafts: Sequence[NotificationDraft], *, push: bool = False) -> list[Notification]:
+        """
+        Fan-out en lote: un INSERT multi-fila en notifications, un upsert
+        multi-fila de contadores y (con push=True) un INSERT multi-fila en
+        push_outbox. NO hace commit: corre dentro de la unidad de trabajo del
+        llamador (session_scope del dispatcher).
+        """
         from app.modules.notifications.infra.models import NotificationModel
+        from app.modules.notifications.infra.models import NotificationUnreadCounterModel as Counter
 
-        model = NotificationModel(
-            id=notification.id,
-            user_id=notification.user_id,
-            type=notification.type,
-            title=notification.title,
-            body=notification.body,
-            data=notification.data,
-            is_read=notification.is_read,
-            created_at=notification.created_at,
+        if not drafts:
+            return []
+        now = datetime.now(timezone.utc)
+        notifications = [
+            Notification.new(user_id=d.user_id, type=d.type, title=d.title, body=d.body, data=d.data, created_at=now)
+            for d in drafts
+        ]
+        await self._session.execute(
+            insert(NotificationModel),
+            [
+                {
+                    "id": n.id,
+                    "user_id": n.user_id,
+                    "type": n.type,
+                    "title": n.title,
+                    "body": n.body,
+                    "data": n.data,
+                    "is_read": n.is_read,
+                    "created_at": n.created_at,
+                }
+                for n in notifications
+            ],
         )
-        self._session.add(model)
-        await self._session.flush()
-        await self._session.commit()
-        return notification
 
-    async def list_notifications(self, user_id: UUID, *, unread_only: bool = False, limit: int = 20) -> list[Notification]:
+        per_user = Tally(n.user_id for n in notifications)
+        stmt = insert(Counter).values([{"user_id": u, "unread": c} for u, c in per_user.items()])
+        stmt = stmt.on_conflict_do_update(
+            index_elements=[Counter.user_id],
+            set_={"unread": Counter.unread + stmt.excluded.unread, "updated_at": func.now()},
+        )
+        await self._session.execute(stmt)
+
+        if push:
+            from app.modules.push.domain.push import PushMessage
+            from app.modules.push.infra.postgres_push_outbox import PostgresPushOutboxRepository
+
+            await PostgresPushOutboxRepository(session=self._session, engine=self._engine).enqueue_many(
+                [
+                    (n.user_id, PushMessage(title=n.title, body=n.body, data=n.data), n.id)
+                    for n in notifications
+                ]
+            )
+        return notifications
+
+    async def list_notifications(
+        self,
+        user_id: UUID,
+        *,
+        unread_only: bool = False,
+        limit: int = 20,
+        before: Optional[KeysetKey] = None,
+    ) -> list[Notification]:
+        """Más recientes primero. `before` = (created_at, id) del último ítem de la página anterior."""
         from app.modules.notifications.infra.models import NotificationModel
 
         stmt = select(NotificationModel).where(NotificationModel.user_id == user_id)
         if unread_only:
             stmt = stmt.where(NotificationModel.is_read.is_(False))
-        stmt = stmt.order_by(NotificationModel.created_at.desc()).limit(limit)
+        if before is not None:
+            stmt = stmt.where(tuple_(NotificationModel.created_at, NotificationModel.id) < tuple_(*before))
+        stmt = stmt.order_by(NotificationModel.created_at.desc(), NotificationModel.id.desc()).limit(limit)
 
         result = await self._session.execute(stmt)
         rows = result.scalars().all()
@@ -77,15 +124,30 @@ class PostgresNotificationRepository(NotificationRepository):
     async def mark_read(self, user_id: UUID, notification_id: UUID) -> Notification:
         from app.modules.notifications.infra.models import NotificationModel
 
+        # Solo la transición no leída → leída descuenta del contador.
         stmt = (
             update(NotificationModel)
-            .where(NotificationModel.id == notification_id, NotificationModel.user_id == user_id)
+            .where(
+                NotificationModel.id == notification_id,
+                NotificationModel.user_id == user_id,
+                NotificationModel.is_read.is_(False),
+            )
             .values(is_read=True)
             .returning(NotificationModel)
         )
         result = await self._session.execute(stmt)
-        await self._session.commit()
         row = result.scalar_one_or_none()
+        if row is not None:
+            await self._bump_unread(user_id, -1)
+        else:
+            row = (
+                await self._session.execute(
+                    select(NotificationModel).where(
+                        NotificationModel.id == notification_id, NotificationModel.user_id == user_id
+                    )
+                )
+            ).scalar_one_or_none()
+        await self._session.commit()
         if not row:
             raise ValueError("notification_not_found")
 
@@ -100,11 +162,123 @@ class PostgresNotificationRepository(NotificationRepository):
             created_at=row.created_at,
         )
 
-    async def unread_count(self, user_id: UUID) -> int:
+    async def mark_read_many(
+        self,
+        user_id: UUID,
+        *,
+        ids: Optional[Sequence[UUID]] = None,
+        up_to: Optional[KeysetKey] = None,
+    ) -> tuple[int, int]:
+        """
+        Marca como leídas por lista de ids o todas hasta `up_to` = (created_at, id)
+        inclusive. Una sola sentencia: UPDATE en CTE + descuento del contador.
+        Devuelve (marcadas, no leídas restantes).
+        """
         from app.modules.notifications.infra.models import NotificationModel
+        from app.modules.notifications.infra.models import NotificationUnreadCounterModel as Counter
+
+        marked = (
+            update(NotificationModel)
+            .where(NotificationModel.user_id == user_id, NotificationModel.is_read.is_(False))
+            .values(is_read=True)
+            .returning(NotificationModel.id)
+        )
+        if ids is not None:
+            marked = marked.where(NotificationModel.id.in_(list(ids)))
+        if up_to is not None:
+            marked = marked.where(tuple_(NotificationModel.created_at, NotificationModel.id) <= tuple_(*up_to))
+        marked_cte = marked.cte("marked")
+        marked_count = select(func.count()).select_from(marked_cte).scalar_subquery()
 
-        stmt = select(NotificationModel).where(
-            NotificationModel.user_id == user_id, NotificationModel.is_read.is_(False)
+        stmt = insert(Counter).values(user_id=user_id, unread=0)
+        stmt = (
+            stmt.on_conflict_do_update(
+                index_elements=[Counter.user_id],
+                set_={"unread": func.greatest(Counter.unread - marked_count, 0), "updated_at": func.now()},
+            )
+            .returning(marked_count, Counter.unread)
+            .add_cte(marked_cte)
         )
+        count, unread = (await self._session.execute(stmt)).one()
+        await self._session.commit()
+        return count, unread
+
+    async def unread_count(self, user_id: UUID) -> int:
+        """Lectura O(1) por PK del contador; sin fila = 0 no leídas."""
+        from app.modules.notifications.infra.models import NotificationUnreadCounterModel as Counter
+
+        stmt = select(Counter.unread).where(Counter.user_id == user_id)
         result = await self._session.execute(stmt)
-        return len(result.scalars().all())
+        return result.scalar_one_or_none() or 0
+
+    async def reconcile_unread_counters(self) -> int:
+        """Recalcula los contadores desde notifications y corrige los que
+        divergen. Devuelve cuántos se corrigieron.
+
+        Los writers insertan/marcan notificaciones y mueven el contador en la
+        misma transacción. Por eso primero se bloquean (FOR UPDATE) los
+        contadores candidatos y recién después, en otra sentencia con snapshot
+        nuevo, se recuenta: un writer que ya tocó el contador terminó antes del
+        recuento y uno que no, lo moverá después. Un conteo tomado antes del
+        bloqueo pisaría esos +1/-1 concurrentes."""
+        drifted = [row.user_id for row in (await self._session.execute(text(_DRIFTED_SQL))).all()]
+        if not drifted:
+            await self._session.commit()
+            return 0
+        params = {"user_ids": drifted}
+        await self._session.execute(text(_LOCK_SQL), params)
+        result = await self._session.execute(text(_RECOUNT_SQL), params)
+        fixed = len(result.all())
+        await self._session.commit()
+        return fixed
+
+
+# Candidatos: usuarios cuyo contador difiere del conteo real (incluye filas de
+# contador faltantes y contadores sin no leídas). Sin bloqueos: solo filtra.
+_DRIFTED_SQL = """
+WITH actual AS (
+    SELECT user_id, count(*)::int AS unread
+    FROM notifications
+    WHERE is_read = false
+    GROUP BY user_id
+)
+SELECT coalesce(a.user_id, c.user_id) AS user_id
+FROM actual a
+FULL JOIN notification_unread_counters c ON c.user_id = a.user_id
+WHERE coalesce(a.unread, 0) <> coalesce(c.unread, 0)
+"""
+
+_LOCK_SQL = """
+SELECT user_id
+FROM notification_unread_counters
+WHERE user_id = ANY(CAST(:user_ids AS uuid[]))
+ORDER BY user_id
+FOR UPDATE
+"""
+
+# Recuento con los contadores ya bloqueados. Las filas faltantes se insertan
+# con DO NOTHING: si un writer la creó mientras tanto, su upsert ya es correcto.
+_RECOUNT_SQL = """
+WITH actual AS (
+    SELECT u.user_id,
+           (SELECT count(*)::int FROM notifications n
+            WHERE n.user_id = u.user_id AND n.is_read = false) AS unread
+    FROM unnest(CAST(:user_ids AS uuid[])) AS u(user_id)
+),
+updated AS (
+    UPDATE notification_unread_counters c
+    SET unread = a.unread, updated_at = now()
+    FROM actual a
+    WHERE c.user_id = a.user_id AND c.unread <> a.unread
+    RETURNING c.user_id
+),
+inserted AS (
+    INSERT INTO notification_unread_counters (user_id, unread, updated_at)
+    SELECT user_id, unread, now() FROM actual WHERE unread > 0
+    ON CONFLICT (user_id) DO NOTHING
+    RETURNING user_id
+)
+SELECT user_id FROM updated
+UNION ALL
+SELECT user_id FROM inserted
+"""
@@ -5,7 +5,7 @@ from fastapi import APIRouter, Depends, HTTPException, Query, status
 from sqlalchemy.ext.asyncio import AsyncSession
 
 from app.core.auth import CurrentUser, get_current_user, require_roles
-from app.core.db import engine, get_async_session
+from app.core.db import engine, get_async_session, get_read_session
 from app.modules.geo.infra.repository import PostgresDistrictRepository
 from app.modules.iam.infra.postgres_user_repository import PostgresUserRepository
 from app.modules.orders.api.schemas import (
@@ -57,6 +57,11 @@ def get_assignments_repo(session: AsyncSession = Depends(get_async_session)) ->
     return PostgresOrderAssignmentRepository(session=session, engine=engine)
 
 
+def get_orders_read_repo(session: AsyncSession = Depends(get_read_session)) -> PostgresOrderRepository:
+    # Listados admin: réplica de lectura (staleness acotado). El detalle y las escrituras van al primario.
+    return PostgresOrderRepository(session=session, engine=engine)
+
+
 def _order_out(order) -> OrderOut:
     return OrderOut(**order.__dict__)
 
@@ -232,7 +237,7 @@ async def admin_list_orders(
     status_filter: Optional[OrderStatus] = Query(None, alias="status"),
     ally_id: Optional[UUID] = Query(None),
     _: CurrentUser = Depends(require_roles("admin")),
-    repo: PostgresOrderRepository = Depends(get_orders_repo),
+    repo: PostgresOrderRepository = Depends(get_orders_read_repo),
 ) -> list[OrderOut]:
     """Lista todas las órdenes con filtros opcionales."""
     orders = await ListOrdersAdmin(orders_repo=repo).execute(status=status_filter, ally_id=ally_id)
@@ -59,9 +59,8 @@ class CreateOrderFromCart:
 
     async def execute(self, *, user_id: UUID, cart_id: UUID, delivery_address_snapshot: dict) -> Order:
         from app.modules.cart.domain.cart import CartStatus
-        from app.core.db import engine
-        from app.modules.notifications.infra.postgres_notification_repository import PostgresNotificationRepository
-        from app.modules.notifications.app.use_cases import CreateNotification
+        from app.modules.notifications.domain.events import OrderCreated
+        from app.modules.notifications.infra.dispatcher import notification_dispatcher
 
         cart = await self.cart_repo.get_cart(cart_id=cart_id, user_id=user_id)
         if cart.status != CartStatus.checked_out:
@@ -80,19 +79,10 @@ class CreateOrderFromCart:
         )
         created = await self.orders_repo.create_order(order)
 
-        # Crear notificación (best effort, no bloquea la orden)
-        try:
-            notifications_repo = PostgresNotificationRepository(session=self.orders_repo._session, engine=engine)
-            await CreateNotification(repo=notifications_repo).execute(
-                user_id=user_id,
-                type="order_status",
-                title="Pedido creado",
-                body="Tu pedido fue creado y está en preparación.",
-                data={"order_id": str(created.id), "status": created.status.value},
-            )
-        except Exception as exc:
-            import logging
-            logging.exception("Failed to create order notification: %s", exc)
+        # Notificación (best effort: el dispatcher agrupa y escribe en segundo plano)
+        await notification_dispatcher.dispatch(
+            OrderCreated(user_id=user_id, order_id=created.id, status=created.status.value)
+        )
 
         return created
 
@@ -118,28 +108,13 @@ class GetOrder:
             raise
 
 
-def _status_message(status_value: str) -> tuple[str, str]:
-    if status_value == OrderStatus.accepted.value:
-        return ("Servicio aceptado", "Tu groomer aceptó el servicio.")
-    if status_value == OrderStatus.on_the_way.value:
-        return ("Groomer en camino", "Tu groomer está en camino a tu domicilio.")
-    if status_value == OrderStatus.in_service.value:
-        return ("¡El grooming comenzó!", "Tu mascota está siendo atendida por nuestro groomer.")
-    if status_value == OrderStatus.done.value:
-        return ("Servicio finalizado", "¡El servicio ha concluido!")
-    if status_value == OrderStatus.cancelled.value:
-        return ("Servicio cancelado", "Tu servicio ha sido cancelado.")
-    return ("Estado actualizado", "Se actualizó el estado de tu pedido.")
-
-
 @dataclass
 class UpdateOrderStatus:
     orders_repo: PostgresOrderRepository
 
     async def execute(self, *, order_id: UUID, status: OrderStatus) -> Order:
-        from app.core.db import engine
-        from app.modules.notifications.infra.postgres_notification_repository import PostgresNotificationRepository
-        from app.modules.notifications.app.use_cases import CreateNotification
+        from app.modules.notifications.domain.events import OrderStatusChanged
+        from app.modules.notifications.infra.dispatcher import notification_dispatcher
 
         try:
             existing = await self.orders_repo.get_order_admin(id=order_id)
@@ -157,21 +132,10 @@ class UpdateOrderStatus:
                 ) from exc
             raise
 
-        title, body = _status_message(updated.status.value)
-        
-        # Crear notificación (best effort, no bloquea la actualización)
-        try:
-            notifications_repo = PostgresNotificationRepository(session=self.orders_repo._session, engine=engine)
-            await CreateNotification(repo=notifications_repo).execute(
-                user_id=updated.user_id,
-                type="order_status",
-                title=title,
-                body=body,
-                data={"order_id": str(updated.id), "status": updated.status.value},
-            )
-        except Exception as exc:
-            import logging
-            logging.exception("Failed to create order status notification: %s", exc)
+        # Notificación (best effort: el dispatcher agrupa y escribe en segundo plano)
+        await notification_dispatcher.dispatch(
+            OrderStatusChanged(user_id=updated.user_id, order_id=updated.id, status=updated.status.value)
+        )
 
         return updated
 
@@ -213,26 +177,13 @@ class PatchOrder:
                 ) from exc
             raise
 
-        # Crear notificación para el usuario
-        from app.core.db import engine
-        from app.modules.notifications.infra.postgres_notification_repository import PostgresNotificationRepository
-        from app.modules.notifications.app.use_cases import CreateNotification
+        from app.modules.notifications.domain.events import OrderStatusChanged
+        from app.modules.notifications.infra.dispatcher import notification_dispatcher
 
-        title, body = _status_message(updated.status.value)
-        
-        # Crear notificación (best effort, no bloquea la actualización)
-        try:
-            notifications_repo = PostgresNotificationRepository(session=self.orders_repo._session, engine=engine)
-            await CreateNotification(repo=notifications_repo).execute(
-                user_id=updated.user_id,
-                type="order_status",
-                title=title,
-                body=body,
-                data={"order_id": str(updated.id), "status": updated.status.value},
-            )
-        except Exception as exc:
-            import logging
-            logging.exception("Failed to create order status notification: %s", exc)
+        # Notificación (best effort: el dispatcher agrupa y escribe en segundo plano)
+        await notification_dispatcher.dispatch(
+            OrderStatusChanged(user_id=updated.user_id, order_id=updated.id, status=updated.status.value)
+        )
         
         return updated
 
@@ -250,9 +201,8 @@ class ConfirmOrderPayment:
     orders_repo: PostgresOrderRepository
 
     async def execute(self, *, order_id: UUID, user_id: UUID, culqi_charge_id: str) -> Order:
-        from app.core.db import engine
-        from app.modules.notifications.infra.postgres_notification_repository import PostgresNotificationRepository
-        from app.modules.notifications.app.use_cases import CreateNotification
+        from app.modules.notifications.domain.events import OrderPaymentConfirmed
+        from app.modules.notifications.infra.dispatcher import notification_dispatcher
 
         try:
             order = await self.orders_repo.confirm_payment(
@@ -271,18 +221,9 @@ class ConfirmOrderPayment:
             raise
 
         # Notificar al usuario (best effort)
-        try:
-            notifications_repo = PostgresNotificationRepository(session=self.orders_repo._session, engine=engine)
-            await CreateNotification(repo=notifications_repo).execute(
-                user_id=user_id,
-                type="order_status",
-                title="Pago confirmado",
-                body="Tu pago fue procesado correctamente. Pronto asignaremos un groomer.",
-                data={"order_id": str(order.id), "payment_status": order.payment_status.value},
-            )
-        except Exception as exc:
-            import logging
-            logging.exception("Failed to create payment confirmation notification: %s", exc)
+        await notification_dispatcher.dispatch(
+            OrderPaymentConfirmed(user_id=user_id, order_id=order.id, payment_status=order.payment_status.value)
+        )
 
         return order
 
@@ -67,24 +67,13 @@ class AssignOrder:
             scheduled_at=scheduled_at,
         )
 
-        # Notificar al cliente (best effort)
-        try:
-            from app.core.db import engine
-            from app.modules.notifications.infra.postgres_notification_repository import PostgresNotificationRepository
-            from app.modules.notifications.app.use_cases import CreateNotification
-
-            notifications_repo = PostgresNotificationRepository(
-                session=self.orders_repo._session, engine=engine
-            )
-            await CreateNotification(repo=notifications_repo).execute(
-                user_id=updated_order.user_id,
-                type="order_assigned",
-                title="Servicio asignado",
-                body=f"Tu servicio fue programado. Tu groomer estará contigo el {scheduled_at.strftime('%d/%m/%Y a las %H:%M')}.",
-                data={"order_id": str(order_id), "scheduled_at": scheduled_at.isoformat()},
-            )
-        except Exception as exc:
-            logger.exception("Failed to send assignment notification: %s", exc)
+        # Notificar al cliente (best effort: el dispatcher agrupa y escribe en segundo plano)
+        from app.modules.notifications.domain.events import OrderAssigned
+        from app.modules.notifications.infra.dispatcher import notification_dispatcher
+
+        await notification_dispatcher.dispatch(
+            OrderAssigned(user_id=updated_order.user_id, order_id=order_id, scheduled_at=scheduled_at)
+        )
 
         return updated_order, assignment
 
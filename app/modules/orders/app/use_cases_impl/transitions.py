@@ -19,33 +19,14 @@ from app.modules.orders.infra.postgres_order_repository import PostgresOrderRepo
 
 logger = logging.getLogger(__name__)
 
-_STATUS_LABELS: dict[OrderStatus, tuple[str, str]] = {
-    OrderStatus.accepted:   ("Servicio aceptado",       "Tu groomer aceptó el servicio."),
-    OrderStatus.on_the_way: ("Groomer en camino",        "Tu groomer está en camino a tu domicilio."),
-    OrderStatus.in_service: ("¡El grooming comenzó!",   "Tu mascota está siendo atendida por nuestro groomer."),
-    OrderStatus.done:       ("Servicio finalizado",      "¡El servicio ha concluido! Esperamos que tu mascota esté feliz."),
-    OrderStatus.cancelled:  ("Servicio cancelado",       "Tu servicio ha sido cancelado."),
-}
-
-
-async def _notify(repo: PostgresOrderRepository, order: Order) -> None:
-    """Envía notificación push al cliente. Best-effort: no bloquea."""
-    try:
-        from app.core.db import engine
-        from app.modules.notifications.infra.postgres_notification_repository import PostgresNotificationRepository
-        from app.modules.notifications.app.use_cases import CreateNotification
-
-        title, body = _STATUS_LABELS.get(order.status, ("Estado actualizado", "Tu pedido fue actualizado."))
-        notifications_repo = PostgresNotificationRepository(session=repo._session, engine=engine)
-        await CreateNotification(repo=notifications_repo).execute(
-            user_id=order.user_id,
-            type="order_status",
-            title=title,
-            body=body,
-            data={"order_id": str(order.id), "status": order.status.value},
-        )
-    except Exception as exc:
-        logger.exception("Failed to send order status notification: %s", exc)
+async def _notify(order: Order) -> None:
+    """Notifica el cambio de estado al cliente. Best-effort: el dispatcher agrupa y escribe en segundo plano."""
+    from app.modules.notifications.domain.events import OrderStatusChanged
+    from app.modules.notifications.infra.dispatcher import notification_dispatcher
+
+    await notification_dispatcher.dispatch(
+        OrderStatusChanged(user_id=order.user_id, order_id=order.id, status=order.status.value)
+    )
 
 
 def _get_order_or_404(order: Order | None, order_id: UUID) -> Order:
@@ -81,7 +62,7 @@ class AcceptOrder:
         _assert_is_ally(order, ally_id)
         _assert_can_advance(order, OrderStatus.accepted)
         updated = await self.repo.set_status(id=order_id, status=OrderStatus.accepted)
-        await _notify(self.repo, updated)
+        await _notify(updated)
         return updated
 
 
@@ -98,7 +79,7 @@ class DepartOrder:
         _assert_is_ally(order, ally_id)
         _assert_can_advance(order, OrderStatus.on_the_way)
         updated = await self.repo.set_status(id=order_id, status=OrderStatus.on_the_way)
-        await _notify(self.repo, updated)
+        await _notify(updated)
         return updated
 
 
@@ -115,7 +96,7 @@ class ArriveOrder:
         _assert_is_ally(order, ally_id)
         _assert_can_advance(order, OrderStatus.in_service)
         updated = await self.repo.set_status(id=order_id, status=OrderStatus.in_service)
-        await _notify(self.repo, updated)
+        await _notify(updated)
         return updated
 
 
@@ -132,7 +113,7 @@ class CompleteOrder:
         _assert_is_ally(order, ally_id)
         _assert_can_advance(order, OrderStatus.done)
         updated = await self.repo.set_status(id=order_id, status=OrderStatus.done)
-        await _notify(self.repo, updated)
+        await _notify(updated)
         return updated
 
 
@@ -152,5 +133,5 @@ class CancelOrder:
                 detail=f"cancel_invalid: no se puede cancelar una orden en estado '{order.status.value}'",
             )
         updated = await self.repo.set_status(id=order_id, status=OrderStatus.cancelled)
-        await _notify(self.repo, updated)
+        await _notify(updated)
         return updated
@@ -137,3 +137,21 @@ class Order:
     # Solo se puede cancelar antes de que el servicio comience (in_service o done).
     def can_cancel(self) -> bool:
         return self.status in _CANCELLABLE_STATUSES
+
+
+# [TECH]
+# Read-only projection of the fields needed for access checks.
+# Same attribute names as Order, so domain rules that only read
+# id/status/user_id/ally_id/delivery_address_snapshot accept either.
+#
+# [NATURAL/BUSINESS]
+# "Quién participa" en una orden: cliente, ally asignado, estado y destino.
+# Es lo único que necesitan tracking, chat y streaming para autorizar,
+# y se cachea para no leer la orden completa en cada poll.
+@dataclass(frozen=True)
+class OrderParticipation:
+    id: UUID
+    user_id: UUID
+    status: OrderStatus
+    ally_id: Optional[UUID]
+    delivery_address_snapshot: Optional[dict[str, Any]]
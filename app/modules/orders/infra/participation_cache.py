@@ -0,0 +1,77 @@
+"""
+Cache TTL de OrderParticipation (status, user_id, ally_id, destino).
+
+Problema:
+  Tracking (/current, /route, /location, /live), streaming y chat leían la
+  orden completa en cada request solo para autorizar. Era la query más
+  frecuente durante servicios activos.
+
+Diseño:
+  - Cache en memoria por instancia, TTL corto (ORDERS_PARTICIPATION_TTL_SECONDS).
+  - Invalidación explícita en PostgresOrderRepository.set_status /
+    update_status / set_ally (las transiciones de transitions.py y la
+    asignación del admin pasan por ahí).
+  - Entre instancias: el repo emite NOTIFY 'orders_participation' con el
+    order_id en la misma transacción del cambio; cada instancia invalida su
+    entrada al recibirlo. Sin LISTEN activo, el TTL acota la inconsistencia.
+  - No se cachean órdenes inexistentes (un 404 no debe sobrevivir a la creación).
+"""
+
+from __future__ import annotations
+
+import logging
+import time
+from uuid import UUID
+
+from app.core.pubsub import pg_listener
+from app.core.settings import settings
+from app.modules.orders.domain.order import OrderParticipation
+
+logger = logging.getLogger(__name__)
+
+PARTICIPATION_CHANNEL = "orders_participation"
+
+
+class ParticipationCache:
+    def __init__(self, *, ttl_seconds: int, max_entries: int = 10_000) -> None:
+        self._ttl = ttl_seconds
+        self._max_entries = max_entries
+        self._entries: dict[UUID, tuple[float, OrderParticipation]] = {}
+
+    def get(self, order_id: UUID) -> OrderParticipation | None:
+        hit = self._entries.get(order_id)
+        if hit is None:
+            return None
+        expires_at, participation = hit
+        if time.monotonic() >= expires_at:
+            self._entries.pop(order_id, None)
+            return None
+        return participation
+
+    def put(self, participation: OrderParticipation) -> None:
+        if self._ttl <= 0:
+            return
+        if participation.id not in self._entries and len(self._entries) >= self._max_entries:
+            self._entries.pop(next(iter(self._entries)))
+        self._entries[participation.id] = (time.monotonic() + self._ttl, participation)
+
+    def invalidate(self, order_id: UUID) -> None:
+        self._entries.pop(order_id, None)
+
+
+def _on_invalidate_notify(payload: str) -> None:
+    try:
+        participation_cache.invalidate(UUID(payload))
+    except ValueError:
+        logger.warning("orders participation: invalid payload %r", payload)
+
+
+def register_participation_channel() -> None:
+    """Registra la invalidación entre instancias. Se llama en el lifespan antes de pg_listener.start()."""
+    pg_listener.on(PARTICIPATION_CHANNEL, _on_invalidate_notify)
+
+
+# ---------------------------------------------------------------------------
+# Singleton de proceso
+# ---------------------------------------------------------------------------
+participation_cache = ParticipationCache(ttl_seconds=settings.ORDERS_PARTICIPATION_TTL_SECONDS)
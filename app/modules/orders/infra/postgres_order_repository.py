@@ -8,7 +8,9 @@ from uuid import UUID
 from sqlalchemy import desc, select
 from sqlalchemy.ext.asyncio import AsyncEngine, AsyncSession
 
-from app.modules.orders.domain.order import Order, OrderStatus, PaymentStatus
+from app.core.pubsub import notify
+from app.modules.orders.domain.order import Order, OrderParticipation, OrderStatus, PaymentStatus
+from app.modules.orders.infra.participation_cache import PARTICIPATION_CHANNEL, participation_cache
 
 
 class PostgresOrderRepository:
@@ -43,6 +45,16 @@ class PostgresOrderRepository:
             culqi_charge_id=r.culqi_charge_id,
         )
 
+    async def _commit_participation_change(self, order_id: UUID) -> None:
+        """
+        Commit de un cambio de status/ally. El NOTIFY viaja en la misma
+        transacción (invalida las demás instancias) y el cache local se
+        invalida después del commit para no re-cachear el valor anterior.
+        """
+        await notify(self._session, PARTICIPATION_CHANNEL, str(order_id))
+        await self._session.commit()
+        participation_cache.invalidate(order_id)
+
     # ------------------------------------------------------------------
     # Write
     # ------------------------------------------------------------------
@@ -106,7 +118,7 @@ class PostgresOrderRepository:
             raise ValueError("invalid_status_transition")
         model.status = status.value
         model.updated_at = utcnow()
-        await self._session.commit()
+        await self._commit_participation_change(id)
         await self._session.refresh(model)
         return self._row_to_order(model)
 
@@ -119,7 +131,7 @@ class PostgresOrderRepository:
             raise ValueError("order_not_found")
         model.status = status.value
         model.updated_at = utcnow()
-        await self._session.commit()
+        await self._commit_participation_change(id)
         await self._session.refresh(model)
         return self._row_to_order(model)
 
@@ -197,7 +209,7 @@ class PostgresOrderRepository:
         model.ally_id = ally_id
         model.scheduled_at = scheduled_at
         model.updated_at = utcnow()
-        await self._session.commit()
+        await self._commit_participation_change(id)
         await self._session.refresh(model)
         return self._row_to_order(model)
 
@@ -236,6 +248,39 @@ class PostgresOrderRepository:
             return None
         return self._row_to_order(model)
 
+    async def get_participation(self, *, id: UUID) -> Optional[OrderParticipation]:
+        """
+        Datos mínimos para autorizar (status, user_id, ally_id, destino).
+        Cacheado con TTL; invalidado por set_status / update_status / set_ally.
+        """
+        cached = participation_cache.get(id)
+        if cached is not None:
+            return cached
+        from app.modules.orders.infra.models import OrderModel
+        await self._ensure_ready()
+        row = (
+            await self._session.execute(
+                select(
+                    OrderModel.id,
+                    OrderModel.user_id,
+                    OrderModel.status,
+                    OrderModel.ally_id,
+                    OrderModel.delivery_address_snapshot,
+                ).where(OrderModel.id == id)
+            )
+        ).first()
+        if row is None:
+            return None
+        participation = OrderParticipation(
+            id=row.id,
+            user_id=row.user_id,
+            status=OrderStatus(row.status),
+            ally_id=row.ally_id,
+            delivery_address_snapshot=row.delivery_address_snapshot,
+        )
+        participation_cache.put(participation)
+        return participation
+
     async def list_orders_admin(
         self,
         *,
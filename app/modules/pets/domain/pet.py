@@ -137,6 +137,27 @@ class Pet:
         )
 
 
+# Subconjunto de Pet que define el precio en la tienda (especie, raza, peso).
+# /store/quote lo lee en cada cotización y se cachea para no leer la mascota completa.
+@dataclass(frozen=True)
+class PetProfile:
+    id: UUID
+    owner_id: UUID
+    species: Species
+    breed: Optional[str]
+    weight_kg: Optional[float]
+
+    @classmethod
+    def from_pet(cls, pet: Pet) -> "PetProfile":
+        return cls(
+            id=pet.id,
+            owner_id=pet.owner_id,
+            species=pet.species,
+            breed=pet.breed,
+            weight_kg=float(pet.weight_kg) if pet.weight_kg is not None else None,
+        )
+
+
 class PetRepository(Protocol):
     async def add(self, pet: Pet) -> None:
         ...
@@ -144,6 +165,9 @@ class PetRepository(Protocol):
     async def get_by_id(self, pet_id: UUID) -> Optional[Pet]:
         ...
 
+    async def get_profile(self, pet_id: UUID) -> Optional[PetProfile]:
+        ...
+
     async def update(self, pet: Pet) -> None:
         ...
 
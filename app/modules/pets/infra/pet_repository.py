@@ -1,7 +1,7 @@
 from typing import Dict, List, Optional
 from uuid import UUID
 
-from app.modules.pets.domain.pet import Pet, PetRepository
+from app.modules.pets.domain.pet import Pet, PetProfile, PetRepository
 from app.modules.pets.domain.weight_entry import PetWeightEntry
 
 
@@ -16,6 +16,10 @@ class InMemoryPetRepository(PetRepository):
     async def get_by_id(self, pet_id: UUID) -> Optional[Pet]:
         return self._by_id.get(pet_id)
 
+    async def get_profile(self, pet_id: UUID) -> Optional[PetProfile]:
+        pet = self._by_id.get(pet_id)
+        return PetProfile.from_pet(pet) if pet is not None else None
+
     async def update(self, pet: Pet) -> None:
         if pet.id not in self._by_id:
             raise ValueError("pet_not_found")
@@ -6,8 +6,10 @@ from uuid import UUID
 from sqlalchemy import desc, select
 from sqlalchemy.ext.asyncio import AsyncEngine, AsyncSession
 
-from app.modules.pets.domain.pet import Pet, PetRepository, Sex, Species, Size, ActivityLevel, CoatType, BathBehavior, AntiparasiticInterval
+from app.core.pubsub import notify
+from app.modules.pets.domain.pet import Pet, PetProfile, PetRepository, Sex, Species, Size, ActivityLevel, CoatType, BathBehavior, AntiparasiticInterval
 from app.modules.pets.domain.weight_entry import PetWeightEntry
+from app.modules.pets.infra.profile_cache import PET_PROFILE_CHANNEL, pet_profile_cache
 
 
 class PostgresPetRepository(PetRepository):
@@ -129,7 +131,23 @@ class PostgresPetRepository(PetRepository):
         model.antiparasitic_interval = (str(pet.antiparasitic_interval.value) if pet.antiparasitic_interval is not None else None)
         model.special_shampoo = pet.special_shampoo
 
+        # Perfil de precio (ver profile_cache.py): NOTIFY en la misma transacción
+        # e invalidación local después del commit.
+        await notify(self._session, PET_PROFILE_CHANNEL, str(pet.id))
         await self._session.commit()
+        pet_profile_cache.invalidate(pet.id)
+
+    async def get_profile(self, pet_id: UUID) -> Optional[PetProfile]:
+        """Especie, raza y peso de la mascota, desde el cache si está vigente."""
+        cached = pet_profile_cache.get(pet_id)
+        if cached is not None:
+            return cached
+        pet = await self.get_by_id(pet_id)
+        if pet is None:
+            return None
+        profile = PetProfile.from_pet(pet)
+        pet_profile_cache.put(profile)
+        return profile
 
     async def add_weight_entry(self, entry: PetWeightEntry) -> None:
         """ from app.modules.pets.infra.models import PetWeightEntryModel, ensure_pets_schema, utcnow """
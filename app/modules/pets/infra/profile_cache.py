@@ -0,0 +1,75 @@
+"""
+Cache TTL del perfil de precio de una mascota (especie, raza, peso).
+
+Problema:
+  /store/quote se llama una y otra vez mientras el usuario marca y desmarca
+  addons, y cada llamada leía la mascota completa solo para saber especie,
+  raza y peso.
+
+Diseño:
+  - Cache en memoria por instancia, TTL (PETS_PROFILE_TTL_SECONDS).
+  - Invalidación explícita en PostgresPetRepository.update (editar la
+    mascota y registrar peso pasan por ahí).
+  - Entre instancias: el repo emite NOTIFY 'pets_profile' con el pet_id en
+    la misma transacción; cada instancia invalida su entrada al recibirlo.
+  - No se cachean mascotas inexistentes.
+"""
+
+from __future__ import annotations
+
+import logging
+import time
+from uuid import UUID
+
+from app.core.pubsub import pg_listener
+from app.core.settings import settings
+from app.modules.pets.domain.pet import PetProfile
+
+logger = logging.getLogger(__name__)
+
+PET_PROFILE_CHANNEL = "pets_profile"
+
+
+class PetProfileCache:
+    def __init__(self, *, ttl_seconds: int, max_entries: int = 10_000) -> None:
+        self._ttl = ttl_seconds
+        self._max_entries = max_entries
+        self._entries: dict[UUID, tuple[float, PetProfile]] = {}
+
+    def get(self, pet_id: UUID) -> PetProfile | None:
+        hit = self._entries.get(pet_id)
+        if hit is None:
+            return None
+        expires_at, profile = hit
+        if time.monotonic() >= expires_at:
+            self._entries.pop(pet_id, None)
+            return None
+        return profile
+
+    def put(self, profile: PetProfile) -> None:
+        if self._ttl <= 0:
+            return
+        if profile.id not in self._entries and len(self._entries) >= self._max_entries:
+            self._entries.pop(next(iter(self._entries)))
+        self._entries[profile.id] = (time.monotonic() + self._ttl, profile)
+
+    def invalidate(self, pet_id: UUID) -> None:
+        self._entries.pop(pet_id, None)
+
+
+def _on_invalidate_notify(payload: str) -> None:
+    try:
+        pet_profile_cache.invalidate(UUID(payload))
+    except ValueError:
+        logger.warning("pets profile: invalid payload %r", payload)
+
+
+def register_pet_profile_channel() -> None:
+    """Registra la invalidación entre instancias. Se llama en el lifespan antes de pg_listener.start()."""
+    pg_listener.on(PET_PROFILE_CHANNEL, _on_invalidate_notify)
+
+
+# ---------------------------------------------------------------------------
+# Singleton de proceso
+# ---------------------------------------------------------------------------
+pet_profile_cache = PetProfileCache(ttl_seconds=settings.PETS_PROFILE_TTL_SECONDS)
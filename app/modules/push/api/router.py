@@ -6,8 +6,10 @@ from sqlalchemy.ext.asyncio import AsyncSession
 from app.core.auth import CurrentUser, get_current_user
 from app.core.db import engine, get_async_session
 from app.modules.push.api.schemas import BroadcastIn, BroadcastOut, DeviceOut, DeviceRegisterIn
-from app.modules.push.app.use_cases import BroadcastPush, DeactivateDevice, ListDevices, RegisterDevice
+from app.modules.push.app.use_cases import BroadcastPush, DeactivateDevice, GetBroadcast, ListDevices, RegisterDevice
+from app.modules.push.domain.push import PushBroadcast
 from app.modules.push.infra.postgres_device_repository import PostgresDeviceTokenRepository
+from app.modules.push.infra.postgres_push_broadcast import PostgresPushBroadcastRepository
 
 
 router = APIRouter(tags=["push"], prefix="/push")
@@ -17,6 +19,25 @@ def get_push_repo(session: AsyncSession = Depends(get_async_session)) -> Postgre
     return PostgresDeviceTokenRepository(session=session, engine=engine)
 
 
+def get_broadcast_repo(session: AsyncSession = Depends(get_async_session)) -> PostgresPushBroadcastRepository:
+    return PostgresPushBroadcastRepository(session=session, engine=engine)
+
+
+def _broadcast_out(broadcast: PushBroadcast) -> BroadcastOut:
+    return BroadcastOut(
+        id=broadcast.id,
+        status=broadcast.status,
+        total_tokens=broadcast.total_tokens,
+        sent=broadcast.sent,
+        failed=broadcast.failed,
+        chunks_done=broadcast.chunks_done,
+        last_error=broadcast.last_error,
+        created_at=broadcast.created_at,
+        started_at=broadcast.started_at,
+        finished_at=broadcast.finished_at,
+    )
+
+
 @router.post("/devices", response_model=DeviceOut, status_code=status.HTTP_201_CREATED)
 async def register_device(
     payload: DeviceRegisterIn,
@@ -46,17 +67,32 @@ async def deactivate_device(
     return None
 
 
-@router.post("/broadcast", response_model=BroadcastOut)
+@router.post("/broadcast", response_model=BroadcastOut, status_code=status.HTTP_202_ACCEPTED)
 async def broadcast_push(
     payload: BroadcastIn,
     current: CurrentUser = Depends(get_current_user),
-    repo: PostgresDeviceTokenRepository = Depends(get_push_repo),
+    repo: PostgresPushBroadcastRepository = Depends(get_broadcast_repo),
 ) -> BroadcastOut:
+    """Encola el envío masivo y responde de inmediato; el progreso se consulta
+    en GET /push/broadcasts/{id}."""
     if current.role not in ("admin", "ally"):
         raise HTTPException(status_code=status.HTTP_403_FORBIDDEN, detail="Forbidden")
-    sent_to = await BroadcastPush(repo=repo).execute(
+    broadcast = await BroadcastPush(repo=repo).execute(
+        created_by=current.id,
         title=payload.title,
         body=payload.body,
         data=payload.data,
     )
-    return BroadcastOut(sent_to=sent_to)
+    return _broadcast_out(broadcast)
+
+
+@router.get("/broadcasts/{id}", response_model=BroadcastOut)
+async def get_broadcast(
+    id: UUID,
+    current: CurrentUser = Depends(get_current_user),
+    repo: PostgresPushBroadcastRepository = Depends(get_broadcast_repo),
+) -> BroadcastOut:
+    if current.role not in ("admin", "ally"):
+        raise HTTPException(status_code=status.HTTP_403_FORBIDDEN, detail="Forbidden")
+    broadcast = await GetBroadcast(repo=repo).execute(broadcast_id=id)
+    return _broadcast_out(broadcast)
@@ -37,5 +37,19 @@ class BroadcastIn(BaseModel):
     data: Optional[dict[str, Any]] = None
 
 
+# [TECH]
+# Output DTO for a background broadcast job and its progress.
+#
+# [NATURAL/BUSINESS]
+# Estado de un envío masivo: cuántos dispositivos se alcanzaron y cuántos fallaron.
 class BroadcastOut(BaseModel):
-    sent_to: int
+    id: UUID
+    status: str                 # queued | running | done | failed
+    total_tokens: int
+    sent: int
+    failed: int
+    chunks_done: int
+    last_error: Optional[str] = None
+    created_at: datetime
+    started_at: Optional[datetime] = None
+    finished_at: Optional[datetime] = None
@@ -4,7 +4,8 @@ from uuid import UUID
 
 from fastapi import HTTPException, status
 
-from app.modules.push.domain.push import DeviceToken, DeviceTokenRepository, Platform, PushMessage
+from app.modules.push.domain.push import DeviceToken, DeviceTokenRepository, Platform, PushBroadcast, PushMessage
+from app.modules.push.infra.postgres_push_broadcast import PostgresPushBroadcastRepository
 
 
 def _raise_device_error(code: str) -> None:
@@ -42,14 +43,33 @@ class DeactivateDevice:
 
 @dataclass
 class BroadcastPush:
-    repo: DeviceTokenRepository
+    repo: PostgresPushBroadcastRepository
+
+    async def execute(
+        self,
+        *,
+        created_by: UUID,
+        title: str,
+        body: str,
+        data: Optional[dict[str, Any]] = None,
+    ) -> PushBroadcast:
+        """Crea el job y lo lanza en segundo plano; el progreso se consulta con GetBroadcast."""
+        from app.modules.push.infra.broadcast_runner import broadcast_runner
+
+        broadcast = await self.repo.create(
+            created_by=created_by,
+            message=PushMessage(title=title, body=body, data=data),
+        )
+        broadcast_runner.launch(broadcast.id)
+        return broadcast
 
-    async def execute(self, *, title: str, body: str, data: Optional[dict[str, Any]] = None) -> int:
-        from app.core.settings import settings
-        from app.modules.push.infra.provider import ExpoPushProvider, MockPushProvider
 
-        tokens = await self.repo.get_all_active_tokens()
-        if tokens:
-            provider = ExpoPushProvider() if settings.ENV == "production" else MockPushProvider()
-            provider.send(tokens=tokens, message=PushMessage(title=title, body=body, data=data))
-        return len(tokens)
+@dataclass
+class GetBroadcast:
+    repo: PostgresPushBroadcastRepository
+
+    async def execute(self, *, broadcast_id: UUID) -> PushBroadcast:
+        broadcast = await self.repo.get(broadcast_id)
+        if broadcast is None:
+            raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail="Broadcast not found")
+        return broadcast
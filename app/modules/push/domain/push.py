@@ -61,6 +61,45 @@ class PushMessage:
     data: Optional[dict[str, Any]] = None
 
 
+# [TECH]
+# Pending push delivery claimed from the outbox (one per notification/user).
+#
+# [NATURAL/BUSINESS]
+# Push pendiente de enviar a todos los dispositivos activos de un usuario.
+@dataclass(frozen=True)
+class PushOutboxEntry:
+    id: int
+    user_id: UUID
+    title: str
+    body: str
+    data: Optional[dict[str, Any]]
+    attempts: int
+    notification_id: Optional[UUID] = None
+
+
+# [TECH]
+# Background broadcast job with progress counters (resumable via token cursor).
+#
+# [NATURAL/BUSINESS]
+# Envío masivo de una notificación a todos los dispositivos activos.
+@dataclass(frozen=True)
+class PushBroadcast:
+    id: UUID
+    created_by: UUID
+    title: str
+    body: str
+    data: Optional[dict[str, Any]]
+    status: str                 # queued | running | done | failed
+    total_tokens: int
+    sent: int
+    failed: int
+    chunks_done: int
+    last_error: Optional[str]
+    created_at: datetime
+    started_at: Optional[datetime]
+    finished_at: Optional[datetime]
+
+
 # [TECH]
 # Repository interface for device token persistence.
 #
@@ -78,6 +117,3 @@ class DeviceTokenRepository(Protocol):
 
     async def get_active_tokens(self, user_id: UUID) -> list[str]:
         ...
-
-    async def get_all_active_tokens(self) -> list[str]:
-        ...
@@ -0,0 +1,193 @@
+"""
+Broadcast push en segundo plano.
+
+Problema:
+  BroadcastPush cargaba todos los tokens activos en memoria y los enviaba en
+  una sola llamada bloqueante desde el request del admin: con toda la base de
+  usuarios el request vencía por timeout.
+
+Diseño:
+  - POST /push/broadcast crea el job (push_broadcasts) y responde 202; el
+    envío corre en una tarea asyncio de la instancia que recibió el request.
+  - Los tokens se leen por páginas keyset (id > cursor) de
+    PUSH_BROADCAST_PAGE_SIZE; cada página se parte en chunks de 100 que se
+    envían en paralelo acotados por un semáforo (PUSH_BROADCAST_CONCURRENCY).
+  - Tras cada página se guardan los resultados por chunk y se avanza el
+    cursor + heartbeat en una sola transacción. Lectura de la página y
+    registro usan sesiones cortas distintas: mientras se envía a Expo no
+    queda ninguna transacción abierta.
+  - Si la instancia muere, el job queda 'running' sin heartbeat; el job del
+    scheduler lo reanuda desde el cursor guardado en otra instancia.
+  - Fallos de red / 429 / 5xx de Expo: el chunk se reintenta con backoff
+    (mismo cálculo que el outbox); si se agotan, se cuenta como fallido.
+  - Los tickets se registran para el chequeo de receipts (infra/receipts.py):
+    los tokens muertos se dan de baja y el próximo broadcast ya no los paga.
+"""
+
+from __future__ import annotations
+
+import asyncio
+import logging
+from datetime import timedelta
+from typing import Any
+from uuid import UUID
+
+from app.core.settings import settings
+from app.modules.push.domain.push import PushMessage
+from app.modules.push.infra.outbox_worker import retry_delay_seconds
+from app.modules.push.infra.provider import (
+    EXPO_CHUNK_SIZE,
+    AsyncPushProvider,
+    PushDeliveryError,
+    get_async_push_provider,
+)
+
+logger = logging.getLogger(__name__)
+
+# Sin heartbeat durante este tiempo → el job se considera huérfano.
+BROADCAST_STALE_AFTER = timedelta(minutes=5)
+_CHUNK_ATTEMPTS = 3
+
+
+class BroadcastRunner:
+    def __init__(
+        self,
+        *,
+        page_size: int,
+        concurrency: int,
+        retry_base_seconds: float,
+        provider: AsyncPushProvider | None = None,
+    ) -> None:
+        self._page_size = max(EXPO_CHUNK_SIZE, page_size)
+        self._concurrency = max(1, concurrency)
+        self._retry_base = retry_base_seconds
+        self._provider = provider
+        # Referencias fuertes a los jobs en curso (evita que el GC los cancele).
+        self._tasks: dict[UUID, asyncio.Task] = {}
+
+    def launch(self, broadcast_id: UUID) -> None:
+        if broadcast_id in self._tasks:
+            return
+        task = asyncio.create_task(self.run(broadcast_id), name=f"push_broadcast_{broadcast_id}")
+        self._tasks[broadcast_id] = task
+        task.add_done_callback(lambda _: self._tasks.pop(broadcast_id, None))
+
+    async def stop(self) -> None:
+        tasks = list(self._tasks.values())
+        for task in tasks:
+            task.cancel()
+        # Los jobs cancelados quedan 'running' y se reanudan desde su cursor.
+        await asyncio.gather(*tasks, return_exceptions=True)
+
+    async def run(self, broadcast_id: UUID) -> None:
+        from app.core.db import AsyncSessionLocal
+        from app.modules.push.infra.postgres_push_broadcast import PostgresPushBroadcastRepository
+        from app.modules.push.infra.postgres_push_tickets import PostgresPushTicketRepository
+        from app.modules.push.infra.receipts import record_tickets
+
+        # Sesiones cortas: ninguna transacción (ni conexión del pool) queda
+        # abierta mientras se espera a Expo.
+        async with AsyncSessionLocal() as session:
+            claim = await PostgresPushBroadcastRepository(session=session).claim(
+                broadcast_id, stale_after=BROADCAST_STALE_AFTER
+            )
+        if claim is None:
+            return
+
+        provider = self._provider or get_async_push_provider()
+        semaphore = asyncio.Semaphore(self._concurrency)
+        cursor, chunk_index = claim.last_token_id, claim.chunks_done
+        try:
+            while True:
+                async with AsyncSessionLocal() as session:
+                    page = await PostgresPushBroadcastRepository(session=session).page_tokens(
+                        after_id=cursor, limit=self._page_size
+                    )
+                if not page:
+                    break
+                tokens = [token for _, token in page]
+                chunks = [tokens[i : i + EXPO_CHUNK_SIZE] for i in range(0, len(tokens), EXPO_CHUNK_SIZE)]
+                sent = await asyncio.gather(
+                    *(
+                        self._send_chunk(provider, semaphore, chunk_index + i, chunk, claim.message)
+                        for i, chunk in enumerate(chunks)
+                    )
+                )
+                chunk_index += len(chunks)
+                cursor = page[-1][0]
+                async with AsyncSessionLocal() as session:
+                    tickets_repo = PostgresPushTicketRepository(session=session)
+                    for chunk, (_, tickets) in zip(chunks, sent):
+                        await record_tickets(
+                            tickets_repo,
+                            source_type="broadcast",
+                            source_id=broadcast_id,
+                            tokens=chunk,
+                            tickets=tickets,
+                        )
+                    # record_page hace commit de tickets + resultados + cursor juntos.
+                    await PostgresPushBroadcastRepository(session=session).record_page(
+                        broadcast_id, results=[r for r, _ in sent], last_token_id=cursor
+                    )
+            async with AsyncSessionLocal() as session:
+                await PostgresPushBroadcastRepository(session=session).finish(broadcast_id, status="done")
+            logger.info("push broadcast done id=%s chunks=%s", broadcast_id, chunk_index)
+        except asyncio.CancelledError:
+            raise
+        except Exception as exc:
+            logger.exception("push broadcast failed id=%s", broadcast_id)
+            async with AsyncSessionLocal() as session:
+                await PostgresPushBroadcastRepository(session=session).finish(
+                    broadcast_id, status="failed", error=str(exc)
+                )
+
+    async def _send_chunk(
+        self,
+        provider: AsyncPushProvider,
+        semaphore: asyncio.Semaphore,
+        chunk_index: int,
+        tokens: list[str],
+        message: PushMessage,
+    ) -> tuple[Any, list[dict[str, Any]]]:
+        """(ChunkResult, tickets de Expo). Sin tickets si se agotaron los reintentos."""
+        from app.modules.push.infra.postgres_push_broadcast import ChunkResult
+
+        messages: list[dict[str, Any]] = [
+            {"to": token, "title": message.title, "body": message.body, "data": message.data or {}, "sound": "default"}
+            for token in tokens
+        ]
+        error: str | None = None
+        async with semaphore:
+            for attempt in range(1, _CHUNK_ATTEMPTS + 1):
+                try:
+                    tickets = await provider.send_chunk(messages)
+                    ok = sum(1 for t in tickets if t.get("status") == "ok")
+                    result = ChunkResult(
+                        chunk_index=chunk_index,
+                        token_count=len(tokens),
+                        ok_count=ok,
+                        error_count=len(tokens) - ok,
+                    )
+                    return result, tickets
+                except PushDeliveryError as exc:
+                    error = str(exc)
+                    if attempt < _CHUNK_ATTEMPTS:
+                        await asyncio.sleep(retry_delay_seconds(attempt, self._retry_base))
+        result = ChunkResult(
+            chunk_index=chunk_index,
+            token_count=len(tokens),
+            ok_count=0,
+            error_count=len(tokens),
+            error=error,
+        )
+        return result, []
+
+
+# ---------------------------------------------------------------------------
+# Singleton de proceso — detenido en el lifespan de app.main.
+# ---------------------------------------------------------------------------
+broadcast_runner = BroadcastRunner(
+    page_size=settings.PUSH_BROADCAST_PAGE_SIZE,
+    concurrency=settings.PUSH_BROADCAST_CONCURRENCY,
+    retry_base_seconds=settings.PUSH_RETRY_BASE_SECONDS,
+)
@@ -3,7 +3,9 @@ from __future__ import annotations
 from datetime import datetime
 from uuid import UUID
 
-from sqlalchemy import Boolean, DateTime, Enum, Index, String, Uuid
+from typing import Any, Optional
+
+from sqlalchemy import JSON, BigInteger, Boolean, DateTime, Enum, Index, Integer, String, Text, Uuid, func, text
 from sqlalchemy.ext.asyncio import AsyncEngine
 from sqlalchemy.orm import Mapped, mapped_column
 
@@ -27,6 +29,126 @@ class DeviceTokenModel(Base):
     )
 
 
+# [TECH]
+# Transactional outbox for push delivery. Rows are inserted in the same
+# transaction as the notification and drained by PushOutboxWorker with
+# FOR UPDATE SKIP LOCKED (safe with several Cloud Run instances).
+#
+# [NATURAL/BUSINESS]
+# Cola de notificaciones push pendientes de enviar a los dispositivos del usuario.
+class PushOutboxModel(Base):
+    __tablename__ = "push_outbox"
+
+    id: Mapped[int] = mapped_column(BigInteger, primary_key=True, autoincrement=True)
+    user_id: Mapped[UUID] = mapped_column(Uuid, nullable=False)
+    notification_id: Mapped[Optional[UUID]] = mapped_column(Uuid, nullable=True)
+    title: Mapped[str] = mapped_column(String(200), nullable=False)
+    body: Mapped[str] = mapped_column(Text, nullable=False)
+    data: Mapped[Optional[dict[str, Any]]] = mapped_column(JSON, nullable=True)
+    status: Mapped[str] = mapped_column(String(20), nullable=False, default="pending")  # pending | sent | failed
+    attempts: Mapped[int] = mapped_column(Integer, nullable=False, default=0)
+    last_error: Mapped[Optional[str]] = mapped_column(Text, nullable=True)
+    next_attempt_at: Mapped[datetime] = mapped_column(DateTime(timezone=True), nullable=False, server_default=func.now())
+    created_at: Mapped[datetime] = mapped_column(DateTime(timezone=True), nullable=False, server_default=func.now())
+    sent_at: Mapped[Optional[datetime]] = mapped_column(DateTime(timezone=True), nullable=True)
+
+    __table_args__ = (
+        # Solo las filas pendientes: el índice se mantiene chico aunque el histórico crezca.
+        Index(
+            "ix_push_outbox_pending",
+            "next_attempt_at",
+            "id",
+            postgresql_where=text("status = 'pending'"),
+        ),
+    )
+
+
+# [TECH]
+# Broadcast job row. last_token_id is the keyset cursor over device_tokens.id
+# so an interrupted job resumes where it stopped; heartbeat_at detects jobs
+# whose instance died.
+#
+# [NATURAL/BUSINESS]
+# Envío masivo en curso o terminado, con su progreso.
+class PushBroadcastModel(Base):
+    __tablename__ = "push_broadcasts"
+
+    id: Mapped[UUID] = mapped_column(Uuid, primary_key=True)
+    created_by: Mapped[UUID] = mapped_column(Uuid, nullable=False)
+    title: Mapped[str] = mapped_column(String(200), nullable=False)
+    body: Mapped[str] = mapped_column(Text, nullable=False)
+    data: Mapped[Optional[dict[str, Any]]] = mapped_column(JSON, nullable=True)
+    status: Mapped[str] = mapped_column(String(20), nullable=False, default="queued")
+    total_tokens: Mapped[int] = mapped_column(Integer, nullable=False, default=0)
+    sent: Mapped[int] = mapped_column(Integer, nullable=False, default=0)
+    failed: Mapped[int] = mapped_column(Integer, nullable=False, default=0)
+    chunks_done: Mapped[int] = mapped_column(Integer, nullable=False, default=0)
+    last_token_id: Mapped[Optional[UUID]] = mapped_column(Uuid, nullable=True)
+    last_error: Mapped[Optional[str]] = mapped_column(Text, nullable=True)
+    created_at: Mapped[datetime] = mapped_column(DateTime(timezone=True), nullable=False, server_default=func.now())
+    started_at: Mapped[Optional[datetime]] = mapped_column(DateTime(timezone=True), nullable=True)
+    finished_at: Mapped[Optional[datetime]] = mapped_column(DateTime(timezone=True), nullable=True)
+    heartbeat_at: Mapped[Optional[datetime]] = mapped_column(DateTime(timezone=True), nullable=True)
+
+
+# [TECH]
+# Per-chunk delivery result of a broadcast (up to 100 tokens each).
+#
+# [NATURAL/BUSINESS]
+# Resultado de cada lote de envío de un broadcast.
+class PushBroadcastChunkModel(Base):
+    __tablename__ = "push_broadcast_chunks"
+
+    broadcast_id: Mapped[UUID] = mapped_column(Uuid, primary_key=True)
+    chunk_index: Mapped[int] = mapped_column(Integer, primary_key=True)
+    token_count: Mapped[int] = mapped_column(Integer, nullable=False)
+    ok_count: Mapped[int] = mapped_column(Integer, nullable=False, default=0)
+    error_count: Mapped[int] = mapped_column(Integer, nullable=False, default=0)
+    error: Mapped[Optional[str]] = mapped_column(Text, nullable=True)
+    created_at: Mapped[datetime] = mapped_column(DateTime(timezone=True), nullable=False, server_default=func.now())
+
+
+# [TECH]
+# Expo push ticket awaiting its receipt. Tickets are checked in batches of
+# 1000 by the scheduler; checked rows are purged after a couple of days.
+#
+# [NATURAL/BUSINESS]
+# Comprobante de envío de Expo; su recibo confirma si el push llegó al dispositivo.
+class PushTicketModel(Base):
+    __tablename__ = "push_tickets"
+
+    ticket_id: Mapped[str] = mapped_column(String(100), primary_key=True)
+    token: Mapped[str] = mapped_column(String(500), nullable=False)
+    source_type: Mapped[str] = mapped_column(String(20), nullable=False)  # notification | broadcast
+    source_id: Mapped[Optional[UUID]] = mapped_column(Uuid, nullable=True)
+    status: Mapped[str] = mapped_column(String(20), nullable=False, default="pending")  # pending | ok | error | expired
+    error: Mapped[Optional[str]] = mapped_column(String(100), nullable=True)
+    created_at: Mapped[datetime] = mapped_column(DateTime(timezone=True), nullable=False, server_default=func.now())
+    checked_at: Mapped[Optional[datetime]] = mapped_column(DateTime(timezone=True), nullable=True)
+
+    __table_args__ = (
+        Index("ix_push_tickets_pending", "created_at", postgresql_where=text("status = 'pending'")),
+    )
+
+
+# [TECH]
+# Aggregated delivery stats per notification / broadcast (tickets + receipts).
+#
+# [NATURAL/BUSINESS]
+# Cuántos pushes aceptó Expo, cuántos llegaron, cuántos fallaron y cuántos
+# dispositivos muertos se dieron de baja por cada notificación o broadcast.
+class PushDeliveryStatsModel(Base):
+    __tablename__ = "push_delivery_stats"
+
+    source_type: Mapped[str] = mapped_column(String(20), primary_key=True)
+    source_id: Mapped[UUID] = mapped_column(Uuid, primary_key=True)
+    accepted: Mapped[int] = mapped_column(Integer, nullable=False, default=0)
+    delivered: Mapped[int] = mapped_column(Integer, nullable=False, default=0)
+    failed: Mapped[int] = mapped_column(Integer, nullable=False, default=0)
+    pruned_tokens: Mapped[int] = mapped_column(Integer, nullable=False, default=0)
+    updated_at: Mapped[datetime] = mapped_column(DateTime(timezone=True), nullable=False, server_default=func.now())
+
+
 async def ensure_push_schema(engine: AsyncEngine) -> None:
     # DDL gestionado por Alembic. No crear tablas aquí.
     pass
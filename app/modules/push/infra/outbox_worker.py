@@ -0,0 +1,282 @@
+"""
+Worker de envío de push (outbox → Expo).
+
+Problema:
+  CreateNotification enviaba el push a Expo dentro del request. El
+  SDK de Expo es HTTP bloqueante: congelaba el event loop mientras Expo
+  respondía, y cada transición de la orden esperaba a Expo.
+
+Diseño:
+  - Las notificaciones insertan sus filas en push_outbox en su misma
+    transacción (create_many → PostgresPushOutboxRepository.enqueue_many,
+    vía notification_dispatcher) y despiertan al worker local con wake().
+    El request responde sin esperar a Expo.
+  - El worker toma lotes de PUSH_OUTBOX_BATCH_SIZE filas con
+    FOR UPDATE SKIP LOCKED (varias instancias drenan sin pisarse), las
+    arrienda por PUSH_OUTBOX_LEASE_SECONDS (next_attempt_at) y resuelve los
+    tokens activos de todos los usuarios del lote en una sola query; esa
+    transacción hace commit antes de hablar con Expo.
+  - El envío a Expo (chunks de hasta 100 mensajes, cliente httpx con pool)
+    corre sin transacción ni conexión tomada. Cada chunk registra sus
+    tickets y su estado (sent / retry) en una transacción corta propia: un
+    fallo al registrar un chunk no deshace los que Expo ya aceptó.
+  - Si el worker muere a mitad de lote, las filas no registradas vuelven a
+    estar vencidas al terminar el lease (entrega al menos una vez).
+  - Fallo del request (red, 429, 5xx): las filas del chunk se reintentan con
+    backoff exponencial (PUSH_RETRY_BASE_SECONDS × 2^(intento-1), tope 10 min
+    y ±10 % de jitter). Tras PUSH_MAX_ATTEMPTS quedan en 'failed'.
+  - Los errores por ticket no se reintentan; los tickets se registran para
+    consultar sus receipts (infra/receipts.py) y los tokens
+    DeviceNotRegistered se dan de baja.
+  - Sin wake(), el worker revisa el outbox cada PUSH_OUTBOX_POLL_SECONDS
+    (pushes encolados por otras instancias o reintentos vencidos).
+"""
+
+from __future__ import annotations
+
+import asyncio
+import logging
+import random
+from dataclasses import dataclass, field
+from datetime import datetime, timedelta, timezone
+from typing import Any, Optional
+from uuid import UUID
+
+from app.core.settings import settings
+from app.modules.push.domain.push import PushMessage, PushOutboxEntry
+from app.modules.push.infra.provider import (
+    EXPO_CHUNK_SIZE,
+    AsyncPushProvider,
+    PushDeliveryError,
+    close_http_client,
+    get_async_push_provider,
+)
+
+logger = logging.getLogger(__name__)
+
+_MAX_RETRY_SECONDS = 600.0
+
+
+def retry_delay_seconds(attempts: int, base: float) -> float:
+    """Backoff exponencial con jitter para el intento número `attempts` (1-based)."""
+    delay = min(base * 2 ** max(attempts - 1, 0), _MAX_RETRY_SECONDS)
+    return delay * random.uniform(0.9, 1.1)
+
+
+@dataclass
+class OutboxChunk:
+    """Un request a Expo: filas del outbox incluidas y sus mensajes, en orden."""
+    ids: list[int] = field(default_factory=list)
+    messages: list[dict[str, Any]] = field(default_factory=list)
+    # (notification_id, inicio, fin) → mensajes de cada fila dentro del chunk
+    spans: list[tuple[Optional[UUID], int, int]] = field(default_factory=list)
+
+
+def build_chunks(
+    entries: list[PushOutboxEntry],
+    tokens: dict[Any, list[str]],
+    chunk_size: int = EXPO_CHUNK_SIZE,
+) -> tuple[list[OutboxChunk], list[int]]:
+    """
+    Arma los chunks de Expo sin partir una fila entre dos requests (así un
+    reintento nunca duplica un push ya aceptado). Devuelve
+    (chunks, ids_sin_dispositivos).
+
+    Un usuario con más de `chunk_size` tokens activos recibe el push solo en
+    los primeros `chunk_size`; el resto se registra en el log.
+    """
+    chunks: list[OutboxChunk] = []
+    no_devices: list[int] = []
+    current = OutboxChunk()
+    for entry in entries:
+        user_tokens = tokens.get(entry.user_id) or []
+        if not user_tokens:
+            no_devices.append(entry.id)
+            continue
+        if len(user_tokens) > chunk_size:
+            logger.warning(
+                "push outbox id=%s user_id=%s has %s active tokens, skipping %s over the %s-message chunk limit",
+                entry.id, entry.user_id, len(user_tokens), len(user_tokens) - chunk_size, chunk_size,
+            )
+        entry_messages = [
+            {"to": token, "title": entry.title, "body": entry.body, "data": entry.data or {}, "sound": "default"}
+            for token in user_tokens[:chunk_size]
+        ]
+        if current.messages and len(current.messages) + len(entry_messages) > chunk_size:
+            chunks.append(current)
+            current = OutboxChunk()
+        start = len(current.messages)
+        current.ids.append(entry.id)
+        current.messages.extend(entry_messages)
+        current.spans.append((entry.notification_id, start, len(current.messages)))
+    if current.messages:
+        chunks.append(current)
+    return chunks, no_devices
+
+
+class PushOutboxWorker:
+    def __init__(
+        self,
+        *,
+        poll_seconds: float,
+        batch_size: int,
+        max_attempts: int,
+        retry_base_seconds: float,
+        lease_seconds: float = 120.0,
+        provider: AsyncPushProvider | None = None,
+    ) -> None:
+        self._poll = poll_seconds
+        self._lease = lease_seconds
+        self._batch_size = max(1, batch_size)
+        self._max_attempts = max(1, max_attempts)
+        self._retry_base = retry_base_seconds
+        self._provider = provider
+        self._wake = asyncio.Event()
+        self._task: asyncio.Task | None = None
+
+    @property
+    def running(self) -> bool:
+        return self._task is not None
+
+    def wake(self) -> None:
+        """Pide un drenado inmediato (llamar después del commit del enqueue)."""
+        self._wake.set()
+
+    async def start(self) -> None:
+        if self._task is not None or self._poll <= 0:
+            return
+        self._task = asyncio.create_task(self._run(), name="push_outbox_worker")
+
+    async def stop(self) -> None:
+        task, self._task = self._task, None
+        if task is not None:
+            task.cancel()
+            try:
+                await task
+            except asyncio.CancelledError:
+                pass
+        await close_http_client()
+
+    async def drain_once(self) -> int:
+        """Procesa un lote. Devuelve la cantidad de filas tomadas del outbox."""
+        from app.core.db import session_scope
+        from app.modules.push.infra.postgres_push_outbox import PostgresPushOutboxRepository
+
+        provider = self._provider or get_async_push_provider()
+
+        # 1. Claim + lease en una transacción corta.
+        async with session_scope() as session:
+            repo = PostgresPushOutboxRepository(session=session)
+            entries = await repo.claim_due(limit=self._batch_size, lease_seconds=self._lease)
+            if not entries:
+                return 0
+            tokens = await repo.tokens_for_users(e.user_id for e in entries)
+            chunks, no_devices = build_chunks(entries, tokens)
+            await repo.mark_sent(no_devices)
+
+        # 2. Expo sin transacción abierta; 3. resultado de cada chunk en su propia transacción.
+        attempts = {e.id: e.attempts + 1 for e in entries}
+        for chunk in chunks:
+            try:
+                tickets = await provider.send_chunk(chunk.messages)
+            except PushDeliveryError as exc:
+                async with session_scope() as session:
+                    await self._schedule_retry(
+                        PostgresPushOutboxRepository(session=session), chunk.ids, attempts, str(exc)
+                    )
+                continue
+            await self._record_sent(chunk, tickets)
+
+        return len(entries)
+
+    async def _record_sent(self, chunk: OutboxChunk, tickets: list[dict[str, Any]]) -> None:
+        """Tickets → receipts pendientes, baja inmediata de tokens muertos y stats; luego 'sent'."""
+        from app.core.db import session_scope
+        from app.modules.push.infra.postgres_push_outbox import PostgresPushOutboxRepository
+        from app.modules.push.infra.postgres_push_tickets import PostgresPushTicketRepository
+        from app.modules.push.infra.receipts import record_tickets
+
+        try:
+            async with session_scope() as session:
+                tickets_repo = PostgresPushTicketRepository(session=session)
+                for notification_id, start, end in chunk.spans:
+                    await record_tickets(
+                        tickets_repo,
+                        source_type="notification",
+                        source_id=notification_id,
+                        tokens=[m["to"] for m in chunk.messages[start:end]],
+                        tickets=tickets[start:end],
+                    )
+                await PostgresPushOutboxRepository(session=session).mark_sent(chunk.ids)
+        except Exception:
+            # Expo ya aceptó el chunk: aunque se pierdan los tickets, no reenviarlo.
+            logger.exception("push outbox: recording tickets failed ids=%s", chunk.ids)
+            async with session_scope() as session:
+                await PostgresPushOutboxRepository(session=session).mark_sent(chunk.ids)
+
+    async def _schedule_retry(self, repo, ids: list[int], attempts: dict[int, int], error: str) -> None:
+        exhausted = [i for i in ids if attempts[i] >= self._max_attempts]
+        if exhausted:
+            logger.error("push outbox giving up ids=%s: %s", exhausted, error)
+            await repo.mark_failed(exhausted, error=error)
+        now = datetime.now(timezone.utc)
+        by_attempt: dict[int, list[int]] = {}
+        for i in ids:
+            if attempts[i] < self._max_attempts:
+                by_attempt.setdefault(attempts[i], []).append(i)
+        for attempt, retry_ids in by_attempt.items():
+            next_at = now + timedelta(seconds=retry_delay_seconds(attempt, self._retry_base))
+            await repo.mark_retry(retry_ids, error=error, next_attempt_at=next_at)
+        logger.warning("push outbox chunk failed size=%s: %s", len(ids), error)
+
+    async def _run(self) -> None:
+        while True:
+            try:
+                await asyncio.wait_for(self._wake.wait(), timeout=self._poll)
+            except asyncio.TimeoutError:
+                pass
+            self._wake.clear()
+            try:
+                # Seguir drenando mientras vengan lotes completos.
+                while await self.drain_once() >= self._batch_size:
+                    pass
+            except asyncio.CancelledError:
+                raise
+            except Exception:
+                logger.exception("push outbox drain failed")
+
+
+async def enqueue_push(
+    *,
+    user_id: UUID,
+    message: PushMessage,
+    notification_id: Optional[UUID] = None,
+) -> None:
+    """
+    Encola un push en una sesión propia (corta) y despierta al worker. Para
+    flujos donde el write de origen ya hizo commit (p. ej. mensajes de chat);
+    si el origen está en la misma transacción, usar
+    PostgresPushOutboxRepository.enqueue directamente.
+    """
+    from app.core.db import session_scope
+    from app.modules.push.infra.postgres_push_outbox import PostgresPushOutboxRepository
+
+    async with session_scope() as session:
+        await PostgresPushOutboxRepository(session=session).enqueue(
+            user_id=user_id,
+            message=message,
+            notification_id=notification_id,
+        )
+    push_outbox_worker.wake()
+
+
+# ---------------------------------------------------------------------------
+# Singleton de proceso — arrancado/detenido en el lifespan de app.main.
+# ---------------------------------------------------------------------------
+push_outbox_worker = PushOutboxWorker(
+    poll_seconds=settings.PUSH_OUTBOX_POLL_SECONDS,
+    batch_size=settings.PUSH_OUTBOX_BATCH_SIZE,
+    max_attempts=settings.PUSH_MAX_ATTEMPTS,
+    retry_base_seconds=settings.PUSH_RETRY_BASE_SECONDS,
+    lease_seconds=settings.PUSH_OUTBOX_LEASE_SECONDS,
+)
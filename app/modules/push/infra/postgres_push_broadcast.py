@@ -0,0 +1,180 @@
+from __future__ import annotations
+
+from dataclasses import dataclass
+from datetime import datetime, timedelta, timezone
+from typing import Any, Optional
+from uuid import UUID, uuid4
+
+from sqlalchemy import func, or_, select, update
+from sqlalchemy.dialects.postgresql import insert
+from sqlalchemy.ext.asyncio import AsyncEngine, AsyncSession
+
+from app.modules.push.domain.push import PushBroadcast, PushMessage
+
+
+@dataclass(frozen=True)
+class BroadcastClaim:
+    """Estado necesario para (re)anudar un broadcast."""
+    id: UUID
+    message: PushMessage
+    last_token_id: Optional[UUID]
+    chunks_done: int
+
+
+@dataclass(frozen=True)
+class ChunkResult:
+    chunk_index: int
+    token_count: int
+    ok_count: int
+    error_count: int
+    error: Optional[str] = None
+
+
+class PostgresPushBroadcastRepository:
+    def __init__(self, *, session: AsyncSession, engine: AsyncEngine | None = None) -> None:
+        self._session = session
+        self._engine = engine
+
+    @staticmethod
+    def _row_to_broadcast(row) -> PushBroadcast:
+        return PushBroadcast(
+            id=row.id,
+            created_by=row.created_by,
+            title=row.title,
+            body=row.body,
+            data=row.data,
+            status=row.status,
+            total_tokens=row.total_tokens,
+            sent=row.sent,
+            failed=row.failed,
+            chunks_done=row.chunks_done,
+            last_error=row.last_error,
+            created_at=row.created_at,
+            started_at=row.started_at,
+            finished_at=row.finished_at,
+        )
+
+    async def create(self, *, created_by: UUID, message: PushMessage) -> PushBroadcast:
+        from app.modules.push.infra.models import DeviceTokenModel, PushBroadcastModel
+
+        total = (
+            await self._session.execute(
+                select(func.count()).select_from(DeviceTokenModel).where(DeviceTokenModel.is_active.is_(True))
+            )
+        ).scalar_one()
+        model = PushBroadcastModel(
+            id=uuid4(),
+            created_by=created_by,
+            title=message.title[:200],
+            body=message.body,
+            data=message.data,
+            status="queued",
+            total_tokens=total,
+            sent=0,
+            failed=0,
+            chunks_done=0,
+            created_at=datetime.now(timezone.utc),
+        )
+        self._session.add(model)
+        await self._session.flush()
+        await self._session.commit()
+        return self._row_to_broadcast(model)
+
+    async def get(self, broadcast_id: UUID) -> Optional[PushBroadcast]:
+        from app.modules.push.infra.models import PushBroadcastModel
+
+        row = await self._session.get(PushBroadcastModel, broadcast_id)
+        return self._row_to_broadcast(row) if row is not None else None
+
+    async def claim(self, broadcast_id: UUID, *, stale_after: timedelta) -> Optional[BroadcastClaim]:
+        """Pasa el job a 'running' si está en cola o si su runner dejó de dar
+        señales (instancia caída). Solo una instancia lo obtiene."""
+        from app.modules.push.infra.models import PushBroadcastModel as B
+
+        stale_before = datetime.now(timezone.utc) - stale_after
+        stmt = (
+            update(B)
+            .where(
+                B.id == broadcast_id,
+                or_(B.status == "queued", (B.status == "running") & (B.heartbeat_at < stale_before)),
+            )
+            .values(status="running", started_at=func.coalesce(B.started_at, func.now()), heartbeat_at=func.now())
+            .returning(B.id, B.title, B.body, B.data, B.last_token_id, B.chunks_done)
+        )
+        row = (await self._session.execute(stmt)).one_or_none()
+        await self._session.commit()
+        if row is None:
+            return None
+        return BroadcastClaim(
+            id=row.id,
+            message=PushMessage(title=row.title, body=row.body, data=row.data),
+            last_token_id=row.last_token_id,
+            chunks_done=row.chunks_done,
+        )
+
+    async def list_resumable(self, *, stale_after: timedelta) -> list[UUID]:
+        from app.modules.push.infra.models import PushBroadcastModel as B
+
+        stale_before = datetime.now(timezone.utc) - stale_after
+        stmt = select(B.id).where(
+            or_(B.status == "queued", (B.status == "running") & (B.heartbeat_at < stale_before))
+        )
+        return list((await self._session.execute(stmt)).scalars().all())
+
+    async def page_tokens(self, *, after_id: Optional[UUID], limit: int) -> list[tuple[UUID, str]]:
+        """Página keyset de tokens activos ordenada por id (índice parcial)."""
+        from app.modules.push.infra.models import DeviceTokenModel as D
+
+        stmt = select(D.id, D.token).where(D.is_active.is_(True))
+        if after_id is not None:
+            stmt = stmt.where(D.id > after_id)
+        stmt = stmt.order_by(D.id).limit(limit)
+        return [(row.id, row.token) for row in (await self._session.execute(stmt)).all()]
+
+    async def record_page(
+        self,
+        broadcast_id: UUID,
+        *,
+        results: list[ChunkResult],
+        last_token_id: UUID,
+    ) -> None:
+        """Guarda los chunks de una página y avanza progreso + cursor en una transacción."""
+        from app.modules.push.infra.models import PushBroadcastChunkModel as C, PushBroadcastModel as B
+
+        if results:
+            stmt = insert(C).values(
+                [
+                    {
+                        "broadcast_id": broadcast_id,
+                        "chunk_index": r.chunk_index,
+                        "token_count": r.token_count,
+                        "ok_count": r.ok_count,
+                        "error_count": r.error_count,
+                        "error": r.error,
+                    }
+                    for r in results
+                ]
+            )
+            await self._session.execute(stmt.on_conflict_do_nothing(index_elements=[C.broadcast_id, C.chunk_index]))
+
+        last_error = next((r.error for r in reversed(results) if r.error), None)
+        values: dict[str, Any] = {
+            "sent": B.sent + sum(r.ok_count for r in results),
+            "failed": B.failed + sum(r.error_count for r in results),
+            "chunks_done": B.chunks_done + len(results),
+            "last_token_id": last_token_id,
+            "heartbeat_at": func.now(),
+        }
+        if last_error is not None:
+            values["last_error"] = last_error[:1000]
+        await self._session.execute(update(B).where(B.id == broadcast_id).values(**values))
+        await self._session.commit()
+
+    async def finish(self, broadcast_id: UUID, *, status: str, error: Optional[str] = None) -> None:
+        from app.modules.push.infra.models import PushBroadcastModel as B
+
+        values: dict[str, Any] = {"status": status, "finished_at": func.now(), "heartbeat_at": func.now()}
+        if error is not None:
+            values["last_error"] = error[:1000]
+        await self._session.execute(update(B).where(B.id == broadcast_id).values(**values))
+        await self._session.commit()
@@ -0,0 +1,170 @@
+from __future__ import annotations
+
+from datetime import datetime, timedelta
+from typing import Iterable, Optional, Sequence
+from uuid import UUID
+
+from sqlalchemy import delete, func, insert, select, update
+from sqlalchemy.ext.asyncio import AsyncEngine, AsyncSession
+
+from app.modules.push.domain.push import PushMessage, PushOutboxEntry
+
+
+class PostgresPushOutboxRepository:
+    """
+    Outbox de push. `enqueue` NO hace commit: el push queda encolado en la
+    misma transacción que el write que lo origina (notificación, mensaje).
+    Los métodos de drenado operan dentro de la transacción del worker.
+    """
+
+    def __init__(self, *, session: AsyncSession, engine: AsyncEngine | None = None) -> None:
+        self._session = session
+        self._engine = engine
+
+    async def enqueue(
+        self,
+        *,
+        user_id: UUID,
+        message: PushMessage,
+        notification_id: Optional[UUID] = None,
+    ) -> None:
+        from app.modules.push.infra.models import PushOutboxModel
+
+        self._session.add(
+            PushOutboxModel(
+                user_id=user_id,
+                notification_id=notification_id,
+                title=message.title[:200],
+                body=message.body,
+                data=message.data,
+                status="pending",
+                attempts=0,
+            )
+        )
+        await self._session.flush()
+
+    async def enqueue_many(self, items: Sequence[tuple[UUID, PushMessage, Optional[UUID]]]) -> None:
+        """Variante en lote de `enqueue`: un INSERT multi-fila (user_id, message, notification_id)."""
+        from app.modules.push.infra.models import PushOutboxModel
+
+        if not items:
+            return
+        await self._session.execute(
+            insert(PushOutboxModel),
+            [
+                {
+                    "user_id": user_id,
+                    "notification_id": notification_id,
+                    "title": message.title[:200],
+                    "body": message.body,
+                    "data": message.data,
+                    "status": "pending",
+                    "attempts": 0,
+                }
+                for user_id, message, notification_id in items
+            ],
+        )
+
+    async def claim_due(self, *, limit: int, lease_seconds: float) -> list[PushOutboxEntry]:
+        """
+        Toma filas pendientes vencidas y las arrienda: next_attempt_at pasa a
+        now() + lease_seconds. Tras el commit del claim, ninguna otra instancia
+        las toma mientras se envían a Expo (sin transacción abierta); si el
+        worker muere, vuelven a estar vencidas al terminar el lease.
+        SKIP LOCKED reparte el trabajo entre instancias.
+        """
+        from app.modules.push.infra.models import PushOutboxModel
+
+        due = (
+            select(PushOutboxModel.id)
+            .where(PushOutboxModel.status == "pending", PushOutboxModel.next_attempt_at <= func.now())
+            .order_by(PushOutboxModel.next_attempt_at, PushOutboxModel.id)
+            .limit(limit)
+            .with_for_update(skip_locked=True)
+        )
+        stmt = (
+            update(PushOutboxModel)
+            .where(PushOutboxModel.id.in_(due.scalar_subquery()))
+            .values(next_attempt_at=func.now() + timedelta(seconds=lease_seconds))
+            .execution_options(synchronize_session=False)
+            .returning(
+                PushOutboxModel.id,
+                PushOutboxModel.user_id,
+                PushOutboxModel.title,
+                PushOutboxModel.body,
+                PushOutboxModel.data,
+                PushOutboxModel.attempts,
+                PushOutboxModel.notification_id,
+            )
+        )
+        result = await self._session.execute(stmt)
+        return [
+            PushOutboxEntry(
+                id=row.id,
+                user_id=row.user_id,
+                title=row.title,
+                body=row.body,
+                data=row.data,
+                attempts=row.attempts,
+                notification_id=row.notification_id,
+            )
+            for row in sorted(result.all(), key=lambda r: r.id)
+        ]
+
+    async def tokens_for_users(self, user_ids: Iterable[UUID]) -> dict[UUID, list[str]]:
+        from app.modules.push.infra.models import DeviceTokenModel
+
+        ids = list(set(user_ids))
+        if not ids:
+            return {}
+        stmt = select(DeviceTokenModel.user_id, DeviceTokenModel.token).where(
+            DeviceTokenModel.user_id.in_(ids), DeviceTokenModel.is_active.is_(True)
+        )
+        tokens: dict[UUID, list[str]] = {}
+        for user_id, token in (await self._session.execute(stmt)).all():
+            tokens.setdefault(user_id, []).append(token)
+        return tokens
+
+    async def mark_sent(self, ids: list[int]) -> None:
+        from app.modules.push.infra.models import PushOutboxModel
+
+        if not ids:
+            return
+        await self._session.execute(
+            update(PushOutboxModel)
+            .where(PushOutboxModel.id.in_(ids))
+            .values(status="sent", sent_at=func.now(), attempts=PushOutboxModel.attempts + 1, last_error=None)
+        )
+
+    async def mark_retry(self, ids: list[int], *, error: str, next_attempt_at: datetime) -> None:
+        from app.modules.push.infra.models import PushOutboxModel
+
+        if not ids:
+            return
+        await self._session.execute(
+            update(PushOutboxModel)
+            .where(PushOutboxModel.id.in_(ids))
+            .values(attempts=PushOutboxModel.attempts + 1, last_error=error[:1000], next_attempt_at=next_attempt_at)
+        )
+
+    async def mark_failed(self, ids: list[int], *, error: str) -> None:
+        from app.modules.push.infra.models import PushOutboxModel
+
+        if not ids:
+            return
+        await self._session.execute(
+            update(PushOutboxModel)
+            .where(PushOutboxModel.id.in_(ids))
+            .values(status="failed", attempts=PushOutboxModel.attempts + 1, last_error=error[:1000])
+        )
+
+    async def purge_finished(self, *, older_than: datetime) -> int:
+        from app.modules.push.infra.models import PushOutboxModel
+
+        result = await self._session.execute(
+            delete(PushOutboxModel).where(
+                PushOutboxModel.status != "pending", PushOutboxModel.created_at < older_than
+            )
+        )
+        await self._session.commit()
+        return result.rowcount or 0
@@ -0,0 +1,126 @@
+from __future__ import annotations
+
+from datetime import datetime
+from typing import Iterable, Optional
+from uuid import UUID
+
+from sqlalchemy import delete, func, select, tuple_, update
+from sqlalchemy.dialects.postgresql import insert
+from sqlalchemy.ext.asyncio import AsyncEngine, AsyncSession
+
+
+class PostgresPushTicketRepository:
+    """
+    Tickets de Expo, estadísticas de entrega y baja de tokens muertos.
+    Ningún método hace commit: participan de la transacción del llamante
+    (worker del outbox, runner de broadcast o job de receipts).
+    """
+
+    def __init__(self, *, session: AsyncSession, engine: AsyncEngine | None = None) -> None:
+        self._session = session
+        self._engine = engine
+
+    async def insert_tickets(
+        self,
+        rows: list[tuple[str, str]],
+        *,
+        source_type: str,
+        source_id: Optional[UUID],
+    ) -> None:
+        """rows: [(ticket_id, token)]."""
+        from app.modules.push.infra.models import PushTicketModel as T
+
+        if not rows:
+            return
+        stmt = insert(T).values(
+            [
+                {"ticket_id": ticket_id, "token": token, "source_type": source_type, "source_id": source_id}
+                for ticket_id, token in rows
+            ]
+        )
+        await self._session.execute(stmt.on_conflict_do_nothing(index_elements=[T.ticket_id]))
+
+    async def list_pending(
+        self,
+        *,
+        created_before: datetime,
+        after: Optional[tuple[datetime, str]] = None,
+        limit: int,
+    ) -> list[tuple[str, str, str, Optional[UUID], datetime]]:
+        """[(ticket_id, token, source_type, source_id, created_at)] listos para
+        consultar su receipt. `after` = (created_at, ticket_id) del último visto
+        (los que aún no tienen receipt siguen pendientes y no se repiten).
+        Sin locks: resolve() es idempotente."""
+        from app.modules.push.infra.models import PushTicketModel as T
+
+        stmt = select(T.ticket_id, T.token, T.source_type, T.source_id, T.created_at).where(
+            T.status == "pending", T.created_at <= created_before
+        )
+        if after is not None:
+            stmt = stmt.where(tuple_(T.created_at, T.ticket_id) > tuple_(*after))
+        stmt = stmt.order_by(T.created_at, T.ticket_id).limit(limit)
+        return [tuple(row) for row in (await self._session.execute(stmt)).all()]
+
+    async def resolve(self, ticket_ids: list[str], *, status: str, error: Optional[str] = None) -> list[str]:
+        """Resuelve los tickets aún pendientes; devuelve los que cambiaron (otro proceso pudo ganarlos)."""
+        from app.modules.push.infra.models import PushTicketModel as T
+
+        if not ticket_ids:
+            return []
+        result = await self._session.execute(
+            update(T)
+            .where(T.ticket_id.in_(ticket_ids), T.status == "pending")
+            .values(status=status, error=error, checked_at=func.now())
+            .returning(T.ticket_id)
+        )
+        return list(result.scalars().all())
+
+    async def deactivate_tokens(self, tokens: Iterable[str]) -> int:
+        """Baja en bloque de tokens DeviceNotRegistered. Devuelve cuántos estaban activos."""
+        from app.modules.push.infra.models import DeviceTokenModel as D
+
+        unique = list(set(tokens))
+        if not unique:
+            return 0
+        result = await self._session.execute(
+            update(D).where(D.token.in_(unique), D.is_active.is_(True)).values(is_active=False)
+        )
+        return result.rowcount or 0
+
+    async def bump_stats(self, deltas: dict[tuple[str, UUID], dict[str, int]]) -> None:
+        """deltas: {(source_type, source_id): {"accepted": n, "delivered": n, "failed": n, "pruned_tokens": n}}."""
+        from app.modules.push.infra.models import PushDeliveryStatsModel as S
+
+        rows = [
+            {
+                "source_type": source_type,
+                "source_id": source_id,
+                "accepted": d.get("accepted", 0),
+                "delivered": d.get("delivered", 0),
+                "failed": d.get("failed", 0),
+                "pruned_tokens": d.get("pruned_tokens", 0),
+            }
+            for (source_type, source_id), d in deltas.items()
+        ]
+        if not rows:
+            return
+        stmt = insert(S).values(rows)
+        stmt = stmt.on_conflict_do_update(
+            index_elements=[S.source_type, S.source_id],
+            set_={
+                "accepted": S.accepted + stmt.excluded.accepted,
+                "delivered": S.delivered + stmt.excluded.delivered,
+                "failed": S.failed + stmt.excluded.failed,
+                "pruned_tokens": S.pruned_tokens + stmt.excluded.pruned_tokens,
+                "updated_at": func.now(),
+            },
+        )
+        await self._session.execute(stmt)
+
+    async def purge_checked(self, *, older_than: datetime) -> int:
+        from app.modules.push.infra.models import PushTicketModel as T
+
+        result = await self._session.execute(
+            delete(T).where(T.status != "pending", T.created_at < older_than)
+        )
+        return result.rowcount or 0
@@ -1,53 +1,116 @@
 from __future__ import annotations
 
 import logging
-from typing import Protocol
+from typing import Any, Protocol
+from uuid import uuid4
 
-from app.modules.push.domain.push import PushMessage
+import httpx
+
+from app.core.metrics import track_external
 
 logger = logging.getLogger(__name__)
 
+EXPO_PUSH_URL = "https://exp.host/--/api/v2/push/send"
+EXPO_RECEIPTS_URL = "https://exp.host/--/api/v2/push/getReceipts"
+# Límites de Expo por request.
+EXPO_CHUNK_SIZE = 100
+EXPO_RECEIPTS_BATCH_SIZE = 1000
+
+
+# ---------------------------------------------------------------------------
+# Providers asíncronos (usados por el outbox worker y el broadcast runner)
+# ---------------------------------------------------------------------------
 
-class PushProvider(Protocol):
-    def send(self, tokens: list[str], message: PushMessage) -> None:
+class PushDeliveryError(Exception):
+    """Fallo del request completo (red, 429, 5xx): el lote se reintenta."""
+
+
+class AsyncPushProvider(Protocol):
+    async def send_chunk(self, messages: list[dict[str, Any]]) -> list[dict[str, Any]]:
+        """Envía hasta EXPO_CHUNK_SIZE mensajes y devuelve un ticket por mensaje (mismo orden)."""
         ...
 
+    async def get_receipts(self, ticket_ids: list[str]) -> dict[str, dict[str, Any]]:
+        """Receipts por ticket id (hasta EXPO_RECEIPTS_BATCH_SIZE). Los aún no
+        disponibles no aparecen en el resultado."""
+        ...
 
-class MockPushProvider(PushProvider):
-    def send(self, tokens: list[str], message: PushMessage) -> None:
-        logger.info("MockPushProvider.send tokens=%s title=%s", tokens, message.title)
-        print({"provider": "mock", "tokens": tokens, "message": message.__dict__})
 
+class AsyncMockPushProvider(AsyncPushProvider):
+    async def send_chunk(self, messages: list[dict[str, Any]]) -> list[dict[str, Any]]:
+        for message in messages:
+            logger.info("AsyncMockPushProvider.send to=%s title=%s", message.get("to"), message.get("title"))
+        return [{"status": "ok", "id": f"mock-{uuid4()}"} for _ in messages]
 
-class ExpoPushProvider(PushProvider):
-    def send(self, tokens: list[str], message: PushMessage) -> None:
-        from exponent_server_sdk import (
-            DeviceNotRegisteredError,
-            PushClient,
-            PushMessage as ExpoPushMessage,
-            PushServerError,
-            PushTicketError,
+    async def get_receipts(self, ticket_ids: list[str]) -> dict[str, dict[str, Any]]:
+        return {ticket_id: {"status": "ok"} for ticket_id in ticket_ids}
+
+
+_http_client: httpx.AsyncClient | None = None
+
+
+def get_http_client() -> httpx.AsyncClient:
+    """Cliente HTTP compartido (keep-alive + pool) para Expo."""
+    global _http_client
+    if _http_client is None or _http_client.is_closed:
+        _http_client = httpx.AsyncClient(
+            timeout=httpx.Timeout(15.0, connect=5.0),
+            limits=httpx.Limits(max_connections=10, max_keepalive_connections=5),
+            headers={"Accept": "application/json", "Accept-Encoding": "gzip, deflate"},
         )
+    return _http_client
+
 
-        push_messages = [
-            ExpoPushMessage(
-                to=token,
-                title=message.title,
-                body=message.body,
-                data=message.data or {},
-            )
-            for token in tokens
-        ]
+async def close_http_client() -> None:
+    global _http_client
+    client, _http_client = _http_client, None
+    if client is not None and not client.is_closed:
+        await client.aclose()
+
+
+class AsyncExpoPushProvider(AsyncPushProvider):
+    async def send_chunk(self, messages: list[dict[str, Any]]) -> list[dict[str, Any]]:
+        if len(messages) > EXPO_CHUNK_SIZE:
+            raise ValueError("expo_chunk_too_large")
+        try:
+            async with track_external("expo", "send"):
+                resp = await get_http_client().post(EXPO_PUSH_URL, json=messages)
+        except httpx.HTTPError as exc:
+            raise PushDeliveryError(f"expo_unreachable: {exc}") from exc
+
+        if resp.status_code == 429 or resp.status_code >= 500:
+            raise PushDeliveryError(f"expo_http_{resp.status_code}")
+        try:
+            payload = resp.json()
+        except ValueError as exc:
+            raise PushDeliveryError(f"expo_invalid_response: {resp.status_code}") from exc
+        if resp.status_code >= 400 or "errors" in payload:
+            # Error de request (payload inválido): reintentar no lo arregla.
+            logger.error("Expo: request rechazado %s %s", resp.status_code, payload.get("errors"))
+            error = {"status": "error", "message": str(payload.get("errors") or resp.status_code)}
+            return [error] * len(messages)
+
+        tickets = payload.get("data") or []
+        if len(tickets) != len(messages):
+            raise PushDeliveryError("expo_ticket_count_mismatch")
+        return tickets
+
+    async def get_receipts(self, ticket_ids: list[str]) -> dict[str, dict[str, Any]]:
+        if len(ticket_ids) > EXPO_RECEIPTS_BATCH_SIZE:
+            raise ValueError("expo_receipts_batch_too_large")
         try:
-            responses = PushClient().publish_multiple(push_messages)
-            for response in responses:
-                try:
-                    response.validate_response()
-                except DeviceNotRegisteredError:
-                    logger.warning("Expo: token no registrado token=%s", response.push_message.to)
-                except PushTicketError as exc:
-                    logger.error("Expo: push ticket error %s", exc)
-        except PushServerError as exc:
-            logger.error("Expo: servidor error %s", exc)
-        except Exception as exc:
-            logger.error("Expo: error inesperado %s", exc)
+            async with track_external("expo", "get_receipts"):
+                resp = await get_http_client().post(EXPO_RECEIPTS_URL, json={"ids": ticket_ids})
+                resp.raise_for_status()
+                payload = resp.json()
+        except (httpx.HTTPError, ValueError) as exc:
+            raise PushDeliveryError(f"expo_receipts_error: {exc}") from exc
+        if "errors" in payload:
+            raise PushDeliveryError(f"expo_receipts_error: {payload['errors']}")
+        return payload.get("data") or {}
+
+
+def get_async_push_provider() -> AsyncPushProvider:
+    from app.core.settings import settings
+
+    return AsyncExpoPushProvider() if settings.ENV == "production" else AsyncMockPushProvider()
@@ -0,0 +1,187 @@
+"""
+Tickets y receipts de Expo → estadísticas de entrega + baja de tokens muertos.
+
+Flujo:
+  1. Al enviar (outbox worker / broadcast runner) Expo devuelve un ticket por
+     mensaje. record_tickets():
+       - tickets ok → push_tickets (pendientes de receipt)
+       - tickets con error DeviceNotRegistered → token desactivado al instante
+       - acumula accepted / failed / pruned_tokens por notificación o broadcast
+  2. Cada 15 min el scheduler corre check_receipts():
+       - lee tickets con más de RECEIPT_DELAY de antigüedad en lotes de 1000
+         y cierra esa transacción antes de pedir sus receipts a Expo,
+       - en una transacción nueva marca ok / error solo los tickets que siguen
+         pendientes (idempotente: si otra instancia ya los resolvió no se
+         cuentan dos veces), desactiva en bloque los tokens DeviceNotRegistered
+         y acumula delivered / failed / pruned_tokens,
+       - los tickets sin receipt tras RECEIPT_EXPIRY (Expo los guarda 24 h)
+         quedan 'expired'.
+Así el set de tokens activos converge a los dispositivos vivos y el costo del
+fan-out sigue a los usuarios reales.
+"""
+
+from __future__ import annotations
+
+import logging
+from collections import defaultdict
+from datetime import datetime, timedelta, timezone
+from typing import Any, Optional
+from uuid import UUID
+
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from app.modules.push.infra.postgres_push_tickets import PostgresPushTicketRepository
+from app.modules.push.infra.provider import (
+    EXPO_RECEIPTS_BATCH_SIZE,
+    AsyncPushProvider,
+    PushDeliveryError,
+    get_async_push_provider,
+)
+
+logger = logging.getLogger(__name__)
+
+DEVICE_NOT_REGISTERED = "DeviceNotRegistered"
+# Expo recomienda esperar ~15 min antes de pedir receipts; los conserva 24 h.
+RECEIPT_DELAY = timedelta(minutes=15)
+RECEIPT_EXPIRY = timedelta(hours=24)
+TICKET_RETENTION = timedelta(days=2)
+
+
+def error_code(ticket_or_receipt: dict[str, Any]) -> str:
+    details = ticket_or_receipt.get("details") or {}
+    return str(details.get("error") or ticket_or_receipt.get("message") or "unknown")[:100]
+
+
+def classify_tickets(
+    tokens: list[str],
+    tickets: list[dict[str, Any]],
+) -> tuple[list[tuple[str, str]], list[str], int]:
+    """(tickets_ok [(ticket_id, token)], tokens_muertos, cantidad_de_errores)."""
+    ok_rows: list[tuple[str, str]] = []
+    dead: list[str] = []
+    errors = 0
+    for token, ticket in zip(tokens, tickets):
+        if ticket.get("status") == "ok" and ticket.get("id"):
+            ok_rows.append((str(ticket["id"]), token))
+            continue
+        errors += 1
+        if error_code(ticket) == DEVICE_NOT_REGISTERED:
+            dead.append(token)
+    return ok_rows, dead, errors
+
+
+async def record_tickets(
+    repo: PostgresPushTicketRepository,
+    *,
+    source_type: str,
+    source_id: Optional[UUID],
+    tokens: list[str],
+    tickets: list[dict[str, Any]],
+) -> None:
+    """Registra los tickets de un envío (sin commit: transacción del llamante)."""
+    ok_rows, dead, errors = classify_tickets(tokens, tickets)
+    await repo.insert_tickets(ok_rows, source_type=source_type, source_id=source_id)
+    pruned = await repo.deactivate_tokens(dead)
+    if pruned:
+        logger.info("push: %s tokens dados de baja (DeviceNotRegistered en ticket)", pruned)
+    if source_id is not None:
+        await repo.bump_stats(
+            {(source_type, source_id): {"accepted": len(ok_rows), "failed": errors, "pruned_tokens": pruned}}
+        )
+
+
+def classify_receipts(
+    pending: list[tuple[str, str, str, Optional[UUID], datetime]],
+    receipts: dict[str, dict[str, Any]],
+    *,
+    now: datetime,
+) -> dict[str, tuple[str, Optional[str]]]:
+    """ticket_id → (status, error) para los tickets con resultado; los aún sin receipt no aparecen."""
+    outcomes: dict[str, tuple[str, Optional[str]]] = {}
+    for ticket_id, _, _, _, created_at in pending:
+        receipt = receipts.get(ticket_id)
+        if receipt is None:
+            if created_at <= now - RECEIPT_EXPIRY:
+                outcomes[ticket_id] = ("expired", None)
+        elif receipt.get("status") == "ok":
+            outcomes[ticket_id] = ("ok", None)
+        else:
+            outcomes[ticket_id] = ("error", error_code(receipt))
+    return outcomes
+
+
+async def check_receipts(
+    session: AsyncSession,
+    *,
+    provider: AsyncPushProvider | None = None,
+    batch_size: int = EXPO_RECEIPTS_BATCH_SIZE,
+    max_batches: int = 20,
+) -> dict[str, int]:
+    """
+    Procesa receipts pendientes en lotes de hasta 1000 tickets: lectura,
+    commit, Expo sin transacción abierta y resolución en otra transacción.
+    """
+    provider = provider or get_async_push_provider()
+    repo = PostgresPushTicketRepository(session=session)
+    totals = {"checked": 0, "delivered": 0, "failed": 0, "expired": 0, "pruned_tokens": 0}
+
+    cursor: Optional[tuple[datetime, str]] = None
+    for _ in range(max_batches):
+        now = datetime.now(timezone.utc)
+        pending = await repo.list_pending(created_before=now - RECEIPT_DELAY, after=cursor, limit=batch_size)
+        await session.commit()
+        if not pending:
+            break
+        try:
+            receipts = await provider.get_receipts([row[0] for row in pending])
+        except PushDeliveryError as exc:
+            logger.warning("push receipts fetch failed size=%s: %s", len(pending), exc)
+            break
+
+        outcomes = classify_receipts(pending, receipts, now=now)
+        by_outcome: dict[tuple[str, Optional[str]], list[str]] = defaultdict(list)
+        for ticket_id, outcome in outcomes.items():
+            by_outcome[outcome].append(ticket_id)
+        resolved: set[str] = set()
+        for (status, error), ids in by_outcome.items():
+            resolved.update(await repo.resolve(ids, status=status, error=error))
+
+        # Solo cuenta lo que esta corrida resolvió.
+        dead_tokens: list[str] = []
+        stats: dict[tuple[str, UUID], dict[str, int]] = defaultdict(lambda: defaultdict(int))
+        dead_by_source: dict[tuple[str, UUID], set[str]] = defaultdict(set)
+        counts = {"ok": 0, "error": 0, "expired": 0}
+        for ticket_id, token, source_type, source_id, _ in pending:
+            if ticket_id not in resolved:
+                continue
+            status, error = outcomes[ticket_id]
+            counts[status] += 1
+            key = (source_type, source_id)
+            if status == "ok" and source_id is not None:
+                stats[key]["delivered"] += 1
+            elif status == "error":
+                if source_id is not None:
+                    stats[key]["failed"] += 1
+                if error == DEVICE_NOT_REGISTERED:
+                    dead_tokens.append(token)
+                    if source_id is not None:
+                        dead_by_source[key].add(token)
+
+        pruned = await repo.deactivate_tokens(dead_tokens)
+        for key, tokens in dead_by_source.items():
+            stats[key]["pruned_tokens"] += len(tokens)
+        await repo.bump_stats({k: dict(v) for k, v in stats.items()})
+        await session.commit()
+
+        totals["checked"] += len(resolved)
+        totals["delivered"] += counts["ok"]
+        totals["failed"] += counts["error"]
+        totals["expired"] += counts["expired"]
+        totals["pruned_tokens"] += pruned
+        if len(pending) < batch_size:
+            break
+        cursor = (pending[-1][4], pending[-1][0])
+
+    totals["purged"] = await repo.purge_checked(older_than=datetime.now(timezone.utc) - TICKET_RETENTION)
+    await session.commit()
+    return totals
@@ -5,7 +5,7 @@ from fastapi import APIRouter, Depends, Query
 from sqlalchemy.ext.asyncio import AsyncSession
 
 from app.core.auth import CurrentUser, get_current_user, require_roles
-from app.core.db import engine, get_async_session
+from app.core.db import engine, get_async_session, get_read_session
 from app.modules.store.api.schemas import (
     AddonCreateIn,
     AddonOut,
@@ -63,6 +63,15 @@ def get_pets_repo(session: AsyncSession = Depends(get_async_session)) -> PetRepo
     return PostgresPetRepository(session=session, engine=engine)
 
 
+# Catálogo público: réplica de lectura (staleness acotado, ver app/core/db_replica.py).
+def get_store_read_repo(session: AsyncSession = Depends(get_read_session)) -> PostgresStoreRepository:
+    return PostgresStoreRepository(session=session, engine=engine)
+
+
+def get_pets_read_repo(session: AsyncSession = Depends(get_read_session)) -> PetRepository:
+    return PostgresPetRepository(session=session, engine=engine)
+
+
 # ------------------------------------------------------------------
 # Endpoints públicos
 # ------------------------------------------------------------------
@@ -70,7 +79,7 @@ def get_pets_repo(session: AsyncSession = Depends(get_async_session)) -> PetRepo
 @router.get("/categories", response_model=List[CategoryOut])
 async def list_categories(
     species: Optional[Species] = Query(None),
-    repo: PostgresStoreRepository = Depends(get_store_repo),
+    repo: PostgresStoreRepository = Depends(get_store_read_repo),
 ) -> List[CategoryOut]:
     items = await ListCategories(repo=repo).execute(species=species)
     return [CategoryOut(**c.__dict__) for c in items]
@@ -81,8 +90,8 @@ async def list_products(
     slug: str,
     pet_id: Optional[UUID] = Query(None),
     species: Optional[Species] = Query(None),
-    repo: PostgresStoreRepository = Depends(get_store_repo),
-    pets_repo: PetRepository = Depends(get_pets_repo),
+    repo: PostgresStoreRepository = Depends(get_store_read_repo),
+    pets_repo: PetRepository = Depends(get_pets_read_repo),
 ) -> List[ProductOut]:
     items = await ListProducts(repo=repo, pets_repo=pets_repo).execute(
         category_slug=slug, pet_id=pet_id, species=species
@@ -94,8 +103,8 @@ async def list_products(
 async def get_product(
     id: UUID,
     pet_id: Optional[UUID] = Query(None),
-    repo: PostgresStoreRepository = Depends(get_store_repo),
-    pets_repo: PetRepository = Depends(get_pets_repo),
+    repo: PostgresStoreRepository = Depends(get_store_read_repo),
+    pets_repo: PetRepository = Depends(get_pets_read_repo),
 ) -> ProductDetailOut:
     rp, addons = await GetProduct(repo=repo, pets_repo=pets_repo).execute(product_id=id, pet_id=pet_id)
     return ProductDetailOut(
@@ -8,23 +8,10 @@ from fastapi import HTTPException, status
 
 from app.modules.store.domain.models import Species
 from app.modules.store.infra.postgres_store_repository import PostgresStoreRepository
+from app.modules.store.infra.quote_cache import quote_cache
 from app.modules.pets.domain.pet import PetRepository
 
 
-def _breed_category(breed: Optional[str]) -> Optional[str]:
-    """Devuelve el coat_type de la raza consultando el catálogo hardcodeado.
-    Retorna None si la raza no tiene coat_type asignado aún."""
-    if not breed or not str(breed).strip():
-        return None
-    breed_id = str(breed).strip().lower()
-    from app.modules.catalog.domain.breeds_data import BREEDS_CATALOG
-    for group in BREEDS_CATALOG:
-        for b in group["breeds"]:
-            if b["id"] == breed_id:
-                return b.get("coat_type")
-    return None
-
-
 @dataclass
 class QuoteLine:
     target_id: UUID
@@ -53,11 +40,12 @@ class Quote:
         product_id: UUID,
         addon_ids: Optional[List[UUID]] = None,
     ) -> QuoteResult:
-        pet = await self.pets_repo.get_by_id(pet_id)
+        # Perfil (especie, raza, peso) desde el cache de pets: sin leer la mascota completa.
+        pet = await self.pets_repo.get_profile(pet_id)
         if not pet:
             raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail="Pet not found")
 
-        pet_weight = getattr(pet, "weight_kg", None)
+        pet_weight = pet.weight_kg
         if pet_weight is None or float(pet_weight) <= 0:
             raise HTTPException(
                 status_code=status.HTTP_422_UNPROCESSABLE_ENTITY,
@@ -66,10 +54,24 @@ class Quote:
 
         raw_species = getattr(pet.species, "value", pet.species)
         pet_species = Species(str(raw_species))
-        pet_breed = getattr(pet, "breed", None)
-        breed_cat = _breed_category(pet_breed)
+        breed_cat = await self.repo.breed_category(pet.breed)
         weight = float(pet_weight)
 
+        # Misma especie + categoría de raza + tramo de peso + producto + addons
+        # → misma cotización (ver app/modules/store/infra/quote_cache.py).
+        cache_key = None
+        if quote_cache.enabled:
+            cache_key = (
+                pet_species.value,
+                breed_cat,
+                await self.repo.pricing_band(weight),
+                product_id,
+                tuple(addon_ids or ()),
+            )
+            cached = quote_cache.get(cache_key, pet_id=pet_id)
+            if cached is not None:
+                return cached
+
         product = await self.repo.get_product(product_id)
         if not product or not product.is_active:
             raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail="Product not found")
@@ -80,22 +82,7 @@ class Quote:
                 detail="Product species does not match pet species",
             )
 
-        product_price = await self.repo.price_for(
-            target_id=product.id,
-            target_type="product",
-            species=pet_species,
-            breed_category=breed_cat,
-            weight=weight,
-        )
-        if product_price is None:
-            raise HTTPException(
-                status_code=status.HTTP_422_UNPROCESSABLE_ENTITY,
-                detail="No price rule found for this product and pet",
-            )
-
-        product_line = QuoteLine(target_id=product.id, name=product.name, price=product_price)
-
-        addons_out: List[QuoteLine] = []
+        addons = []
         for addon_id in addon_ids or []:
             addon = await self.repo.get_addon(addon_id)
             if not addon or not addon.is_active:
@@ -108,20 +95,35 @@ class Quote:
                     status_code=status.HTTP_400_BAD_REQUEST,
                     detail={"addon_id": str(addon_id), "reason": "not_in_product"},
                 )
+            addons.append(addon)
 
-            addon_price = await self.repo.price_for(
-                target_id=addon.id,
-                target_type="addon",
-                species=pet_species,
-                breed_category=breed_cat,
-                weight=weight,
+        prices = await self.repo.price_for_many(
+            targets=[(product.id, "product", pet_species)] + [(a.id, "addon", pet_species) for a in addons],
+            breed_category=breed_cat,
+            weight=weight,
+        )
+
+        product_price = prices.get((product.id, "product"))
+        if product_price is None:
+            raise HTTPException(
+                status_code=status.HTTP_422_UNPROCESSABLE_ENTITY,
+                detail="No price rule found for this product and pet",
             )
+
+        product_line = QuoteLine(target_id=product.id, name=product.name, price=product_price)
+
+        addons_out: List[QuoteLine] = []
+        for addon in addons:
+            addon_price = prices.get((addon.id, "addon"))
             if addon_price is None:
                 raise HTTPException(
                     status_code=status.HTTP_422_UNPROCESSABLE_ENTITY,
-                    detail={"addon_id": str(addon_id), "reason": "no_price_rule"},
+                    detail={"addon_id": str(addon.id), "reason": "no_price_rule"},
                 )
             addons_out.append(QuoteLine(target_id=addon.id, name=addon.name, price=addon_price))
 
         total = product_line.price + sum(a.price for a in addons_out)
-        return QuoteResult(pet_id=pet_id, product=product_line, addons=addons_out, total=total)
+        result = QuoteResult(pet_id=pet_id, product=product_line, addons=addons_out, total=total)
+        if cache_key is not None:
+            quote_cache.put(cache_key, result)
+        return result
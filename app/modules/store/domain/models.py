@@ -2,7 +2,7 @@ from __future__ import annotations
 
 from dataclasses import dataclass
 from enum import Enum
-from typing import List, Optional, Protocol
+from typing import Dict, Hashable, List, Optional, Protocol, Sequence, Tuple
 from uuid import UUID
 
 
@@ -84,3 +84,6 @@ class StoreRepository(Protocol):
     async def create_price_rule(self, *, target_id: UUID, target_type: str, species: Species, breed_category: str, weight_min: float, weight_max: Optional[float], price: float, currency: str) -> PriceRule: ...
     async def update_price_rule(self, rule_id: UUID, patch: dict) -> PriceRule: ...
     async def price_for(self, *, target_id: UUID, target_type: str, species: Species, breed_category: str, weight: float) -> Optional[float]: ...
+    async def price_for_many(self, *, targets: Sequence[Tuple[UUID, str, Species]], breed_category: Optional[str], weight: float) -> Dict[Tuple[UUID, str], float]: ...
+    async def pricing_band(self, weight: float) -> Hashable: ...
+    async def breed_category(self, breed: Optional[str]) -> Optional[str]: ...
@@ -1,13 +1,18 @@
 from __future__ import annotations
 
 from decimal import Decimal
-from typing import List, Optional
+from typing import Dict, Hashable, List, Optional, Sequence, Tuple
 from uuid import UUID
 
-from sqlalchemy import and_, select
+from sqlalchemy import case, select, tuple_
 from sqlalchemy.ext.asyncio import AsyncEngine, AsyncSession
 
+from app.modules.catalog.infra.breed_index import breed_index
 from app.modules.store.domain.models import Addon, Category, PriceRule, Product, Species
+from app.modules.store.infra.price_index import FALLBACK_BREED_CATEGORY, notify_price_rule_changed, price_index
+from app.modules.store.infra.quote_cache import notify_quotes_changed, quote_cache
+
+PriceTarget = Tuple[UUID, str, Species]   # (target_id, target_type, species)
 
 
 def _breed_allowed(allowed_breeds: Optional[List[str]], breed: Optional[str]) -> bool:
@@ -73,6 +78,17 @@ class PostgresStoreRepository:
             is_active=r.is_active,
         )
 
+    async def _commit_quote_change(self, *target_ids: UUID) -> None:
+        """
+        Commit de un cambio que afecta cotizaciones (producto, addon o regla).
+        El NOTIFY viaja en la misma transacción y el cache local se invalida
+        después del commit (ver quote_cache.py).
+        """
+        await notify_quotes_changed(self._session, *target_ids)
+        await self._session.commit()
+        for target_id in target_ids:
+            quote_cache.invalidate(target_id)
+
     # ------------------------------------------------------------------
     # Categorías
     # ------------------------------------------------------------------
@@ -221,7 +237,7 @@ class PostgresStoreRepository:
         for key, value in patch.items():
             setattr(row, key, value)
         row.updated_at = _utcnow()
-        await self._session.commit()
+        await self._commit_quote_change(product_id)
         await self._session.refresh(row)
         return self._to_product(row)
 
@@ -233,7 +249,7 @@ class PostgresStoreRepository:
             raise ValueError("product_not_found")
         row.is_active = is_active
         row.updated_at = _utcnow()
-        await self._session.commit()
+        await self._commit_quote_change(product_id)
         await self._session.refresh(row)
         return self._to_product(row)
 
@@ -299,7 +315,7 @@ class PostgresStoreRepository:
         for key, value in patch.items():
             setattr(row, key, value)
         row.updated_at = _utcnow()
-        await self._session.commit()
+        await self._commit_quote_change(addon_id)
         await self._session.refresh(row)
         return self._to_addon(row)
 
@@ -311,7 +327,7 @@ class PostgresStoreRepository:
             raise ValueError("addon_not_found")
         row.is_active = is_active
         row.updated_at = _utcnow()
-        await self._session.commit()
+        await self._commit_quote_change(addon_id)
         await self._session.refresh(row)
         return self._to_addon(row)
 
@@ -356,9 +372,13 @@ class PostgresStoreRepository:
             updated_at=now,
         )
         self._session.add(row)
-        await self._session.commit()
+        await self._session.flush()
+        await notify_price_rule_changed(self._session, row.id)
+        await self._commit_quote_change(target_id)
         await self._session.refresh(row)
-        return self._to_price_rule(row)
+        rule = self._to_price_rule(row)
+        price_index.apply(rule)
+        return rule
 
     async def update_price_rule(self, rule_id: UUID, patch: dict) -> PriceRule:
         from app.modules.store.infra.db_models import StorePriceRuleModel, _utcnow
@@ -366,15 +386,38 @@ class PostgresStoreRepository:
         row = await self._session.get(StorePriceRuleModel, rule_id)
         if row is None:
             raise ValueError("price_rule_not_found")
+        previous_target_id = row.target_id
         for key, value in patch.items():
             if key == "price":
                 row.price = Decimal(str(round(value, 2)))   # str() evita imprecisión de float → Decimal
             else:
                 setattr(row, key, value)
         row.updated_at = _utcnow()
-        await self._session.commit()
+        await notify_price_rule_changed(self._session, rule_id)
+        await self._commit_quote_change(*dict.fromkeys((previous_target_id, row.target_id)))
         await self._session.refresh(row)
-        return self._to_price_rule(row)
+        rule = self._to_price_rule(row)
+        price_index.apply(rule)
+        return rule
+
+    async def breed_category(self, breed: Optional[str]) -> Optional[str]:
+        """
+        Categoría de precio (coat_type) de la raza según la tabla breeds, vía el
+        índice en memoria de catálogo (app/modules/catalog/infra/breed_index.py).
+        None si la raza no existe o aún no tiene coat_type.
+        """
+        index = await breed_index.get()
+        return index.coat_type(breed)
+
+    async def pricing_band(self, weight: float) -> Hashable:
+        """
+        Tramo de peso para claves de cache: pesos del mismo tramo obtienen los
+        mismos precios. Incluye la versión del índice; sin índice, el peso exacto.
+        """
+        if not price_index.enabled:
+            return weight
+        index = await price_index.get()
+        return index.version, index.weight_band(weight)
 
     async def price_for(
         self,
@@ -385,32 +428,80 @@ class PostgresStoreRepository:
         breed_category: str,
         weight: float,
     ) -> Optional[float]:
-        from app.modules.store.infra.db_models import StorePriceRuleModel
+        prices = await self.price_for_many(
+            targets=[(target_id, target_type, species)],
+            breed_category=breed_category,
+            weight=weight,
+        )
+        return prices.get((target_id, target_type))
 
-        async def _find(cat: str) -> Optional[StorePriceRuleModel]:
-            stmt = (
-                select(StorePriceRuleModel)
-                .where(
-                    and_(
-                        StorePriceRuleModel.is_active.is_(True),
-                        StorePriceRuleModel.target_id == target_id,
-                        StorePriceRuleModel.target_type == target_type,
-                        StorePriceRuleModel.species == species.value,
-                        StorePriceRuleModel.breed_category == cat,
-                        StorePriceRuleModel.weight_min <= weight,
-                        (StorePriceRuleModel.weight_max.is_(None) | (StorePriceRuleModel.weight_max >= weight)),
-                    )
+    async def price_for_many(
+        self,
+        *,
+        targets: Sequence[PriceTarget],
+        breed_category: Optional[str],
+        weight: float,
+    ) -> Dict[Tuple[UUID, str], float]:
+        """
+        Precios de varios productos/addons para una misma mascota.
+
+        Devuelve {(target_id, target_type): precio}; los targets sin regla no
+        aparecen. Con el índice compilado habilitado se resuelve en memoria;
+        si no, en una sola query.
+        """
+        if not targets:
+            return {}
+
+        if price_index.enabled:
+            index = await price_index.get()
+            prices: Dict[Tuple[UUID, str], float] = {}
+            for target_id, target_type, species in targets:
+                price = index.lookup(
+                    target_id=target_id,
+                    target_type=target_type,
+                    species=species.value,
+                    breed_category=breed_category,
+                    weight=weight,
                 )
-                .order_by(StorePriceRuleModel.weight_min.desc())
-            )
-            result = await self._session.execute(stmt)
-            return result.scalars().first()
-
-        rule = await _find(breed_category)
-        if rule is None and breed_category != "mestizo":
-            rule = await _find("mestizo")
+                if price is not None:
+                    prices[(target_id, target_type)] = price
+            return prices
 
-        if rule is None:
-            return None
+        return await self._price_for_many_sql(targets=targets, breed_category=breed_category, weight=weight)
 
-        return float(rule.price)   # Decimal("120.00") → 120.0 (soles)
+    async def _price_for_many_sql(
+        self,
+        *,
+        targets: Sequence[PriceTarget],
+        breed_category: Optional[str],
+        weight: float,
+    ) -> Dict[Tuple[UUID, str], float]:
+        from app.modules.store.infra.db_models import StorePriceRuleModel as R
+
+        # Por target: primero la categoría de la raza, luego "mestizo"; dentro de
+        # cada una, la banda que cubre el peso con mayor weight_min.
+        categories = {FALLBACK_BREED_CATEGORY}
+        if breed_category:
+            categories.add(breed_category)
+        stmt = (
+            select(R.target_id, R.target_type, R.price)
+            .distinct(R.target_id, R.target_type)
+            .where(
+                R.is_active.is_(True),
+                tuple_(R.target_id, R.target_type, R.species).in_(
+                    [(t_id, t_type, species.value) for t_id, t_type, species in targets]
+                ),
+                R.breed_category.in_(categories),
+                R.weight_min <= weight,
+                R.weight_max.is_(None) | (R.weight_max >= weight),
+            )
+            .order_by(
+                R.target_id,
+                R.target_type,
+                case((R.breed_category == FALLBACK_BREED_CATEGORY, 1), else_=0),
+                R.weight_min.desc(),
+            )
+        )
+        result = await self._session.execute(stmt)
+        # Decimal("120.00") → 120.0 (soles)
+        return {(row.target_id, row.target_type): float(row.price) for row in result.all()}
@@ -0,0 +1,281 @@
+"""
+Índice compilado de reglas de precio (store_price_rules) en memoria.
+
+Problema:
+  PostgresStoreRepository.price_for hacía hasta 2 queries por producto/addon
+  (categoría de raza + fallback "mestizo"). ListProducts, GetProduct y Quote
+  lo llaman en loop: una ficha con 10 addons eran ~20 queries secuenciales.
+
+Diseño:
+  - Se cargan todas las reglas activas una vez y se agrupan por
+    (target_id, target_type, species, breed_category).
+  - Cada grupo guarda sus bandas de peso ordenadas por weight_min; la
+    búsqueda es bisect sobre weight_min + verificación de weight_max.
+    Misma semántica que la query anterior: entre las bandas que cubren el
+    peso gana la de mayor weight_min. Sin banda → fallback a "mestizo".
+  - create_price_rule / update_price_rule parchean el índice local
+    (apply) y emiten NOTIFY 'store_price_rules' en la misma transacción;
+    las demás instancias lo marcan como vencido y recargan en el próximo uso.
+    Si apply/invalidate llegan mientras se carga, esa carga se descarta y se
+    repite: el snapshot leído antes del cambio no queda fresco hasta el TTL.
+  - La carga usa una sesión propia sobre el primario (AsyncSessionLocal),
+    nunca la sesión del request: con réplica, un índice cargado atrasado
+    quedaría vivo hasta el próximo NOTIFY/TTL.
+  - TTL (STORE_PRICE_INDEX_TTL_SECONDS) como red de seguridad si no hay
+    LISTEN activo o alguien edita la tabla por fuera de la API (0 = sin
+    vencimiento).
+  - STORE_PRICE_INDEX_ENABLED=false apaga el índice: price_for_many
+    resuelve con una query por lote.
+"""
+
+from __future__ import annotations
+
+import asyncio
+import itertools
+import logging
+import time
+from bisect import bisect_left, bisect_right
+from dataclasses import dataclass
+from typing import Iterable, Optional
+from uuid import UUID, uuid4
+
+from sqlalchemy import select
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from app.core.pubsub import notify, pg_listener
+from app.core.settings import settings
+from app.modules.store.domain.models import PriceRule, Species
+
+logger = logging.getLogger(__name__)
+
+PRICE_RULES_CHANNEL = "store_price_rules"
+FALLBACK_BREED_CATEGORY = "mestizo"
+
+# Identifica a esta instancia en el payload del NOTIFY: la instancia que
+# escribió ya parcheó su índice y no necesita recargarlo.
+_INSTANCE_ID = uuid4().hex
+
+GroupKey = tuple[UUID, str, str, str]   # (target_id, target_type, species, breed_category)
+
+# Cada índice construido o parcheado recibe una versión nueva (ver weight_band).
+_versions = itertools.count(1)
+
+# Recargas máximas si apply/invalidate llegan mientras se carga el índice.
+_LOAD_ATTEMPTS = 3
+
+
+@dataclass(frozen=True)
+class PriceBand:
+    rule_id: UUID
+    weight_min: float
+    weight_max: Optional[float]
+    price: float
+
+    def covers(self, weight: float) -> bool:
+        return self.weight_min <= weight and (self.weight_max is None or weight <= self.weight_max)
+
+
+class _BandGroup:
+    __slots__ = ("bands", "mins")
+
+    def __init__(self, bands: Iterable[PriceBand]) -> None:
+        self.bands: tuple[PriceBand, ...] = tuple(sorted(bands, key=lambda b: (b.weight_min, str(b.rule_id))))
+        self.mins: tuple[float, ...] = tuple(b.weight_min for b in self.bands)
+
+    def find(self, weight: float) -> Optional[PriceBand]:
+        # Candidatas: weight_min <= peso; de mayor a menor weight_min, la primera que cubre.
+        for i in range(bisect_right(self.mins, weight) - 1, -1, -1):
+            if self.bands[i].covers(weight):
+                return self.bands[i]
+        return None
+
+
+def _key(rule: PriceRule) -> GroupKey:
+    species = getattr(rule.species, "value", rule.species)
+    return rule.target_id, rule.target_type, str(species), rule.breed_category
+
+
+def _band(rule: PriceRule) -> PriceBand:
+    return PriceBand(rule_id=rule.id, weight_min=rule.weight_min, weight_max=rule.weight_max, price=rule.price)
+
+
+class CompiledPriceIndex:
+    def __init__(self, rules: Iterable[PriceRule] = ()) -> None:
+        grouped: dict[GroupKey, list[PriceBand]] = {}
+        self._rule_keys: dict[UUID, GroupKey] = {}
+        for rule in rules:
+            if not rule.is_active:
+                continue
+            key = _key(rule)
+            grouped.setdefault(key, []).append(_band(rule))
+            self._rule_keys[rule.id] = key
+        self._groups: dict[GroupKey, _BandGroup] = {k: _BandGroup(v) for k, v in grouped.items()}
+        self._refresh_breakpoints()
+
+    def _refresh_breakpoints(self) -> None:
+        points: set[float] = set()
+        for group in self._groups.values():
+            for band in group.bands:
+                points.add(band.weight_min)
+                if band.weight_max is not None:
+                    points.add(band.weight_max)
+        self._breakpoints: tuple[float, ...] = tuple(sorted(points))
+        self.version = next(_versions)
+
+    def weight_band(self, weight: float) -> int:
+        """
+        Tramo de peso: entre dos límites consecutivos de cualquier banda todas
+        las búsquedas dan el mismo resultado. Los límites son inclusivos, así
+        que cada límite exacto es su propio tramo. Solo comparable con la
+        misma `version` del índice.
+        """
+        i = bisect_left(self._breakpoints, weight)
+        if i < len(self._breakpoints) and self._breakpoints[i] == weight:
+            return 2 * i + 1
+        return 2 * i
+
+    def __len__(self) -> int:
+        return len(self._rule_keys)
+
+    def lookup(
+        self,
+        *,
+        target_id: UUID,
+        target_type: str,
+        species: str,
+        breed_category: Optional[str],
+        weight: float,
+    ) -> Optional[float]:
+        band = self._find((target_id, target_type, species, breed_category), weight)
+        if band is None and breed_category != FALLBACK_BREED_CATEGORY:
+            band = self._find((target_id, target_type, species, FALLBACK_BREED_CATEGORY), weight)
+        return band.price if band is not None else None
+
+    def _find(self, key: GroupKey, weight: float) -> Optional[PriceBand]:
+        group = self._groups.get(key)
+        return group.find(weight) if group is not None else None
+
+    def apply(self, rule: PriceRule) -> None:
+        """Parchea una regla creada/actualizada: la quita de su grupo anterior y la agrega al nuevo si está activa."""
+        previous = self._rule_keys.pop(rule.id, None)
+        if previous is not None:
+            self._rebuild(previous, exclude=rule.id)
+        if rule.is_active:
+            key = _key(rule)
+            self._rule_keys[rule.id] = key
+            current = self._groups.get(key)
+            bands = [b for b in current.bands if b.rule_id != rule.id] if current else []
+            bands.append(_band(rule))
+            self._groups[key] = _BandGroup(bands)
+        self._refresh_breakpoints()
+
+    def _rebuild(self, key: GroupKey, *, exclude: UUID) -> None:
+        group = self._groups.get(key)
+        if group is None:
+            return
+        bands = [b for b in group.bands if b.rule_id != exclude]
+        if bands:
+            self._groups[key] = _BandGroup(bands)
+        else:
+            self._groups.pop(key, None)
+
+
+class PriceIndexCache:
+    """Índice por proceso con carga perezosa, single-flight y TTL."""
+
+    def __init__(self, *, enabled: bool, ttl_seconds: int) -> None:
+        self._enabled = enabled
+        self._ttl = ttl_seconds
+        self._index: Optional[CompiledPriceIndex] = None
+        self._loaded_at = 0.0
+        self._lock = asyncio.Lock()
+        # Sube con cada apply/invalidate: una carga que se cruzó con un cambio
+        # se descarta en vez de quedar marcada como fresca hasta el TTL.
+        self._generation = 0
+
+    @property
+    def enabled(self) -> bool:
+        return self._enabled
+
+    def _fresh(self) -> bool:
+        return self._index is not None and (self._ttl <= 0 or time.monotonic() - self._loaded_at < self._ttl)
+
+    async def get(self) -> CompiledPriceIndex:
+        if self._fresh():
+            return self._index
+        async with self._lock:
+            for _ in range(_LOAD_ATTEMPTS):
+                if self._fresh():
+                    return self._index
+                generation = self._generation
+                index = await self._load()
+                if generation == self._generation:
+                    self._index = index
+                    self._loaded_at = time.monotonic()
+                    return index
+                logger.info("store price index changed while loading, reloading")
+            # Cambios continuos: se usa la última carga sin cachearla.
+            return index
+
+    async def _load(self) -> CompiledPriceIndex:
+        # Siempre desde el primario y con sesión propia: el índice vive más que
+        # el request y no debe heredar el lag de la réplica ni su transacción.
+        from app.core.db import AsyncSessionLocal
+        from app.modules.store.infra.db_models import StorePriceRuleModel
+
+        async with AsyncSessionLocal() as session:
+            result = await session.execute(
+                select(StorePriceRuleModel).where(StorePriceRuleModel.is_active.is_(True))
+            )
+            rows = result.scalars().all()
+        index = CompiledPriceIndex(
+            PriceRule(
+                id=r.id,
+                target_id=r.target_id,
+                target_type=r.target_type,
+                species=Species(r.species),
+                breed_category=r.breed_category,
+                weight_min=r.weight_min,
+                weight_max=r.weight_max,
+                price=float(r.price),
+                currency=r.currency,
+                is_active=r.is_active,
+            )
+            for r in rows
+        )
+        logger.info("store price index loaded rules=%s", len(index))
+        return index
+
+    def apply(self, rule: PriceRule) -> None:
+        self._generation += 1
+        if self._index is not None:
+            self._index.apply(rule)
+
+    def invalidate(self) -> None:
+        self._generation += 1
+        self._index = None
+
+
+async def notify_price_rule_changed(session: AsyncSession, rule_id: UUID) -> None:
+    """NOTIFY transaccional: llamar antes del commit que crea/actualiza la regla."""
+    await notify(session, PRICE_RULES_CHANNEL, f"{_INSTANCE_ID}:{rule_id}")
+
+
+def _on_price_rules_notify(payload: str) -> None:
+    origin, _, _ = payload.partition(":")
+    if origin != _INSTANCE_ID:
+        price_index.invalidate()
+
+
+def register_price_index_channel() -> None:
+    """Registra la invalidación entre instancias. Se llama en el lifespan antes de pg_listener.start()."""
+    pg_listener.on(PRICE_RULES_CHANNEL, _on_price_rules_notify)
+
+
+# ---------------------------------------------------------------------------
+# Singleton de proceso
+# ---------------------------------------------------------------------------
+price_index = PriceIndexCache(
+    enabled=settings.STORE_PRICE_INDEX_ENABLED,
+    ttl_seconds=settings.STORE_PRICE_INDEX_TTL_SECONDS,
+)
@@ -0,0 +1,119 @@
+"""
+Cache de cotizaciones (/store/quote) por perfil de precio de la mascota.
+
+Problema:
+  La app llama /store/quote cada vez que el usuario marca o desmarca un
+  addon, y cada llamada releía mascota, producto, cada addon y cada regla.
+
+Diseño:
+  - Clave: (especie, categoría de raza, tramo de peso, producto, addons en
+    el orden pedido). Dos mascotas con el mismo perfil comparten entrada.
+  - Tramo de peso: lo da el índice compilado (CompiledPriceIndex.weight_band)
+    junto con su versión, así cualquier cambio de reglas genera claves nuevas.
+    Con el índice deshabilitado se usa el peso exacto.
+  - El perfil de la mascota sale de pet_profile_cache (pets): cambiar el
+    peso a otro tramo cambia la clave.
+  - Invalidación por tags: cada entrada se registra bajo el producto y sus
+    addons. update/toggle de producto o addon y create/update de reglas de
+    precio invalidan el tag local y emiten NOTIFY 'store_quotes' con el id.
+  - Solo se cachean cotizaciones exitosas; los errores se recalculan.
+"""
+
+from __future__ import annotations
+
+import dataclasses
+import logging
+import time
+from typing import Hashable, Optional
+from uuid import UUID
+
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from app.core.pubsub import notify, pg_listener
+from app.core.settings import settings
+
+logger = logging.getLogger(__name__)
+
+QUOTES_CHANNEL = "store_quotes"
+
+QuoteKey = tuple[str, Optional[str], Hashable, UUID, tuple[UUID, ...]]
+
+
+class QuoteCache:
+    def __init__(self, *, ttl_seconds: int, max_entries: int = 10_000) -> None:
+        self._ttl = ttl_seconds
+        self._max_entries = max_entries
+        self._entries: dict[QuoteKey, tuple[float, object]] = {}
+        self._tags: dict[UUID, set[QuoteKey]] = {}
+
+    @property
+    def enabled(self) -> bool:
+        return self._ttl > 0
+
+    def get(self, key: QuoteKey, *, pet_id: UUID):
+        """Devuelve la cotización cacheada con el pet_id del request, o None."""
+        hit = self._entries.get(key)
+        if hit is None:
+            return None
+        expires_at, result = hit
+        if time.monotonic() >= expires_at:
+            self._drop(key)
+            return None
+        return dataclasses.replace(result, pet_id=pet_id)
+
+    def put(self, key: QuoteKey, result) -> None:
+        if self._ttl <= 0:
+            return
+        if key not in self._entries and len(self._entries) >= self._max_entries:
+            self._drop(next(iter(self._entries)))
+        self._entries[key] = (time.monotonic() + self._ttl, result)
+        for tag in _tags_of(key):
+            self._tags.setdefault(tag, set()).add(key)
+
+    def invalidate(self, tag: UUID) -> None:
+        """Descarta las cotizaciones que incluyen el producto/addon `tag`."""
+        for key in self._tags.pop(tag, ()):
+            self._drop(key)
+
+    def clear(self) -> None:
+        self._entries.clear()
+        self._tags.clear()
+
+    def _drop(self, key: QuoteKey) -> None:
+        if self._entries.pop(key, None) is None:
+            return
+        for tag in _tags_of(key):
+            keys = self._tags.get(tag)
+            if keys is not None:
+                keys.discard(key)
+                if not keys:
+                    del self._tags[tag]
+
+
+def _tags_of(key: QuoteKey) -> tuple[UUID, ...]:
+    _, _, _, product_id, addon_ids = key
+    return (product_id, *addon_ids)
+
+
+async def notify_quotes_changed(session: AsyncSession, *target_ids: UUID) -> None:
+    """NOTIFY transaccional: llamar antes del commit del cambio de producto/addon/regla."""
+    for target_id in dict.fromkeys(target_ids):
+        await notify(session, QUOTES_CHANNEL, str(target_id))
+
+
+def _on_invalidate_notify(payload: str) -> None:
+    try:
+        quote_cache.invalidate(UUID(payload))
+    except ValueError:
+        logger.warning("store quotes: invalid payload %r", payload)
+
+
+def register_quote_channel() -> None:
+    """Registra la invalidación entre instancias. Se llama en el lifespan antes de pg_listener.start()."""
+    pg_listener.on(QUOTES_CHANNEL, _on_invalidate_notify)
+
+
+# ---------------------------------------------------------------------------
+# Singleton de proceso
+# ---------------------------------------------------------------------------
+quote_cache = QuoteCache(ttl_seconds=settings.STORE_QUOTE_CACHE_TTL_SECONDS)
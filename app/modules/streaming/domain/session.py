@@ -4,7 +4,7 @@ from dataclasses import dataclass
 from enum import Enum
 from uuid import UUID
 
-from app.modules.orders.domain.order import Order, OrderStatus
+from app.modules.orders.domain.order import Order, OrderParticipation, OrderStatus
 
 
 # [TECH]
@@ -53,7 +53,7 @@ class StreamSession:
 # 4. El ally obtiene rol HOST; el cliente y el admin obtienen rol VIEWER.
 def resolve_stream_session(
     *,
-    order: Order,
+    order: Order | OrderParticipation,
     requester_id: UUID,
     requester_role: str,   # "user" | "ally" | "admin"  — viene del JWT
 ) -> StreamSession:
@@ -33,7 +33,7 @@ class GetStreamSession:
 
         # Buscar la orden sin restricción de user_id para que admin y ally
         # también puedan consultarla.
-        order = await self.orders_repo.get_order_admin(id=order_id)
+        order = await self.orders_repo.get_participation(id=order_id)
 
         if order is None:
             logger.info("streaming.get_stream_session order_not_found order_id=%s requester_id=%s", order_id, requester_id)
@@ -5,38 +5,68 @@ Endpoints:
   POST /tracking/orders/{order_id}/location
     → Ally reporta su posición actual. Solo accesible con rol "ally".
 
+  POST /tracking/orders/{order_id}/locations/batch
+    → Ally reenvía en un solo request los puntos acumulados sin señal.
+      Todos van al historial; solo el más nuevo queda como posición actual.
+
   GET /tracking/orders/{order_id}/current
     → Devuelve la última posición conocida del ally + destino del servicio.
       Accesible por el cliente dueño de la orden, el ally asignado o un admin.
 
   GET /tracking/orders/{order_id}/route
-    → Devuelve polyline + ETA calculados por Google Routes API.
+    → Devuelve polyline + ETA. Responde al instante con la ruta cacheada de
+      Google o con una estimación local; Google refina en segundo plano.
       Mismo control de acceso que /current.
-      Devuelve 501 si GOOGLE_ROUTES_API_KEY no está configurada.
+
+  GET /tracking/orders/{order_id}/trail?since=
+    → Recorrido del ally (historial), delta-encoded. Disponible también tras
+      finalizar el servicio (done) para soporte y disputas.
+
+  WS /tracking/orders/{order_id}/live?token=<access_token>
+    → Push de cada nueva posición del ally (reemplaza el polling a /current).
+      Mismo control de acceso que /current, validado una sola vez al conectar.
 """
 
+import asyncio
+from datetime import datetime
+from typing import Optional
 from uuid import UUID
 
-from fastapi import APIRouter, Depends, status
+from fastapi import APIRouter, Depends, HTTPException, Query, WebSocket, WebSocketDisconnect, status
 from sqlalchemy.ext.asyncio import AsyncSession
 
-from app.core.auth import CurrentUser, get_current_user, require_roles
-from app.core.db import engine, get_async_session
+from app.core.auth import CurrentUser, get_current_user, get_current_user_ws, require_roles
+from app.core.db import AsyncSessionLocal, engine, get_async_session
 from app.modules.orders.infra.postgres_order_repository import PostgresOrderRepository
 from app.modules.tracking.api.schemas import (
     CurrentLocationOut,
     LocationPoint,
+    ReportLocationBatchIn,
+    ReportLocationBatchOut,
     ReportLocationIn,
     ReportLocationOut,
     RouteOut,
+    TrailOut,
 )
+from app.modules.tracking.domain.location import assert_tracking_readable
+from app.modules.tracking.infra.live_channel import location_broadcaster
+from app.modules.tracking.infra.location_history import PostgresLocationHistoryStore
 from app.modules.tracking.infra.postgres_location_store import PostgresLocationStore
 from app.modules.tracking.use_cases.get_current import GetCurrent
 from app.modules.tracking.use_cases.get_route import GetRoute
+from app.modules.tracking.use_cases.get_trail import GetTrail
 from app.modules.tracking.use_cases.report_location import ReportLocation
+from app.modules.tracking.use_cases.report_location_batch import ReportLocationBatch
 
 router = APIRouter(tags=["tracking"], prefix="/tracking")
 
+# Sin posiciones nuevas, se envía un ping cada N segundos para mantener viva
+# la conexión detrás de proxies/balanceadores y detectar clientes caídos.
+_LIVE_KEEPALIVE_SECONDS = 25
+# Cada N segundos el socket revisa el estado de la orden (participación
+# cacheada, invalidada por NOTIFY) y se cierra al pasar a done/cancelled.
+_LIVE_STATUS_CHECK_SECONDS = 5
+
 
 def _get_orders_repo(session: AsyncSession = Depends(get_async_session)) -> PostgresOrderRepository:
     return PostgresOrderRepository(session=session, engine=engine)
@@ -46,6 +76,10 @@ def _get_location_store(session: AsyncSession = Depends(get_async_session)) -> P
     return PostgresLocationStore(session=session)
 
 
+def _get_history_store(session: AsyncSession = Depends(get_async_session)) -> PostgresLocationHistoryStore:
+    return PostgresLocationHistoryStore(session=session)
+
+
 # ---------------------------------------------------------------------------
 # POST /tracking/orders/{order_id}/location
 # ---------------------------------------------------------------------------
@@ -87,6 +121,50 @@ async def report_location(
     )
 
 
+# ---------------------------------------------------------------------------
+# POST /tracking/orders/{order_id}/locations/batch
+# ---------------------------------------------------------------------------
+
+@router.post(
+    "/orders/{order_id}/locations/batch",
+    response_model=ReportLocationBatchOut,
+    status_code=status.HTTP_201_CREATED,
+    summary="Ally reenvía en lote las posiciones acumuladas sin señal",
+)
+async def report_location_batch(
+    order_id: UUID,
+    payload: ReportLocationBatchIn,
+    current: CurrentUser = Depends(require_roles("ally")),
+    orders_repo: PostgresOrderRepository = Depends(_get_orders_repo),
+    location_store: PostgresLocationStore = Depends(_get_location_store),
+) -> ReportLocationBatchOut:
+    """
+    Al recuperar señal, el app envía todos los puntos pendientes en un solo request.
+
+    - Mismas reglas que `/location` (rol **ally**, ally asignado, `on_the_way` / `in_service`),
+      validadas una sola vez para todo el lote.
+    - `points` en orden cronológico por `recorded_at`, máximo 500.
+    - Todos los puntos se guardan en el recorrido (`/trail`); solo el más nuevo
+      queda como posición actual.
+    """
+    locations = await ReportLocationBatch(orders_repo=orders_repo, location_store=location_store).execute(
+        order_id=order_id,
+        ally_id=current.id,
+        points=[(p.lat, p.lng, p.accuracy_m, p.recorded_at) for p in payload.points],
+    )
+    newest = locations[-1]
+    return ReportLocationBatchOut(
+        order_id=order_id,
+        accepted=len(locations),
+        current=LocationPoint(
+            lat=newest.lat,
+            lng=newest.lng,
+            accuracy_m=newest.accuracy_m,
+            recorded_at=newest.recorded_at,
+        ),
+    )
+
+
 # ---------------------------------------------------------------------------
 # GET /tracking/orders/{order_id}/current
 # ---------------------------------------------------------------------------
@@ -111,7 +189,8 @@ async def get_current(
     - `ally_location` puede ser `null` si el ally aún no envió su primera posición.
     - `staleness_seconds` indica la antigüedad de los datos de posición.
 
-    **Uso recomendado:** el frontend hace polling cada 5 segundos.
+    **Uso recomendado:** seguir la posición por el WebSocket `/live`; este
+    endpoint queda como fallback mientras el socket reconecta.
     """
     data = await GetCurrent(orders_repo=orders_repo, location_store=location_store).execute(
         order_id=order_id,
@@ -146,7 +225,7 @@ async def get_current(
 @router.get(
     "/orders/{order_id}/route",
     response_model=RouteOut,
-    summary="Ruta y ETA calculados por Google Routes API",
+    summary="Ruta y ETA (Google Routes cacheado o estimación local)",
 )
 async def get_route(
     order_id: UUID,
@@ -155,11 +234,12 @@ async def get_route(
     location_store: PostgresLocationStore = Depends(_get_location_store),
 ) -> RouteOut:
     """
-    Devuelve la polyline codificada y el tiempo estimado de llegada (ETA)
-    calculados en tiempo real por Google Routes API.
+    Devuelve la polyline codificada y el tiempo estimado de llegada (ETA).
 
     - Mismo control de acceso que `/current`.
-    - Devuelve **HTTP 501** si `GOOGLE_ROUTES_API_KEY` no está configurada.
+    - `source = "google"`: ETA proyectado sobre la última ruta de Google Routes.
+    - `source = "estimate"`: estimación local sin red (sin polyline); Google
+      refina en segundo plano si `GOOGLE_ROUTES_API_KEY` está configurada.
     - Si el ally aún no reportó posición, devuelve el destino sin ruta
       (`eta_seconds`, `polyline` y `distance_meters` serán `null`).
     """
@@ -188,4 +268,163 @@ async def get_route(
         eta_display=data["eta_display"],
         polyline=data["polyline"],
         distance_meters=data["distance_meters"],
+        source=data["source"],
+    )
+
+
+# ---------------------------------------------------------------------------
+# GET /tracking/orders/{order_id}/trail
+# ---------------------------------------------------------------------------
+
+@router.get(
+    "/orders/{order_id}/trail",
+    response_model=TrailOut,
+    summary="Recorrido del ally (delta-encoded)",
+)
+async def get_trail(
+    order_id: UUID,
+    since: Optional[datetime] = Query(None, description="Solo puntos posteriores (default: últimas 24 h)"),
+    current: CurrentUser = Depends(get_current_user),
+    orders_repo: PostgresOrderRepository = Depends(_get_orders_repo),
+    history_store: PostgresLocationHistoryStore = Depends(_get_history_store),
+) -> TrailOut:
+    """
+    Devuelve el recorrido del ally para dibujarlo en el mapa o revisar una disputa.
+
+    - Mismo control de acceso que `/current`; además disponible en `done`.
+      El admin puede leerlo en cualquier estado.
+    - Máximo 2000 puntos por respuesta; si `has_more` es true, pedir de nuevo
+      con `since = last_recorded_at`.
+    - Formato: `points[0] = [lat_e5, lng_e5, t]`, luego deltas `[Δlat, Δlng, Δt]`.
+    """
+    data = await GetTrail(orders_repo=orders_repo, history_store=history_store).execute(
+        order_id=order_id,
+        requester_id=current.id,
+        requester_role=current.role,
+        since=since,
     )
+    return TrailOut(**data)
+
+
+# ---------------------------------------------------------------------------
+# WS /tracking/orders/{order_id}/live
+# ---------------------------------------------------------------------------
+
+def _point_json(location) -> dict:
+    return LocationPoint(
+        lat=location.lat,
+        lng=location.lng,
+        accuracy_m=location.accuracy_m,
+        recorded_at=location.recorded_at,
+    ).model_dump(mode="json")
+
+
+async def _tracking_closed_reason(order_id: UUID) -> Optional[str]:
+    """Motivo de cierre si la orden ya no es rastreable (p. ej. done/cancelled), o None."""
+    async with AsyncSessionLocal() as session:
+        order = await PostgresOrderRepository(session=session, engine=engine).get_participation(id=order_id)
+    if order is None:
+        return "Order not found"
+    try:
+        assert_tracking_readable(order)
+    except ValueError as exc:
+        return str(exc)
+    return None
+
+
+async def _wait_disconnect(websocket: WebSocket) -> None:
+    """Consume mensajes del cliente (se ignoran) hasta que se desconecta."""
+    try:
+        while True:
+            await websocket.receive_text()
+    except (WebSocketDisconnect, RuntimeError):
+        return
+
+
+@router.websocket("/orders/{order_id}/live")
+async def live_location(
+    websocket: WebSocket,
+    order_id: UUID,
+    current: CurrentUser = Depends(get_current_user_ws),
+) -> None:
+    """
+    Canal en vivo de la posición del ally.
+
+    - Auth: `?token=<access_token>` (o header `Authorization: Bearer`).
+    - Acceso y estado de la orden se validan **una sola vez** al conectar;
+      si fallan, el socket se acepta y se cierra con `4000 + status HTTP`
+      (4403, 4404, 4409).
+    - Primer mensaje: `{"type": "snapshot", ...}` con el mismo contenido que `/current`.
+    - Luego: `{"type": "location", "ally_location": {...}}` por cada reporte del ally.
+    - Sin datos nuevos se envía `{"type": "ping"}` cada 25 s.
+    - Cuando la orden sale de `on_the_way`/`in_service` (done, cancelled) el
+      socket se cierra con 4409.
+    """
+    # Suscribirse antes de leer el snapshot para no perder un reporte intermedio.
+    queue = location_broadcaster.subscribe(order_id)
+    try:
+        try:
+            async with AsyncSessionLocal() as session:
+                data = await GetCurrent(
+                    orders_repo=PostgresOrderRepository(session=session, engine=engine),
+                    location_store=PostgresLocationStore(session=session),
+                ).execute(
+                    order_id=order_id,
+                    requester_id=current.id,
+                    requester_role=current.role,
+                )
+        except HTTPException as exc:
+            # Cerrar antes de accept() se traduce en un 403 del handshake y el
+            # cliente nunca ve el código: aceptar y luego cerrar.
+            await websocket.accept()
+            await websocket.close(code=4000 + exc.status_code, reason=str(exc.detail)[:120])
+            return
+
+        await websocket.accept()
+        ally_loc = data["ally_location"]
+        await websocket.send_json(
+            {
+                "type": "snapshot",
+                "order_id": str(order_id),
+                "order_status": data["order_status"],
+                "ally_location": _point_json(ally_loc) if ally_loc is not None else None,
+                "destination": data["destination"],
+                "staleness_seconds": data["staleness_seconds"],
+            }
+        )
+
+        disconnected = asyncio.create_task(_wait_disconnect(websocket))
+        loop = asyncio.get_running_loop()
+        last_sent = last_check = loop.time()
+        try:
+            while not disconnected.done():
+                getter = asyncio.ensure_future(queue.get())
+                done, _ = await asyncio.wait(
+                    {getter, disconnected},
+                    timeout=_LIVE_STATUS_CHECK_SECONDS,
+                    return_when=asyncio.FIRST_COMPLETED,
+                )
+                now = loop.time()
+                if getter in done:
+                    location = getter.result()
+                    await websocket.send_json({"type": "location", "ally_location": _point_json(location)})
+                    last_sent = now
+                else:
+                    getter.cancel()
+                    if disconnected in done:
+                        break
+                if now - last_check >= _LIVE_STATUS_CHECK_SECONDS:
+                    last_check = now
+                    reason = await _tracking_closed_reason(order_id)
+                    if reason is not None:
+                        await websocket.close(code=4409, reason=reason[:120])
+                        break
+                if now - last_sent >= _LIVE_KEEPALIVE_SECONDS:
+                    await websocket.send_json({"type": "ping"})
+                    last_sent = now
+        except (WebSocketDisconnect, RuntimeError):
+            pass
+        finally:
+            disconnected.cancel()
+    finally:
+        location_broadcaster.unsubscribe(order_id, queue)
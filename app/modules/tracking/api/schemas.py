@@ -3,8 +3,10 @@ Schemas Pydantic del módulo tracking.
 
 Contratos de request/response para los tres endpoints:
   - POST /tracking/orders/{order_id}/location  (ally reporta posición)
+  - POST /tracking/orders/{order_id}/locations/batch  (reenvío en lote tras perder señal)
   - GET  /tracking/orders/{order_id}/current   (última posición + destino)
   - GET  /tracking/orders/{order_id}/route     (polyline + ETA via Google Routes)
+  - GET  /tracking/orders/{order_id}/trail     (recorrido delta-encoded)
 """
 
 from __future__ import annotations
@@ -29,6 +31,17 @@ class ReportLocationIn(BaseModel):
     )
 
 
+class BatchPointIn(ReportLocationIn):
+    recorded_at: datetime = Field(..., description="Momento en que el app capturó el punto (ISO-8601)")
+
+
+class ReportLocationBatchIn(BaseModel):
+    points: list[BatchPointIn] = Field(
+        ..., min_length=1, max_length=500,
+        description="Puntos en orden cronológico (máx. 500)",
+    )
+
+
 # ---------------------------------------------------------------------------
 # Fragmento reutilizable — un punto geográfico con metadatos
 # ---------------------------------------------------------------------------
@@ -52,6 +65,13 @@ class ReportLocationOut(BaseModel):
     recorded_at: datetime
 
 
+class ReportLocationBatchOut(BaseModel):
+    """Confirmación del lote: cuántos puntos se guardaron y cuál quedó como actual."""
+    order_id: UUID
+    accepted: int
+    current: LocationPoint
+
+
 class CurrentLocationOut(BaseModel):
     """
     Última posición conocida del ally + destino del servicio.
@@ -71,11 +91,12 @@ class CurrentLocationOut(BaseModel):
 
 class RouteOut(BaseModel):
     """
-    Información de ruta y ETA calculada por Google Routes API.
+    Información de ruta y ETA.
 
-    - Todos los campos opcionales pueden ser None si:
-        a) El ally aún no reportó posición (no hay origen).
-        b) Google Routes devolvió error o no hay API key configurada.
+    - source = "google": proyección sobre la última ruta de Google Routes.
+    - source = "estimate": estimación local (línea recta × desvío, velocidad
+      por distrito); polyline es None hasta que Google responda.
+    - Todos los campos opcionales son None si el ally aún no reportó posición.
     """
     order_id: UUID
     ally_location: Optional[LocationPoint]
@@ -84,3 +105,21 @@ class RouteOut(BaseModel):
     eta_display: Optional[str]               # e.g. "7 min" para mostrar en UI
     polyline: Optional[str]                  # encoded polyline para Google Maps SDK
     distance_meters: Optional[int]
+    source: Optional[str] = None             # "google" | "estimate"
+
+
+class TrailOut(BaseModel):
+    """
+    Recorrido del ally en formato compacto (delta encoding).
+
+    - points[0] = [lat_e5, lng_e5, t_epoch] absoluto.
+    - points[i] = [Δlat_e5, Δlng_e5, Δt_segundos] respecto al anterior.
+    - lat/lng reales = valor acumulado / 10**precision.
+    - Para continuar (polling o paginación) usar since = last_recorded_at.
+    """
+    order_id: UUID
+    precision: int
+    points: list[list[int]]
+    count: int
+    last_recorded_at: Optional[datetime]
+    has_more: bool
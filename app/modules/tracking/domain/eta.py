@@ -0,0 +1,192 @@
+"""
+Estimación de distancia/ETA local (sin red).
+
+Responsabilidades (funciones puras, sin I/O):
+  - Distancia great-circle (haversine) entre dos puntos WGS-84.
+  - Encode/decode de encoded polylines (formato Google, precisión 1e5).
+  - Proyección de la posición del ally sobre una ruta cacheada → distancia
+    restante a lo largo de la ruta y desvío respecto a ella.
+  - Modelo de velocidad por distrito para estimar ETA sin Google.
+
+Uso:
+  - GetRoute responde de inmediato con estos cálculos; Google Routes solo
+    refina la ruta en segundo plano (ver infra/route_cache.py).
+  - Hace testeable el tracking sin red.
+"""
+
+from __future__ import annotations
+
+import math
+from dataclasses import dataclass, field
+from typing import Sequence
+
+EARTH_RADIUS_M = 6_371_000.0
+
+LatLng = tuple[float, float]
+
+
+# ---------------------------------------------------------------------------
+# Distancia
+# ---------------------------------------------------------------------------
+
+def haversine_m(lat1: float, lng1: float, lat2: float, lng2: float) -> float:
+    """Distancia great-circle en metros."""
+    p1, p2 = math.radians(lat1), math.radians(lat2)
+    dp = p2 - p1
+    dl = math.radians(lng2 - lng1)
+    a = math.sin(dp / 2) ** 2 + math.cos(p1) * math.cos(p2) * math.sin(dl / 2) ** 2
+    return 2 * EARTH_RADIUS_M * math.asin(min(1.0, math.sqrt(a)))
+
+
+# ---------------------------------------------------------------------------
+# Encoded polyline (https://developers.google.com/maps/documentation/utilities/polylinealgorithm)
+# ---------------------------------------------------------------------------
+
+def _encode_value(value: int) -> str:
+    value = ~(value << 1) if value < 0 else value << 1
+    chunks: list[str] = []
+    while value >= 0x20:
+        chunks.append(chr((0x20 | (value & 0x1F)) + 63))
+        value >>= 5
+    chunks.append(chr(value + 63))
+    return "".join(chunks)
+
+
+def encode_polyline(points: Sequence[LatLng], precision: int = 5) -> str:
+    scale = 10 ** precision
+    out: list[str] = []
+    prev_lat = prev_lng = 0
+    for lat, lng in points:
+        ilat, ilng = round(lat * scale), round(lng * scale)
+        out.append(_encode_value(ilat - prev_lat))
+        out.append(_encode_value(ilng - prev_lng))
+        prev_lat, prev_lng = ilat, ilng
+    return "".join(out)
+
+
+def decode_polyline(encoded: str, precision: int = 5) -> list[LatLng]:
+    scale = 10 ** precision
+    points: list[LatLng] = []
+    index = lat = lng = 0
+    length = len(encoded)
+    while index < length:
+        deltas = []
+        for _ in range(2):
+            shift = result = 0
+            while True:
+                if index >= length:
+                    raise ValueError("invalid_polyline: truncated value")
+                byte = ord(encoded[index]) - 63
+                index += 1
+                result |= (byte & 0x1F) << shift
+                shift += 5
+                if byte < 0x20:
+                    break
+            deltas.append(~(result >> 1) if result & 1 else result >> 1)
+        lat += deltas[0]
+        lng += deltas[1]
+        points.append((lat / scale, lng / scale))
+    return points
+
+
+# ---------------------------------------------------------------------------
+# Proyección sobre una ruta
+# ---------------------------------------------------------------------------
+
+@dataclass(frozen=True)
+class Projection:
+    segment_index: int      # segmento de la ruta más cercano
+    offset_m: float         # distancia del ally a la ruta (desvío)
+    remaining_m: float      # distancia restante a lo largo de la ruta
+
+
+@dataclass(frozen=True)
+class RouteGeometry:
+    """Ruta decodificada con distancias acumuladas precalculadas (se arma una vez por ruta)."""
+    points: tuple[LatLng, ...]
+    # suffix_m[i] = distancia desde points[i] hasta el final de la ruta
+    suffix_m: tuple[float, ...] = field(repr=False)
+
+    @classmethod
+    def from_points(cls, points: Sequence[LatLng]) -> "RouteGeometry":
+        pts = tuple(points)
+        suffix = [0.0] * len(pts)
+        for i in range(len(pts) - 2, -1, -1):
+            suffix[i] = suffix[i + 1] + haversine_m(*pts[i], *pts[i + 1])
+        return cls(points=pts, suffix_m=tuple(suffix))
+
+    @classmethod
+    def from_encoded(cls, encoded: str) -> "RouteGeometry":
+        return cls.from_points(decode_polyline(encoded))
+
+    @property
+    def length_m(self) -> float:
+        return self.suffix_m[0] if self.suffix_m else 0.0
+
+    def project(self, lat: float, lng: float) -> Projection | None:
+        """
+        Proyecta (lat, lng) sobre el segmento más cercano. Usa una aproximación
+        equirectangular local, precisa a escala urbana (< 0.1 % en pocos km).
+        """
+        if len(self.points) < 2:
+            return None
+        kx = math.cos(math.radians(lat)) * (math.pi / 180) * EARTH_RADIUS_M
+        ky = (math.pi / 180) * EARTH_RADIUS_M
+
+        best: Projection | None = None
+        for i in range(len(self.points) - 1):
+            (alat, alng), (blat, blng) = self.points[i], self.points[i + 1]
+            ax, ay = (alng - lng) * kx, (alat - lat) * ky
+            bx, by = (blng - lng) * kx, (blat - lat) * ky
+            dx, dy = bx - ax, by - ay
+            seg2 = dx * dx + dy * dy
+            t = 0.0 if seg2 == 0 else max(0.0, min(1.0, -(ax * dx + ay * dy) / seg2))
+            cx, cy = ax + t * dx, ay + t * dy
+            offset = math.hypot(cx, cy)
+            if best is None or offset < best.offset_m:
+                remaining = math.hypot(bx - cx, by - cy) + self.suffix_m[i + 1]
+                best = Projection(segment_index=i, offset_m=offset, remaining_m=remaining)
+        return best
+
+
+# ---------------------------------------------------------------------------
+# Modelo de velocidad
+# ---------------------------------------------------------------------------
+
+def parse_district_speeds(raw: str | None) -> dict[str, float]:
+    """'150101:14,150122:22' → {'150101': 14.0, '150122': 22.0}. Ignora entradas inválidas."""
+    speeds: dict[str, float] = {}
+    for item in (raw or "").split(","):
+        district_id, sep, kmh = item.strip().partition(":")
+        if not sep:
+            continue
+        try:
+            value = float(kmh)
+        except ValueError:
+            continue
+        if value > 0:
+            speeds[district_id.strip()] = value
+    return speeds
+
+
+@dataclass(frozen=True)
+class SpeedModel:
+    """
+    Velocidad media urbana (km/h) por distrito de destino + factor de desvío
+    (la distancia por calles es mayor que la línea recta).
+    """
+    default_kmh: float
+    district_kmh: dict[str, float] = field(default_factory=dict)
+    detour_factor: float = 1.3
+
+    def speed_mps(self, district_id: str | None) -> float:
+        kmh = self.district_kmh.get(str(district_id), self.default_kmh) if district_id else self.default_kmh
+        return max(kmh, 1.0) / 3.6
+
+    def estimate(self, origin: LatLng, dest: LatLng, district_id: str | None = None) -> tuple[int, int]:
+        """(eta_seconds, distance_meters) estimados por línea recta × desvío."""
+        distance = haversine_m(*origin, *dest) * self.detour_factor
+        return round(distance / self.speed_mps(district_id)), round(distance)
+
+    def seconds_for(self, distance_m: float, district_id: str | None = None) -> int:
+        return round(distance_m / self.speed_mps(district_id))
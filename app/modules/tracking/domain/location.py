@@ -12,6 +12,8 @@ Reglas de negocio:
   - El cliente, el ally y el admin pueden leer la posición cuando la orden
     está en on_the_way o in_service.
   - Fuera de esos estados el tracking está cerrado.
+  - El recorrido (trail) sigue disponible tras finalizar el servicio (done)
+    para soporte y disputas; el admin lo puede leer en cualquier estado.
 """
 
 from __future__ import annotations
@@ -20,7 +22,7 @@ from dataclasses import dataclass
 from datetime import datetime
 from uuid import UUID
 
-from app.modules.orders.domain.order import Order, OrderStatus
+from app.modules.orders.domain.order import Order, OrderParticipation, OrderStatus
 
 
 # ---------------------------------------------------------------------------
@@ -37,6 +39,11 @@ TRACKING_READABLE_STATUSES: frozenset[OrderStatus] = frozenset(
     {OrderStatus.on_the_way, OrderStatus.in_service}
 )
 
+# Recorrido histórico: también tras finalizar el servicio (disputas)
+TRAIL_READABLE_STATUSES: frozenset[OrderStatus] = frozenset(
+    {OrderStatus.on_the_way, OrderStatus.in_service, OrderStatus.done}
+)
+
 
 # ---------------------------------------------------------------------------
 # Value object
@@ -57,7 +64,7 @@ class AllyLocation:
 # Reglas puras — sin I/O, lanzan ValueError con código descriptivo
 # ---------------------------------------------------------------------------
 
-def assert_tracking_writable(order: Order) -> None:
+def assert_tracking_writable(order: Order | OrderParticipation) -> None:
     """
     Verifica que el tracking acepta escrituras para esta orden.
     El ally puede reportar posición en on_the_way e in_service.
@@ -69,7 +76,7 @@ def assert_tracking_writable(order: Order) -> None:
         )
 
 
-def assert_tracking_readable(order: Order) -> None:
+def assert_tracking_readable(order: Order | OrderParticipation) -> None:
     """
     Verifica que el tracking tiene datos visibles para esta orden.
     """
@@ -80,7 +87,21 @@ def assert_tracking_readable(order: Order) -> None:
         )
 
 
-def assert_is_ally(order: Order, ally_id: UUID) -> None:
+def assert_trail_readable(order: Order | OrderParticipation, requester_role: str) -> None:
+    """
+    Verifica que el recorrido histórico es visible para esta orden.
+    El admin puede leerlo en cualquier estado.
+    """
+    if requester_role == "admin":
+        return
+    if order.status not in TRAIL_READABLE_STATUSES:
+        raise ValueError(
+            f"trail_not_available: order status is '{order.status.value}', "
+            f"expected one of {sorted(s.value for s in TRAIL_READABLE_STATUSES)}"
+        )
+
+
+def assert_is_ally(order: Order | OrderParticipation, ally_id: UUID) -> None:
     """Verifica que el requester es el ally asignado a la orden."""
     if order.ally_id is None:
         raise ValueError("tracking_forbidden: order has no ally assigned")
@@ -88,7 +109,7 @@ def assert_is_ally(order: Order, ally_id: UUID) -> None:
         raise ValueError("tracking_forbidden: requester is not the assigned ally")
 
 
-def assert_can_read(order: Order, requester_id: UUID, requester_role: str) -> None:
+def assert_can_read(order: Order | OrderParticipation, requester_id: UUID, requester_role: str) -> None:
     """
     Verifica que el requester tiene permiso de lectura.
     - Cliente dueño de la orden.
@@ -0,0 +1,48 @@
+"""
+Codificación compacta del recorrido (trail) del ally.
+
+Formato (delta encoding, ints):
+  - Coordenadas en grados × 1e5 (≈ 1.1 m de resolución, igual que las
+    encoded polylines de Google).
+  - Tiempo en segundos epoch UTC.
+  - points[0] = [lat_e5, lng_e5, t] absoluto.
+  - points[i] = [Δlat_e5, Δlng_e5, Δt] respecto al punto anterior.
+
+Con reportes cada 10 s los deltas son números de 1–3 dígitos: el JSON de un
+recorrido de 1 h (~360 puntos) ocupa unos pocos KB.
+"""
+
+from __future__ import annotations
+
+from datetime import datetime, timezone
+from typing import Iterable
+
+TRAIL_PRECISION = 5
+_SCALE = 10 ** TRAIL_PRECISION
+
+
+def encode_trail(points: Iterable[tuple[float, float, datetime]]) -> list[list[int]]:
+    """points: (lat, lng, recorded_at) ordenados por recorded_at ascendente."""
+    encoded: list[list[int]] = []
+    prev: tuple[int, int, int] | None = None
+    for lat, lng, recorded_at in points:
+        cur = (round(lat * _SCALE), round(lng * _SCALE), int(recorded_at.timestamp()))
+        if prev is None:
+            encoded.append(list(cur))
+        else:
+            encoded.append([cur[0] - prev[0], cur[1] - prev[1], cur[2] - prev[2]])
+        prev = cur
+    return encoded
+
+
+def decode_trail(encoded: list[list[int]]) -> list[tuple[float, float, datetime]]:
+    """Inversa de encode_trail (útil para tests y herramientas de soporte)."""
+    points: list[tuple[float, float, datetime]] = []
+    lat_e5 = lng_e5 = t = 0
+    for i, (dlat, dlng, dt) in enumerate(encoded):
+        if i == 0:
+            lat_e5, lng_e5, t = dlat, dlng, dt
+        else:
+            lat_e5, lng_e5, t = lat_e5 + dlat, lng_e5 + dlng, t + dt
+        points.append((lat_e5 / _SCALE, lng_e5 / _SCALE, datetime.fromtimestamp(t, tz=timezone.utc)))
+    return points
@@ -0,0 +1,80 @@
+"""
+Canal en vivo de posiciones del ally (push en lugar de polling).
+
+Flujo:
+  1. PostgresLocationStore.upsert emite NOTIFY 'tracking_locations' en la
+     misma transacción que escribe ally_locations.
+  2. Cada instancia escucha el canal (app.core.pubsub.pg_listener) y reenvía
+     la posición al Broadcaster local, indexado por order_id.
+  3. Los WebSocket de /tracking/orders/{id}/live conectados a esa instancia
+     reciben la posición sin tocar la base de datos.
+
+Costo: 1 write + 1 NOTIFY por reporte, independiente de cuántos clientes miran.
+"""
+
+from __future__ import annotations
+
+import json
+import logging
+from datetime import datetime
+from uuid import UUID
+
+from app.core.pubsub import Broadcaster, pg_listener
+from app.modules.tracking.domain.location import AllyLocation
+
+logger = logging.getLogger(__name__)
+
+LOCATIONS_CHANNEL = "tracking_locations"
+
+# Cola por cliente: basta con pocas posiciones, al cliente lento se le entrega la última.
+location_broadcaster = Broadcaster(queue_size=8)
+
+
+def location_to_payload(location: AllyLocation) -> str:
+    return json.dumps(
+        {
+            "order_id": str(location.order_id),
+            "ally_id": str(location.ally_id),
+            "lat": location.lat,
+            "lng": location.lng,
+            "accuracy_m": location.accuracy_m,
+            "recorded_at": location.recorded_at.isoformat(),
+        },
+        separators=(",", ":"),
+    )
+
+
+def payload_to_location(payload: str) -> AllyLocation:
+    data = json.loads(payload)
+    return AllyLocation(
+        order_id=UUID(data["order_id"]),
+        ally_id=UUID(data["ally_id"]),
+        lat=data["lat"],
+        lng=data["lng"],
+        accuracy_m=data.get("accuracy_m"),
+        recorded_at=datetime.fromisoformat(data["recorded_at"]),
+    )
+
+
+def _on_location_notify(payload: str) -> None:
+    try:
+        location = payload_to_location(payload)
+    except (ValueError, KeyError, TypeError) as exc:
+        logger.warning("tracking live: invalid payload: %s", exc)
+        return
+    location_broadcaster.publish(location.order_id, location)
+
+
+def publish_local(location: AllyLocation) -> None:
+    """
+    Entrega directa al Broadcaster de esta instancia.
+    Solo se usa si no hay LISTEN activo; con LISTEN la posición llega vía NOTIFY
+    (incluida la propia instancia) y publicar aquí la duplicaría.
+    """
+    if not pg_listener.is_listening:
+        location_broadcaster.publish(location.order_id, location)
+
+
+def register_live_channel() -> None:
+    """Registra el callback del canal. Se llama en el lifespan antes de pg_listener.start()."""
+    pg_listener.on(LOCATIONS_CHANNEL, _on_location_notify)
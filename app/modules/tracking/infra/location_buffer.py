@@ -0,0 +1,123 @@
+"""
+Buffer de ingesta de posiciones (write-coalescing).
+
+Problema:
+  Cada reporte del ally era un INSERT ... ON CONFLICT + COMMIT. Con cientos de
+  allies reportando cada 10 s son miles de transacciones mínimas por minuto.
+
+Diseño:
+  - En memoria se guarda SOLO la última posición por order_id (un reporte más
+    nuevo pisa al anterior: para ally_locations solo importa la última).
+  - Una tarea asyncio vacía el buffer cada TRACKING_FLUSH_INTERVAL_MS, o antes
+    si se alcanzan TRACKING_FLUSH_MAX_BATCH órdenes pendientes.
+  - El flush es un único upsert multi-fila + NOTIFY en una sola transacción
+    (PostgresLocationStore.upsert_many), junto con los puntos pendientes del
+    historial (infra/location_history.py).
+  - Las lecturas (PostgresLocationStore.get) consultan primero el buffer, así
+    que ven posiciones aún no persistidas en esta instancia.
+  - Si el flush falla, los puntos vuelven al buffer (sin pisar reportes más nuevos).
+  - Con TRACKING_FLUSH_INTERVAL_MS=0 el buffer no arranca y se escribe directo.
+
+Trade-off: en caída abrupta de la instancia se pierde como máximo un intervalo
+de posiciones; el ally vuelve a reportar a los 10 s.
+"""
+
+from __future__ import annotations
+
+import asyncio
+import logging
+from uuid import UUID
+
+from app.core.settings import settings
+from app.modules.tracking.domain.location import AllyLocation
+from app.modules.tracking.infra.location_history import location_history
+
+logger = logging.getLogger(__name__)
+
+
+class LocationIngestBuffer:
+    def __init__(self, *, interval_ms: int, max_batch: int) -> None:
+        self._interval = interval_ms / 1000
+        self._max_batch = max(1, max_batch)
+        self._pending: dict[UUID, AllyLocation] = {}
+        # Lote que se está escribiendo: sigue visible para get() hasta el commit.
+        self._inflight: dict[UUID, AllyLocation] = {}
+        self._wake = asyncio.Event()
+        self._task: asyncio.Task | None = None
+        self._flush_lock = asyncio.Lock()
+
+    @property
+    def running(self) -> bool:
+        return self._task is not None
+
+    def put(self, location: AllyLocation) -> None:
+        current = self._pending.get(location.order_id)
+        if current is not None and current.recorded_at > location.recorded_at:
+            return
+        self._pending[location.order_id] = location
+        if len(self._pending) >= self._max_batch:
+            self._wake.set()
+
+    def get(self, order_id: UUID) -> AllyLocation | None:
+        return self._pending.get(order_id) or self._inflight.get(order_id)
+
+    def discard(self, order_id: UUID) -> None:
+        self._pending.pop(order_id, None)
+        self._inflight.pop(order_id, None)
+
+    async def start(self) -> None:
+        if self._task is not None or self._interval <= 0:
+            return
+        self._task = asyncio.create_task(self._run(), name="tracking_location_buffer")
+
+    async def stop(self) -> None:
+        task, self._task = self._task, None
+        if task is not None:
+            task.cancel()
+            try:
+                await task
+            except asyncio.CancelledError:
+                pass
+        # Último flush para no perder lo pendiente al apagar la instancia.
+        await self.flush()
+
+    async def flush(self) -> int:
+        async with self._flush_lock:
+            if not self._pending and not location_history.has_unpersisted:
+                return 0
+            self._inflight, self._pending = self._pending, {}
+            batch = list(self._inflight.values())
+            history = location_history.drain_unpersisted()
+            try:
+                from app.core.db import AsyncSessionLocal
+                from app.modules.tracking.infra.postgres_location_store import PostgresLocationStore
+
+                async with AsyncSessionLocal() as session:
+                    await PostgresLocationStore(session=session).upsert_many(batch, history=history)
+            except Exception as exc:
+                logger.error("tracking flush failed size=%s: %s", len(batch), exc)
+                for location in batch:
+                    self.put(location)
+                location_history.requeue(history)
+                return 0
+            finally:
+                self._inflight = {}
+            return len(batch)
+
+    async def _run(self) -> None:
+        while True:
+            try:
+                await asyncio.wait_for(self._wake.wait(), timeout=self._interval)
+            except asyncio.TimeoutError:
+                pass
+            self._wake.clear()
+            await self.flush()
+
+
+# ---------------------------------------------------------------------------
+# Singleton de proceso — arrancado/detenido en el lifespan de app.main.
+# ---------------------------------------------------------------------------
+location_buffer = LocationIngestBuffer(
+    interval_ms=settings.TRACKING_FLUSH_INTERVAL_MS,
+    max_batch=settings.TRACKING_FLUSH_MAX_BATCH,
+)
@@ -0,0 +1,275 @@
+"""
+Historial de posiciones del ally (trail) — append-only y acotado.
+
+Dos capas:
+  1. LocationHistoryRing (memoria, por instancia):
+       - ring buffer de tamaño fijo por orden (deque maxlen) con los puntos
+         recientes → lecturas del trail sin DB para lo más nuevo.
+       - cola acotada de puntos aún no persistidos; se vacía en el mismo flush
+         del buffer de ingesta (una sola transacción) o en el write directo.
+  2. ally_location_history (PostgreSQL):
+       - tabla particionada por día (RANGE sobre recorded_at).
+       - el job de mantenimiento crea las particiones futuras y elimina las
+         que superan TRACKING_HISTORY_RETENTION_DAYS (DROP de partición, sin
+         DELETE masivo ni bloat).
+
+Acotado: memoria = órdenes activas × TRACKING_HISTORY_RING_SIZE; disco =
+días de retención; lecturas = índice (order_id, recorded_at) + límite de puntos.
+
+Pérdida acotada: la cola de no persistidos guarda hasta
+TRACKING_FLUSH_MAX_BATCH × 20 puntos (10 000 por defecto). Si la DB no
+responde mientras llegan más, se descartan los más viejos: con ~1 reporte
+cada 10 s por ally, 500 allies activos llenan la cola en ~3 min de caída.
+Cada descarte suma en tracking_history_points_dropped_total{reason="queue_full"}
+(los días sin partición, en {reason="no_partition"}) y se loguea como máximo
+una vez por minuto. Solo se pierde el trail histórico; la última posición
+vive en ally_locations.
+"""
+
+from __future__ import annotations
+
+import logging
+import time
+from collections import deque
+from datetime import date, datetime, timedelta, timezone
+from uuid import UUID
+
+from sqlalchemy import text
+from sqlalchemy.exc import DBAPIError
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from app.core.metrics import tracking_history_points_dropped_total
+from app.core.settings import settings
+from app.modules.tracking.domain.location import AllyLocation
+
+logger = logging.getLogger(__name__)
+
+HISTORY_TABLE = "ally_location_history"
+_PARTITION_PREFIX = f"{HISTORY_TABLE}_p"
+
+# Intervalo mínimo entre warnings por cola de no persistidos llena.
+_DROP_LOG_INTERVAL_SECONDS = 60.0
+
+
+def oldest_retained_at(now: datetime | None = None) -> datetime:
+    """
+    Inicio de la partición más vieja que conserva el job de mantenimiento
+    (drop_expired_partitions). Puntos anteriores no tienen partición.
+    """
+    today = (now or datetime.now(timezone.utc)).astimezone(timezone.utc).date()
+    day = today - timedelta(days=settings.TRACKING_HISTORY_RETENTION_DAYS)
+    return datetime(day.year, day.month, day.day, tzinfo=timezone.utc)
+
+
+class LocationHistoryRing:
+    def __init__(self, *, ring_size: int, max_unpersisted: int) -> None:
+        self._ring_size = max(1, ring_size)
+        self._rings: dict[UUID, deque[AllyLocation]] = {}
+        # Si la DB no responde por un rato se descartan los puntos más viejos.
+        self._unpersisted: deque[AllyLocation] = deque(maxlen=max(1, max_unpersisted))
+        self._dropped_unlogged = 0
+        self._drop_logged_at = float("-inf")
+
+    @property
+    def has_unpersisted(self) -> bool:
+        return bool(self._unpersisted)
+
+    def append(self, location: AllyLocation) -> None:
+        ring = self._rings.get(location.order_id)
+        if ring is None:
+            ring = self._rings[location.order_id] = deque(maxlen=self._ring_size)
+        ring.append(location)
+        if len(self._unpersisted) == self._unpersisted.maxlen:
+            self._record_dropped(1)
+        self._unpersisted.append(location)
+
+    def recent(self, order_id: UUID, since: datetime) -> list[AllyLocation]:
+        ring = self._rings.get(order_id)
+        if not ring:
+            return []
+        return [loc for loc in ring if loc.recorded_at > since]
+
+    def drain_unpersisted(self) -> list[AllyLocation]:
+        points = list(self._unpersisted)
+        self._unpersisted.clear()
+        return points
+
+    def requeue(self, points: list[AllyLocation]) -> None:
+        """Devuelve a la cola puntos cuyo write falló (delante de los nuevos)."""
+        pending = list(self._unpersisted)
+        overflow = len(points) + len(pending) - self._unpersisted.maxlen
+        if overflow > 0:
+            self._record_dropped(overflow)
+        self._unpersisted.clear()
+        self._unpersisted.extend(points)
+        self._unpersisted.extend(pending)
+
+    def _record_dropped(self, count: int) -> None:
+        tracking_history_points_dropped_total.inc(count, reason="queue_full")
+        self._dropped_unlogged += count
+        now = time.monotonic()
+        if now - self._drop_logged_at >= _DROP_LOG_INTERVAL_SECONDS:
+            logger.warning(
+                "tracking history queue full, dropped oldest points=%s max=%s",
+                self._dropped_unlogged,
+                self._unpersisted.maxlen,
+            )
+            self._dropped_unlogged = 0
+            self._drop_logged_at = now
+
+    def discard(self, order_id: UUID) -> None:
+        self._rings.pop(order_id, None)
+
+    def prune(self, *, max_age: timedelta) -> int:
+        """Libera los rings de órdenes sin reportes recientes."""
+        cutoff = datetime.now(timezone.utc) - max_age
+        stale = [oid for oid, ring in self._rings.items() if not ring or ring[-1].recorded_at < cutoff]
+        for order_id in stale:
+            del self._rings[order_id]
+        return len(stale)
+
+
+class PostgresLocationHistoryStore:
+    """Acceso a ally_location_history. No hace commit: participa de la transacción del caller."""
+
+    def __init__(self, session: AsyncSession) -> None:
+        self._session = session
+
+    async def insert_many(self, locations: list[AllyLocation]) -> None:
+        if not locations:
+            return
+        await self._session.execute(
+            text(
+                f"""
+                INSERT INTO {HISTORY_TABLE}
+                    (order_id, ally_id, lat, lng, accuracy_m, recorded_at)
+                SELECT * FROM unnest(
+                    CAST(:order_ids AS uuid[]),
+                    CAST(:ally_ids AS uuid[]),
+                    CAST(:lats AS float8[]),
+                    CAST(:lngs AS float8[]),
+                    CAST(:accuracies AS float8[]),
+                    CAST(:recorded_ats AS timestamptz[])
+                )
+                """
+            ),
+            {
+                "order_ids":    [loc.order_id for loc in locations],
+                "ally_ids":     [loc.ally_id for loc in locations],
+                "lats":         [loc.lat for loc in locations],
+                "lngs":         [loc.lng for loc in locations],
+                "accuracies":   [loc.accuracy_m for loc in locations],
+                "recorded_ats": [loc.recorded_at for loc in locations],
+            },
+        )
+
+    async def insert_many_by_day(self, locations: list[AllyLocation]) -> int:
+        """
+        Inserta agrupando por día UTC, cada día en su propio savepoint. Un día
+        sin partición (reloj del celular, retención ya aplicada) se descarta
+        sin abortar la transacción del caller: así no envenena el flush
+        compartido ni se reencola para siempre. Devuelve los puntos descartados.
+        """
+        by_day: dict[date, list[AllyLocation]] = {}
+        for loc in locations:
+            by_day.setdefault(loc.recorded_at.astimezone(timezone.utc).date(), []).append(loc)
+        dropped = 0
+        for day, points in sorted(by_day.items()):
+            try:
+                async with self._session.begin_nested():
+                    await self.insert_many(points)
+            except DBAPIError as exc:
+                dropped += len(points)
+                tracking_history_points_dropped_total.inc(len(points), reason="no_partition")
+                logger.warning(
+                    "tracking history dropped day=%s points=%s: %s", day, len(points), exc.orig or exc
+                )
+        return dropped
+
+    async def list_since(self, order_id: UUID, *, since: datetime, limit: int) -> list[AllyLocation]:
+        """Puntos posteriores a `since` en orden cronológico (el filtro por fecha poda particiones)."""
+        result = await self._session.execute(
+            text(
+                f"""
+                SELECT order_id, ally_id, lat, lng, accuracy_m, recorded_at
+                FROM {HISTORY_TABLE}
+                WHERE order_id = :order_id AND recorded_at > :since
+                ORDER BY recorded_at
+                LIMIT :limit
+                """
+            ),
+            {"order_id": order_id, "since": since, "limit": limit},
+        )
+        return [
+            AllyLocation(
+                order_id=row["order_id"],
+                ally_id=row["ally_id"],
+                lat=row["lat"],
+                lng=row["lng"],
+                accuracy_m=row["accuracy_m"],
+                recorded_at=row["recorded_at"],
+            )
+            for row in result.mappings().all()
+        ]
+
+    async def ensure_partitions(self, *, days_ahead: int) -> list[str]:
+        """Crea (si faltan) las particiones diarias de hoy a hoy + days_ahead (UTC)."""
+        created: list[str] = []
+        today = datetime.now(timezone.utc).date()
+        for offset in range(days_ahead + 1):
+            day = today + timedelta(days=offset)
+            name = f"{_PARTITION_PREFIX}{day:%Y%m%d}"
+            await self._session.execute(
+                text(
+                    f"CREATE TABLE IF NOT EXISTS {name} PARTITION OF {HISTORY_TABLE} "
+                    f"FOR VALUES FROM ('{day.isoformat()} 00:00:00+00') "
+                    f"TO ('{(day + timedelta(days=1)).isoformat()} 00:00:00+00')"
+                )
+            )
+            created.append(name)
+        return created
+
+    async def drop_expired_partitions(self, *, retention_days: int) -> list[str]:
+        """Elimina las particiones cuyo día completo quedó fuera de la retención."""
+        result = await self._session.execute(
+            text(
+                """
+                SELECT c.relname
+                FROM pg_inherits i
+                JOIN pg_class c ON c.oid = i.inhrelid
+                JOIN pg_class p ON p.oid = i.inhparent
+                WHERE p.relname = :parent
+                """
+            ),
+            {"parent": HISTORY_TABLE},
+        )
+        cutoff = datetime.now(timezone.utc).date() - timedelta(days=retention_days)
+        dropped: list[str] = []
+        for (name,) in result.all():
+            try:
+                day = date(int(name[-8:-4]), int(name[-4:-2]), int(name[-2:]))
+            except ValueError:
+                continue
+            if day < cutoff:
+                await self._session.execute(text(f"DROP TABLE IF EXISTS {name}"))
+                dropped.append(name)
+        return dropped
+
+
+async def run_history_maintenance(session: AsyncSession) -> None:
+    """Job periódico: particiones futuras, retención y limpieza de rings en memoria."""
+    store = PostgresLocationHistoryStore(session=session)
+    await store.ensure_partitions(days_ahead=2)
+    dropped = await store.drop_expired_partitions(retention_days=settings.TRACKING_HISTORY_RETENTION_DAYS)
+    await session.commit()
+    pruned = location_history.prune(max_age=timedelta(hours=2))
+    logger.info("tracking_history_maintenance dropped=%s pruned_rings=%s", dropped, pruned)
+
+
+# ---------------------------------------------------------------------------
+# Singleton de proceso
+# ---------------------------------------------------------------------------
+location_history = LocationHistoryRing(
+    ring_size=settings.TRACKING_HISTORY_RING_SIZE,
+    max_unpersisted=settings.TRACKING_FLUSH_MAX_BATCH * 20,
+)
@@ -9,6 +9,13 @@ Diseño:
   - INSERT ... ON CONFLICT (order_id) DO UPDATE → atómico, sin race conditions.
   - La interfaz pública (upsert / get / delete) es idéntica al LocationStore
     original, por lo que ningún use case necesita cambios.
+  - upsert emite NOTIFY en la misma transacción para el canal en vivo
+    (ver infra/live_channel.py).
+  - Con el buffer de ingesta activo (infra/location_buffer.py), upsert solo
+    encola y el buffer persiste en lote vía upsert_many.
+  - Cada punto se agrega también al historial (infra/location_history.py),
+    que se persiste en la misma transacción que ally_locations pero en
+    savepoints por día: un punto sin partición se descarta sin abortarla.
 
 Intervalo de reporte recomendado: cada 10 segundos desde el app del ally.
 """
@@ -20,7 +27,18 @@ from uuid import UUID
 from sqlalchemy import text
 from sqlalchemy.ext.asyncio import AsyncSession
 
+from app.core.pubsub import notify, notify_many
 from app.modules.tracking.domain.location import AllyLocation
+from app.modules.tracking.infra.live_channel import (
+    LOCATIONS_CHANNEL,
+    location_to_payload,
+    publish_local,
+)
+from app.modules.tracking.infra.location_buffer import location_buffer
+from app.modules.tracking.infra.location_history import (
+    PostgresLocationHistoryStore,
+    location_history,
+)
 
 
 class PostgresLocationStore:
@@ -34,6 +52,11 @@ class PostgresLocationStore:
 
     async def upsert(self, location: AllyLocation) -> None:
         """Guarda o sobreescribe la última posición del ally para esta orden."""
+        location_history.append(location)
+        if location_buffer.running:
+            location_buffer.put(location)
+            return
+        history = location_history.drain_unpersisted()
         await self._session.execute(
             text(
                 """
@@ -58,10 +81,95 @@ class PostgresLocationStore:
                 "recorded_at": location.recorded_at,
             },
         )
+        await notify(self._session, LOCATIONS_CHANNEL, location_to_payload(location))
+        try:
+            await PostgresLocationHistoryStore(session=self._session).insert_many_by_day(history)
+            await self._session.commit()
+        except Exception:
+            location_history.requeue(history)
+            raise
+        publish_local(location)
+
+    async def upsert_batch(self, locations: list[AllyLocation]) -> None:
+        """
+        Lote de una misma orden (reconexión del ally): todos los puntos van al
+        historial y solo el más nuevo queda como posición actual.
+        """
+        if not locations:
+            return
+        for location in locations:
+            location_history.append(location)
+        newest = max(locations, key=lambda loc: loc.recorded_at)
+        if location_buffer.running:
+            location_buffer.put(newest)
+            return
+        history = location_history.drain_unpersisted()
+        try:
+            await self.upsert_many([newest], history=history)
+        except Exception:
+            location_history.requeue(history)
+            raise
+
+    async def upsert_many(
+        self,
+        locations: list[AllyLocation],
+        history: list[AllyLocation] | None = None,
+    ) -> None:
+        """
+        Upsert multi-fila en una sola sentencia (flush del buffer de ingesta).
+        El WHERE evita que un lote atrasado pise una posición más reciente
+        escrita por otra instancia. `history` (todos los puntos, no solo el
+        último por orden) se inserta en la misma transacción, en savepoints
+        por día: un punto sin partición no bloquea ally_locations.
+        """
+        if not locations:
+            if history:
+                await PostgresLocationHistoryStore(session=self._session).insert_many_by_day(history)
+            await self._session.commit()
+            return
+        await self._session.execute(
+            text(
+                """
+                INSERT INTO ally_locations
+                    (order_id, ally_id, lat, lng, accuracy_m, recorded_at)
+                SELECT * FROM unnest(
+                    CAST(:order_ids AS uuid[]),
+                    CAST(:ally_ids AS uuid[]),
+                    CAST(:lats AS float8[]),
+                    CAST(:lngs AS float8[]),
+                    CAST(:accuracies AS float8[]),
+                    CAST(:recorded_ats AS timestamptz[])
+                )
+                ON CONFLICT (order_id) DO UPDATE SET
+                    ally_id     = EXCLUDED.ally_id,
+                    lat         = EXCLUDED.lat,
+                    lng         = EXCLUDED.lng,
+                    accuracy_m  = EXCLUDED.accuracy_m,
+                    recorded_at = EXCLUDED.recorded_at
+                WHERE EXCLUDED.recorded_at >= ally_locations.recorded_at
+                """
+            ),
+            {
+                "order_ids":    [loc.order_id for loc in locations],
+                "ally_ids":     [loc.ally_id for loc in locations],
+                "lats":         [loc.lat for loc in locations],
+                "lngs":         [loc.lng for loc in locations],
+                "accuracies":   [loc.accuracy_m for loc in locations],
+                "recorded_ats": [loc.recorded_at for loc in locations],
+            },
+        )
+        await notify_many(self._session, LOCATIONS_CHANNEL, [location_to_payload(loc) for loc in locations])
+        if history:
+            await PostgresLocationHistoryStore(session=self._session).insert_many_by_day(history)
         await self._session.commit()
+        for location in locations:
+            publish_local(location)
 
     async def get(self, order_id: UUID) -> AllyLocation | None:
         """Devuelve la última posición conocida, o None si aún no hay datos."""
+        buffered = location_buffer.get(order_id)
+        if buffered is not None:
+            return buffered
         result = await self._session.execute(
             text(
                 """
@@ -86,6 +194,7 @@ class PostgresLocationStore:
 
     async def delete(self, order_id: UUID) -> None:
         """Elimina la entrada cuando el servicio termina o se cancela."""
+        location_buffer.discard(order_id)
         await self._session.execute(
             text("DELETE FROM ally_locations WHERE order_id = :order_id"),
             {"order_id": str(order_id)},
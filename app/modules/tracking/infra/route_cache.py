@@ -0,0 +1,292 @@
+"""
+Cache de rutas/ETA por orden (Google Routes API).
+
+Problema:
+  GET /route llamaba a Google en cada request (1 llamada paga por viewer por
+  poll) y abría un httpx.AsyncClient nuevo cada vez (handshake TLS incluido).
+
+Diseño:
+  - Una entrada por order_id con la ruta calculada desde el origen de ese momento.
+  - Se recalcula solo si:
+      a) el ally se alejó más de TRACKING_ROUTE_RECOMPUTE_METERS del origen cacheado,
+      b) pasó TRACKING_ROUTE_TTL_SECONDS, o
+      c) cambió el destino.
+  - Entre recálculos, la posición del ally se proyecta sobre la polyline
+    cacheada (domain/eta.py): distancia restante a lo largo de la ruta y ETA
+    proporcional al de Google (sin red).
+  - Single-flight: requests concurrentes de la misma orden comparten una sola
+    llamada en curso.
+  - GetRoute no espera a Google: usa peek() + schedule_refresh() y responde
+    con lo cacheado o con la estimación local mientras Google refina.
+  - Si Google falla y hay una ruta vencida, se sirve la vencida (interpolada)
+    en lugar de un 502. El fallo queda registrado con backoff exponencial
+    (15 s, 30 s, ... hasta el TTL) por orden: mientras dure, ningún poll
+    vuelve a llamar a Google.
+  - Cambios de la orden (NOTIFY 'orders_participation': estado, ally,
+    destino) descartan la ruta y el backoff de esa orden.
+  - Un único httpx.AsyncClient con pool de conexiones para todo el proceso,
+    cerrado en el lifespan (close_http_client).
+
+Estado por instancia: cada instancia de Cloud Run tiene su propio cache; el
+costo queda acotado a ~1 llamada por orden activa por TTL por instancia.
+"""
+
+from __future__ import annotations
+
+import asyncio
+import logging
+import time
+from dataclasses import dataclass
+from typing import Any, Awaitable, Callable
+from uuid import UUID
+
+import httpx
+
+from app.core.pubsub import pg_listener
+from app.core.settings import settings
+from app.modules.orders.infra.participation_cache import PARTICIPATION_CHANNEL
+from app.modules.tracking.domain.eta import RouteGeometry, haversine_m
+
+logger = logging.getLogger(__name__)
+
+# Backoff tras un fallo de Google: base × 2^(fallos-1), tope = TTL de la ruta.
+_FAILURE_BACKOFF_SECONDS = 15.0
+
+_http_client: httpx.AsyncClient | None = None
+
+
+def get_http_client() -> httpx.AsyncClient:
+    """Cliente HTTP compartido (keep-alive + pool) para las llamadas de tracking."""
+    global _http_client
+    if _http_client is None or _http_client.is_closed:
+        _http_client = httpx.AsyncClient(
+            timeout=httpx.Timeout(8.0, connect=3.0),
+            limits=httpx.Limits(max_connections=20, max_keepalive_connections=10),
+        )
+    return _http_client
+
+
+async def close_http_client() -> None:
+    global _http_client
+    client, _http_client = _http_client, None
+    if client is not None and not client.is_closed:
+        await client.aclose()
+
+
+@dataclass(frozen=True)
+class CachedRoute:
+    origin_lat: float
+    origin_lng: float
+    dest_lat: float
+    dest_lng: float
+    eta_seconds: int | None
+    distance_meters: int | None
+    polyline: str | None
+    computed_at: float          # time.monotonic()
+    geometry: RouteGeometry | None = None
+
+    def interpolate(self, lat: float, lng: float) -> tuple[int | None, int | None]:
+        """
+        ETA/distancia desde la posición actual. Con polyline: proyección sobre
+        la ruta (distancia restante real por calles). Sin polyline: fracción de
+        la distancia en línea recta que aún falta.
+        """
+        projection = self.geometry.project(lat, lng) if self.geometry is not None else None
+        if projection is not None and self.geometry.length_m >= 1:
+            ratio = min(1.0, projection.remaining_m / self.geometry.length_m)
+            eta = round(self.eta_seconds * ratio) if self.eta_seconds is not None else None
+            return eta, round(projection.remaining_m)
+
+        total = haversine_m(self.origin_lat, self.origin_lng, self.dest_lat, self.dest_lng)
+        if total < 1:
+            return self.eta_seconds, self.distance_meters
+        remaining = haversine_m(lat, lng, self.dest_lat, self.dest_lng)
+        ratio = min(1.0, remaining / total)
+        eta = round(self.eta_seconds * ratio) if self.eta_seconds is not None else None
+        distance = round(self.distance_meters * ratio) if self.distance_meters is not None else None
+        return eta, distance
+
+
+RouteFetcher = Callable[[float, float, float, float], Awaitable[dict[str, Any]]]
+
+
+class RouteCache:
+    def __init__(self, *, ttl_seconds: int, recompute_distance_m: int, max_entries: int = 5000) -> None:
+        self._ttl = ttl_seconds
+        self._recompute_m = recompute_distance_m
+        self._max_entries = max_entries
+        self._entries: dict[UUID, CachedRoute] = {}
+        self._inflight: dict[UUID, asyncio.Future] = {}
+        # order_id → (monotonic hasta el que no se reintenta, fallos consecutivos)
+        self._failures: dict[UUID, tuple[float, int]] = {}
+        # Referencias fuertes a los refresh en segundo plano (evita que el GC los cancele).
+        self._background: set[asyncio.Task] = set()
+
+    def _is_fresh(self, entry: CachedRoute, lat: float, lng: float, dest: tuple[float, float]) -> bool:
+        if (entry.dest_lat, entry.dest_lng) != dest:
+            return False
+        if time.monotonic() - entry.computed_at > self._ttl:
+            return False
+        return haversine_m(entry.origin_lat, entry.origin_lng, lat, lng) <= self._recompute_m
+
+    def peek(self, order_id: UUID, *, dest: tuple[float, float]) -> CachedRoute | None:
+        """Ruta cacheada para el mismo destino, sin importar su antigüedad."""
+        entry = self._entries.get(order_id)
+        if entry is None or (entry.dest_lat, entry.dest_lng) != dest:
+            return None
+        return entry
+
+    def is_fresh(self, order_id: UUID, *, origin: tuple[float, float], dest: tuple[float, float]) -> bool:
+        entry = self._entries.get(order_id)
+        return entry is not None and self._is_fresh(entry, origin[0], origin[1], dest)
+
+    def in_backoff(self, order_id: UUID) -> bool:
+        """True si el último cálculo falló y aún no toca reintentar."""
+        failure = self._failures.get(order_id)
+        return failure is not None and time.monotonic() < failure[0]
+
+    def _record_failure(self, order_id: UUID) -> None:
+        _, count = self._failures.pop(order_id, (0.0, 0))
+        count += 1
+        delay = min(_FAILURE_BACKOFF_SECONDS * 2 ** (count - 1), max(self._ttl, _FAILURE_BACKOFF_SECONDS))
+        if len(self._failures) >= self._max_entries:
+            self._failures.pop(next(iter(self._failures)))
+        self._failures[order_id] = (time.monotonic() + delay, count)
+
+    def schedule_refresh(
+        self,
+        order_id: UUID,
+        *,
+        origin: tuple[float, float],
+        dest: tuple[float, float],
+        fetch: RouteFetcher,
+    ) -> None:
+        """Recalcula en segundo plano si hace falta (respeta single-flight y frescura)."""
+        if (
+            order_id in self._inflight
+            or self.in_backoff(order_id)
+            or self.is_fresh(order_id, origin=origin, dest=dest)
+        ):
+            return
+
+        async def _refresh() -> None:
+            try:
+                await self.get_route(order_id, origin=origin, dest=dest, fetch=fetch)
+            except Exception as exc:
+                logger.warning("route refresh failed order_id=%s: %s", order_id, exc)
+
+        task = asyncio.create_task(_refresh())
+        self._background.add(task)
+        task.add_done_callback(self._background.discard)
+
+    async def get_route(
+        self,
+        order_id: UUID,
+        *,
+        origin: tuple[float, float],
+        dest: tuple[float, float],
+        fetch: RouteFetcher,
+    ) -> CachedRoute:
+        entry = self._entries.get(order_id)
+        if entry is not None and self._is_fresh(entry, origin[0], origin[1], dest):
+            return entry
+
+        inflight = self._inflight.get(order_id)
+        if inflight is not None:
+            return await asyncio.shield(inflight)
+
+        if self.in_backoff(order_id):
+            if entry is not None and (entry.dest_lat, entry.dest_lng) == dest:
+                return entry
+            raise RuntimeError("route_fetch_backoff")
+
+        future: asyncio.Future = asyncio.get_running_loop().create_future()
+        self._inflight[order_id] = future
+        try:
+            route = await fetch(origin[0], origin[1], dest[0], dest[1])
+            polyline = route.get("polyline", {}).get("encodedPolyline")
+            fresh = CachedRoute(
+                origin_lat=origin[0],
+                origin_lng=origin[1],
+                dest_lat=dest[0],
+                dest_lng=dest[1],
+                eta_seconds=_parse_duration(route.get("duration")),
+                distance_meters=route.get("distanceMeters"),
+                polyline=polyline,
+                computed_at=time.monotonic(),
+                geometry=_geometry(polyline),
+            )
+            self._store(order_id, fresh)
+            self._failures.pop(order_id, None)
+            future.set_result(fresh)
+            return fresh
+        except Exception as exc:
+            self._record_failure(order_id)
+            # Ruta vencida como fallback (mismo destino) antes que propagar el error.
+            if entry is not None and (entry.dest_lat, entry.dest_lng) == dest:
+                future.set_result(entry)
+                return entry
+            future.set_exception(exc)
+            future.exception()  # marcar como leída si nadie más la espera
+            raise
+        finally:
+            # Líder cancelado (BaseException): los que esperan el mismo cálculo
+            # no deben quedar colgados.
+            if not future.done():
+                future.set_exception(RuntimeError("route_fetch_cancelled"))
+                future.exception()
+            self._inflight.pop(order_id, None)
+
+    def _store(self, order_id: UUID, entry: CachedRoute) -> None:
+        if order_id not in self._entries and len(self._entries) >= self._max_entries:
+            # Desalojo simple: la entrada más antigua (dict mantiene orden de inserción).
+            self._entries.pop(next(iter(self._entries)))
+        self._entries.pop(order_id, None)
+        self._entries[order_id] = entry
+
+    def invalidate(self, order_id: UUID) -> None:
+        self._entries.pop(order_id, None)
+        self._failures.pop(order_id, None)
+
+
+def _geometry(polyline: str | None) -> RouteGeometry | None:
+    if not polyline:
+        return None
+    try:
+        return RouteGeometry.from_encoded(polyline)
+    except ValueError:
+        return None
+
+
+def _parse_duration(duration: str | None) -> int | None:
+    """Google devuelve la duración como '420s'."""
+    if not duration:
+        return None
+    try:
+        return int(str(duration).rstrip("s"))
+    except ValueError:
+        return None
+
+
+def _on_participation_notify(payload: str) -> None:
+    try:
+        route_cache.invalidate(UUID(payload))
+    except ValueError:
+        logger.warning("route cache: invalid payload %r", payload)
+
+
+def register_route_cache_channel() -> None:
+    """
+    Descarta la ruta cuando cambia la orden (estado, ally, destino) en
+    cualquier instancia. Se llama en el lifespan antes de pg_listener.start().
+    """
+    pg_listener.on(PARTICIPATION_CHANNEL, _on_participation_notify)
+
+
+# ---------------------------------------------------------------------------
+# Singleton de proceso
+# ---------------------------------------------------------------------------
+route_cache = RouteCache(
+    ttl_seconds=settings.TRACKING_ROUTE_TTL_SECONDS,
+    recompute_distance_m=settings.TRACKING_ROUTE_RECOMPUTE_METERS,
+)
@@ -2,7 +2,7 @@
 Use case: obtener la última posición conocida del ally y el destino del servicio.
 
 Flujo:
-  1. Lee la orden.
+  1. Lee la participación de la orden (cacheada, ver orders/infra/participation_cache.py).
   2. Valida que el tracking está disponible para lectura.
   3. Valida que el requester tiene acceso (dueño / ally asignado / admin).
   4. Lee la última posición del LocationStore (puede ser None si el ally aún no reportó).
@@ -20,7 +20,7 @@ from uuid import UUID
 
 from fastapi import HTTPException, status
 
-from app.modules.orders.domain.order import Order
+from app.modules.orders.domain.order import Order, OrderParticipation
 from app.modules.orders.infra.postgres_order_repository import PostgresOrderRepository
 from app.modules.tracking.domain.location import (
     AllyLocation,
@@ -30,7 +30,7 @@ from app.modules.tracking.domain.location import (
 from app.modules.tracking.infra.postgres_location_store import PostgresLocationStore
 
 
-def _extract_destination(order: Order) -> dict[str, Any]:
+def _extract_destination(order: Order | OrderParticipation) -> dict[str, Any]:
     """
     Extrae lat/lng del delivery_address_snapshot de la orden.
     Lanza HTTPException 422 si la orden no tiene dirección de entrega con coordenadas.
@@ -68,8 +68,8 @@ class GetCurrent:
           order_id, order_status, ally_location (AllyLocation | None),
           destination (dict lat/lng), staleness_seconds (int | None)
         """
-        # 1. Leer orden
-        order = await self.orders_repo.get_order_admin(id=order_id)
+        # 1. Leer participación de la orden (cache TTL)
+        order = await self.orders_repo.get_participation(id=order_id)
         if order is None:
             raise HTTPException(
                 status_code=status.HTTP_404_NOT_FOUND,
@@ -1,11 +1,17 @@
 """
-Use case: obtener polyline, ETA y distancia via Google Routes API.
+Use case: obtener polyline, ETA y distancia.
 
 Comportamiento:
-  - Si GOOGLE_ROUTES_API_KEY no está configurada → HTTP 501 (no implementado).
+  - Responde siempre de inmediato, sin esperar a la red:
+      a) Con ruta de Google cacheada (infra/route_cache.py) → se proyecta la
+         posición actual sobre la polyline (source="google").
+      b) Sin ruta cacheada → estimación local por línea recta × desvío y
+         velocidad del distrito (domain/eta.py, source="estimate", sin polyline).
+  - Si GOOGLE_ROUTES_API_KEY está configurada, Google refina en segundo plano:
+    solo se vuelve a pedir si el ally se movió lo suficiente o venció el TTL.
+    Los errores de Google se loguean; el cliente sigue recibiendo la estimación.
   - Si el ally aún no reportó posición → devuelve RouteOut con campos None
     (el frontend muestra el destino sin ruta trazada).
-  - Si Google Routes falla → HTTP 502 con detalle del error.
 
 Google Routes API (v2):
   POST https://routes.googleapis.com/directions/v2:computeRoutes
@@ -23,14 +29,17 @@ from uuid import UUID
 import httpx
 from fastapi import HTTPException, status
 
+from app.core.metrics import track_external
 from app.core.settings import settings
 from app.modules.orders.infra.postgres_order_repository import PostgresOrderRepository
+from app.modules.tracking.domain.eta import SpeedModel, parse_district_speeds
 from app.modules.tracking.domain.location import (
     AllyLocation,
     assert_can_read,
     assert_tracking_readable,
 )
 from app.modules.tracking.infra.postgres_location_store import PostgresLocationStore
+from app.modules.tracking.infra.route_cache import get_http_client, route_cache
 from app.modules.tracking.use_cases.get_current import _extract_destination
 
 logger = logging.getLogger(__name__)
@@ -38,6 +47,12 @@ logger = logging.getLogger(__name__)
 _ROUTES_URL = "https://routes.googleapis.com/directions/v2:computeRoutes"
 _FIELD_MASK = "routes.duration,routes.distanceMeters,routes.polyline.encodedPolyline"
 
+_speed_model = SpeedModel(
+    default_kmh=settings.TRACKING_DEFAULT_SPEED_KMH,
+    district_kmh=parse_district_speeds(settings.TRACKING_DISTRICT_SPEEDS_KMH),
+    detour_factor=settings.TRACKING_DETOUR_FACTOR,
+)
+
 
 def _seconds_to_display(seconds: int) -> str:
     """Convierte segundos a string legible. Ej: 420 → '7 min', 3700 → '1 h 2 min'."""
@@ -67,8 +82,8 @@ async def _call_google_routes(
         "Content-Type": "application/json",
     }
     try:
-        async with httpx.AsyncClient(timeout=8.0) as client:
-            resp = await client.post(_ROUTES_URL, json=body, headers=headers)
+        async with track_external("google_routes", "compute_routes"):
+            resp = await get_http_client().post(_ROUTES_URL, json=body, headers=headers)
             resp.raise_for_status()
             data = resp.json()
     except httpx.HTTPStatusError as exc:
@@ -108,17 +123,11 @@ class GetRoute:
         """
         Devuelve un dict con las claves:
           order_id, ally_location (AllyLocation | None), destination (dict),
-          eta_seconds, eta_display, polyline, distance_meters
+          eta_seconds, eta_display, polyline, distance_meters,
+          source ("google" | "estimate" | None)
         """
-        # Prerequisito: API key configurada
-        if not settings.GOOGLE_ROUTES_API_KEY:
-            raise HTTPException(
-                status_code=status.HTTP_501_NOT_IMPLEMENTED,
-                detail="routes_not_configured: GOOGLE_ROUTES_API_KEY is not set",
-            )
-
-        # 1. Leer orden
-        order = await self.orders_repo.get_order_admin(id=order_id)
+        # 1. Leer participación de la orden (cache TTL)
+        order = await self.orders_repo.get_participation(id=order_id)
         if order is None:
             raise HTTPException(
                 status_code=status.HTTP_404_NOT_FOUND,
@@ -159,25 +168,28 @@ class GetRoute:
                 "eta_display": None,
                 "polyline": None,
                 "distance_meters": None,
+                "source": None,
             }
 
-        # 6. Llamar a Google Routes
-        route = await _call_google_routes(
-            origin_lat=ally_location.lat,
-            origin_lng=ally_location.lng,
-            dest_lat=destination["lat"],
-            dest_lng=destination["lng"],
-        )
-
-        duration_str: str = route.get("duration", "0s")
-        # duration viene como "420s" → extraer entero
-        try:
-            eta_seconds = int(duration_str.rstrip("s"))
-        except ValueError:
-            eta_seconds = None
-
-        distance_meters: int | None = route.get("distanceMeters")
-        polyline: str | None = route.get("polyline", {}).get("encodedPolyline")
+        origin = (ally_location.lat, ally_location.lng)
+        dest = (destination["lat"], destination["lng"])
+
+        # 6. Refinamiento con Google en segundo plano (solo si hace falta recalcular)
+        if settings.GOOGLE_ROUTES_API_KEY:
+            route_cache.schedule_refresh(order_id, origin=origin, dest=dest, fetch=_call_google_routes)
+
+        # 7. ETA/distancia desde la posición actual: ruta cacheada o estimación local
+        cached = route_cache.peek(order_id, dest=dest)
+        polyline: str | None
+        if cached is not None:
+            eta_seconds, distance_meters = cached.interpolate(*origin)
+            polyline = cached.polyline
+            source = "google"
+        else:
+            district_id = (order.delivery_address_snapshot or {}).get("district_id")
+            eta_seconds, distance_meters = _speed_model.estimate(origin, dest, district_id)
+            polyline = None
+            source = "estimate"
         eta_display = _seconds_to_display(eta_seconds) if eta_seconds is not None else None
 
         return {
@@ -188,4 +200,5 @@ class GetRoute:
             "eta_display": eta_display,
             "polyline": polyline,
             "distance_meters": distance_meters,
+            "source": source,
         }
@@ -0,0 +1,109 @@
+"""
+Use case: recorrido (trail) del ally para una orden.
+
+Flujo:
+  1. Lee la participación de la orden (cacheada).
+  2. Valida que el trail es visible (on_the_way / in_service / done; admin siempre).
+  3. Valida que el requester tiene acceso (dueño / ally asignado / admin).
+  4. Lee los puntos posteriores a `since` de ally_location_history (acotado).
+  5. Completa con los puntos recientes del ring en memoria aún no persistidos.
+  6. Devuelve los puntos codificados en deltas (domain/trail.py).
+"""
+
+from __future__ import annotations
+
+from dataclasses import dataclass
+from datetime import datetime, timedelta, timezone
+from typing import Any
+from uuid import UUID
+
+from fastapi import HTTPException, status
+
+from app.modules.orders.infra.postgres_order_repository import PostgresOrderRepository
+from app.modules.tracking.domain.location import (
+    AllyLocation,
+    assert_can_read,
+    assert_trail_readable,
+)
+from app.modules.tracking.domain.trail import TRAIL_PRECISION, encode_trail
+from app.modules.tracking.infra.location_history import (
+    PostgresLocationHistoryStore,
+    location_history,
+)
+
+# Límite de puntos por respuesta: el cliente pagina con `since = last_recorded_at`.
+TRAIL_MAX_POINTS = 2000
+# Sin `since` se devuelve la ventana de las últimas 24 h.
+_DEFAULT_WINDOW = timedelta(hours=24)
+
+
+@dataclass
+class GetTrail:
+    orders_repo: PostgresOrderRepository
+    history_store: PostgresLocationHistoryStore
+
+    async def execute(
+        self,
+        *,
+        order_id: UUID,
+        requester_id: UUID,
+        requester_role: str,
+        since: datetime | None,
+    ) -> dict[str, Any]:
+        """
+        Devuelve un dict con las claves:
+          order_id, precision, points (list[list[int]]), count,
+          last_recorded_at (datetime | None), has_more (bool)
+        """
+        # 1. Leer participación de la orden (cache TTL)
+        order = await self.orders_repo.get_participation(id=order_id)
+        if order is None:
+            raise HTTPException(
+                status_code=status.HTTP_404_NOT_FOUND,
+                detail="Order not found",
+            )
+
+        # 2. Trail visible
+        try:
+            assert_trail_readable(order, requester_role)
+        except ValueError as exc:
+            raise HTTPException(
+                status_code=status.HTTP_409_CONFLICT,
+                detail=str(exc),
+            ) from exc
+
+        # 3. Acceso
+        try:
+            assert_can_read(order, requester_id, requester_role)
+        except ValueError as exc:
+            raise HTTPException(
+                status_code=status.HTTP_403_FORBIDDEN,
+                detail=str(exc),
+            ) from exc
+
+        if since is None:
+            since = datetime.now(timezone.utc) - _DEFAULT_WINDOW
+        elif since.tzinfo is None:
+            since = since.replace(tzinfo=timezone.utc)
+
+        # 4. Puntos persistidos (uno extra para saber si hay más)
+        persisted = await self.history_store.list_since(order_id, since=since, limit=TRAIL_MAX_POINTS + 1)
+
+        # 5. Merge con el ring en memoria (dedupe por timestamp)
+        by_time: dict[datetime, AllyLocation] = {loc.recorded_at: loc for loc in persisted}
+        for loc in location_history.recent(order_id, since):
+            by_time.setdefault(loc.recorded_at, loc)
+        points = sorted(by_time.values(), key=lambda loc: loc.recorded_at)
+
+        has_more = len(points) > TRAIL_MAX_POINTS
+        points = points[:TRAIL_MAX_POINTS]
+
+        # 6. Delta encoding
+        return {
+            "order_id": order_id,
+            "precision": TRAIL_PRECISION,
+            "points": encode_trail((loc.lat, loc.lng, loc.recorded_at) for loc in points),
+            "count": len(points),
+            "last_recorded_at": points[-1].recorded_at if points else None,
+            "has_more": has_more,
+        }
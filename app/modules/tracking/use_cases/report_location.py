@@ -2,10 +2,10 @@
 Use case: el ally/groomer reporta su posición actual.
 
 Flujo:
-  1. Lee la orden (sin restricción de user_id, igual que streaming).
+  1. Lee la participación de la orden (cacheada, sin restricción de user_id).
   2. Valida que el tracking está abierto para escritura (on_the_way o in_service).
   3. Valida que el requester es el ally asignado a esa orden.
-  4. Almacena la posición en el LocationStore (en memoria).
+  4. Almacena la posición en el LocationStore (buffer de ingesta → PostgreSQL).
   5. Devuelve la AllyLocation guardada.
 """
 
@@ -40,8 +40,8 @@ class ReportLocation:
         lng: float,
         accuracy_m: float | None,
     ) -> AllyLocation:
-        # 1. Leer orden (admin-level: sin filtro por user_id)
-        order = await self.orders_repo.get_order_admin(id=order_id)
+        # 1. Leer participación de la orden (cache TTL, sin filtro por user_id)
+        order = await self.orders_repo.get_participation(id=order_id)
         if order is None:
             raise HTTPException(
                 status_code=status.HTTP_404_NOT_FOUND,
@@ -66,7 +66,7 @@ class ReportLocation:
                 detail=str(exc),
             ) from exc
 
-        # 4. Guardar en PostgreSQL (upsert por order_id)
+        # 4. Guardar (encolado en el buffer; se persiste en lote por order_id)
         location = AllyLocation(
             order_id=order_id,
             ally_id=ally_id,
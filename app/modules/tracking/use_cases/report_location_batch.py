@@ -0,0 +1,110 @@
+"""
+Use case: el ally reenvía en lote las posiciones acumuladas sin señal.
+
+Flujo:
+  1. Lee la participación de la orden (una sola vez para todo el lote).
+  2. Valida tracking abierto para escritura y que el requester es el ally asignado.
+  3. Valida el lote: ordenado por recorded_at, sin timestamps en el futuro
+     ni anteriores a la partición más vieja del historial (retención).
+  4. Guarda todos los puntos en el historial y solo el más nuevo como posición
+     actual (PostgresLocationStore.upsert_batch).
+  5. Devuelve la lista de AllyLocation aceptadas.
+"""
+
+from __future__ import annotations
+
+from dataclasses import dataclass
+from datetime import datetime, timedelta, timezone
+from typing import Sequence
+from uuid import UUID
+
+from fastapi import HTTPException, status
+
+from app.modules.orders.infra.postgres_order_repository import PostgresOrderRepository
+from app.modules.tracking.domain.location import (
+    AllyLocation,
+    assert_is_ally,
+    assert_tracking_writable,
+)
+from app.modules.tracking.infra.location_history import oldest_retained_at
+from app.modules.tracking.infra.postgres_location_store import PostgresLocationStore
+
+# Tolerancia para relojes de celulares levemente adelantados.
+_MAX_CLOCK_SKEW = timedelta(seconds=60)
+
+
+@dataclass
+class ReportLocationBatch:
+    orders_repo: PostgresOrderRepository
+    location_store: PostgresLocationStore
+
+    async def execute(
+        self,
+        *,
+        order_id: UUID,
+        ally_id: UUID,
+        points: Sequence[tuple[float, float, float | None, datetime]],
+    ) -> list[AllyLocation]:
+        """points: (lat, lng, accuracy_m, recorded_at) en orden cronológico."""
+        # 1. Leer participación de la orden (cache TTL, sin filtro por user_id)
+        order = await self.orders_repo.get_participation(id=order_id)
+        if order is None:
+            raise HTTPException(
+                status_code=status.HTTP_404_NOT_FOUND,
+                detail="Order not found",
+            )
+
+        # 2. Tracking abierto + ally asignado
+        try:
+            assert_tracking_writable(order)
+        except ValueError as exc:
+            raise HTTPException(
+                status_code=status.HTTP_409_CONFLICT,
+                detail=str(exc),
+            ) from exc
+        try:
+            assert_is_ally(order, ally_id)
+        except ValueError as exc:
+            raise HTTPException(
+                status_code=status.HTTP_403_FORBIDDEN,
+                detail=str(exc),
+            ) from exc
+
+        # 3. Validar el lote
+        now = datetime.now(timezone.utc)
+        max_allowed = now + _MAX_CLOCK_SKEW
+        min_allowed = oldest_retained_at(now)
+        locations: list[AllyLocation] = []
+        for lat, lng, accuracy_m, recorded_at in points:
+            if recorded_at.tzinfo is None:
+                recorded_at = recorded_at.replace(tzinfo=timezone.utc)
+            if recorded_at > max_allowed:
+                raise HTTPException(
+                    status_code=status.HTTP_422_UNPROCESSABLE_ENTITY,
+                    detail="tracking_batch_invalid: recorded_at is in the future",
+                )
+            if recorded_at < min_allowed:
+                raise HTTPException(
+                    status_code=status.HTTP_422_UNPROCESSABLE_ENTITY,
+                    detail="tracking_batch_invalid: recorded_at is older than the history retention window",
+                )
+            if locations and recorded_at < locations[-1].recorded_at:
+                raise HTTPException(
+                    status_code=status.HTTP_422_UNPROCESSABLE_ENTITY,
+                    detail="tracking_batch_invalid: points must be ordered by recorded_at",
+                )
+            locations.append(
+                AllyLocation(
+                    order_id=order_id,
+                    ally_id=ally_id,
+                    lat=lat,
+                    lng=lng,
+                    accuracy_m=accuracy_m,
+                    recorded_at=recorded_at,
+                )
+            )
+
+        # 4. Historial completo + solo el último como posición actual
+        await self.location_store.upsert_batch(locations)
+
+        return locations
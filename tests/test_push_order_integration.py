@@ -1,9 +1,66 @@
-"""Integration tests: Order creation and status update trigger push notifications."""
+"""Integration tests: Order creation and status update trigger push notifications.
+
+Los pushes salen por el outbox (push_outbox → PushOutboxWorker). Los tests
+cambian el provider del worker por uno falso y drenan el outbox en el loop
+de la app para ver qué mensajes se habrían enviado a Expo.
+"""
+import asyncio
+import time
 import uuid
 
+import pytest
 from fastapi.testclient import TestClient
 
 from app.main import app
+from app.modules.notifications.infra.dispatcher import notification_dispatcher
+from app.modules.push.infra.outbox_worker import push_outbox_worker
+
+
+class FakeAsyncPushProvider:
+    def __init__(self):
+        self.messages = []
+
+    async def send_chunk(self, messages):
+        self.messages.extend(messages)
+        return [{"status": "ok", "id": f"fake-{uuid.uuid4()}"} for _ in messages]
+
+    async def get_receipts(self, ticket_ids):
+        return {ticket_id: {"status": "ok"} for ticket_id in ticket_ids}
+
+
+@pytest.fixture
+def provider(monkeypatch):
+    fake = FakeAsyncPushProvider()
+    monkeypatch.setattr("app.modules.push.infra.outbox_worker.get_async_push_provider", lambda: fake)
+    return fake
+
+
+@pytest.fixture
+def client(provider):
+    with TestClient(app) as c:
+        yield c
+
+
+def _pushes_for_order(
+    client: TestClient, provider: FakeAsyncPushProvider, order_id: str, *, until=bool, timeout: float = 5.0
+) -> list[dict]:
+    """
+    Escribe las notificaciones agrupadas y drena el outbox hasta que los pushes
+    de la orden cumplan `until` (o se agote el tiempo). Devuelve esos pushes.
+    """
+    client.portal.call(notification_dispatcher.flush)
+    deadline = time.monotonic() + timeout
+    while True:
+        # El worker de fondo también drena con el provider falso; SKIP LOCKED reparte las filas.
+        client.portal.call(push_outbox_worker.drain_once)
+        sent = [m for m in provider.messages if (m.get("data") or {}).get("order_id") == order_id]
+        if until(sent) or time.monotonic() >= deadline:
+            return sent
+        client.portal.call(asyncio.sleep, 0.1)
+
+
+def _token(label: str) -> str:
+    return f"ExponentPushToken[{label}-{uuid.uuid4().hex[:12]}]"
 
 
 def _auth_headers(client: TestClient, *, email: str, password: str, role: str = "user") -> dict:
@@ -45,23 +102,12 @@ def _create_checked_out_cart(client: TestClient, headers: dict) -> str:
     return cart_id
 
 
-def test_create_order_sends_push_to_registered_device(monkeypatch):
-    captured = []
-
-    def fake_send(self, tokens, message):
-        captured.append({"tokens": tokens, "title": message.title, "body": message.body})
-
-    monkeypatch.setattr("app.modules.push.infra.provider.MockPushProvider.send", fake_send)
-
-    client = TestClient(app)
+def test_create_order_sends_push_to_registered_device(client, provider):
     email = f"push_order_{uuid.uuid4().hex}@example.com"
     headers = _auth_headers(client, email=email, password="pass1234")
+    token = _token("order")
 
-    r = client.post(
-        "/push/devices",
-        json={"platform": "android", "token": "ExponentPushToken[test-order-001]"},
-        headers=headers,
-    )
+    r = client.post("/push/devices", json={"platform": "android", "token": token}, headers=headers)
     assert r.status_code == 201
 
     cart_id = _create_checked_out_cart(client, headers)
@@ -69,20 +115,11 @@ def test_create_order_sends_push_to_registered_device(monkeypatch):
     r = client.post("/orders", json={"cart_id": cart_id}, headers=headers)
     assert r.status_code in (200, 201)
 
-    assert len(captured) >= 1, "MockPushProvider.send no fue invocado al crear el order"
-    tokens_sent = captured[0]["tokens"]
-    assert "ExponentPushToken[test-order-001]" in tokens_sent
-
-
-def test_create_order_no_push_when_no_device_registered(monkeypatch):
-    captured = []
+    sent = _pushes_for_order(client, provider, r.json()["id"])
+    assert [m["to"] for m in sent] == [token], "No se envió push al crear el order"
 
-    def fake_send(self, tokens, message):
-        captured.append({"tokens": tokens})
 
-    monkeypatch.setattr("app.modules.push.infra.provider.MockPushProvider.send", fake_send)
-
-    client = TestClient(app)
+def test_create_order_no_push_when_no_device_registered(client, provider):
     email = f"push_nodevice_{uuid.uuid4().hex}@example.com"
     headers = _auth_headers(client, email=email, password="pass1234")
 
@@ -90,29 +127,19 @@ def test_create_order_no_push_when_no_device_registered(monkeypatch):
     r = client.post("/orders", json={"cart_id": cart_id}, headers=headers)
     assert r.status_code in (200, 201)
 
-    assert len(captured) == 0, "No debería enviar push si no hay device tokens registrados"
-
-
-def test_update_order_status_sends_push(monkeypatch):
-    captured = []
-
-    def fake_send(self, tokens, message):
-        captured.append({"tokens": tokens, "title": message.title})
+    sent = _pushes_for_order(client, provider, r.json()["id"], timeout=1.0)
+    assert sent == [], "No debería enviar push si no hay device tokens registrados"
 
-    monkeypatch.setattr("app.modules.push.infra.provider.MockPushProvider.send", fake_send)
 
-    client = TestClient(app)
+def test_update_order_status_sends_push(client, provider):
     user_email = f"push_status_user_{uuid.uuid4().hex}@example.com"
     admin_email = f"push_status_admin_{uuid.uuid4().hex}@example.com"
 
     user_headers = _auth_headers(client, email=user_email, password="pass1234", role="user")
     admin_headers = _auth_headers(client, email=admin_email, password="pass1234", role="admin")
+    token = _token("status")
 
-    r = client.post(
-        "/push/devices",
-        json={"platform": "ios", "token": "ExponentPushToken[test-status-001]"},
-        headers=user_headers,
-    )
+    r = client.post("/push/devices", json={"platform": "ios", "token": token}, headers=user_headers)
     assert r.status_code == 201
 
     cart_id = _create_checked_out_cart(client, user_headers)
@@ -120,9 +147,6 @@ def test_update_order_status_sends_push(monkeypatch):
     assert r.status_code in (200, 201)
     order_id = r.json()["id"]
 
-    # Reset captured after order creation push
-    captured.clear()
-
     r = client.post(
         f"/orders/{order_id}/status",
         json={"status": "in_process"},
@@ -130,28 +154,19 @@ def test_update_order_status_sends_push(monkeypatch):
     )
     assert r.status_code == 200
 
-    assert len(captured) >= 1, "MockPushProvider.send no fue invocado al actualizar status"
-    tokens_sent = captured[0]["tokens"]
-    assert "ExponentPushToken[test-status-001]" in tokens_sent
-
+    def _in_process(sent):
+        return [m for m in sent if m["data"].get("status") == "in_process"]
 
-def test_deactivated_device_does_not_receive_push(monkeypatch):
-    captured = []
+    sent = _in_process(_pushes_for_order(client, provider, order_id, until=_in_process))
+    assert [m["to"] for m in sent] == [token], "No se envió push al actualizar status"
 
-    def fake_send(self, tokens, message):
-        captured.append({"tokens": tokens})
 
-    monkeypatch.setattr("app.modules.push.infra.provider.MockPushProvider.send", fake_send)
-
-    client = TestClient(app)
+def test_deactivated_device_does_not_receive_push(client, provider):
     email = f"push_deact_{uuid.uuid4().hex}@example.com"
     headers = _auth_headers(client, email=email, password="pass1234")
+    token = _token("deact")
 
-    r = client.post(
-        "/push/devices",
-        json={"platform": "android", "token": "ExponentPushToken[deact-token]"},
-        headers=headers,
-    )
+    r = client.post("/push/devices", json={"platform": "android", "token": token}, headers=headers)
     assert r.status_code == 201
     device_id = r.json()["id"]
 
@@ -162,4 +177,5 @@ def test_deactivated_device_does_not_receive_push(monkeypatch):
     r = client.post("/orders", json={"cart_id": cart_id}, headers=headers)
     assert r.status_code in (200, 201)
 
-    assert len(captured) == 0, "No debería enviar push a device desactivado"
+    sent = _pushes_for_order(client, provider, r.json()["id"], timeout=1.0)
+    assert sent == [], "No debería enviar push a device desactivado"
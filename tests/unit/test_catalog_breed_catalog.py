@@ -0,0 +1,42 @@
+import asyncio
+import json
+
+from app.modules.catalog.app.use_cases import GetBreedCatalog
+from app.modules.catalog.domain.breed import Breed
+from app.modules.catalog.infra.breed_index import BreedIndex
+
+
+def _breed(id, name, species, is_active=True):
+    return Breed(id=id, name=name, species=species, is_active=is_active, coat_group=None, coat_type=None)
+
+
+class FakeBreedIndexCache:
+    def __init__(self, index):
+        self.index = index
+
+    async def get(self):
+        return self.index
+
+
+def test_catalog_is_grouped_memoized_and_versioned():
+    index = BreedIndex([
+        _breed("siames", "Siamés", "cat"),
+        _breed("pug", "Pug", "dog"),
+        _breed("dalmata", "Dálmata", "dog"),
+        _breed("boxer", "Boxer", "dog", is_active=False),
+    ])
+    use_case = GetBreedCatalog(breeds=FakeBreedIndexCache(index))
+
+    first = asyncio.run(use_case.execute())
+    assert asyncio.run(use_case.execute()) is first
+    groups = json.loads(first.body)
+    assert [g["species"] for g in groups] == ["dog", "cat"]
+    assert [b["id"] for b in groups[0]["breeds"]] == ["dalmata", "pug"]
+
+    dogs = asyncio.run(use_case.execute(species=" DOG "))
+    assert [g["species"] for g in json.loads(dogs.body)] == ["dog"]
+
+    index.apply(_breed("boxer", "Boxer", "dog"))
+    updated = asyncio.run(use_case.execute())
+    assert updated.etag != first.etag
+    assert [b["id"] for b in json.loads(updated.body)[0]["breeds"]] == ["boxer", "dalmata", "pug"]
@@ -0,0 +1,64 @@
+import asyncio
+from dataclasses import replace
+
+from app.modules.catalog.domain.breed import Breed
+from app.modules.catalog.infra.breed_index import BreedIndex, BreedIndexCache, normalize_breed_key
+
+DACHSHUND = Breed(
+    id="dachshund", name="Dachshund (Salchicha)", species="dog", is_active=True,
+    coat_group="single", coat_type="simple_short",
+)
+PASTOR = Breed(
+    id="pastor_aleman", name="Pastor Alemán", species="dog", is_active=True,
+    coat_group="double", coat_type="double_long",
+)
+
+
+def test_normalize_strips_accents_case_and_separators():
+    assert normalize_breed_key(" Pastor-Alemán ") == "pastor_aleman"
+    assert normalize_breed_key("PASTOR_ALEMAN") == "pastor_aleman"
+
+
+def test_lookup_by_id_name_and_aliases():
+    index = BreedIndex([DACHSHUND, PASTOR])
+
+    assert index.coat_type("dachshund") == "simple_short"
+    assert index.coat_type("Salchicha") == "simple_short"
+    assert index.coat_type("dachshund (salchicha)") == "simple_short"
+    assert index.coat_type("pastor aleman") == "double_long"
+    assert index.coat_type("pastor_aleman", species="cat") is None
+    assert index.coat_type("mestizo") is None
+    assert index.coat_type(None) is None
+
+
+def test_apply_reflects_admin_coat_type_change():
+    index = BreedIndex([DACHSHUND])
+    index.apply(replace(DACHSHUND, coat_type="simple_medium_long"))
+
+    assert index.coat_type("salchicha") == "simple_medium_long"
+
+
+class _RacingCache(BreedIndexCache):
+    """El admin actualiza una raza mientras esta instancia lee la tabla."""
+
+    def __init__(self, snapshots):
+        super().__init__(ttl_seconds=300)
+        self._snapshots = list(snapshots)
+        self.loads = 0
+
+    async def _load(self):
+        self.loads += 1
+        index = BreedIndex(self._snapshots.pop(0))
+        if self.loads == 1:
+            self.invalidate()
+        return index
+
+
+def test_load_that_raced_an_invalidation_is_discarded():
+    cache = _RacingCache([[DACHSHUND], [replace(DACHSHUND, coat_type="simple_long")]])
+
+    index = asyncio.run(cache.get())
+
+    assert cache.loads == 2
+    assert index.coat_type("dachshund") == "simple_long"
+    assert asyncio.run(cache.get()) is index
@@ -0,0 +1,41 @@
+import json
+from datetime import datetime, timezone
+from uuid import uuid4
+
+from app.modules.chat.domain.message import Message
+from app.modules.chat.infra.live_room import _on_chat_notify, chat_broadcaster, message_event
+
+
+def _message(body: str) -> Message:
+    return Message(
+        id=uuid4(),
+        order_id=uuid4(),
+        sender_id=uuid4(),
+        sender_role="user",
+        body=body,
+        is_read=False,
+        created_at=datetime.now(timezone.utc),
+    )
+
+
+def test_message_event_fits_notify_payload():
+    message = _message("hola")
+    event = json.loads(message_event(message))
+    assert event["type"] == "message"
+    assert event["message"]["body"] == "hola"
+
+
+def test_oversized_message_becomes_resync():
+    message = _message("ñ" * 2000 + "x" * 4000)
+    event = json.loads(message_event(message))
+    assert event == {"type": "resync", "order_id": str(message.order_id)}
+
+
+def test_notify_is_routed_to_order_subscribers():
+    message = _message("hola")
+    queue = chat_broadcaster.subscribe(message.order_id)
+    try:
+        _on_chat_notify(message_event(message))
+        assert queue.get_nowait()["message"]["id"] == str(message.id)
+    finally:
+        chat_broadcaster.unsubscribe(message.order_id, queue)
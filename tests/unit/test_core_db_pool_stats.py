@@ -0,0 +1,21 @@
+from app.core.db_pool import PoolStats
+
+
+def test_snapshot_reports_percentiles_and_timeouts():
+    stats = PoolStats(window=100)
+    for ms in range(1, 101):
+        stats.observe(ms / 1000)
+    stats.observe(10.0, timed_out=True)
+
+    snap = stats.snapshot()
+
+    assert snap["checkouts"] == 100
+    assert snap["timeouts"] == 1
+    assert snap["wait_p50_ms"] == 52.0
+    assert snap["wait_p99_ms"] == 10000.0
+    assert snap["wait_max_ms"] == 10000.0
+
+
+def test_empty_snapshot_is_zero():
+    snap = PoolStats().snapshot()
+    assert snap["checkouts"] == 0 and snap["wait_p95_ms"] == 0.0 and snap["wait_avg_ms"] == 0.0
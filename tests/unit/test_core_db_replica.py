@@ -0,0 +1,57 @@
+import asyncio
+
+from app.core.db_replica import ReplicaRouter
+
+
+def _router(probe, **kwargs):
+    defaults = dict(enabled=True, probe=probe, max_lag_seconds=5, check_interval_seconds=60)
+    defaults.update(kwargs)
+    return ReplicaRouter(**defaults)
+
+
+def test_disabled_router_always_uses_primary():
+    async def probe():
+        raise AssertionError("no debe medir")
+
+    assert asyncio.run(_router(probe, enabled=False).use_replica()) is False
+
+
+def test_lag_over_bound_falls_back_to_primary_and_is_cached():
+    calls = []
+
+    async def probe():
+        calls.append(1)
+        return 1.0
+
+    async def scenario():
+        router = _router(probe)
+        first = await router.use_replica()
+        second = await router.use_replica()
+        return first, second
+
+    assert asyncio.run(scenario()) == (True, True)
+    assert len(calls) == 1
+
+    lagging = _router(lambda: _const(30.0))
+    assert asyncio.run(lagging.use_replica()) is False
+    assert lagging.status()["lag_seconds"] == 30.0
+
+
+def test_probe_errors_route_to_primary():
+    async def probe():
+        raise ConnectionError("replica down")
+
+    router = _router(probe)
+    assert asyncio.run(router.use_replica()) is False
+    assert router.status()["healthy"] is False
+
+
+def test_unknown_lag_routes_to_primary():
+    router = _router(lambda: _const(None))
+    assert asyncio.run(router.use_replica()) is False
+    assert router.status()["healthy"] is False
+    assert router.status()["lag_seconds"] is None
+
+
+async def _const(value):
+    return value
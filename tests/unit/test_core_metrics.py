@@ -0,0 +1,50 @@
+import pytest
+
+from app.core.metrics import Counter, Gauge, Histogram, Registry, external_calls_total, track_external
+
+
+def test_histogram_renders_cumulative_buckets():
+    hist = Histogram("req_seconds", "Duración.", ("route",), buckets=(0.1, 1.0))
+    hist.observe(0.05, route="/a")
+    hist.observe(0.5, route="/a")
+    hist.observe(3.0, route="/a")
+
+    text = hist.render()
+
+    assert '# TYPE req_seconds histogram' in text
+    assert 'req_seconds_bucket{route="/a",le="0.1"} 1' in text
+    assert 'req_seconds_bucket{route="/a",le="1"} 2' in text
+    assert 'req_seconds_bucket{route="/a",le="+Inf"} 3' in text
+    assert 'req_seconds_count{route="/a"} 3' in text
+    assert 'req_seconds_sum{route="/a"} 3.55' in text
+
+
+def test_registry_renders_counters_and_gauges_with_escaped_labels():
+    registry = Registry()
+    calls = registry.register(Counter("calls_total", "Llamadas.", ("path",)))
+    inflight = registry.register(Gauge("inflight", "En curso."))
+    calls.inc(path='/x"y')
+    inflight.inc()
+    inflight.inc()
+    inflight.dec()
+
+    text = registry.render()
+
+    assert 'calls_total{path="/x\\"y"} 1' in text
+    assert "inflight 1" in text
+    with pytest.raises(ValueError):
+        registry.register(Counter("calls_total", "dup"))
+    with pytest.raises(ValueError):
+        calls.inc(other="x")
+
+
+def test_track_external_counts_outcome():
+    before = external_calls_total.value(service="test", operation="op", outcome="error")
+    with pytest.raises(RuntimeError):
+        with track_external("test", "op"):
+            raise RuntimeError("boom")
+    with track_external("test", "op"):
+        pass
+
+    assert external_calls_total.value(service="test", operation="op", outcome="error") == before + 1
+    assert external_calls_total.value(service="test", operation="op", outcome="ok") >= 1
@@ -0,0 +1,18 @@
+from datetime import datetime, timezone
+from uuid import uuid4
+
+import pytest
+
+from app.core.pagination import decode_cursor, encode_cursor
+
+
+def test_cursor_round_trip():
+    created_at = datetime(2026, 5, 15, 14, 32, 10, 123456, tzinfo=timezone.utc)
+    id_ = uuid4()
+    assert decode_cursor(encode_cursor(created_at, id_)) == (created_at, id_)
+
+
+@pytest.mark.parametrize("cursor", ["", "not-base64!", "aGVsbG8"])
+def test_invalid_cursor_raises(cursor):
+    with pytest.raises(ValueError, match="invalid_cursor"):
+        decode_cursor(cursor)
@@ -0,0 +1,60 @@
+import logging
+
+from fastapi import FastAPI, Request
+from fastapi.responses import StreamingResponse
+from fastapi.testclient import TestClient
+
+from app.core.request_context import (
+    RequestContextMiddleware,
+    add_server_timing,
+    configure_logging,
+    get_request_id,
+)
+
+
+def _app() -> FastAPI:
+    app = FastAPI()
+    app.add_middleware(RequestContextMiddleware)
+
+    @app.get("/ctx")
+    async def ctx(request: Request):
+        add_server_timing("work", 1.5, "compute")
+        return {"context": get_request_id(), "state": request.state.request_id}
+
+    @app.get("/stream")
+    async def stream():
+        async def chunks():
+            yield b"a"
+            yield b"b"
+
+        return StreamingResponse(chunks())
+
+    return app
+
+
+def test_request_id_is_propagated_and_echoed():
+    client = TestClient(_app())
+
+    resp = client.get("/ctx", headers={"X-Request-ID": "abc-123"})
+
+    assert resp.json() == {"context": "abc-123", "state": "abc-123"}
+    assert resp.headers["x-request-id"] == "abc-123"
+    timing = resp.headers["server-timing"]
+    assert timing.startswith("app;dur=")
+    assert 'work;dur=1.5;desc="compute"' in timing
+
+
+def test_invalid_incoming_id_is_replaced_and_streaming_works():
+    client = TestClient(_app())
+
+    resp = client.get("/stream", headers={"X-Request-ID": "bad id\twith spaces"})
+
+    assert resp.content == b"ab"
+    assert resp.headers["x-request-id"] != "bad id\twith spaces"
+    assert get_request_id() is None
+
+
+def test_log_records_carry_request_id():
+    configure_logging()
+    record = logging.getLogger("test").makeRecord("test", logging.INFO, __file__, 1, "msg", (), None)
+    assert record.request_id == "-"
@@ -0,0 +1,70 @@
+import asyncio
+from datetime import datetime
+from uuid import uuid4
+
+from app.modules.notifications.domain.events import (
+    CompiledTemplate,
+    OrderAssigned,
+    OrderPaymentConfirmed,
+    OrderStatusChanged,
+)
+from app.modules.notifications.infra.dispatcher import NotificationDispatcher
+
+
+def test_compiled_template_renders_fields():
+    template = CompiledTemplate("Hola {name}, tu cita es el {date}.")
+    assert template.render({"name": "Ana", "date": "01/05"}) == "Hola Ana, tu cita es el 01/05."
+
+
+def test_events_render_title_body_and_data():
+    user, order = uuid4(), uuid4()
+    draft = OrderAssigned(user_id=user, order_id=order, scheduled_at=datetime(2026, 5, 1, 9, 30)).render()
+    assert draft.type == "order_assigned"
+    assert draft.body.endswith("el 01/05/2026 a las 09:30.")
+    assert draft.data["order_id"] == str(order)
+
+    unknown = OrderStatusChanged(user_id=user, order_id=order, status="created").render()
+    assert unknown.title == "Estado actualizado"
+
+
+def test_status_bursts_coalesce_into_last_event():
+    user, order = uuid4(), uuid4()
+    batches = []
+
+    async def writer(drafts):
+        batches.append(list(drafts))
+
+    async def scenario():
+        dispatcher = NotificationDispatcher(coalesce_ms=50, writer=writer)
+        await dispatcher.start()
+        await dispatcher.dispatch(OrderStatusChanged(user_id=user, order_id=order, status="accepted"))
+        await dispatcher.dispatch(OrderStatusChanged(user_id=user, order_id=order, status="on_the_way"))
+        await dispatcher.dispatch(OrderPaymentConfirmed(user_id=user, order_id=order, payment_status="paid"))
+        assert batches == []
+        await asyncio.sleep(0.1)
+        await dispatcher.stop()
+
+    asyncio.run(scenario())
+
+    assert len(batches) == 1
+    assert [d.title for d in batches[0]] == ["Groomer en camino", "Pago confirmado"]
+
+
+def test_stop_flushes_pending_and_immediate_mode_writes_at_once():
+    batches = []
+
+    async def writer(drafts):
+        batches.append(len(drafts))
+
+    async def scenario():
+        dispatcher = NotificationDispatcher(coalesce_ms=60_000, writer=writer)
+        await dispatcher.start()
+        await dispatcher.dispatch(OrderStatusChanged(user_id=uuid4(), order_id=uuid4(), status="done"))
+        await dispatcher.stop()
+
+        immediate = NotificationDispatcher(coalesce_ms=0, writer=writer)
+        await immediate.start()
+        await immediate.dispatch(OrderStatusChanged(user_id=uuid4(), order_id=uuid4(), status="done"))
+
+    asyncio.run(scenario())
+    assert batches == [1, 1]
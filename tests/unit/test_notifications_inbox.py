@@ -0,0 +1,56 @@
+import asyncio
+from datetime import datetime, timezone
+from uuid import uuid4
+
+import pytest
+from fastapi import HTTPException
+
+from app.core.pagination import encode_cursor
+from app.modules.notifications.app.use_cases import ListNotifications, MarkReadMany
+
+
+class FakeRepo:
+    def __init__(self):
+        self.calls = []
+
+    async def list_notifications(self, **kwargs):
+        self.calls.append(("list", kwargs))
+        return []
+
+    async def mark_read_many(self, **kwargs):
+        self.calls.append(("mark", kwargs))
+        return 3, 1
+
+    async def unread_count(self, **kwargs):
+        return 4
+
+
+def test_list_decodes_before_cursor():
+    repo = FakeRepo()
+    ts, id_ = datetime(2026, 10, 1, tzinfo=timezone.utc), uuid4()
+
+    asyncio.run(ListNotifications(repo=repo).execute(user_id=uuid4(), before=encode_cursor(ts, id_)))
+
+    assert repo.calls[0][1]["before"] == (ts, id_)
+
+
+@pytest.mark.parametrize(
+    "kwargs",
+    [{}, {"ids": [uuid4()], "up_to": "x"}, {"up_to": "not-a-cursor"}],
+)
+def test_mark_read_many_rejects_ambiguous_or_invalid_input(kwargs):
+    with pytest.raises(HTTPException) as exc:
+        asyncio.run(MarkReadMany(repo=FakeRepo()).execute(user_id=uuid4(), **kwargs))
+    assert exc.value.status_code == 422
+
+
+def test_mark_read_many_up_to_cursor_is_one_repo_call():
+    repo = FakeRepo()
+    ts, id_ = datetime(2026, 10, 1, tzinfo=timezone.utc), uuid4()
+
+    result = asyncio.run(MarkReadMany(repo=repo).execute(user_id=uuid4(), up_to=encode_cursor(ts, id_)))
+
+    assert result == (3, 1)
+    assert [c[0] for c in repo.calls] == ["mark"]
+    assert repo.calls[0][1]["up_to"] == (ts, id_)
+    assert asyncio.run(MarkReadMany(repo=FakeRepo()).execute(user_id=uuid4(), ids=[])) == (0, 4)
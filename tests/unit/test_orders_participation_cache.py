@@ -0,0 +1,42 @@
+from uuid import uuid4
+
+from app.modules.orders.domain.order import OrderParticipation, OrderStatus
+from app.modules.orders.infra.participation_cache import ParticipationCache
+
+
+def _participation(status=OrderStatus.on_the_way):
+    return OrderParticipation(
+        id=uuid4(),
+        user_id=uuid4(),
+        status=status,
+        ally_id=uuid4(),
+        delivery_address_snapshot={"lat": -12.05, "lng": -77.04},
+    )
+
+
+def test_cache_returns_entry_until_invalidated():
+    cache = ParticipationCache(ttl_seconds=30)
+    participation = _participation()
+    cache.put(participation)
+
+    assert cache.get(participation.id) is participation
+    cache.invalidate(participation.id)
+    assert cache.get(participation.id) is None
+
+
+def test_cache_disabled_with_zero_ttl():
+    cache = ParticipationCache(ttl_seconds=0)
+    participation = _participation()
+    cache.put(participation)
+
+    assert cache.get(participation.id) is None
+
+
+def test_cache_evicts_oldest_when_full():
+    cache = ParticipationCache(ttl_seconds=30, max_entries=2)
+    first, second, third = _participation(), _participation(), _participation()
+    for p in (first, second, third):
+        cache.put(p)
+
+    assert cache.get(first.id) is None
+    assert cache.get(third.id) is third
@@ -0,0 +1,40 @@
+import asyncio
+
+from app.modules.push.domain.push import PushMessage
+from app.modules.push.infra.broadcast_runner import BroadcastRunner
+from app.modules.push.infra.provider import PushDeliveryError
+
+
+class _FlakyProvider:
+    def __init__(self, failures: int) -> None:
+        self.failures = failures
+        self.calls = 0
+
+    async def send_chunk(self, messages):
+        self.calls += 1
+        if self.calls <= self.failures:
+            raise PushDeliveryError("expo_http_503")
+        return [{"status": "ok"} for _ in messages[:-1]] + [{"status": "error", "message": "DeviceNotRegistered"}]
+
+
+def _send(provider, tokens):
+    runner = BroadcastRunner(page_size=1000, concurrency=2, retry_base_seconds=0)
+    return asyncio.run(
+        runner._send_chunk(provider, asyncio.Semaphore(1), 3, tokens, PushMessage(title="t", body="b"))
+    )
+
+
+def test_chunk_is_retried_after_transient_failure():
+    provider = _FlakyProvider(failures=1)
+    result, tickets = _send(provider, ["a", "b", "c"])
+    assert provider.calls == 2
+    assert len(tickets) == 3
+    assert (result.chunk_index, result.ok_count, result.error_count, result.error) == (3, 2, 1, None)
+
+
+def test_chunk_counts_as_failed_when_retries_are_exhausted():
+    provider = _FlakyProvider(failures=10)
+    result, tickets = _send(provider, ["a", "b"])
+    assert provider.calls == 3
+    assert tickets == []
+    assert (result.ok_count, result.error_count, result.error) == (0, 2, "expo_http_503")
@@ -0,0 +1,43 @@
+from uuid import uuid4
+
+from app.modules.push.domain.push import PushOutboxEntry
+from app.modules.push.infra.outbox_worker import build_chunks, retry_delay_seconds
+
+
+def _entry(id_: int, user_id) -> PushOutboxEntry:
+    return PushOutboxEntry(id=id_, user_id=user_id, title="t", body="b", data=None, attempts=0)
+
+
+def test_chunks_never_split_an_entry():
+    users = [uuid4() for _ in range(3)]
+    tokens = {users[0]: ["a"] * 60, users[1]: ["b"] * 60, users[2]: ["c"]}
+    entries = [_entry(1, users[0]), _entry(2, users[1]), _entry(3, users[2])]
+
+    chunks, no_devices = build_chunks(entries, tokens, chunk_size=100)
+
+    assert no_devices == []
+    assert [chunk.ids for chunk in chunks] == [[1], [2, 3]]
+    assert all(len(chunk.messages) <= 100 for chunk in chunks)
+    assert [(start, end) for _, start, end in chunks[1].spans] == [(0, 60), (60, 61)]
+
+
+def test_entries_without_devices_are_reported():
+    user = uuid4()
+    chunks, no_devices = build_chunks([_entry(7, user)], {}, chunk_size=100)
+    assert chunks == []
+    assert no_devices == [7]
+
+
+def test_tokens_over_chunk_limit_are_logged(caplog):
+    user = uuid4()
+    with caplog.at_level("WARNING"):
+        chunks, _ = build_chunks([_entry(9, user)], {user: ["t"] * 105}, chunk_size=100)
+
+    assert [len(chunk.messages) for chunk in chunks] == [100]
+    assert "has 105 active tokens, skipping 5" in caplog.text
+
+
+def test_retry_delay_grows_and_is_capped():
+    assert 4.5 <= retry_delay_seconds(1, 5) <= 5.5
+    assert 36 <= retry_delay_seconds(4, 5) <= 44
+    assert retry_delay_seconds(30, 5) <= 660
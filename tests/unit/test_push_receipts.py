@@ -0,0 +1,39 @@
+from datetime import datetime, timedelta, timezone
+
+from app.modules.push.infra.receipts import DEVICE_NOT_REGISTERED, RECEIPT_EXPIRY, classify_receipts, classify_tickets
+
+
+def test_classify_tickets_splits_ok_and_dead_tokens():
+    tokens = ["t1", "t2", "t3"]
+    tickets = [
+        {"status": "ok", "id": "abc"},
+        {"status": "error", "message": "gone", "details": {"error": DEVICE_NOT_REGISTERED}},
+        {"status": "error", "message": "MessageRateExceeded"},
+    ]
+
+    ok_rows, dead, errors = classify_tickets(tokens, tickets)
+
+    assert ok_rows == [("abc", "t1")]
+    assert dead == ["t2"]
+    assert errors == 2
+
+
+def test_classify_receipts_skips_tickets_still_waiting():
+    now = datetime.now(timezone.utc)
+    recent, old = now - timedelta(minutes=20), now - RECEIPT_EXPIRY - timedelta(minutes=1)
+    pending = [
+        ("ok", "t1", "notification", None, recent),
+        ("dead", "t2", "notification", None, recent),
+        ("waiting", "t3", "notification", None, recent),
+        ("lost", "t4", "notification", None, old),
+    ]
+    receipts = {
+        "ok": {"status": "ok"},
+        "dead": {"status": "error", "details": {"error": DEVICE_NOT_REGISTERED}},
+    }
+
+    assert classify_receipts(pending, receipts, now=now) == {
+        "ok": ("ok", None),
+        "dead": ("error", DEVICE_NOT_REGISTERED),
+        "lost": ("expired", None),
+    }
@@ -0,0 +1,96 @@
+import asyncio
+from decimal import Decimal
+from uuid import uuid4
+
+from sqlalchemy.ext.asyncio import AsyncSession, create_async_engine
+
+from app.modules.store.domain.models import Species
+from app.modules.store.infra.db_models import StorePriceRuleModel
+from app.modules.store.infra.postgres_store_repository import PostgresStoreRepository
+
+PRODUCT, ADDON, UNPRICED = uuid4(), uuid4(), uuid4()
+
+
+class _Rows:
+    def __init__(self, rows):
+        self._rows = rows
+
+    def all(self):
+        return self._rows
+
+
+class DistinctOnSession:
+    """
+    SQLite no tiene DISTINCT ON: ejecuta la query sin él y se queda con la
+    primera fila de cada (target_id, target_type), respetando el ORDER BY.
+    """
+
+    def __init__(self, session):
+        self._session = session
+
+    async def execute(self, stmt):
+        assert [c.name for c in stmt._distinct_on] == ["target_id", "target_type"]
+        plain = stmt._clone()
+        plain._distinct = False
+        plain._distinct_on = ()
+        first = {}
+        for row in (await self._session.execute(plain)).all():
+            first.setdefault((row.target_id, row.target_type), row)
+        return _Rows(list(first.values()))
+
+
+def _rule(target_id, breed_category, weight_min, weight_max, price, *, target_type="product", is_active=True):
+    return StorePriceRuleModel(
+        target_id=target_id,
+        target_type=target_type,
+        species="dog",
+        breed_category=breed_category,
+        weight_min=weight_min,
+        weight_max=weight_max,
+        price=Decimal(price),
+        currency="PEN",
+        is_active=is_active,
+    )
+
+
+async def _prices(rules, *, breed_category, weight):
+    engine = create_async_engine("sqlite+aiosqlite://")
+    async with engine.begin() as conn:
+        await conn.run_sync(StorePriceRuleModel.__table__.create)
+    async with AsyncSession(engine) as session:
+        session.add_all(rules)
+        await session.commit()
+        repo = PostgresStoreRepository(session=DistinctOnSession(session), engine=engine)
+        prices = await repo._price_for_many_sql(
+            targets=[
+                (PRODUCT, "product", Species.dog),
+                (ADDON, "addon", Species.dog),
+                (UNPRICED, "product", Species.dog),
+            ],
+            breed_category=breed_category,
+            weight=weight,
+        )
+    await engine.dispose()
+    return prices
+
+
+def test_breed_category_beats_mestizo_and_highest_weight_min_wins():
+    rules = [
+        _rule(PRODUCT, "mestizo", 0, None, "40"),
+        _rule(PRODUCT, "small", 0, 10, "50"),
+        _rule(PRODUCT, "small", 5, None, "90"),
+        _rule(PRODUCT, "small", 6, None, "1", is_active=False),
+        _rule(ADDON, "mestizo", 0, None, "15", target_type="addon"),
+        _rule(ADDON, "small", 0, 3, "20", target_type="addon"),
+    ]
+
+    prices = asyncio.run(_prices(rules, breed_category="small", weight=8))
+
+    assert prices == {(PRODUCT, "product"): 90.0, (ADDON, "addon"): 15.0}   # sin regla → ausente
+    assert (UNPRICED, "product") not in prices
+
+
+def test_unknown_breed_category_falls_back_to_mestizo():
+    rules = [_rule(PRODUCT, "mestizo", 0, None, "40"), _rule(PRODUCT, "small", 0, 10, "50")]
+
+    assert asyncio.run(_prices(rules, breed_category=None, weight=8)) == {(PRODUCT, "product"): 40.0}
@@ -0,0 +1,101 @@
+import asyncio
+from uuid import uuid4
+
+from app.modules.store.domain.models import PriceRule, Species
+from app.modules.store.infra.price_index import CompiledPriceIndex, PriceIndexCache
+
+PRODUCT = uuid4()
+
+
+def _rule(breed_category, weight_min, weight_max, price, *, is_active=True, rule_id=None):
+    return PriceRule(
+        id=rule_id or uuid4(),
+        target_id=PRODUCT,
+        target_type="product",
+        species=Species.dog,
+        breed_category=breed_category,
+        weight_min=weight_min,
+        weight_max=weight_max,
+        price=price,
+        currency="PEN",
+        is_active=is_active,
+    )
+
+
+def _lookup(index, breed_category, weight):
+    return index.lookup(
+        target_id=PRODUCT, target_type="product", species="dog", breed_category=breed_category, weight=weight
+    )
+
+
+def test_bands_and_overlap_pick_highest_weight_min():
+    index = CompiledPriceIndex([
+        _rule("small", 0, 10, 50.0),
+        _rule("small", 10, 20, 70.0),
+        _rule("small", 5, None, 90.0),
+        _rule("small", 0, 100, 1.0, is_active=False),
+    ])
+
+    assert _lookup(index, "small", 3) == 50.0
+    assert _lookup(index, "small", 8) == 90.0     # 0–10 y 5–∞ cubren; gana weight_min=5
+    assert _lookup(index, "small", 10) == 70.0
+    assert _lookup(index, "small", 250) == 90.0
+
+
+def test_mestizo_fallback_and_miss():
+    index = CompiledPriceIndex([_rule("small", 0, 10, 50.0), _rule("mestizo", 0, None, 40.0)])
+
+    assert _lookup(index, "small", 15) == 40.0
+    assert _lookup(index, "large", 15) == 40.0
+    assert _lookup(CompiledPriceIndex([_rule("small", 0, 10, 50.0)]), "small", 15) is None
+
+
+def test_apply_patches_moved_and_deactivated_rules():
+    rule_id = uuid4()
+    index = CompiledPriceIndex([_rule("small", 0, 10, 50.0, rule_id=rule_id)])
+
+    index.apply(_rule("large", 0, 10, 65.0, rule_id=rule_id))
+    assert _lookup(index, "small", 5) is None
+    assert _lookup(index, "large", 5) == 65.0
+
+    index.apply(_rule("large", 0, 10, 65.0, rule_id=rule_id, is_active=False))
+    assert _lookup(index, "large", 5) is None
+    assert len(index) == 0
+
+
+def test_weight_band_changes_only_at_rule_limits():
+    index = CompiledPriceIndex([_rule("small", 0, 10, 50.0), _rule("small", 10, 20, 70.0)])
+
+    assert index.weight_band(3) == index.weight_band(9.5)
+    assert index.weight_band(10) not in (index.weight_band(9.5), index.weight_band(12))
+    assert index.weight_band(12) == index.weight_band(19)
+
+    version = index.version
+    index.apply(_rule("small", 5, None, 90.0))
+    assert index.version != version
+
+
+class _RacingCache(PriceIndexCache):
+    """Simula un NOTIFY de otra instancia que llega mientras se lee la tabla."""
+
+    def __init__(self, snapshots):
+        super().__init__(enabled=True, ttl_seconds=300)
+        self._snapshots = list(snapshots)
+        self.loads = 0
+
+    async def _load(self):
+        self.loads += 1
+        index = CompiledPriceIndex(self._snapshots.pop(0))
+        if self.loads == 1:
+            self.invalidate()
+        return index
+
+
+def test_load_that_raced_an_invalidation_is_discarded():
+    cache = _RacingCache([[_rule("small", 0, 10, 50.0)], [_rule("small", 0, 10, 55.0)]])
+
+    index = asyncio.run(cache.get())
+
+    assert cache.loads == 2
+    assert _lookup(index, "small", 5) == 55.0
+    assert asyncio.run(cache.get()) is index
@@ -0,0 +1,80 @@
+import asyncio
+from datetime import datetime, timezone
+from uuid import uuid4
+
+from app.modules.pets.domain.pet import Pet, Species as PetSpecies
+from app.modules.pets.infra.pet_repository import InMemoryPetRepository
+from app.modules.store.app.use_cases_impl.quote import Quote
+from app.modules.store.domain.models import Addon, Product, Species
+from app.modules.store.infra.quote_cache import quote_cache
+
+PRODUCT = Product(
+    id=uuid4(), category_id=uuid4(), name="Baño", species=Species.dog, allowed_breeds=None, is_active=True
+)
+ADDON = Addon(id=uuid4(), product_id=PRODUCT.id, name="Corte de uñas", species=Species.dog, allowed_breeds=None, is_active=True)
+
+
+class FakeStoreRepo:
+    def __init__(self):
+        self.reads = 0
+
+    async def breed_category(self, breed):
+        return None
+
+    async def pricing_band(self, weight):
+        return 0 if weight <= 10 else 1
+
+    async def get_product(self, product_id):
+        self.reads += 1
+        return PRODUCT if product_id == PRODUCT.id else None
+
+    async def get_addon(self, addon_id):
+        self.reads += 1
+        return ADDON if addon_id == ADDON.id else None
+
+    async def price_for_many(self, *, targets, breed_category, weight):
+        self.reads += 1
+        return {(t_id, t_type): (50.0 if weight <= 10 else 80.0) for t_id, t_type, _ in targets}
+
+
+class CountingPetRepo(InMemoryPetRepository):
+    def __init__(self):
+        super().__init__()
+        self.reads = 0
+
+    async def get_profile(self, pet_id):
+        self.reads += 1
+        return await super().get_profile(pet_id)
+
+
+def _pet(weight_kg):
+    return Pet(
+        id=uuid4(), owner_id=uuid4(), name="Toby", species=PetSpecies.dog, breed=None, sex=None,
+        birth_date=None, notes=None, created_at=datetime.now(timezone.utc), weight_kg=weight_kg,
+    )
+
+
+def test_repeat_quotes_hit_cache_until_tag_or_band_changes():
+    quote_cache.clear()
+    store, pets = FakeStoreRepo(), CountingPetRepo()
+    light, other_light, heavy = _pet(5.0), _pet(8.0), _pet(20.0)
+    for pet in (light, other_light, heavy):
+        asyncio.run(pets.add(pet))
+    use_case = Quote(repo=store, pets_repo=pets)
+
+    def quote(pet):
+        return asyncio.run(use_case.execute(pet_id=pet.id, product_id=PRODUCT.id, addon_ids=[ADDON.id]))
+
+    first = quote(light)
+    reads = store.reads
+    second = quote(other_light)     # mismo perfil de precio (tramo de peso) → cache
+    assert store.reads == reads
+    assert second.pet_id == other_light.id and second.total == first.total == 100.0
+
+    assert quote(heavy).total == 160.0      # otro tramo → recalcula
+    assert store.reads > reads
+
+    reads = store.reads
+    quote_cache.invalidate(ADDON.id)
+    quote(light)
+    assert store.reads > reads
@@ -0,0 +1,104 @@
+import asyncio
+from datetime import datetime, timezone
+from uuid import uuid4
+
+import pytest
+
+from app.modules.orders.domain.order import Order, OrderStatus
+from app.modules.tracking.domain.eta import (
+    RouteGeometry,
+    SpeedModel,
+    decode_polyline,
+    encode_polyline,
+    haversine_m,
+    parse_district_speeds,
+)
+from app.modules.tracking.domain.location import AllyLocation
+from app.modules.tracking.use_cases.get_route import GetRoute
+
+# Ejemplo oficial del algoritmo de encoded polylines de Google.
+_GOOGLE_POINTS = [(38.5, -120.2), (40.7, -120.95), (43.252, -126.453)]
+_GOOGLE_ENCODED = "_p~iF~ps|U_ulLnnqC_mqNvxq`@"
+
+
+def test_haversine_one_degree_of_latitude():
+    assert haversine_m(0.0, 0.0, 1.0, 0.0) == pytest.approx(111_195, rel=1e-3)
+
+
+def test_polyline_encode_decode_matches_google_reference():
+    assert encode_polyline(_GOOGLE_POINTS) == _GOOGLE_ENCODED
+    assert decode_polyline(_GOOGLE_ENCODED) == _GOOGLE_POINTS
+
+
+def test_decode_polyline_rejects_truncated_input():
+    with pytest.raises(ValueError):
+        decode_polyline("_p~iF~ps|U_")
+
+
+def test_projection_gives_remaining_distance_along_route():
+    # Ruta en L: 0.01° al norte y luego 0.01° al este (~1.1 km cada tramo).
+    geometry = RouteGeometry.from_points([(0.0, 0.0), (0.01, 0.0), (0.01, 0.01)])
+    leg = haversine_m(0.0, 0.0, 0.01, 0.0)
+
+    projection = geometry.project(0.005, 0.0001)  # a mitad del primer tramo, ~11 m de desvío
+
+    assert projection.segment_index == 0
+    assert projection.offset_m == pytest.approx(11.1, rel=0.05)
+    assert projection.remaining_m == pytest.approx(leg * 1.5, rel=0.01)
+
+
+def test_speed_model_uses_district_override():
+    model = SpeedModel(default_kmh=20, district_kmh=parse_district_speeds("150101:10, bad, 150122:x"))
+
+    eta_default, dist = model.estimate((0.0, 0.0), (0.01, 0.0), district_id="150140")
+    eta_slow, _ = model.estimate((0.0, 0.0), (0.01, 0.0), district_id="150101")
+
+    assert model.district_kmh == {"150101": 10.0}
+    assert dist == round(haversine_m(0.0, 0.0, 0.01, 0.0) * 1.3)
+    assert eta_slow == pytest.approx(eta_default * 2, abs=1)
+
+
+class _FakeOrdersRepo:
+    def __init__(self, order):
+        self._order = order
+
+    async def get_participation(self, id):
+        return self._order
+
+
+class _FakeLocationStore:
+    def __init__(self, location):
+        self._location = location
+
+    async def get(self, order_id):
+        return self._location
+
+
+def test_get_route_answers_with_local_estimate_without_network(monkeypatch):
+    monkeypatch.setattr("app.modules.tracking.use_cases.get_route.settings.GOOGLE_ROUTES_API_KEY", None)
+    now = datetime.now(timezone.utc)
+    user_id, ally_id = uuid4(), uuid4()
+    order = Order(
+        id=uuid4(),
+        user_id=user_id,
+        status=OrderStatus.on_the_way,
+        items_snapshot=[],
+        total_snapshot=0.0,
+        currency="PEN",
+        delivery_address_snapshot={"district_id": "150101", "lat": -12.0512, "lng": -77.0398},
+        created_at=now,
+        updated_at=now,
+        ally_id=ally_id,
+    )
+    location = AllyLocation(order.id, ally_id, -12.0464, -77.0428, 5.0, now)
+
+    data = asyncio.run(
+        GetRoute(orders_repo=_FakeOrdersRepo(order), location_store=_FakeLocationStore(location)).execute(
+            order_id=order.id, requester_id=user_id, requester_role="user"
+        )
+    )
+
+    assert data["source"] == "estimate"
+    assert data["polyline"] is None
+    assert data["distance_meters"] > 0
+    assert data["eta_seconds"] > 0
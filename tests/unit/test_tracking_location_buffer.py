@@ -0,0 +1,48 @@
+from datetime import datetime, timedelta, timezone
+from uuid import uuid4
+
+from app.modules.tracking.domain.location import AllyLocation
+from app.modules.tracking.infra.location_buffer import LocationIngestBuffer
+
+
+def _loc(order_id, recorded_at, lat=-12.05):
+    return AllyLocation(
+        order_id=order_id,
+        ally_id=uuid4(),
+        lat=lat,
+        lng=-77.04,
+        accuracy_m=5.0,
+        recorded_at=recorded_at,
+    )
+
+
+def test_buffer_keeps_latest_point_per_order():
+    buffer = LocationIngestBuffer(interval_ms=1000, max_batch=10)
+    order_id = uuid4()
+    now = datetime.now(timezone.utc)
+
+    buffer.put(_loc(order_id, now, lat=-12.01))
+    buffer.put(_loc(order_id, now - timedelta(seconds=5), lat=-12.02))  # llega tarde
+    buffer.put(_loc(order_id, now + timedelta(seconds=10), lat=-12.03))
+
+    assert buffer.get(order_id).lat == -12.03
+
+
+def test_buffer_discard_removes_pending_point():
+    buffer = LocationIngestBuffer(interval_ms=1000, max_batch=10)
+    order_id = uuid4()
+    buffer.put(_loc(order_id, datetime.now(timezone.utc)))
+
+    buffer.discard(order_id)
+
+    assert buffer.get(order_id) is None
+
+
+def test_buffer_size_threshold_wakes_flusher():
+    buffer = LocationIngestBuffer(interval_ms=1000, max_batch=2)
+    now = datetime.now(timezone.utc)
+
+    buffer.put(_loc(uuid4(), now))
+    assert not buffer._wake.is_set()
+    buffer.put(_loc(uuid4(), now))
+    assert buffer._wake.is_set()
@@ -0,0 +1,101 @@
+import asyncio
+from datetime import datetime, timedelta, timezone
+from uuid import uuid4
+
+import pytest
+from fastapi import HTTPException
+
+from app.modules.orders.domain.order import OrderParticipation, OrderStatus
+from app.modules.tracking.use_cases.report_location_batch import ReportLocationBatch
+
+
+class _FakeOrdersRepo:
+    def __init__(self, participation):
+        self._participation = participation
+        self.calls = 0
+
+    async def get_participation(self, id):
+        self.calls += 1
+        return self._participation
+
+
+class _FakeLocationStore:
+    def __init__(self):
+        self.batches = []
+
+    async def upsert_batch(self, locations):
+        self.batches.append(locations)
+
+
+def _setup():
+    ally_id = uuid4()
+    participation = OrderParticipation(
+        id=uuid4(),
+        user_id=uuid4(),
+        status=OrderStatus.on_the_way,
+        ally_id=ally_id,
+        delivery_address_snapshot=None,
+    )
+    return ally_id, participation, _FakeOrdersRepo(participation), _FakeLocationStore()
+
+
+def test_batch_validates_order_once_and_stores_all_points():
+    ally_id, participation, orders_repo, store = _setup()
+    t0 = datetime.now(timezone.utc) - timedelta(minutes=5)
+    points = [(-12.0 - i * 0.001, -77.0, 5.0, t0 + timedelta(seconds=10 * i)) for i in range(30)]
+
+    locations = asyncio.run(
+        ReportLocationBatch(orders_repo=orders_repo, location_store=store).execute(
+            order_id=participation.id, ally_id=ally_id, points=points
+        )
+    )
+
+    assert orders_repo.calls == 1
+    assert len(store.batches) == 1
+    assert len(locations) == 30
+    assert locations[-1].recorded_at == t0 + timedelta(seconds=290)
+
+
+def test_batch_rejects_unordered_points():
+    ally_id, participation, orders_repo, store = _setup()
+    t0 = datetime.now(timezone.utc) - timedelta(minutes=5)
+    points = [(-12.0, -77.0, None, t0 + timedelta(seconds=10)), (-12.0, -77.0, None, t0)]
+
+    with pytest.raises(HTTPException) as exc:
+        asyncio.run(
+            ReportLocationBatch(orders_repo=orders_repo, location_store=store).execute(
+                order_id=participation.id, ally_id=ally_id, points=points
+            )
+        )
+
+    assert exc.value.status_code == 422
+    assert store.batches == []
+
+
+def test_batch_rejects_other_ally():
+    _, participation, orders_repo, store = _setup()
+    points = [(-12.0, -77.0, None, datetime.now(timezone.utc))]
+
+    with pytest.raises(HTTPException) as exc:
+        asyncio.run(
+            ReportLocationBatch(orders_repo=orders_repo, location_store=store).execute(
+                order_id=participation.id, ally_id=uuid4(), points=points
+            )
+        )
+
+    assert exc.value.status_code == 403
+
+
+def test_batch_rejects_points_older_than_retention():
+    ally_id, participation, orders_repo, store = _setup()
+    points = [(-12.0, -77.0, None, datetime.now(timezone.utc) - timedelta(days=400))]
+
+    with pytest.raises(HTTPException) as exc:
+        asyncio.run(
+            ReportLocationBatch(orders_repo=orders_repo, location_store=store).execute(
+                order_id=participation.id, ally_id=ally_id, points=points
+            )
+        )
+
+    assert exc.value.status_code == 422
+    assert store.batches == []
@@ -0,0 +1,128 @@
+import asyncio
+from uuid import uuid4
+
+from app.modules.tracking.infra.route_cache import RouteCache
+
+_DEST = (-12.0512, -77.0398)
+
+
+class _FakeRoutes:
+    def __init__(self):
+        self.calls = 0
+
+    async def fetch(self, origin_lat, origin_lng, dest_lat, dest_lng):
+        self.calls += 1
+        await asyncio.sleep(0.01)
+        return {"duration": "600s", "distanceMeters": 2000, "polyline": {"encodedPolyline": "abc"}}
+
+
+def test_concurrent_requests_share_one_call():
+    async def _run():
+        cache = RouteCache(ttl_seconds=120, recompute_distance_m=300)
+        routes = _FakeRoutes()
+        order_id = uuid4()
+        results = await asyncio.gather(
+            *[
+                cache.get_route(order_id, origin=(-12.0464, -77.0428), dest=_DEST, fetch=routes.fetch)
+                for _ in range(5)
+            ]
+        )
+        return routes.calls, results
+
+    calls, results = asyncio.run(_run())
+
+    assert calls == 1
+    assert all(r is results[0] for r in results)
+
+
+def test_small_movement_reuses_route_and_large_movement_recomputes():
+    async def _run():
+        cache = RouteCache(ttl_seconds=120, recompute_distance_m=300)
+        routes = _FakeRoutes()
+        order_id = uuid4()
+        await cache.get_route(order_id, origin=(-12.0464, -77.0428), dest=_DEST, fetch=routes.fetch)
+        # ~100 m → reutiliza
+        await cache.get_route(order_id, origin=(-12.0473, -77.0428), dest=_DEST, fetch=routes.fetch)
+        first_calls = routes.calls
+        # ~1 km → recalcula
+        await cache.get_route(order_id, origin=(-12.0554, -77.0428), dest=_DEST, fetch=routes.fetch)
+        return first_calls, routes.calls
+
+    first_calls, total_calls = asyncio.run(_run())
+
+    assert first_calls == 1
+    assert total_calls == 2
+
+
+def test_interpolated_eta_shrinks_as_ally_approaches():
+    async def _run():
+        cache = RouteCache(ttl_seconds=120, recompute_distance_m=300)
+        return await cache.get_route(uuid4(), origin=(-12.0464, -77.0428), dest=_DEST, fetch=_FakeRoutes().fetch)
+
+    route = asyncio.run(_run())
+    eta_start, _ = route.interpolate(-12.0464, -77.0428)
+    eta_mid, dist_mid = route.interpolate(-12.0488, -77.0413)
+
+    assert eta_start == 600
+    assert eta_mid < eta_start
+    assert dist_mid < 2000
+
+
+def test_cancelled_leader_releases_waiters():
+    async def _run():
+        cache = RouteCache(ttl_seconds=120, recompute_distance_m=300)
+        started = asyncio.Event()
+
+        async def _slow_fetch(*_):
+            started.set()
+            await asyncio.sleep(10)
+
+        order_id = uuid4()
+        leader = asyncio.create_task(
+            cache.get_route(order_id, origin=(-12.0464, -77.0428), dest=_DEST, fetch=_slow_fetch)
+        )
+        await started.wait()
+        waiter = asyncio.create_task(
+            cache.get_route(order_id, origin=(-12.0464, -77.0428), dest=_DEST, fetch=_slow_fetch)
+        )
+        await asyncio.sleep(0)
+        leader.cancel()
+        done, _ = await asyncio.wait({waiter}, timeout=1)
+        return done, waiter
+
+    done, waiter = asyncio.run(_run())
+
+    assert waiter in done
+    assert isinstance(waiter.exception(), RuntimeError)
+
+
+def test_failed_fetch_backs_off_until_invalidated():
+    async def _run():
+        cache = RouteCache(ttl_seconds=120, recompute_distance_m=300)
+        calls = []
+
+        async def _failing_fetch(*_):
+            calls.append(1)
+            raise ConnectionError("google down")
+
+        order_id = uuid4()
+        origin = (-12.0464, -77.0428)
+        for _ in range(3):
+            try:
+                await cache.get_route(order_id, origin=origin, dest=_DEST, fetch=_failing_fetch)
+            except Exception:
+                pass
+        cache.schedule_refresh(order_id, origin=origin, dest=_DEST, fetch=_failing_fetch)
+        await asyncio.sleep(0)
+        in_backoff = cache.in_backoff(order_id)
+
+        cache.invalidate(order_id)
+        routes = _FakeRoutes()
+        await cache.get_route(order_id, origin=origin, dest=_DEST, fetch=routes.fetch)
+        return len(calls), in_backoff, routes.calls, cache.in_backoff(order_id)
+
+    failing_calls, in_backoff, calls_after, backoff_after = asyncio.run(_run())
+
+    assert failing_calls == 1
+    assert in_backoff is True
+    assert calls_after == 1 and backoff_after is False
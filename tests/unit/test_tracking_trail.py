@@ -0,0 +1,93 @@
+import asyncio
+from contextlib import asynccontextmanager
+from datetime import datetime, timedelta, timezone
+from uuid import uuid4
+
+from sqlalchemy.exc import IntegrityError
+
+from app.core.metrics import tracking_history_points_dropped_total
+from app.modules.tracking.domain.location import AllyLocation
+from app.modules.tracking.domain.trail import decode_trail, encode_trail
+from app.modules.tracking.infra.location_history import LocationHistoryRing, PostgresLocationHistoryStore
+
+
+def test_trail_roundtrip_uses_small_deltas():
+    t0 = datetime(2026, 5, 15, 15, 0, 0, tzinfo=timezone.utc)
+    points = [
+        (-12.046374, -77.042793, t0),
+        (-12.046500, -77.042600, t0 + timedelta(seconds=10)),
+        (-12.046800, -77.042100, t0 + timedelta(seconds=20)),
+    ]
+
+    encoded = encode_trail(points)
+
+    assert encoded[0] == [-1204637, -7704279, int(t0.timestamp())]
+    assert encoded[1] == [-13, 19, 10]
+    decoded = decode_trail(encoded)
+    for (lat, lng, ts), (dlat, dlng, dts) in zip(points, decoded):
+        assert abs(lat - dlat) < 1e-5
+        assert abs(lng - dlng) < 1e-5
+        assert ts == dts
+
+
+def test_history_ring_is_bounded_per_order():
+    ring = LocationHistoryRing(ring_size=3, max_unpersisted=100)
+    order_id = uuid4()
+    t0 = datetime.now(timezone.utc)
+    for i in range(5):
+        ring.append(AllyLocation(order_id, uuid4(), -12.0, -77.0, None, t0 + timedelta(seconds=i)))
+
+    recent = ring.recent(order_id, since=t0 - timedelta(seconds=1))
+
+    assert [loc.recorded_at for loc in recent] == [t0 + timedelta(seconds=i) for i in (2, 3, 4)]
+    assert len(ring.drain_unpersisted()) == 5
+    assert not ring.has_unpersisted
+
+
+def test_unpersisted_queue_drops_oldest_and_counts_them():
+    ring = LocationHistoryRing(ring_size=10, max_unpersisted=3)
+    before = tracking_history_points_dropped_total.value(reason="queue_full")
+    t0 = datetime.now(timezone.utc)
+    points = [AllyLocation(uuid4(), uuid4(), -12.0, -77.0, None, t0 + timedelta(seconds=i)) for i in range(5)]
+    for loc in points[:4]:
+        ring.append(loc)
+
+    failed = ring.drain_unpersisted()      # flush que falla: vuelven delante de los nuevos
+    ring.append(points[4])
+    ring.requeue(failed)
+
+    assert [loc.recorded_at for loc in ring.drain_unpersisted()] == [p.recorded_at for p in points[2:]]
+    assert tracking_history_points_dropped_total.value(reason="queue_full") - before == 2
+
+
+class _PartitionedSession:
+    """Simula ally_location_history con particiones solo para `days`."""
+
+    def __init__(self, days):
+        self.days = days
+        self.rows = []
+
+    @asynccontextmanager
+    async def begin_nested(self):
+        yield
+
+    async def execute(self, stmt, params):
+        for ts in params["recorded_ats"]:
+            if ts.date() not in self.days:
+                raise IntegrityError("INSERT", params, Exception("no partition of relation found for row"))
+        self.rows.extend(params["recorded_ats"])
+
+
+def test_history_insert_drops_only_days_without_partition():
+    today = datetime.now(timezone.utc)
+    old = today - timedelta(days=90)
+    points = [
+        AllyLocation(order_id=uuid4(), ally_id=uuid4(), lat=-12.0, lng=-77.0, accuracy_m=None, recorded_at=ts)
+        for ts in (old, today, today)
+    ]
+    session = _PartitionedSession({today.date()})
+
+    dropped = asyncio.run(PostgresLocationHistoryStore(session=session).insert_many_by_day(points))
+
+    assert dropped == 1
+    assert session.rows == [today, today]